@@ -8,8 +8,9 @@ from fastapi.responses import JSONResponse
 from sentry_sdk.integrations.fastapi import FastApiIntegration
 from sentry_sdk.integrations.starlette import StarletteIntegration
 
-from .middleware import RequestLoggingMiddleware, configure_json_logging
+from .middleware import BodySizeLimitMiddleware, RequestLoggingMiddleware, configure_json_logging
 from .routes import (
+    change_router,
     employee_router,
     public_router,
     schedule_export_router,
@@ -57,12 +58,21 @@ logger.info(f"🔧 CORS_ORIGINS raw: {settings.CORS_ORIGINS}")
 logger.info(f"🔧 CORS_ORIGINS list: {settings.cors_origins_list}")
 
 
+# Added first so it sits inside CORS and request logging: its 413s still
+# get CORS headers and a request log line. Batch import takes many files in
+# one body; the route caps each at MAX_UPLOAD_BYTES.
+app.add_middleware(
+    BodySizeLimitMiddleware,
+    max_bytes=settings.MAX_UPLOAD_BYTES,
+    path_limits={"/api/v1/shift-templates/import/batch/parse": settings.MAX_BATCH_UPLOAD_BYTES},
+)
 app.add_middleware(
     CORSMiddleware,
     allow_origins=settings.cors_origins_list,
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=["X-Request-ID", "X-Next-Cursor", "ETag", "Retry-After", "X-Cache"],
 )
 app.add_middleware(RequestLoggingMiddleware)
 
@@ -111,6 +121,7 @@ app.include_router(schedule_export_router.schedule_export_router)
 app.include_router(shift_router.shifts_router)
 app.include_router(shift_template_router.shift_template_router)
 app.include_router(public_router.public_router)
+app.include_router(change_router.change_router)
 app.include_router(ai_router)
 
 
@@ -126,6 +137,16 @@ async def startup_event():
     logger.info("Supabase client initialised")
 
 
+@app.on_event("shutdown")
+async def shutdown_event():
+    """Drop queued import stages rather than holding shutdown for them."""
+    from app.core.workers import parse_pool
+    from app.services.ai_service import close_ai_service
+
+    parse_pool.shutdown()
+    await close_ai_service()
+
+
 @app.get("/")
 async def read_root():
     return {"Hello": "World"}
@@ -2,11 +2,18 @@ import json
 import logging
 import time
 import traceback
+from typing import Dict, Optional
 from uuid import uuid4
 
+from fastapi import HTTPException, status
 from starlette.middleware.base import BaseHTTPMiddleware
 from starlette.requests import Request
-from starlette.responses import Response
+from starlette.responses import JSONResponse, Response
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from app.core.config import settings
+from app.core.query_metrics import start_query_stats, warn_on_query_smells
+from app.core.workers import start_stage_timings
 
 logger = logging.getLogger(__name__)
 
@@ -68,11 +75,16 @@ class RequestLoggingMiddleware(BaseHTTPMiddleware):
     - Returns it in the X-Request-ID response header
     - Logs incoming requests and outgoing responses as structured JSON
     - Logs unhandled exceptions with full stack trace before re-raising
+    - Attaches PostgREST round-trip totals (count, time, per table) to the
+      completion log, and in development warns on budget overruns / N+1s
+    - Attaches wait/run times of any worker-pool stages to the completion log
     """
 
     async def dispatch(self, request: Request, call_next) -> Response:
         request_id = str(uuid4())
         request.state.request_id = request_id
+        query_stats = start_query_stats()
+        stage_timings = start_stage_timings()
 
         client_ip = (
             request.headers.get("x-forwarded-for", "").split(",")[0].strip()
@@ -108,6 +120,7 @@ class RequestLoggingMiddleware(BaseHTTPMiddleware):
                     "duration_ms": duration_ms,
                     "error_type": type(exc).__name__,
                     "stack_trace": traceback.format_exc(),
+                    **query_stats.summary(),
                 },
                 exc_info=True,
             )
@@ -117,19 +130,100 @@ class RequestLoggingMiddleware(BaseHTTPMiddleware):
         level = logging.WARNING if response.status_code >= 400 else logging.INFO
         logger.log(
             level,
-            "Request completed: %s %s → %d (%.2fms)",
+            "Request completed: %s %s → %d (%.2fms, %d db calls)",
             request.method,
             request.url.path,
             response.status_code,
             duration_ms,
+            query_stats.count,
             extra={
                 "request_id": request_id,
                 "method": request.method,
                 "path": request.url.path,
                 "status_code": response.status_code,
                 "duration_ms": duration_ms,
+                **query_stats.summary(),
+                **stage_timings.summary(),
             },
         )
 
+        if settings.ENVIRONMENT == "development":
+            warn_on_query_smells(
+                query_stats,
+                settings.DB_CALL_BUDGET_PER_REQUEST,
+                request.method,
+                request.url.path,
+                request_id,
+            )
+
         response.headers["X-Request-ID"] = request_id
         return response
+
+
+class BodySizeLimitMiddleware:
+    """
+    Reject request bodies larger than max_bytes with 413, without ever
+    holding more than that in memory.
+
+    A Content-Length over the limit is refused before the body is read.
+    Bodies without one (chunked uploads) are counted as they stream in, and
+    the request fails as soon as the count passes the limit — FastAPI
+    re-raises an HTTPException thrown while it reads the body, so the
+    client gets a 413 rather than the generic 400 for unparseable bodies.
+
+    path_limits overrides max_bytes for specific paths (e.g. a batch upload
+    route that takes many files, each still checked by the route).
+
+    Pure ASGI rather than BaseHTTPMiddleware so it can wrap `receive`.
+    """
+
+    def __init__(self, app: ASGIApp, max_bytes: int, path_limits: Optional[Dict[str, int]] = None):
+        self.app = app
+        self.max_bytes = max_bytes
+        self.path_limits = path_limits or {}
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        max_bytes = self.path_limits.get(scope["path"], self.max_bytes)
+        content_length = dict(scope["headers"]).get(b"content-length")
+        if content_length is not None and content_length.isdigit() and int(content_length) > max_bytes:
+            logger.warning(
+                "Rejected %s %s: Content-Length %s exceeds %d bytes",
+                scope["method"],
+                scope["path"],
+                content_length.decode(),
+                max_bytes,
+            )
+            response = JSONResponse(
+                {"detail": self._detail(max_bytes)}, status_code=status.HTTP_413_CONTENT_TOO_LARGE
+            )
+            await response(scope, receive, send)
+            return
+
+        received = 0
+
+        async def limited_receive() -> Message:
+            nonlocal received
+            message = await receive()
+            if message["type"] == "http.request":
+                received += len(message.get("body", b""))
+                if received > max_bytes:
+                    logger.warning(
+                        "Rejected %s %s: body exceeded %d bytes while streaming",
+                        scope["method"],
+                        scope["path"],
+                        max_bytes,
+                    )
+                    raise HTTPException(
+                        status_code=status.HTTP_413_CONTENT_TOO_LARGE, detail=self._detail(max_bytes)
+                    )
+            return message
+
+        await self.app(scope, limited_receive, send)
+
+    @staticmethod
+    def _detail(max_bytes: int) -> str:
+        return f"Request body too large (limit {max_bytes // 2**20} MB)"
@@ -2,13 +2,17 @@ import logging
 from typing import Literal
 from uuid import UUID
 
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, Response, status
+from fastapi.concurrency import run_in_threadpool
 from pydantic import BaseModel
 
+from ...core.ai_client import AIDeadlineExceededError, ai_metrics
 from ...core.auth import get_current_user
 from ...core.db import get_supabase
-from ...services.ai_service import AIServiceUnavailableError, get_ai_service
-from ...services.employee_service import EmployeeService
+from ...core.workers import PoolSaturatedError, pool_saturated_http_error
+from ...services.ai_service import AIServiceUnavailableError, analysis_input_hash, get_ai_service
+from ...services.analysis_cache_service import analysis_cache_service
+from ...services.employee_service import EmployeeService, EMPLOYEE_ROSTER_COLUMNS
 from ...services.schedule_service import ScheduleService, ScheduleNotFoundError
 
 logger = logging.getLogger(__name__)
@@ -40,43 +44,43 @@ class ScheduleAnalysisResponse(BaseModel):
     "/schedules/{schedule_id}/analyze",
     response_model=ScheduleAnalysisResponse,
 )
-def analyze_schedule(schedule_id: UUID):
+async def analyze_schedule(schedule_id: UUID, response: Response, refresh: bool = False):
     """
     Run an AI-powered analysis of a weekly schedule.
 
     Returns a structured report covering fairness, coverage, workload,
     patterns, and concrete recommendations — each with a good/fair/poor score.
-    """
-    supabase = get_supabase()
-    schedule_service = ScheduleService(supabase)
-    employee_service = EmployeeService(supabase)
 
+    Analyses are cached by a hash of the model's input, so re-analyzing an
+    unchanged schedule (same shifts, same roster) returns the stored report
+    without calling the model; `X-Cache` is HIT or MISS. Any change to the
+    schedule's shifts or the roster misses. Pass `refresh=true` for a fresh
+    analysis (it replaces the cached one).
+
+    The model call is async and bounded (see AsyncCompletionClient): 429
+    when too many are outstanding, 504 past AI_ANALYSIS_DEADLINE_SECONDS.
+    """
     try:
-        schedule_with_shifts = schedule_service.get_schedule_with_shifts(schedule_id)
+        schedule_with_shifts, flat_shifts, all_employees = await run_in_threadpool(
+            _load_analysis_inputs, schedule_id
+        )
     except ScheduleNotFoundError:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail=f"Schedule {schedule_id} not found",
         )
 
-    shifts = schedule_with_shifts.get("shifts", [])
-
-    # Flatten employee name/role from the nested join onto each shift
-    flat_shifts = []
-    for shift in shifts:
-        employee = shift.get("employee") or {}
-        flat_shifts.append({
-            **shift,
-            "employee_name": employee.get("name"),
-            "role": employee.get("role"),
-        })
-
-    # Fetch full active roster so the model can flag employees with zero shifts
-    restaurant_id = schedule_with_shifts.get("restaurant_id")
-    all_employees = employee_service.get_employees(
-        restaurant_id=str(restaurant_id) if restaurant_id else None,
-        is_active=True,
-    )
+    input_hash = analysis_input_hash(schedule_with_shifts, flat_shifts, all_employees)
+    if not refresh:
+        cached = await run_in_threadpool(analysis_cache_service.get, input_hash)
+        if cached is not None:
+            logger.info("Analysis cache hit for schedule_id=%s", schedule_id)
+            response.headers["X-Cache"] = "HIT"
+            return ScheduleAnalysisResponse(
+                schedule_id=str(schedule_with_shifts["id"]),
+                week_start=schedule_with_shifts["week_start"],
+                **cached,
+            )
 
     try:
         ai = get_ai_service()
@@ -88,7 +92,11 @@ def analyze_schedule(schedule_id: UUID):
         )
 
     try:
-        result = ai.analyze_schedule(schedule_with_shifts, flat_shifts, all_employees)
+        result = await ai.analyze_schedule(schedule_with_shifts, flat_shifts, all_employees)
+    except PoolSaturatedError as e:
+        raise pool_saturated_http_error(e)
+    except AIDeadlineExceededError as e:
+        raise HTTPException(status_code=status.HTTP_504_GATEWAY_TIMEOUT, detail=str(e))
     except ValueError as e:
         logger.error("AI returned unexpected response for schedule_id=%s: %s", schedule_id, e)
         raise HTTPException(
@@ -102,8 +110,50 @@ def analyze_schedule(schedule_id: UUID):
             detail="AI analysis failed. Please try again later.",
         )
 
+    await run_in_threadpool(analysis_cache_service.put, input_hash, schedule_with_shifts["id"], result)
+    response.headers["X-Cache"] = "MISS"
     return ScheduleAnalysisResponse(
         schedule_id=str(schedule_with_shifts["id"]),
         week_start=schedule_with_shifts["week_start"],
         **result,
     )
+
+
+@ai_router.get("/ai/metrics")
+def get_ai_metrics():
+    """
+    Per-model call metrics since process start: latency histogram
+    (completed requests, bucketed by upper bound in ms), p50/p95 of recent
+    successful calls, error counts by kind, retries and hedges.
+    """
+    return ai_metrics.snapshot()
+
+
+def _load_analysis_inputs(schedule_id: UUID):
+    """Schedule with shifts (employee name/role flattened on) and the active
+    roster. Blocking; the route runs it in the threadpool."""
+    supabase = get_supabase()
+    schedule_service = ScheduleService(supabase)
+    employee_service = EmployeeService(supabase)
+
+    schedule_with_shifts = schedule_service.get_schedule_with_shifts(schedule_id)
+    shifts = schedule_with_shifts.get("shifts", [])
+
+    # Flatten employee name/role from the nested join onto each shift
+    flat_shifts = []
+    for shift in shifts:
+        employee = shift.get("employee") or {}
+        flat_shifts.append({
+            **shift,
+            "employee_name": employee.get("name"),
+            "role": employee.get("role"),
+        })
+
+    # Fetch full active roster so the model can flag employees with zero shifts
+    restaurant_id = schedule_with_shifts.get("restaurant_id")
+    all_employees = employee_service.get_employees(
+        restaurant_id=str(restaurant_id) if restaurant_id else None,
+        is_active=True,
+        columns=EMPLOYEE_ROSTER_COLUMNS,
+    )
+    return schedule_with_shifts, flat_shifts, all_employees
@@ -0,0 +1,43 @@
+import logging
+
+from fastapi import APIRouter, Depends, HTTPException, Query, status
+from uuid import UUID
+
+from ...core.auth import get_current_user
+from ...core.pagination import InvalidCursorError
+from ...models.change_model import ChangeFeedResponse
+from ...services.change_log_service import CHANGE_FEED_PAGE_SIZE, change_log_service
+
+logger = logging.getLogger(__name__)
+
+change_router = APIRouter(
+    prefix="/api/v1/changes",
+    tags=["changes"],
+    dependencies=[Depends(get_current_user)],
+)
+
+
+@change_router.get("", response_model=ChangeFeedResponse)
+def get_changes(
+    restaurant_id: UUID,
+    since: str | None = None,
+    limit: int = Query(CHANGE_FEED_PAGE_SIZE, ge=1, le=CHANGE_FEED_PAGE_SIZE),
+):
+    """
+    Delta sync feed: shifts, schedules, employees and availability windows
+    created, updated or deleted for a restaurant since `since`, oldest first.
+
+    Call once without `since` to get a starting cursor, then send back the
+    returned `cursor` each time. While `has_more` is true, call again
+    straight away to drain the backlog.
+    """
+    try:
+        return change_log_service.get_changes(restaurant_id, since=since, limit=limit)
+    except InvalidCursorError as e:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
+    except Exception as e:
+        logger.exception("GET /changes failed: %s", e)
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail="An unexpected error occurred. Please try again later.",
+        )
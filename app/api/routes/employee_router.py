@@ -1,11 +1,27 @@
 import logging
 
-from ...models.employee_model import EmployeeCreate, EmployeeModel, EmployeeUpdate
+from ...models.employee_model import (
+    CalendarFeedTokenResponse,
+    EmployeeBulkRequest,
+    EmployeeBulkResponse,
+    EmployeeCreate,
+    EmployeeModel,
+    EmployeeUpdate,
+)
 from ...models.availability_model import AvailabilityCreate, AvailabilityModel
+from ...models.shifts_model import EmployeeShiftsResponse
 from ...services.employee_service import (
     employee_service,
     EmployeeHasShiftsError,
     EmployeeNotFoundError,
+    EMPLOYEE_SORT_KEYS,
+)
+from ...services.employee_import_service import employee_import_service
+from ...services.calendar_feed_service import calendar_feed_service
+from ...services.shifts_service import (
+    shifts_service,
+    ShiftValidationError,
+    SHIFT_SORT_KEYS,
 )
 from ...services.availability_service import (
     availability_service,
@@ -13,7 +29,28 @@ from ...services.availability_service import (
     AvailabilityNotFoundError,
 )
 from ...core.auth import get_current_user
-from fastapi import APIRouter, Depends, HTTPException, status
+from ...core.workers import PoolSaturatedError, parse_pool, pool_saturated_http_error
+from ...core.pagination import (
+    MAX_PAGE_SIZE,
+    InvalidCursorError,
+    iter_ndjson,
+    next_cursor,
+)
+from fastapi import (
+    APIRouter,
+    Depends,
+    File,
+    Form,
+    Header,
+    HTTPException,
+    Query,
+    Response,
+    UploadFile,
+    status,
+)
+from fastapi.concurrency import run_in_threadpool
+from fastapi.responses import StreamingResponse
+from datetime import date
 from uuid import UUID
 
 logger = logging.getLogger(__name__)
@@ -28,18 +65,42 @@ employee_router = APIRouter(
 
 @employee_router.get("", response_model=list[EmployeeModel])
 def get_employees(
+    response: Response,
     restaurant_id: str | None = None,
     is_active: bool | None = None,
+    limit: int | None = Query(None, ge=1, le=MAX_PAGE_SIZE),
+    cursor: str | None = None,
+    accept: str | None = Header(None),
 ):
+    """
+    List employees ordered by name.
+
+    Pass `limit` to page through results: while more rows remain, the
+    response carries an `X-Next-Cursor` header to send back as `cursor`.
+    With `Accept: application/x-ndjson` every matching row is streamed as
+    newline-delimited JSON instead (limit/cursor ignored) for bulk consumers.
+    """
+    if accept and "application/x-ndjson" in accept:
+        rows = employee_service.iter_employees(
+            restaurant_id=restaurant_id, is_active=is_active
+        )
+        return StreamingResponse(iter_ndjson(rows), media_type="application/x-ndjson")
+
     try:
         employees = employee_service.get_employees(
-            restaurant_id=restaurant_id, is_active=is_active
+            restaurant_id=restaurant_id, is_active=is_active, limit=limit, cursor=cursor
         )
-        return employees
+    except InvalidCursorError as e:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
     except Exception as e:
         logger.exception("GET /employees failed: %s", e)
         raise HTTPException(status_code=500, detail=str(e))
 
+    cursor_out = next_cursor(employees, limit, EMPLOYEE_SORT_KEYS)
+    if cursor_out:
+        response.headers["X-Next-Cursor"] = cursor_out
+    return employees
+
 
 @employee_router.get("/{employee_id}", response_model=EmployeeModel)
 def get_employee(employee_id: UUID):
@@ -72,6 +133,65 @@ def create_employee(employee: EmployeeCreate):
         raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
 
 
+@employee_router.post("/bulk", response_model=EmployeeBulkResponse)
+def bulk_import_employees(body: EmployeeBulkRequest, dry_run: bool = False):
+    """
+    Create and/or update many employees in one request.
+
+    Rows with an `id` update that employee; rows without one are created
+    (using the top-level `restaurant_id` unless the row sets its own). Every
+    row is validated up front and reported individually — invalid rows don't
+    block the valid ones. With `dry_run=true` nothing is saved.
+    """
+    try:
+        return employee_import_service.import_employees(
+            [row.model_dump() for row in body.employees],
+            default_restaurant_id=body.restaurant_id,
+            dry_run=dry_run,
+        )
+    except ValueError as e:
+        logger.warning("Bulk employee import rejected: %s", e)
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
+
+
+@employee_router.post("/bulk/csv", response_model=EmployeeBulkResponse)
+async def bulk_import_employees_file(
+    file: UploadFile = File(...),
+    restaurant_id: str | None = Form(None),
+    dry_run: bool = Form(False),
+):
+    """
+    Same as POST /bulk, but reading rows from an uploaded CSV/Excel roster.
+    Columns are matched to fields by best-guess header names (e.g. "Full
+    Name", "Position", "Max Hours"); the mapping used is returned as
+    `column_mapping`.
+    """
+    file_bytes = await file.read()
+    try:
+        rows, column_mapping = await parse_pool.run(
+            "parse_file", employee_import_service.parse_employee_file, file_bytes, file.filename
+        )
+        # Database writes: blocking I/O, not CPU, so the shared threadpool
+        result = await run_in_threadpool(
+            employee_import_service.import_employees,
+            rows,
+            default_restaurant_id=restaurant_id,
+            dry_run=dry_run,
+        )
+    except PoolSaturatedError as e:
+        raise pool_saturated_http_error(e)
+    except ValueError as e:
+        logger.warning("Bulk employee file import rejected: %s", e)
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
+    except Exception as e:
+        logger.exception("POST /employees/bulk/csv failed: %s", e)
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail="An unexpected error occurred while importing the file.",
+        )
+    return {**result, "column_mapping": column_mapping}
+
+
 @employee_router.patch("/{employee_id}", response_model=EmployeeModel)
 def update_employee(employee_id: UUID, employee: EmployeeUpdate):
     try:
@@ -129,6 +249,78 @@ def delete_employee(employee_id: UUID):
         raise HTTPException(status_code=status.HTTP_409_CONFLICT, detail=str(e))
 
 
+# --- Calendar feed ---
+
+
+@employee_router.post("/{employee_id}/feed-token", response_model=CalendarFeedTokenResponse)
+def create_calendar_feed_token(employee_id: UUID):
+    """
+    Issue (or rotate) the secret token for an employee's subscribable
+    calendar feed. Rotating cuts off calendar apps using the old URL.
+    """
+    try:
+        token = calendar_feed_service.create_feed_token(employee_id)
+    except EmployeeNotFoundError:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=f"Employee with ID {employee_id} not found",
+        )
+    return {"feed_token": token, "feed_path": f"/api/v1/public/feeds/{token}.ics"}
+
+
+@employee_router.delete("/{employee_id}/feed-token", status_code=status.HTTP_204_NO_CONTENT)
+def revoke_calendar_feed_token(employee_id: UUID):
+    """Disable an employee's calendar feed."""
+    try:
+        calendar_feed_service.revoke_feed_token(employee_id)
+    except EmployeeNotFoundError:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=f"Employee with ID {employee_id} not found",
+        )
+
+
+# --- Shifts ---
+
+
+@employee_router.get("/{employee_id}/shifts", response_model=EmployeeShiftsResponse)
+def get_employee_shifts(
+    employee_id: UUID,
+    response: Response,
+    from_date: date = Query(..., alias="from"),
+    to_date: date = Query(..., alias="to"),
+    limit: int | None = Query(None, ge=1, le=MAX_PAGE_SIZE),
+    cursor: str | None = None,
+):
+    """
+    An employee's shifts between `from` and `to` (inclusive, across all
+    schedules), with hours totalled per week. One indexed range query — the
+    employee isn't looked up separately, so an unknown ID just returns no
+    shifts.
+
+    Pass `limit` to page through long ranges (`X-Next-Cursor` header, as on
+    GET /employees); weekly totals then cover the returned page only.
+    """
+    try:
+        shifts = shifts_service.get_employee_shifts(
+            employee_id, from_date, to_date, limit=limit, cursor=cursor
+        )
+    except (ShiftValidationError, InvalidCursorError) as e:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
+
+    cursor_out = next_cursor(shifts, limit, SHIFT_SORT_KEYS)
+    if cursor_out:
+        response.headers["X-Next-Cursor"] = cursor_out
+
+    weekly_hours = shifts_service.summarize_weekly_hours(shifts)
+    return {
+        "employee_id": employee_id,
+        "shifts": shifts,
+        "weekly_hours": weekly_hours,
+        "total_hours": round(sum(w["hours"] for w in weekly_hours), 2),
+    }
+
+
 # --- Availability ---
 
 
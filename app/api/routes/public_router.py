@@ -1,9 +1,12 @@
 import logging
 
-from fastapi import APIRouter, HTTPException, status
+from fastapi import APIRouter, Header, HTTPException, Response, status
 
+from ...core.config import settings
+from ...core.etags import etag_matches, http_date, not_modified
 from ...models.schedule_model import PublicScheduleResponse
-from ...services.schedule_service import schedule_service
+from ...services.calendar_feed_service import calendar_feed_service
+from ...services.public_snapshot_service import public_snapshot_service
 
 logger = logging.getLogger(__name__)
 
@@ -19,11 +22,23 @@ public_router = APIRouter(
 )
 
 
-@public_router.get("/schedules/{token}", response_model=PublicScheduleResponse)
-def get_public_schedule(token: str):
-    """Get a read-only schedule via its public share token. No auth required."""
+@public_router.get(
+    "/schedules/{token}",
+    response_model=PublicScheduleResponse,
+    responses={304: {"description": "Not modified (If-None-Match matched)"}},
+)
+def get_public_schedule(token: str, if_none_match: str | None = Header(None)):
+    """
+    Get a read-only schedule via its public share token. No auth required.
+
+    Served from a pre-rendered snapshot (see PublicScheduleSnapshotService):
+    the body is stored as JSON bytes, so a cache hit does no database or
+    serialization work. Responses are `Cache-Control: public` so a CDN or
+    reverse proxy can absorb most traffic; a revoked link may therefore stay
+    visible there for up to PUBLIC_SCHEDULE_MAX_AGE_SECONDS.
+    """
     try:
-        result = schedule_service.get_schedule_by_share_token(token)
+        snapshot = public_snapshot_service.get_snapshot(token)
     except Exception as e:
         logger.exception("GET /public/schedules/%s failed: %s", token, e)
         raise HTTPException(
@@ -31,6 +46,59 @@ def get_public_schedule(token: str):
             detail="An unexpected error occurred. Please try again later.",
         )
 
-    if not result:
+    if not snapshot:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Schedule not found")
-    return result
+
+    headers = {
+        "ETag": snapshot["etag"],
+        "Cache-Control": f"public, max-age={settings.PUBLIC_SCHEDULE_MAX_AGE_SECONDS}",
+    }
+    if etag_matches(if_none_match, snapshot["etag"]):
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=headers)
+    return Response(content=snapshot["body"], media_type="application/json", headers=headers)
+
+
+@public_router.get(
+    "/feeds/{feed_token}.ics",
+    response_class=Response,
+    responses={
+        200: {"content": {"text/calendar": {}}},
+        304: {"description": "Not modified"},
+    },
+)
+def get_employee_calendar_feed(
+    feed_token: str,
+    if_none_match: str | None = Header(None),
+    if_modified_since: str | None = Header(None),
+):
+    """
+    Subscribable calendar of one employee's shifts (past 2 weeks, next 8).
+    The feed token in the URL is the only credential; see
+    POST /api/v1/employees/{id}/feed-token. Supports ETag and
+    Last-Modified revalidation, so unchanged feeds are answered with 304.
+    """
+    try:
+        feed = calendar_feed_service.get_feed(feed_token)
+    except Exception as e:
+        logger.exception("GET /public/feeds failed: %s", e)
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail="An unexpected error occurred. Please try again later.",
+        )
+
+    if not feed:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Feed not found")
+
+    headers = {
+        "ETag": feed["etag"],
+        "Last-Modified": http_date(feed["last_modified"]),
+        # Personal data behind a bearer-style URL: no shared caches
+        "Cache-Control": "private, no-cache",
+    }
+    if not_modified(if_none_match, if_modified_since, feed["etag"], feed["last_modified"]):
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=headers)
+    return Response(
+        content=feed["body"],
+        media_type="text/calendar; charset=utf-8",
+        headers=headers,
+    )
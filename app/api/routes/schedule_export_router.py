@@ -1,16 +1,20 @@
 import logging
 
-from fastapi import APIRouter, Depends, HTTPException, Response, status
+from datetime import date
+from fastapi import APIRouter, Depends, HTTPException, Query, status
+from fastapi.responses import StreamingResponse
 from uuid import UUID
 
-from ...core.auth import get_current_user_or_share_token
+from ...core.auth import get_current_user, get_current_user_or_share_token
 from ...services.export_service import export_service
 from ...services.schedule_service import ScheduleNotFoundError
 
 logger = logging.getLogger(__name__)
 
+XLSX_MEDIA_TYPE = "application/vnd.openxmlformats-officedocument.spreadsheetml.sheet"
+
 # Separate from schedule_router (which requires a JWT for every route) because
-# this endpoint must also work for an employee following a share link with no
+# the iCal endpoint must also work for an employee following a share link with no
 # account — see get_current_user_or_share_token.
 schedule_export_router = APIRouter(
     prefix="/api/v1/schedules",
@@ -31,7 +35,7 @@ def export_schedule_ical(schedule_id: UUID, token: str | None = None):
     param matching this schedule's active share link.
     """
     try:
-        ical_content = export_service.generate_ical(schedule_id)
+        chunks = export_service.iter_ical(schedule_id)
     except ScheduleNotFoundError:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
@@ -44,10 +48,69 @@ def export_schedule_ical(schedule_id: UUID, token: str | None = None):
             detail="An unexpected error occurred. Please try again later.",
         )
 
-    return Response(
-        content=ical_content,
-        media_type="text/calendar",
+    return StreamingResponse(
+        chunks,
+        media_type="text/calendar; charset=utf-8",
         headers={
             "Content-Disposition": f'attachment; filename="schedule_{schedule_id}.ics"'
         },
     )
+
+
+# Declared with a literal "export" segment, so they never collide with the
+# /{schedule_id}/... routes.
+@schedule_export_router.get("/export/csv", dependencies=[Depends(get_current_user)])
+def export_shifts_csv(
+    restaurant_id: UUID,
+    from_date: date = Query(..., alias="from"),
+    to_date: date = Query(..., alias="to"),
+):
+    """
+    Download every shift of the weeks in [from, to] as CSV, one row per
+    shift. Streamed as rows are fetched, so long ranges are fine.
+    """
+    try:
+        chunks = export_service.iter_csv(restaurant_id, from_date, to_date)
+    except ValueError as e:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
+    except Exception as e:
+        logger.exception("GET /schedules/export/csv failed: %s", e)
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail="An unexpected error occurred. Please try again later.",
+        )
+
+    return StreamingResponse(
+        chunks,
+        media_type="text/csv; charset=utf-8",
+        headers={
+            "Content-Disposition": f'attachment; filename="shifts_{from_date}_{to_date}.csv"'
+        },
+    )
+
+
+@schedule_export_router.get("/export/xlsx", dependencies=[Depends(get_current_user)])
+def export_shifts_xlsx(
+    restaurant_id: UUID,
+    from_date: date = Query(..., alias="from"),
+    to_date: date = Query(..., alias="to"),
+):
+    """Same rows as /export/csv, as an Excel workbook."""
+    try:
+        chunks = export_service.iter_xlsx(restaurant_id, from_date, to_date)
+    except ValueError as e:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
+    except Exception as e:
+        logger.exception("GET /schedules/export/xlsx failed: %s", e)
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail="An unexpected error occurred. Please try again later.",
+        )
+
+    return StreamingResponse(
+        chunks,
+        media_type=XLSX_MEDIA_TYPE,
+        headers={
+            "Content-Disposition": f'attachment; filename="shifts_{from_date}_{to_date}.xlsx"'
+        },
+    )
@@ -1,21 +1,43 @@
+import json
 import logging
 
 from ...models.schedule_model import (
     GenerateScheduleRequest,
     ScheduleModel,
+    ScheduleCalendarResponse,
     ScheduleCreate,
     ScheduleResponse,
+    ScheduleSummary,
+    ScheduleWeeksCreate,
     ShareLinkResponse,
 )
-from datetime import date
-from ...services.schedule_service import schedule_service, ScheduleNotFoundError
+from datetime import date, timedelta
+from ...services.schedule_service import (
+    schedule_service,
+    ScheduleNotFoundError,
+    SCHEDULE_SORT_KEYS,
+)
 from ...services.schedule_generator_service import schedule_generator
+from ...services.public_snapshot_service import public_snapshot_service
 from ...core.auth import get_current_user
-from fastapi import APIRouter, Depends, HTTPException, status
+from ...core.events import RESYNC_EVENT, get_event_broker, schedule_channel
+from ...core.etags import PRIVATE_REVALIDATE, etag_matches, make_etag
+from ...core.pagination import (
+    MAX_PAGE_SIZE,
+    InvalidCursorError,
+    iter_ndjson,
+    next_cursor,
+)
+from fastapi import APIRouter, Depends, Header, HTTPException, Query, Request, Response, status
+from fastapi.concurrency import run_in_threadpool
+from fastapi.responses import StreamingResponse
 from uuid import UUID
 
 logger = logging.getLogger(__name__)
 
+# Comment line sent on idle event streams so proxies don't time them out.
+SSE_KEEPALIVE_SECONDS = 15
+
 schedule_router = APIRouter(
     prefix="/api/v1/schedules",
     tags=["schedules"],
@@ -26,13 +48,32 @@ schedule_router = APIRouter(
 
 @schedule_router.get("", response_model=list[ScheduleModel])
 def get_schedules(
+    response: Response,
     restaurant_id: UUID | None = None,
     start_date: date | None = None,
     end_date: date | None = None,
+    limit: int | None = Query(None, ge=1, le=MAX_PAGE_SIZE),
+    cursor: str | None = None,
+    accept: str | None = Header(None),
 ):
+    """
+    List schedules, newest week first.
+
+    Pass `limit` to page through results: while more rows remain, the
+    response carries an `X-Next-Cursor` header to send back as `cursor`.
+    With `Accept: application/x-ndjson` every matching row is streamed as
+    newline-delimited JSON instead (limit/cursor ignored).
+    """
+    if accept and "application/x-ndjson" in accept:
+        rows = schedule_service.iter_schedules(restaurant_id, start_date, end_date)
+        return StreamingResponse(iter_ndjson(rows), media_type="application/x-ndjson")
+
     try:
-        schedules = schedule_service.get_schedules(restaurant_id, start_date, end_date)
-        return schedules
+        schedules = schedule_service.get_schedules(
+            restaurant_id, start_date, end_date, limit=limit, cursor=cursor
+        )
+    except InvalidCursorError as e:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
     except Exception as e:
         logger.exception("GET /schedules failed: %s", e)
         raise HTTPException(
@@ -40,16 +81,159 @@ def get_schedules(
             detail="An unexpected error occurred. Please try again later.",
         )
 
+    cursor_out = next_cursor(schedules, limit, SCHEDULE_SORT_KEYS)
+    if cursor_out:
+        response.headers["X-Next-Cursor"] = cursor_out
+    return schedules
+
 
-@schedule_router.get("/{schedule_id}", response_model=ScheduleResponse)
-def get_schedule(schedule_id: UUID):
+# Declared before /{schedule_id} so "calendar" and "summary" aren't parsed as IDs
+@schedule_router.get("/calendar", response_model=ScheduleCalendarResponse)
+def get_schedule_calendar(
+    restaurant_id: UUID,
+    from_date: date = Query(..., alias="from"),
+    to_date: date = Query(..., alias="to"),
+    employee_id: UUID | None = None,
+):
+    """
+    Every week in [from, to] (at most MAX_CALENDAR_WEEKS) with its shifts,
+    loaded in a single query. Pass `employee_id` to keep only that
+    employee's shifts. Weeks with no schedule are omitted.
+    """
     try:
+        weeks = schedule_service.get_schedule_calendar(
+            restaurant_id, from_date, to_date, employee_id=employee_id
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
+    except Exception as e:
+        logger.exception("GET /schedules/calendar failed: %s", e)
+        raise HTTPException(
+            status_code=500,
+            detail="An unexpected error occurred. Please try again later.",
+        )
+    return {
+        "restaurant_id": str(restaurant_id),
+        "start_date": from_date,
+        "end_date": to_date,
+        "weeks": weeks,
+    }
+
+
+@schedule_router.get("/summary", response_model=list[ScheduleSummary])
+def get_schedule_summaries(
+    restaurant_id: UUID | None = None,
+    from_date: date | None = Query(None, alias="from"),
+    to_date: date | None = Query(None, alias="to"),
+):
+    """
+    Shift count, total hours, hours per role and hours per employee for every
+    schedule whose week starts in [from, to], newest week first. Aggregated
+    in the database, so a season overview is one query.
+    """
+    if from_date and to_date and to_date < from_date:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="'to' must be on or after 'from'",
+        )
+    try:
+        return schedule_service.get_schedule_summaries(restaurant_id, from_date, to_date)
+    except Exception as e:
+        logger.exception("GET /schedules/summary failed: %s", e)
+        raise HTTPException(
+            status_code=500,
+            detail="An unexpected error occurred. Please try again later.",
+        )
+
+
+@schedule_router.get(
+    "/{schedule_id}",
+    response_model=ScheduleResponse,
+    responses={304: {"description": "Not modified (If-None-Match matched)"}},
+)
+def get_schedule(
+    schedule_id: UUID,
+    response: Response,
+    if_none_match: str | None = Header(None),
+):
+    """
+    Get a schedule with all its shifts.
+
+    Responses carry a strong `ETag` derived from the schedule's version
+    counter. Send it back as `If-None-Match` to get an empty 304 when
+    nothing changed — that costs a single-column lookup instead of loading
+    and serializing every shift.
+    """
+    try:
+        if if_none_match:
+            version = schedule_service.get_schedule_version(schedule_id)
+            if version is None:
+                raise ScheduleNotFoundError(schedule_id)
+            etag = make_etag(schedule_id, version)
+            if etag_matches(if_none_match, etag):
+                return Response(
+                    status_code=status.HTTP_304_NOT_MODIFIED,
+                    headers={"ETag": etag, "Cache-Control": PRIVATE_REVALIDATE},
+                )
+
         schedule = schedule_service.get_schedule_with_shifts(schedule_id)
-        return schedule
+    except ScheduleNotFoundError:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=f"Schedule {schedule_id} not found",
+        )
     except Exception as e:
         logger.exception("GET /schedules/%s failed: %s", schedule_id, e)
         raise HTTPException(status_code=500, detail=str(e))
 
+    response.headers["ETag"] = make_etag(schedule_id, schedule["version"])
+    response.headers["Cache-Control"] = PRIVATE_REVALIDATE
+    return schedule
+
+
+@schedule_router.get(
+    "/{schedule_id}/events",
+    response_class=StreamingResponse,
+    responses={200: {"content": {"text/event-stream": {}}}},
+)
+async def stream_schedule_events(schedule_id: UUID, request: Request):
+    """
+    Live changes to a schedule's shifts as Server-Sent Events.
+
+    Each `shifts` event carries {schedule_id, created, updated, deleted}:
+    compact rows for created/updated shifts and ids for deleted ones. A
+    `resync` event means this client fell behind and should reload the
+    schedule. Subscribe first, then load the schedule, so no change falls
+    in between.
+    """
+    version = await run_in_threadpool(schedule_service.get_schedule_version, schedule_id)
+    if version is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=f"Schedule {schedule_id} not found",
+        )
+
+    subscription = get_event_broker().subscribe(schedule_channel(schedule_id))
+
+    async def event_stream():
+        try:
+            yield "retry: 3000\n\n"
+            while not await request.is_disconnected():
+                event = await subscription.get(timeout=SSE_KEEPALIVE_SECONDS)
+                if event is None:
+                    yield ": keepalive\n\n"
+                    continue
+                name = "resync" if event is RESYNC_EVENT else event.get("type", "message")
+                yield f"event: {name}\ndata: {json.dumps(event, default=str)}\n\n"
+        finally:
+            subscription.close()
+
+    return StreamingResponse(
+        event_stream(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
 
 @schedule_router.post("", response_model=ScheduleModel)
 def create_schedule(schedule: ScheduleCreate):
@@ -63,6 +247,24 @@ def create_schedule(schedule: ScheduleCreate):
         raise HTTPException(status_code=500, detail=str(e))
 
 
+@schedule_router.post("/weeks", response_model=list[ScheduleModel])
+def create_schedule_weeks(request: ScheduleWeeksCreate):
+    """
+    Create schedules for `weeks` consecutive weeks starting at the week of
+    `start_date` (default: this week). Weeks that already have a schedule
+    are skipped; only newly created schedules are returned.
+    """
+    start = request.start_date or date.today()
+    end = start + timedelta(weeks=request.weeks - 1)
+    try:
+        return schedule_service.create_schedules_for_range(
+            start_date=start, end_date=end, restaurant_id=request.restaurant_id
+        )
+    except Exception as e:
+        logger.exception("POST /schedules/weeks failed: %s", e)
+        raise HTTPException(status_code=500, detail=str(e))
+
+
 @schedule_router.post("/generate")
 def generate_schedule(request: GenerateScheduleRequest):
     logger.info(
@@ -99,6 +301,8 @@ def generate_schedule(request: GenerateScheduleRequest):
 def create_share_link(schedule_id: UUID):
     try:
         schedule = schedule_service.generate_share_link(schedule_id)
+        # Pre-render now so the first employee to open the link is a cache hit
+        public_snapshot_service.publish(schedule_id)
         return schedule
     except ScheduleNotFoundError:
         raise HTTPException(
@@ -117,6 +321,7 @@ def create_share_link(schedule_id: UUID):
 def revoke_share_link(schedule_id: UUID):
     try:
         schedule_service.revoke_share_link(schedule_id)
+        public_snapshot_service.revoke(schedule_id)
     except ScheduleNotFoundError:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
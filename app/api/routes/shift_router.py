@@ -1,13 +1,21 @@
 import logging
 
-from ...models.shifts_model import ShiftCreate, ShiftResponse, ShiftUpdate
+from ...models.shifts_model import (
+    ShiftBatchRequest,
+    ShiftBatchResponse,
+    ShiftCreate,
+    ShiftResponse,
+    ShiftUpdate,
+)
 from ...services.shifts_service import (
     shifts_service,
+    ShiftBatchError,
     ShiftNotFoundError,
     ShiftValidationError,
     OverlappingShiftError,
 )
 from ...services.employee_service import EmployeeNotFoundError
+from ...services.schedule_service import ScheduleNotFoundError
 from ...core.auth import get_current_user
 from fastapi import APIRouter, Depends, HTTPException, status
 from uuid import UUID
@@ -34,6 +42,9 @@ def create_shift(shift: ShiftCreate):
             notes=shift.notes,
         )
         return created_shift
+    except ScheduleNotFoundError as e:
+        logger.warning("Create shift failed: %s", e)
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=str(e))
     except EmployeeNotFoundError as e:
         logger.warning("Create shift failed: employee %s not found", e.employee_id)
         raise HTTPException(
@@ -51,6 +62,33 @@ def create_shift(shift: ShiftCreate):
         raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
 
 
+@shifts_router.post("/batch", response_model=ShiftBatchResponse)
+def apply_shift_batch(body: ShiftBatchRequest):
+    """
+    Apply many shift creates/updates/deletes on one schedule in a single
+    request. The whole batch is validated first (including conflicts between
+    operations in the batch); if any operation is invalid nothing is saved
+    and the 400 response lists every failing operation by index.
+    """
+    try:
+        return shifts_service.apply_shift_batch(
+            schedule_id=body.schedule_id,
+            operations=[op.model_dump() for op in body.operations],
+        )
+    except ScheduleNotFoundError as e:
+        logger.warning("Shift batch failed: %s", e)
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=str(e))
+    except ShiftBatchError as e:
+        logger.warning("Shift batch rejected: %s", e)
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail={"message": str(e), "errors": e.errors},
+        )
+    except ShiftValidationError as e:
+        logger.warning("Shift batch failed validation: %s", e)
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
+
+
 @shifts_router.patch("/{shift_id}", response_model=ShiftResponse)
 def update_shift(shift_id: UUID, request: ShiftUpdate):
     try:
@@ -1,14 +1,21 @@
 import logging
+from typing import List
 
+from ...core.config import settings
 from ...models.shift_template_model import ShiftTemplateSave, ShiftTemplateResponse
 from ...models.template_import_model import (
+    TemplateBatchConfirmRequest,
+    TemplateBatchConfirmResponse,
+    TemplateBatchPreviewResponse,
     TemplateImportConfirmRequest,
     TemplateImportPreviewResponse,
 )
 from ...services.ai_service import AIServiceUnavailableError
 from ...services.shift_template_service import shift_template_service
 from ...services.template_import_service import InvalidImageError, template_import_service
+from ...core.ai_client import AIDeadlineExceededError
 from ...core.auth import get_current_user
+from ...core.workers import PoolSaturatedError, parse_pool, pool_saturated_http_error
 from fastapi import APIRouter, Depends, File, HTTPException, UploadFile, status
 
 logger = logging.getLogger(__name__)
@@ -21,6 +28,28 @@ shift_template_router = APIRouter(
 )
 
 
+async def _read_upload_capped(file: UploadFile) -> bytes:
+    """
+    Read one file of a multi-file upload, refusing it (413) past
+    MAX_UPLOAD_BYTES — the body limit only bounds the request as a whole.
+    """
+    limit = settings.MAX_UPLOAD_BYTES
+    # The parser records each part's size as it spools it, so an oversized
+    # file is refused without reading it back; the bounded read covers
+    # parts whose size isn't known
+    data = b""
+    too_large = file.size is not None and file.size > limit
+    if not too_large:
+        data = await file.read(limit + 1)
+        too_large = len(data) > limit
+    if too_large:
+        raise HTTPException(
+            status_code=status.HTTP_413_CONTENT_TOO_LARGE,
+            detail=f"{file.filename or 'A file'} is too large (limit {limit // 2**20} MB per file)",
+        )
+    return data
+
+
 @shift_template_router.get("", response_model=ShiftTemplateResponse)
 def get_shift_templates(restaurant_id: str):
     """Get the saved shift templates for a restaurant."""
@@ -57,12 +86,19 @@ async def parse_template_import(file: UploadFile = File(...)):
     Does NOT save anything — returns best-guess column mapping and each row
     flagged with any validation errors/warnings, for the frontend to show a
     confirmation UI before calling /import/confirm.
+
+    Large files are read and validated in chunks. The counts cover every row,
+    but `rows` holds only the first rows plus a sample of later errors; see
+    `total_rows` / `truncated`. Every sheet of a workbook is read.
     """
+    # Parsing blocks, so it runs on the bounded parse pool (429 when full)
     file_bytes = await file.read()
     try:
-        rows, column_mapping = template_import_service.parse_template_file(
-            file_bytes, file.filename
+        return await parse_pool.run(
+            "parse_file", template_import_service.preview_template_file, file_bytes, file.filename
         )
+    except PoolSaturatedError as e:
+        raise pool_saturated_http_error(e)
     except ValueError as e:
         raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
     except Exception as e:
@@ -72,17 +108,11 @@ async def parse_template_import(file: UploadFile = File(...)):
             detail="An unexpected error occurred while parsing the file.",
         )
 
-    validated_rows = template_import_service.validate_parsed_templates(rows)
-    return {
-        "column_mapping": column_mapping,
-        "rows": validated_rows,
-        "valid_count": sum(1 for r in validated_rows if r["is_valid"]),
-        "error_count": sum(1 for r in validated_rows if not r["is_valid"]),
-    }
-
 
 @shift_template_router.post("/import/image/parse", response_model=TemplateImportPreviewResponse)
-async def parse_template_image_import(file: UploadFile = File(...)):
+async def parse_template_image_import(
+    file: UploadFile = File(...), refresh: bool = False, current_user=Depends(get_current_user)
+):
     """
     Parse an uploaded photo/screenshot of a schedule into a preview of shift
     templates via vision AI.
@@ -96,16 +126,24 @@ async def parse_template_image_import(file: UploadFile = File(...)):
     vision model. The browser-reported content-type is NOT used to reject
     uploads; it's unreliable (e.g. some clients send HEIC as
     application/octet-stream) and decoding is a strictly more accurate check.
+
+    Results are cached per image; `vision_cache` says whether this one came
+    from the model or the cache. Near-duplicate matches only come from the
+    same user's uploads. Pass `refresh=true` to skip the cache.
     """
+    # Decoding runs on the bounded parse pool and the vision call on the
+    # async AI client; both answer 429 when full
     image_bytes = await file.read()
     try:
-        rows = template_import_service.parse_template_image(
-            image_bytes, file.content_type
-        )
+        preview = await template_import_service.preview_image(image_bytes, str(current_user.id), refresh)
+    except PoolSaturatedError as e:
+        raise pool_saturated_http_error(e)
     except InvalidImageError as e:
         raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
     except AIServiceUnavailableError as e:
         raise HTTPException(status_code=status.HTTP_503_SERVICE_UNAVAILABLE, detail=str(e))
+    except AIDeadlineExceededError as e:
+        raise HTTPException(status_code=status.HTTP_504_GATEWAY_TIMEOUT, detail=str(e))
     except ValueError as e:
         # The image decoded fine, so a ValueError here means the vision
         # model's response couldn't be parsed — an upstream failure, not a
@@ -121,14 +159,40 @@ async def parse_template_image_import(file: UploadFile = File(...)):
             status_code=status.HTTP_502_BAD_GATEWAY,
             detail="Vision AI analysis failed. Please try again later.",
         )
+    logger.info("Parsed %d rows from image (mime=%s)", len(preview["rows"]), file.content_type)
+    return preview
+
 
-    validated_rows = template_import_service.validate_parsed_templates(rows)
-    return {
-        "column_mapping": {},
-        "rows": validated_rows,
-        "valid_count": sum(1 for r in validated_rows if r["is_valid"]),
-        "error_count": sum(1 for r in validated_rows if not r["is_valid"]),
-    }
+@shift_template_router.post("/import/batch/parse", response_model=TemplateBatchPreviewResponse)
+async def parse_template_batch_import(
+    files: List[UploadFile] = File(...), refresh: bool = False, current_user=Depends(get_current_user)
+):
+    """
+    Preview several files in one request — e.g. a folder of per-location
+    CSVs and schedule photos. Each file gets the same preview as
+    /import/parse (CSV/Excel, by extension) or /import/image/parse
+    (anything else).
+
+    Files are processed concurrently, a few at a time, on the same bounded
+    pools as the single-file endpoints. A file that can't be read, or that
+    a busy pool turns away, gets an `error` instead of a `preview`; the
+    rest of the batch is unaffected. Nothing is saved; confirm via
+    /import/batch/confirm.
+
+    The request may total MAX_BATCH_UPLOAD_BYTES; any one file over
+    MAX_UPLOAD_BYTES fails the request with 413.
+    """
+    if not files:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="No files uploaded")
+    if len(files) > settings.MAX_BATCH_IMPORT_FILES:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"At most {settings.MAX_BATCH_IMPORT_FILES} files can be imported at once",
+        )
+    # The body as a whole is capped at MAX_BATCH_UPLOAD_BYTES by
+    # BodySizeLimitMiddleware; each file at MAX_UPLOAD_BYTES here
+    uploads = [(file.filename or "", await _read_upload_capped(file)) for file in files]
+    return {"files": await template_import_service.preview_batch(uploads, str(current_user.id), refresh)}
 
 
 @shift_template_router.post("/import/confirm", response_model=ShiftTemplateResponse)
@@ -151,3 +215,20 @@ def confirm_template_import(body: TemplateImportConfirmRequest):
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail=f"Failed to save imported templates: {str(e)}",
         )
+
+
+@shift_template_router.post("/import/batch/confirm", response_model=TemplateBatchConfirmResponse)
+def confirm_template_batch_import(body: TemplateBatchConfirmRequest):
+    """
+    Save the confirmed rows of a batch import. Entries are grouped by
+    restaurant, so each restaurant gets one upsert however many of its
+    files were imported. Results are per restaurant: one that fails to save
+    carries an `error` and doesn't stop the others.
+    """
+    imports = [(i.restaurant_id, [r.model_dump() for r in i.rows]) for i in body.imports if i.rows]
+    if not imports:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="No rows to import",
+        )
+    return {"results": template_import_service.save_templates_for_restaurants(imports)}
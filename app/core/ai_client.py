@@ -0,0 +1,312 @@
+import asyncio
+import bisect
+import logging
+import random
+import threading
+import time
+from collections import deque
+from typing import Any, Deque, Dict, List, Optional
+
+import groq
+
+from .workers import PoolSaturatedError, get_stage_timings
+
+logger = logging.getLogger(__name__)
+
+# Upper bounds (ms) of the latency histogram buckets; the last is +Inf
+LATENCY_BUCKETS_MS = (250, 500, 1000, 2000, 4000, 8000, 16000, 32000, 64000)
+# Successful latencies kept per model for percentiles (and the hedge delay)
+LATENCY_WINDOW = 200
+# Hedge only once a model has this many recent latencies to estimate p95 from
+HEDGE_MIN_SAMPLES = 20
+# Full-jitter exponential backoff between retries: uniform(0, min(cap, base * 2**n))
+BACKOFF_BASE_SECONDS = 0.5
+BACKOFF_CAP_SECONDS = 8.0
+
+
+class AIDeadlineExceededError(Exception):
+    """Raised when a model call (including queueing and retries) runs past
+    its deadline; routes map it to 504."""
+
+
+class ModelStats:
+    """Latency histogram, recent latencies and error counts for one model."""
+
+    def __init__(self) -> None:
+        self.buckets = [0] * (len(LATENCY_BUCKETS_MS) + 1)
+        self.recent: Deque[float] = deque(maxlen=LATENCY_WINDOW)
+        self.errors: Dict[str, int] = {}
+        self.calls = self.retries = self.hedges = self.hedge_wins = 0
+
+    def percentile(self, q: float) -> Optional[float]:
+        if not self.recent:
+            return None
+        ordered = sorted(self.recent)
+        return ordered[min(len(ordered) - 1, int(q * len(ordered)))]
+
+    def snapshot(self) -> Dict[str, Any]:
+        labels = [f"le_{bound}" for bound in LATENCY_BUCKETS_MS] + ["le_inf"]
+        p50, p95 = self.percentile(0.5), self.percentile(0.95)
+        return {
+            "calls": self.calls,
+            "latency_ms": dict(zip(labels, self.buckets)),
+            "p50_ms": None if p50 is None else round(p50, 1),
+            "p95_ms": None if p95 is None else round(p95, 1),
+            "errors": dict(self.errors),
+            "retries": self.retries,
+            "hedges": self.hedges,
+            "hedge_wins": self.hedge_wins,
+        }
+
+
+class AIMetrics:
+    """
+    Per-model call metrics, kept in process (like every cache here):
+    a latency histogram of completed calls, error counts by kind, and the
+    recent successful latencies the hedge delay is derived from.
+    """
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._models: Dict[str, ModelStats] = {}
+
+    def _stats(self, model: str) -> ModelStats:
+        stats = self._models.get(model)
+        if stats is None:
+            stats = self._models[model] = ModelStats()
+        return stats
+
+    def record_call(self, model: str, latency_ms: float, error_kind: Optional[str] = None) -> None:
+        with self._lock:
+            stats = self._stats(model)
+            stats.calls += 1
+            stats.buckets[bisect.bisect_left(LATENCY_BUCKETS_MS, latency_ms)] += 1
+            if error_kind is None:
+                stats.recent.append(latency_ms)
+            else:
+                stats.errors[error_kind] = stats.errors.get(error_kind, 0) + 1
+
+    def record_error(self, model: str, error_kind: str) -> None:
+        """An error with no completed call behind it (e.g. deadline exceeded)."""
+        with self._lock:
+            errors = self._stats(model).errors
+            errors[error_kind] = errors.get(error_kind, 0) + 1
+
+    def increment(self, model: str, counter: str) -> None:
+        """Bump "retries", "hedges" or "hedge_wins"."""
+        with self._lock:
+            stats = self._stats(model)
+            setattr(stats, counter, getattr(stats, counter) + 1)
+
+    def p95_ms(self, model: str, min_samples: int = HEDGE_MIN_SAMPLES) -> Optional[float]:
+        with self._lock:
+            stats = self._models.get(model)
+            if stats is None or len(stats.recent) < min_samples:
+                return None
+            return stats.percentile(0.95)
+
+    def snapshot(self) -> Dict[str, Dict[str, Any]]:
+        with self._lock:
+            return {model: stats.snapshot() for model, stats in self._models.items()}
+
+    def clear(self) -> None:
+        with self._lock:
+            self._models.clear()
+
+
+ai_metrics = AIMetrics()
+
+
+def error_kind(e: BaseException) -> str:
+    """Metric label for a failed call."""
+    if isinstance(e, groq.RateLimitError):
+        return "rate_limited"
+    if isinstance(e, groq.APITimeoutError):
+        return "timeout"
+    if isinstance(e, groq.APIConnectionError):
+        return "connection"
+    if isinstance(e, groq.APIStatusError):
+        return "server_error" if e.status_code >= 500 else "client_error"
+    return "other"
+
+
+def is_retryable(e: BaseException) -> bool:
+    """429s, 5xx and network failures are worth another attempt; other 4xx aren't."""
+    if isinstance(e, groq.APIConnectionError):
+        return True
+    if isinstance(e, groq.APIStatusError):
+        return e.status_code == 429 or e.status_code >= 500
+    return False
+
+
+def _retry_after_seconds(e: BaseException) -> Optional[float]:
+    response = getattr(e, "response", None)
+    try:
+        return float(response.headers["retry-after"])
+    except (AttributeError, KeyError, TypeError, ValueError):
+        return None
+
+
+class AsyncCompletionClient:
+    """
+    Chat completions on groq.AsyncGroq with the limits the sync client
+    never had:
+
+    - Concurrency: at most max_concurrency requests are in flight across
+      the process, and at most max_queued more wait for a slot; beyond
+      that complete() raises PoolSaturatedError (429) like a BoundedPool.
+    - Deadlines: each complete() has one deadline covering queueing,
+      every attempt and the backoff between them.
+    - Retries: 429 / 5xx / network errors are retried up to max_attempts
+      with full-jitter exponential backoff (at least Retry-After when the
+      server sends one), as long as the deadline leaves room.
+    - Hedging (optional): if an attempt hasn't answered by the model's
+      recent p95 latency and a slot is free, a second identical request
+      is sent and whichever answers first wins. Costs up to 5% extra
+      calls; cuts the tail when the provider has a slow replica.
+
+    Every completed request is recorded in `metrics` per model, and each
+    complete() as a stage in the request's StageTimings.
+    """
+
+    def __init__(
+        self,
+        client: Any,
+        max_concurrency: int,
+        max_queued: int,
+        max_attempts: int = 3,
+        hedge: bool = False,
+        metrics: Optional[AIMetrics] = None,
+    ):
+        self._client = client
+        self.max_concurrency = max_concurrency
+        self.max_queued = max_queued
+        self.max_attempts = max_attempts
+        self.hedge = hedge
+        self.metrics = metrics or ai_metrics
+        self._semaphore = asyncio.Semaphore(max_concurrency)
+        # complete() calls running or waiting; checked and bumped on the
+        # event loop only, so no lock
+        self._outstanding = 0
+
+    async def complete(self, stage: str, deadline_seconds: float, model: str, **kwargs: Any) -> Any:
+        """
+        client.chat.completions.create(model=model, **kwargs), within the
+        limits above.
+
+        Args:
+            stage: Name for logs and StageTimings (e.g. "vision")
+            deadline_seconds: Budget for the whole call, retries included
+
+        Raises:
+            PoolSaturatedError: If max_concurrency + max_queued calls are
+                already outstanding
+            AIDeadlineExceededError: If the deadline passes first
+            groq.APIError: The last error, once it's not retryable or
+                attempts (or time for another) run out
+        """
+        if self._outstanding >= self.max_concurrency + self.max_queued:
+            logger.warning("AI client saturated; rejecting stage %s", stage)
+            raise PoolSaturatedError("ai")
+
+        self._outstanding += 1
+        loop = asyncio.get_running_loop()
+        started_at = loop.time()
+        deadline = started_at + deadline_seconds
+        waits: List[float] = []
+        try:
+            attempt = 0
+            while True:
+                attempt += 1
+                remaining = deadline - loop.time()
+                try:
+                    return await asyncio.wait_for(self._attempt(model, kwargs, waits), remaining)
+                except asyncio.TimeoutError:
+                    self.metrics.record_error(model, "deadline_exceeded")
+                    logger.error(
+                        "AI stage %s (%s) exceeded its %gs deadline on attempt %d",
+                        stage,
+                        model,
+                        deadline_seconds,
+                        attempt,
+                    )
+                    raise AIDeadlineExceededError(
+                        f"The AI model did not respond within {deadline_seconds:g}s."
+                    )
+                except Exception as e:
+                    if not is_retryable(e) or attempt == self.max_attempts:
+                        raise
+                    delay = random.uniform(0, min(BACKOFF_CAP_SECONDS, BACKOFF_BASE_SECONDS * 2 ** (attempt - 1)))
+                    delay = max(delay, _retry_after_seconds(e) or 0)
+                    if loop.time() + delay >= deadline:
+                        raise
+                    self.metrics.increment(model, "retries")
+                    logger.warning(
+                        "AI stage %s (%s) attempt %d failed (%s); retrying in %.2fs",
+                        stage,
+                        model,
+                        attempt,
+                        error_kind(e),
+                        delay,
+                    )
+                    await asyncio.sleep(delay)
+        finally:
+            self._outstanding -= 1
+            wait_ms = sum(waits) * 1000
+            total_ms = (loop.time() - started_at) * 1000
+            timings = get_stage_timings()
+            if timings is not None:
+                timings.record(stage, wait_ms, total_ms - wait_ms)
+            logger.info(
+                "AI stage %s (%s): waited %.1fms, ran %.1fms", stage, model, wait_ms, total_ms - wait_ms
+            )
+
+    async def _attempt(self, model: str, kwargs: Dict[str, Any], waits: List[float]) -> Any:
+        """One attempt: a request, plus a hedged duplicate if it's slow."""
+        primary = asyncio.ensure_future(self._request(model, kwargs, waits))
+        tasks = [primary]
+        try:
+            hedge_after = self.metrics.p95_ms(model) if self.hedge else None
+            if hedge_after is None:
+                return await primary
+            done, _ = await asyncio.wait(tasks, timeout=hedge_after / 1000)
+            # Never hedge into a queue: that would only add load when the
+            # slowness is ours
+            if done or self._semaphore.locked():
+                return await primary
+
+            self.metrics.increment(model, "hedges")
+            hedge = asyncio.ensure_future(self._request(model, kwargs, waits))
+            tasks.append(hedge)
+            pending = set(tasks)
+            while pending:
+                done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    if task.exception() is None:
+                        if task is hedge:
+                            self.metrics.increment(model, "hedge_wins")
+                        return task.result()
+            # Both failed; the primary's error decides whether to retry
+            return primary.result()
+        finally:
+            for task in tasks:
+                if task.done() and not task.cancelled():
+                    task.exception()  # mark retrieved
+                else:
+                    task.cancel()
+
+    async def _request(self, model: str, kwargs: Dict[str, Any], waits: List[float]) -> Any:
+        queued_at = time.perf_counter()
+        async with self._semaphore:
+            started_at = time.perf_counter()
+            waits.append(started_at - queued_at)
+            try:
+                response = await self._client.chat.completions.create(model=model, **kwargs)
+            except Exception as e:
+                self.metrics.record_call(model, (time.perf_counter() - started_at) * 1000, error_kind(e))
+                raise
+            self.metrics.record_call(model, (time.perf_counter() - started_at) * 1000)
+            return response
+
+    async def close(self) -> None:
+        await self._client.close()
@@ -27,8 +27,54 @@ class Settings(BaseSettings):
     # 2026-07-17; qwen/qwen3.6-27b is their documented vision replacement.
     GROQ_VISION_MODEL: str = "qwen/qwen3.6-27b"
 
+    # Public share links
+    # Pre-rendered snapshots are rebuilt on every shift change in this
+    # process; the TTL bounds how stale another worker's copy (or one missing
+    # an employee rename) can get.
+    PUBLIC_SNAPSHOT_TTL_SECONDS: int = 300
+    PUBLIC_SNAPSHOT_CACHE_SIZE: int = 1000
+    # max-age sent to browsers and shared caches (CDN / reverse proxy)
+    PUBLIC_SCHEDULE_MAX_AGE_SECONDS: int = 60
+
+    # Largest request body accepted (uploads included); enforced while the
+    # body streams in, before it is buffered. Full-size 48 MP phone photos
+    # run 15-25 MB.
+    MAX_UPLOAD_BYTES: int = 25 * 1024 * 1024
+
+    # Worker pools for blocking import stages (see app/core/workers.py).
+    # Requests beyond workers + queue get a 429 instead of waiting.
+    PARSE_POOL_WORKERS: int = 2
+    PARSE_POOL_QUEUE: int = 8
+    # Sample each parse stage's peak RSS on a 200 Hz thread instead of the
+    # default ru_maxrss before/after reading. For investigating memory use.
+    STAGE_RSS_SAMPLING: bool = False
+
+    # Groq calls (see app/core/ai_client.py). Concurrency and queue are
+    # process-wide; beyond them requests get a 429. Deadlines cover
+    # queueing and retries, and a call past its deadline is a 504.
+    AI_MAX_CONCURRENCY: int = 4
+    AI_MAX_QUEUED: int = 16
+    AI_MAX_ATTEMPTS: int = 3
+    AI_ANALYSIS_DEADLINE_SECONDS: float = 45.0
+    AI_VISION_DEADLINE_SECONDS: float = 60.0
+    # Send a duplicate request when one outlives the model's recent p95
+    AI_HEDGE_REQUESTS: bool = False
+    # Schedule analyses are cached in schedule_analyses (migrations/0009)
+    # by a hash of the model's input; any shift or roster change misses.
+    AI_ANALYSIS_CACHE_TTL_SECONDS: int = 7 * 24 * 3600
+    # Batch template import: files per request, and how many of a batch's
+    # files are in flight on the pools at once
+    MAX_BATCH_IMPORT_FILES: int = 20
+    BATCH_IMPORT_CONCURRENCY: int = 4
+    # Body limit for the batch import route in place of MAX_UPLOAD_BYTES,
+    # which still applies to each file in the batch
+    MAX_BATCH_UPLOAD_BYTES: int = 200 * 1024 * 1024
+
     # Observability
     SENTRY_DSN: Optional[str] = None
+    # Development only: warn when a single request makes more PostgREST round
+    # trips than this, or repeats an identical query (likely an N+1 loop).
+    DB_CALL_BUDGET_PER_REQUEST: int = 10
 
     model_config = {"env_file": ".env", "case_sensitive": True}
 
@@ -0,0 +1,62 @@
+from datetime import datetime
+from email.utils import format_datetime, parsedate_to_datetime
+from typing import Any, Optional
+
+# Authenticated responses may be cached by the browser but must be
+# revalidated (If-None-Match) before every reuse.
+PRIVATE_REVALIDATE = "private, no-cache"
+
+
+def make_etag(*parts: Any) -> str:
+    """
+    Build a strong ETag from the values that identify one exact
+    representation, e.g. make_etag(schedule_id, version) -> '"<id>.<version>"'.
+    """
+    return '"' + ".".join(str(p) for p in parts) + '"'
+
+
+def etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    """
+    Whether an If-None-Match header value matches etag.
+
+    Uses the weak comparison RFC 9110 prescribes for If-None-Match: a W/
+    prefix on either side is ignored, "*" matches anything, and the header
+    may list several comma-separated tags.
+    """
+    if not if_none_match:
+        return False
+    candidate = etag.removeprefix("W/")
+    for tag in if_none_match.split(","):
+        tag = tag.strip()
+        if tag == "*" or tag.removeprefix("W/") == candidate:
+            return True
+    return False
+
+
+def http_date(value: datetime) -> str:
+    """Format an aware datetime as an HTTP-date (Last-Modified)."""
+    return format_datetime(value.replace(microsecond=0), usegmt=True)
+
+
+def not_modified(
+    if_none_match: Optional[str],
+    if_modified_since: Optional[str],
+    etag: str,
+    last_modified: datetime,
+) -> bool:
+    """
+    Whether a conditional GET can be answered with 304. If-None-Match wins
+    when present (RFC 9110 13.2.2); otherwise If-Modified-Since is compared
+    at one-second precision. An unparseable date is ignored.
+    """
+    if if_none_match:
+        return etag_matches(if_none_match, etag)
+    if not if_modified_since:
+        return False
+    try:
+        since = parsedate_to_datetime(if_modified_since)
+    except (TypeError, ValueError):
+        return False
+    if since.tzinfo is None:
+        return False
+    return last_modified.replace(microsecond=0) <= since
@@ -0,0 +1,130 @@
+import asyncio
+import logging
+import threading
+from abc import ABC, abstractmethod
+from collections import defaultdict
+from typing import Any, Dict, Optional, Set
+
+logger = logging.getLogger(__name__)
+
+# Per-subscriber backlog. A subscriber that falls this far behind (stalled
+# connection) gets its backlog replaced by a single resync event.
+SUBSCRIBER_QUEUE_SIZE = 100
+
+RESYNC_EVENT = {"type": "resync"}
+
+
+def schedule_channel(schedule_id) -> str:
+    """Channel carrying live changes to one schedule."""
+    return f"schedule:{schedule_id}"
+
+
+class Subscription:
+    """
+    One listener on a channel. Iterate with `await subscription.get()`;
+    always close() it (the SSE endpoint does so in a finally block).
+    """
+
+    def __init__(self, broker: "EventBroker", channel: str):
+        self.broker = broker
+        self.channel = channel
+        self.loop = asyncio.get_running_loop()
+        self.queue: asyncio.Queue = asyncio.Queue(maxsize=SUBSCRIBER_QUEUE_SIZE)
+
+    async def get(self, timeout: Optional[float] = None) -> Optional[Dict[str, Any]]:
+        """Next event, or None if timeout elapses first."""
+        try:
+            return await asyncio.wait_for(self.queue.get(), timeout)
+        except asyncio.TimeoutError:
+            return None
+
+    def offer(self, event: Dict[str, Any]) -> None:
+        """Enqueue an event; runs on the subscriber's event loop."""
+        try:
+            self.queue.put_nowait(event)
+        except asyncio.QueueFull:
+            # Deltas after a gap are useless; tell the client to reload
+            while not self.queue.empty():
+                self.queue.get_nowait()
+            self.queue.put_nowait(RESYNC_EVENT)
+
+    def close(self) -> None:
+        self.broker.unsubscribe(self)
+
+
+class EventBroker(ABC):
+    """
+    Pub/sub interface for live updates. Abstract: a broker missing any of
+    the three methods fails when it's constructed, not on first publish.
+
+    publish() is called from service code, usually on a threadpool thread
+    (sync route handlers); subscribe() is called from async endpoints.
+    InMemoryBroker only reaches subscribers in the same process. To share
+    events between workers, implement publish() on top of an external
+    broker (e.g. Redis pub/sub) that fans messages back out to local
+    subscribers, and install it with set_event_broker() at startup.
+    """
+
+    @abstractmethod
+    def publish(self, channel: str, event: Dict[str, Any]) -> None:
+        ...
+
+    @abstractmethod
+    def subscribe(self, channel: str) -> Subscription:
+        ...
+
+    @abstractmethod
+    def unsubscribe(self, subscription: Subscription) -> None:
+        ...
+
+
+class InMemoryBroker(EventBroker):
+    """Single-process broker: per-channel sets of subscriber queues."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._channels: Dict[str, Set[Subscription]] = defaultdict(set)
+
+    def publish(self, channel: str, event: Dict[str, Any]) -> None:
+        """Deliver to every subscriber of channel. Thread-safe and
+        non-blocking: events are handed to each subscriber's own loop."""
+        with self._lock:
+            subscribers = list(self._channels.get(channel, ()))
+        for subscription in subscribers:
+            try:
+                subscription.loop.call_soon_threadsafe(subscription.offer, event)
+            except RuntimeError:
+                # Loop already closed (shutdown); nothing left to deliver to
+                self.unsubscribe(subscription)
+
+    def subscribe(self, channel: str) -> Subscription:
+        subscription = Subscription(self, channel)
+        with self._lock:
+            self._channels[channel].add(subscription)
+        logger.debug("Subscribed to %s", channel)
+        return subscription
+
+    def unsubscribe(self, subscription: Subscription) -> None:
+        with self._lock:
+            subscribers = self._channels.get(subscription.channel)
+            if subscribers is not None:
+                subscribers.discard(subscription)
+                if not subscribers:
+                    del self._channels[subscription.channel]
+
+    def subscriber_count(self, channel: str) -> int:
+        with self._lock:
+            return len(self._channels.get(channel, ()))
+
+
+_broker: EventBroker = InMemoryBroker()
+
+
+def get_event_broker() -> EventBroker:
+    return _broker
+
+
+def set_event_broker(broker: EventBroker) -> None:
+    """Replace the process-wide broker (e.g. with a cross-worker one)."""
+    global _broker
+    _broker = broker
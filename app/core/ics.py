@@ -0,0 +1,126 @@
+from datetime import datetime
+from typing import Dict, Iterable, Iterator, Optional
+
+# Minimal RFC 5545 writer for the shapes we export (VCALENDAR of VEVENTs
+# with text, floating local date-time and UTC stamp properties). Emits text
+# straight from shift rows instead of building an icalendar object graph.
+
+CRLF = "\r\n"
+# Content lines longer than this many octets must be folded (RFC 5545 3.1)
+MAX_LINE_OCTETS = 75
+# Buffer output into chunks of roughly this size for StreamingResponse
+CHUNK_SIZE = 16 * 1024
+
+EVENT_PROPERTIES = (
+    ("uid", "UID"),
+    ("dtstamp", "DTSTAMP"),
+    ("dtstart", "DTSTART"),
+    ("dtend", "DTEND"),
+    ("summary", "SUMMARY"),
+    ("description", "DESCRIPTION"),
+    ("location", "LOCATION"),
+)
+# Values of these properties are TEXT and need escaping
+_TEXT_PROPERTIES = {"summary", "description", "location"}
+
+
+def escape_text(value: str) -> str:
+    """Escape a TEXT value: backslash, semicolon, comma and newlines."""
+    return (
+        str(value)
+        .replace("\\", "\\\\")
+        .replace(";", "\\;")
+        .replace(",", "\\,")
+        .replace("\r\n", "\\n")
+        .replace("\n", "\\n")
+    )
+
+
+def fold_line(line: str) -> str:
+    """
+    Terminate a content line with CRLF, folding it at 75 octets. Folds never
+    split a multi-byte UTF-8 character; continuation lines start with a
+    space, which counts toward their 75.
+    """
+    if len(line) * 4 <= MAX_LINE_OCTETS or len(line.encode("utf-8")) <= MAX_LINE_OCTETS:
+        return line + CRLF
+
+    parts = []
+    current = []
+    size = 0
+    limit = MAX_LINE_OCTETS
+    for char in line:
+        char_size = len(char.encode("utf-8"))
+        if size + char_size > limit:
+            parts.append("".join(current))
+            current, size, limit = [], 0, MAX_LINE_OCTETS - 1
+        current.append(char)
+        size += char_size
+    parts.append("".join(current))
+    return (CRLF + " ").join(parts) + CRLF
+
+
+def local_datetime(date_str: str, time_str: str) -> str:
+    """
+    Floating DATE-TIME from ISO strings as stored ("2026-04-22", "09:00:00"
+    or "09:00") -> "20260422T090000", without parsing either.
+    """
+    return date_str[:10].replace("-", "") + "T" + time_str.replace(":", "")[:6].ljust(6, "0")
+
+
+def utc_datetime(value: datetime) -> str:
+    """UTC DATE-TIME, e.g. for DTSTAMP: "20260422T090000Z". value must be UTC."""
+    return value.strftime("%Y%m%dT%H%M%SZ")
+
+
+def iter_calendar(
+    events: Iterable[Dict[str, str]],
+    prodid: str,
+    calendar_properties: Optional[Dict[str, str]] = None,
+    chunk_size: int = CHUNK_SIZE,
+) -> Iterator[str]:
+    """
+    Stream a VCALENDAR document in chunks of about chunk_size characters.
+
+    Args:
+        events: Dicts keyed by EVENT_PROPERTIES names ("uid", "dtstart",
+            ...). Date-time values must already be formatted (see
+            local_datetime / utc_datetime); text values are escaped here.
+            Missing or None properties are omitted.
+        prodid: PRODID of the calendar
+        calendar_properties: Extra calendar-level properties, e.g.
+            {"X-WR-CALNAME": "My shifts"}; values are escaped as TEXT
+        chunk_size: Approximate size of each yielded chunk
+
+    Yields:
+        Consecutive pieces of the .ics document
+    """
+    buffer = [
+        "BEGIN:VCALENDAR" + CRLF,
+        fold_line("PRODID:" + prodid),
+        "VERSION:2.0" + CRLF,
+        "CALSCALE:GREGORIAN" + CRLF,
+    ]
+    for name, value in (calendar_properties or {}).items():
+        buffer.append(fold_line(f"{name}:{escape_text(value)}"))
+    size = sum(len(piece) for piece in buffer)
+
+    for event in events:
+        lines = ["BEGIN:VEVENT" + CRLF]
+        for key, name in EVENT_PROPERTIES:
+            value = event.get(key)
+            if value is None:
+                continue
+            if key in _TEXT_PROPERTIES:
+                value = escape_text(value)
+            lines.append(fold_line(f"{name}:{value}"))
+        lines.append("END:VEVENT" + CRLF)
+        text = "".join(lines)
+        buffer.append(text)
+        size += len(text)
+        if size >= chunk_size:
+            yield "".join(buffer)
+            buffer, size = [], 0
+
+    buffer.append("END:VCALENDAR" + CRLF)
+    yield "".join(buffer)
@@ -0,0 +1,229 @@
+import io
+import logging
+import re
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Tuple
+
+import pandas as pd
+from openpyxl import load_workbook
+
+logger = logging.getLogger(__name__)
+
+
+def normalize_header(header: str) -> str:
+    """Lowercase a column header and strip everything but letters and digits."""
+    return re.sub(r"[^a-z0-9]", "", str(header).lower())
+
+
+def guess_column_mapping(
+    columns: List[str],
+    field_synonyms: Dict[str, List[str]],
+    exact_only: Optional[Iterable[str]] = None,
+) -> Dict[str, str]:
+    """
+    Best-guess match each normalized field to a source column header.
+
+    An exact match against a field's synonyms wins; failing that, the first
+    header containing any synonym as a substring (e.g. "Day of Week (1-7)")
+    is used. Fields listed in `exact_only` skip the substring fallback —
+    for short synonyms like "id" that would otherwise claim unrelated
+    headers such as "Restaurant ID".
+
+    Args:
+        columns: Source column headers, in file order
+        field_synonyms: normalized_field -> list of normalized header synonyms
+        exact_only: Fields that must match a synonym exactly
+
+    Returns:
+        normalized_field -> source column header, only for fields found
+    """
+    exact_only = set(exact_only or ())
+    normalized_columns = {col: normalize_header(col) for col in columns}
+    mapping: Dict[str, str] = {}
+
+    for field, synonyms in field_synonyms.items():
+        for col, normalized in normalized_columns.items():
+            if normalized in synonyms:
+                mapping[field] = col
+                break
+        else:
+            if field in exact_only:
+                continue
+            for col, normalized in normalized_columns.items():
+                if any(syn in normalized for syn in synonyms):
+                    mapping[field] = col
+                    break
+
+    return mapping
+
+
+SPREADSHEET_EXTENSIONS = (".csv", ".xlsx", ".xls")
+
+
+def is_spreadsheet(filename: Optional[str]) -> bool:
+    """Whether an upload is read by iter_spreadsheet, judged by extension."""
+    return (filename or "").lower().endswith(SPREADSHEET_EXTENSIONS)
+
+
+# Rows per DataFrame yielded by iter_spreadsheet. Bounds the memory a
+# single chunk takes while it's mapped and validated.
+SPREADSHEET_CHUNK_ROWS = 5000
+
+
+def iter_spreadsheet(
+    file_bytes: bytes, filename: str, chunk_rows: int = SPREADSHEET_CHUNK_ROWS
+) -> Iterator[Tuple[Optional[str], pd.DataFrame]]:
+    """
+    Read an uploaded CSV or Excel file in chunks of at most chunk_rows rows.
+
+    CSVs are read with pd.read_csv(chunksize=...). Workbooks are read with
+    openpyxl in read-only mode, which streams rows instead of loading the
+    whole sheet. Every sheet with a header row is read, not just the first,
+    and each sheet's first non-blank row is its header. Cell values are
+    strings ("" for empty), and fully-blank rows are dropped.
+
+    Yields:
+        (sheet_name, chunk). sheet_name is None for CSV. Chunks of the same
+        sheet share its header as their columns.
+
+    Raises:
+        ValueError: If the file type is unsupported or the file can't be
+            parsed. Raised lazily, possibly after some chunks were yielded.
+    """
+    lower_name = (filename or "").lower()
+    if lower_name.endswith(".csv"):
+        chunks = _iter_csv(file_bytes, chunk_rows)
+    elif lower_name.endswith(".xlsx") or lower_name.endswith(".xls"):
+        chunks = _iter_workbook(file_bytes, chunk_rows)
+    else:
+        raise ValueError(
+            f"Unsupported file type: {filename!r}. Expected .csv or .xlsx"
+        )
+
+    try:
+        for sheet, chunk in chunks:
+            chunk = drop_blank_rows(chunk)
+            if len(chunk):
+                yield sheet, chunk
+    except ValueError:
+        raise
+    except Exception as e:
+        logger.error("Failed to parse spreadsheet %s: %s", filename, e)
+        raise ValueError(f"Could not parse file: {e}") from e
+
+
+def _iter_csv(file_bytes: bytes, chunk_rows: int) -> Iterator[Tuple[Optional[str], pd.DataFrame]]:
+    with pd.read_csv(
+        io.BytesIO(file_bytes), dtype=str, keep_default_na=False, chunksize=chunk_rows
+    ) as reader:
+        for chunk in reader:
+            yield None, chunk
+
+
+def _iter_workbook(file_bytes: bytes, chunk_rows: int) -> Iterator[Tuple[Optional[str], pd.DataFrame]]:
+    workbook = load_workbook(
+        io.BytesIO(file_bytes), read_only=True, data_only=True, keep_links=False
+    )
+    try:
+        for sheet in workbook.worksheets:
+            header: Optional[List[str]] = None
+            batch: List[List[str]] = []
+            for values in sheet.iter_rows(values_only=True):
+                cells = [value if type(value) is str else _cell_to_str(value) for value in values]
+                if header is None:
+                    if any(cells):
+                        header = _dedupe_headers(cells)
+                    continue
+                # Rows can be ragged in read-only mode; align to the header
+                batch.append((cells + [""] * len(header))[: len(header)])
+                if len(batch) >= chunk_rows:
+                    yield sheet.title, pd.DataFrame(batch, columns=header, dtype=str)
+                    batch = []
+            if header is not None and batch:
+                yield sheet.title, pd.DataFrame(batch, columns=header, dtype=str)
+    finally:
+        workbook.close()
+
+
+def _cell_to_str(value: Any) -> str:
+    """Cell value as pandas' read_excel(dtype=str) would give it."""
+    if value is None:
+        return ""
+    if isinstance(value, float) and value.is_integer():
+        return str(int(value))
+    return str(value)
+
+
+def _dedupe_headers(cells: List[str]) -> List[str]:
+    """Name blank headers and suffix repeats, as pd.read_csv does ("Day", "Day.1")."""
+    seen: Dict[str, int] = {}
+    headers = []
+    for i, cell in enumerate(cells):
+        name = cell.strip() or f"Unnamed: {i}"
+        if name in seen:
+            seen[name] += 1
+            name = f"{name}.{seen[name]}"
+        else:
+            seen[name] = 0
+        headers.append(name)
+    return headers
+
+
+def drop_blank_rows(df: pd.DataFrame) -> pd.DataFrame:
+    """
+    Drop fully-empty rows (common in exported spreadsheets). Built one
+    column at a time with vectorized string ops, not row by row.
+    """
+    blank = pd.Series(True, index=df.index)
+    for col in df.columns:
+        blank &= df[col].astype(str).str.strip().eq("")
+    return df[~blank]
+
+
+def iter_mapped_rows(
+    file_bytes: bytes,
+    filename: str,
+    field_synonyms: Dict[str, List[str]],
+    exact_only: Optional[Iterable[str]] = None,
+    empty: Any = "",
+    chunk_rows: int = SPREADSHEET_CHUNK_ROWS,
+) -> Iterator[Tuple[Optional[str], Dict[str, str], List[Dict[str, Any]]]]:
+    """
+    iter_spreadsheet + guess_column_mapping + frame_to_rows: raw row dicts,
+    a chunk at a time, with columns mapped per sheet.
+
+    Yields:
+        (sheet_name, column_mapping, rows) per chunk
+
+    Raises:
+        ValueError: As iter_spreadsheet
+    """
+    mappings: Dict[Optional[str], Dict[str, str]] = {}
+    for sheet, chunk in iter_spreadsheet(file_bytes, filename, chunk_rows):
+        if sheet not in mappings:
+            mappings[sheet] = guess_column_mapping(list(chunk.columns), field_synonyms, exact_only)
+        yield sheet, mappings[sheet], frame_to_rows(chunk, mappings[sheet], empty=empty)
+
+
+def frame_to_rows(
+    df: pd.DataFrame, column_mapping: Dict[str, str], empty: Any = ""
+) -> List[Dict[str, Any]]:
+    """
+    Raw row dicts (normalized_field -> stripped string) from a DataFrame
+    chunk of iter_spreadsheet, selecting columns per column_mapping.
+
+    Args:
+        df: Source rows
+        column_mapping: normalized_field -> source column header
+        empty: Value to use for blank cells
+
+    Returns:
+        One dict per DataFrame row, in order
+    """
+    if not column_mapping:
+        return [{} for _ in range(len(df))]
+    fields = list(column_mapping)
+    columns = [
+        [value or empty for value in df[source_col].astype(str).str.strip().tolist()]
+        for source_col in column_mapping.values()
+    ]
+    return [dict(zip(fields, values)) for values in zip(*columns)]
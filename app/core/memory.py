@@ -0,0 +1,130 @@
+import logging
+import os
+import sys
+import threading
+from typing import Optional
+
+logger = logging.getLogger(__name__)
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+_PAGE_SIZE = os.sysconf("SC_PAGE_SIZE") if hasattr(os, "sysconf") else 4096
+# ru_maxrss is in kilobytes on Linux, bytes on macOS
+_MAXRSS_UNIT = 1 if sys.platform == "darwin" else 1024
+# How often PeakRSSSampler reads RSS while a stage runs
+SAMPLE_INTERVAL_SECONDS = 0.005
+
+
+def current_rss_bytes() -> Optional[int]:
+    """Resident set size of this process, or None where /proc isn't available."""
+    try:
+        with open("/proc/self/statm") as f:
+            return int(f.read().split()[1]) * _PAGE_SIZE
+    except (OSError, ValueError, IndexError):
+        return None
+
+
+def max_rss_bytes() -> Optional[int]:
+    """High-water mark of this process's RSS since it started (ru_maxrss)."""
+    if resource is None:
+        return None
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * _MAXRSS_UNIT
+
+
+class MaxRSSReading:
+    """
+    Cheap per-stage memory figure: ru_maxrss before and after the block,
+    two getrusage() calls and no thread.
+
+        with MaxRSSReading() as reading:
+            decode(...)
+        reading.peak_mb, reading.delta_mb
+
+    peak_mb is the process high-water mark after the block; delta_mb is how
+    far the block pushed it up, 0 if the block stayed under an earlier
+    peak. That's the figure that matters for OOM kills (did this import
+    make the worker bigger than it has ever been?), but like any RSS
+    figure it's per process, so stages running at the same time share it.
+    Use PeakRSSSampler when the peak within the block itself is needed.
+    """
+
+    def __init__(self) -> None:
+        self.start_bytes: Optional[int] = None
+        self.peak_bytes: Optional[int] = None
+
+    def __enter__(self) -> "MaxRSSReading":
+        self.start_bytes = max_rss_bytes()
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.peak_bytes = max_rss_bytes()
+
+    @property
+    def peak_mb(self) -> Optional[float]:
+        return None if self.peak_bytes is None else round(self.peak_bytes / 2**20, 1)
+
+    @property
+    def delta_mb(self) -> Optional[float]:
+        if self.peak_bytes is None or self.start_bytes is None:
+            return None
+        return round((self.peak_bytes - self.start_bytes) / 2**20, 1)
+
+
+class PeakRSSSampler:
+    """
+    Highest process RSS seen while the block runs, sampled on a background
+    thread:
+
+        with PeakRSSSampler() as sampler:
+            decode(...)
+        sampler.peak_mb, sampler.delta_mb
+
+    RSS is per process, so concurrent work shows up in the figure too.
+    Unlike MaxRSSReading it sees peaks below the process's earlier
+    high-water mark, at the cost of a thread reading /proc every 5 ms, so
+    it's for investigations (STAGE_RSS_SAMPLING), not the default. Where
+    RSS can't be read (non-Linux), both figures are None.
+    """
+
+    def __init__(self, interval: float = SAMPLE_INTERVAL_SECONDS):
+        self.interval = interval
+        self.start_bytes: Optional[int] = None
+        self.peak_bytes: Optional[int] = None
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def __enter__(self) -> "PeakRSSSampler":
+        self.start_bytes = self.peak_bytes = current_rss_bytes()
+        if self.start_bytes is not None:
+            self._thread = threading.Thread(target=self._sample, name="rss-sampler", daemon=True)
+            self._thread.start()
+        return self
+
+    def __exit__(self, *exc) -> None:
+        if self._thread is not None:
+            self._stop.set()
+            self._thread.join()
+            self._observe()
+
+    def _sample(self) -> None:
+        while not self._stop.wait(self.interval):
+            self._observe()
+
+    def _observe(self) -> None:
+        rss = current_rss_bytes()
+        if rss is not None and (self.peak_bytes is None or rss > self.peak_bytes):
+            self.peak_bytes = rss
+
+    @property
+    def peak_mb(self) -> Optional[float]:
+        return None if self.peak_bytes is None else round(self.peak_bytes / 2**20, 1)
+
+    @property
+    def delta_mb(self) -> Optional[float]:
+        """Growth of the peak over RSS at entry."""
+        if self.peak_bytes is None or self.start_bytes is None:
+            return None
+        return round((self.peak_bytes - self.start_bytes) / 2**20, 1)
@@ -0,0 +1,103 @@
+import base64
+import binascii
+import json
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Sequence, Tuple
+
+# Upper bound for ?limit= on paginated list endpoints.
+MAX_PAGE_SIZE = 500
+
+# Page size used internally when streaming a full result set as NDJSON.
+STREAM_PAGE_SIZE = 500
+
+
+class InvalidCursorError(ValueError):
+    """Raised when a pagination cursor can't be decoded (tampered, truncated, or stale format)."""
+
+    def __init__(self, cursor: str):
+        self.cursor = cursor
+        super().__init__("Invalid pagination cursor")
+
+
+def encode_cursor(values: Sequence[Any]) -> str:
+    """
+    Encode the sort-key values of the last row on a page into an opaque,
+    URL-safe cursor. Clients must treat it as a black box.
+    """
+    raw = json.dumps(list(values), separators=(",", ":"), default=str)
+    return base64.urlsafe_b64encode(raw.encode("utf-8")).decode("ascii").rstrip("=")
+
+
+def decode_cursor(cursor: str, size: int) -> List[Any]:
+    """
+    Decode a cursor produced by encode_cursor.
+
+    Args:
+        cursor: Opaque cursor string from a previous page
+        size: Number of sort-key values the caller expects
+
+    Raises:
+        InvalidCursorError: If the cursor is malformed, has the wrong arity,
+            or holds anything but strings and integers
+    """
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        values = json.loads(base64.urlsafe_b64decode(padded.encode("ascii")))
+    except (binascii.Error, UnicodeError, ValueError) as e:
+        raise InvalidCursorError(cursor) from e
+    if not isinstance(values, list) or len(values) != size:
+        raise InvalidCursorError(cursor)
+    # Sort keys are ids, names and ISO dates/times; anything else (null,
+    # objects, bools) was never produced by encode_cursor
+    if any(isinstance(v, bool) or not isinstance(v, (str, int)) for v in values):
+        raise InvalidCursorError(cursor)
+    return values
+
+
+def _quote(value: Any) -> str:
+    """Double-quote a value for a PostgREST filter so commas/dots/parens in it are literal."""
+    text = str(value).replace("\\", "\\\\").replace('"', '\\"')
+    return f'"{text}"'
+
+
+def keyset_filter(keys: Sequence[Tuple[str, bool]], values: Sequence[Any]) -> str:
+    """
+    Build a PostgREST `or` expression selecting rows strictly after `values`
+    in the ordering given by `keys` — the row-value comparison
+    (k1, k2, ...) > (v1, v2, ...) spelled out for PostgREST, e.g. for
+    [("name", False), ("id", False)]:
+
+        name.gt."Bob",and(name.eq."Bob",id.gt."<uuid>")
+
+    Args:
+        keys: (column, descending) pairs, in ORDER BY order
+        values: Last row's value for each key column
+
+    Returns:
+        Expression to pass to query.or_()
+    """
+    clauses = []
+    for i, (column, desc) in enumerate(keys):
+        op = "lt" if desc else "gt"
+        equal_prefix = [f"{col}.eq.{_quote(values[j])}" for j, (col, _) in enumerate(keys[:i])]
+        condition = f"{column}.{op}.{_quote(values[i])}"
+        if equal_prefix:
+            clauses.append(f"and({','.join(equal_prefix + [condition])})")
+        else:
+            clauses.append(condition)
+    return ",".join(clauses)
+
+
+def next_cursor(
+    rows: List[Dict[str, Any]], limit: Optional[int], keys: Sequence[Tuple[str, bool]]
+) -> Optional[str]:
+    """Cursor for the page after `rows`, or None if this was the last page."""
+    if not limit or len(rows) < limit:
+        return None
+    last = rows[-1]
+    return encode_cursor([last[column] for column, _ in keys])
+
+
+def iter_ndjson(rows: Iterable[Dict[str, Any]]) -> Iterator[bytes]:
+    """Serialize rows as newline-delimited JSON, one row per chunk."""
+    for row in rows:
+        yield (json.dumps(row, default=str) + "\n").encode("utf-8")
@@ -0,0 +1,191 @@
+import hashlib
+import json
+import logging
+import threading
+import time
+from collections import Counter
+from contextvars import ContextVar
+from typing import Any, Dict, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+# PostgREST builder methods that decide what kind of round trip a query is.
+# The first one seen on a chain wins (e.g. upsert(...).select(...) is an upsert).
+_OPERATIONS = {"select", "insert", "update", "upsert", "delete"}
+
+
+class QueryStats:
+    """
+    Round-trip accounting for a single HTTP request.
+
+    One instance is bound to the request's context by RequestLoggingMiddleware;
+    every .execute() on the instrumented Supabase client records into it.
+    Sync route handlers run in a threadpool with a *copy* of the request
+    context, which still points at this same object — hence the lock rather
+    than relying on one-thread-per-request.
+    """
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self.calls: List[Tuple[str, str, float]] = []
+        self._signatures: Counter = Counter()
+
+    def record(self, table: str, operation: str, signature: str, duration_ms: float) -> None:
+        with self._lock:
+            self.calls.append((table, operation, duration_ms))
+            self._signatures[signature] += 1
+
+    @property
+    def count(self) -> int:
+        return len(self.calls)
+
+    @property
+    def total_ms(self) -> float:
+        return round(sum(duration for _, _, duration in self.calls), 2)
+
+    def by_table(self) -> Dict[str, int]:
+        """Call counts keyed by "table.operation", e.g. {"shifts.select": 3}."""
+        counts: Counter = Counter(f"{table}.{operation}" for table, operation, _ in self.calls)
+        return dict(counts)
+
+    def repeated_queries(self) -> Dict[str, int]:
+        """Queries executed more than once with identical filters — the N+1 tell."""
+        return {sig: n for sig, n in self._signatures.items() if n > 1}
+
+    def summary(self) -> Dict[str, Any]:
+        return {
+            "db_calls": self.count,
+            "db_time_ms": self.total_ms,
+            "db_calls_by_table": self.by_table(),
+        }
+
+
+_current_stats: ContextVar[Optional[QueryStats]] = ContextVar("query_stats", default=None)
+
+
+def start_query_stats() -> QueryStats:
+    """Bind a fresh QueryStats to the current context and return it."""
+    stats = QueryStats()
+    _current_stats.set(stats)
+    return stats
+
+
+def get_query_stats() -> Optional[QueryStats]:
+    """QueryStats for the current request, or None outside a request (e.g. startup)."""
+    return _current_stats.get()
+
+
+class _InstrumentedQuery:
+    """
+    Wraps a postgrest request builder so the chain stays instrumented through
+    every .eq()/.order()/... call, and times the final .execute().
+    """
+
+    def __init__(self, builder: Any, table: str, operation: Optional[str], parts: Tuple[str, ...]):
+        self._builder = builder
+        self._table = table
+        self._operation = operation
+        self._parts = parts
+
+    def __getattr__(self, name: str) -> Any:
+        attr = getattr(self._builder, name)
+        if name == "execute":
+            return self._execute
+        if not callable(attr):
+            return attr
+
+        def call(*args, **kwargs):
+            result = attr(*args, **kwargs)
+            if not hasattr(result, "execute"):
+                return result
+            operation = self._operation
+            if operation is None and name in _OPERATIONS:
+                operation = name
+            part = f"{name}({_describe_args(args, kwargs)})"
+            return _InstrumentedQuery(result, self._table, operation, self._parts + (part,))
+
+        return call
+
+    def _execute(self, *args, **kwargs):
+        stats = _current_stats.get()
+        if stats is None:
+            return self._builder.execute(*args, **kwargs)
+
+        start = time.perf_counter()
+        try:
+            return self._builder.execute(*args, **kwargs)
+        finally:
+            duration_ms = (time.perf_counter() - start) * 1000
+            operation = self._operation or "select"
+            signature = f"{self._table}." + ".".join(self._parts)
+            stats.record(self._table, operation, signature, duration_ms)
+
+
+def _describe_arg(value: Any) -> str:
+    # Insert/upsert payloads, rpc params and in_() lists can be large, so
+    # they're reduced to their shape plus a short hash of the contents:
+    # equal payloads still match, different ones don't
+    if isinstance(value, (list, tuple, set, dict)):
+        contents = sorted(map(str, value)) if isinstance(value, set) else value
+        digest = hashlib.sha1(json.dumps(contents, sort_keys=True, default=str).encode("utf-8"))
+        return f"{type(value).__name__}[{len(value)}]#{digest.hexdigest()[:8]}"
+    return repr(value)
+
+
+def _describe_args(args: tuple, kwargs: dict) -> str:
+    parts = [_describe_arg(a) for a in args]
+    parts.extend(f"{k}={_describe_arg(v)}" for k, v in sorted(kwargs.items()))
+    return ", ".join(parts)
+
+
+class InstrumentedClient:
+    """
+    Thin proxy around the Supabase Client that counts and times every
+    PostgREST round trip made through .table()/.from_()/.rpc(). Everything
+    else (auth, storage, ...) passes straight through to the real client.
+    """
+
+    def __init__(self, client: Any):
+        self._client = client
+
+    def table(self, table_name: str) -> _InstrumentedQuery:
+        return _InstrumentedQuery(self._client.table(table_name), table_name, None, ())
+
+    def from_(self, table_name: str) -> _InstrumentedQuery:
+        return _InstrumentedQuery(self._client.from_(table_name), table_name, None, ())
+
+    def rpc(self, fn: str, params: Optional[Dict[str, Any]] = None, **kwargs) -> _InstrumentedQuery:
+        builder = self._client.rpc(fn, params, **kwargs)
+        return _InstrumentedQuery(
+            builder, f"rpc:{fn}", "rpc", (f"rpc({_describe_args((params,), kwargs)})",)
+        )
+
+    def __getattr__(self, name: str) -> Any:
+        return getattr(self._client, name)
+
+
+def warn_on_query_smells(stats: QueryStats, budget: int, method: str, path: str, request_id: str) -> None:
+    """
+    Development-only nudges: flag requests that blow the round-trip budget or
+    run the same query more than once (almost always an N+1 loop).
+    """
+    if stats.count > budget:
+        logger.warning(
+            "DB call budget exceeded: %s %s made %d calls (budget %d)",
+            method,
+            path,
+            stats.count,
+            budget,
+            extra={"request_id": request_id, "db_calls_by_table": stats.by_table()},
+        )
+
+    repeated = stats.repeated_queries()
+    if repeated:
+        logger.warning(
+            "Possible N+1: %s %s repeated %d identical quer%s",
+            method,
+            path,
+            len(repeated),
+            "y" if len(repeated) == 1 else "ies",
+            extra={"request_id": request_id, "repeated_queries": repeated},
+        )
@@ -0,0 +1,224 @@
+import asyncio
+import contextvars
+import logging
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from contextvars import ContextVar
+from typing import Any, Callable, Dict, List, Optional, TypeVar
+
+from fastapi import HTTPException, status
+
+from .config import settings
+from .memory import MaxRSSReading, PeakRSSSampler
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+
+class PoolSaturatedError(Exception):
+    """Raised when a pool already has as much work as it will accept; routes
+    map it to 429 so clients back off instead of piling onto the queue."""
+
+    def __init__(self, pool_name: str):
+        self.pool_name = pool_name
+        super().__init__(f"The {pool_name} workers are busy. Please retry shortly.")
+
+
+# Retry-After sent with the 429 for a saturated pool
+POOL_RETRY_AFTER_SECONDS = 2
+
+
+def pool_saturated_http_error(e: PoolSaturatedError) -> HTTPException:
+    """429 for routes to raise when a pool turns work away."""
+    return HTTPException(
+        status_code=status.HTTP_429_TOO_MANY_REQUESTS,
+        detail=str(e),
+        headers={"Retry-After": str(POOL_RETRY_AFTER_SECONDS)},
+    )
+
+
+class StageTimings:
+    """
+    Per-request record of work run on a BoundedPool: for each stage, how
+    long it waited for a worker, how long it ran and, on pools that track
+    memory, the peak process RSS while it ran. Bound to the request context
+    by RequestLoggingMiddleware and attached to its completion log.
+    """
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self.stages: List[Dict[str, Any]] = []
+
+    def record(
+        self,
+        stage: str,
+        wait_ms: float,
+        run_ms: float,
+        peak_rss_mb: Optional[float] = None,
+        rss_delta_mb: Optional[float] = None,
+    ) -> None:
+        entry: Dict[str, Any] = {"stage": stage, "wait_ms": round(wait_ms, 2), "run_ms": round(run_ms, 2)}
+        if peak_rss_mb is not None:
+            entry["peak_rss_mb"] = peak_rss_mb
+            entry["rss_delta_mb"] = rss_delta_mb
+        with self._lock:
+            self.stages.append(entry)
+
+    def summary(self) -> Dict[str, Any]:
+        with self._lock:
+            stages = list(self.stages)
+        if not stages:
+            return {}
+        summary: Dict[str, Any] = {"stages": stages}
+        peaks = [entry["peak_rss_mb"] for entry in stages if "peak_rss_mb" in entry]
+        if peaks:
+            summary["peak_rss_mb"] = max(peaks)
+        return summary
+
+
+_current_timings: ContextVar[Optional[StageTimings]] = ContextVar("stage_timings", default=None)
+
+
+def start_stage_timings() -> StageTimings:
+    """Bind a fresh StageTimings to the current context and return it."""
+    timings = StageTimings()
+    _current_timings.set(timings)
+    return timings
+
+
+def get_stage_timings() -> Optional[StageTimings]:
+    return _current_timings.get()
+
+
+class BoundedPool:
+    """
+    A dedicated thread pool with a hard cap on queued work.
+
+    Async routes use it to move blocking stages (pandas parsing, image
+    decoding) off the event loop, so one slow upload
+    only ties up one worker rather than the whole process. At most
+    max_workers stages run at once and max_queued more wait; beyond that
+    run() raises PoolSaturatedError immediately rather than letting the
+    backlog (and the memory held by its uploads) grow without bound.
+
+    Threads rather than processes: Pillow and pandas release the GIL in
+    their heavy loops, and arguments (uploaded bytes, DataFrames) would
+    otherwise be pickled across a process boundary on every call.
+
+    With track_rss, each stage also reports process memory — for pools
+    whose stages allocate a lot. By default that's the cheap MaxRSSReading
+    (how far the stage raised the process's RSS high-water mark); with
+    sample_rss, a PeakRSSSampler thread per stage measures the peak while
+    it ran instead.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        max_workers: int,
+        max_queued: int,
+        track_rss: bool = False,
+        sample_rss: bool = False,
+    ):
+        self.name = name
+        self.max_workers = max_workers
+        self.max_queued = max_queued
+        self.track_rss = track_rss
+        self.sample_rss = sample_rss
+        self._slots = threading.BoundedSemaphore(max_workers + max_queued)
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._lock = threading.Lock()
+
+    @property
+    def executor(self) -> ThreadPoolExecutor:
+        if self._executor is None:
+            with self._lock:
+                if self._executor is None:
+                    self._executor = ThreadPoolExecutor(
+                        max_workers=self.max_workers, thread_name_prefix=f"{self.name}-pool"
+                    )
+        return self._executor
+
+    async def run(self, stage: str, fn: Callable[..., T], *args: Any, **kwargs: Any) -> T:
+        """
+        Run fn(*args, **kwargs) on this pool and await its result.
+
+        The call runs in a copy of the caller's context, so request-scoped
+        state (query stats, stage timings) still applies inside it. Its wait
+        and run times are logged and recorded under `stage`.
+
+        Raises:
+            PoolSaturatedError: If the pool's workers and queue are all taken
+            Whatever fn raises
+        """
+        if not self._slots.acquire(blocking=False):
+            logger.warning("%s pool saturated; rejecting stage %s", self.name, stage)
+            raise PoolSaturatedError(self.name)
+
+        queued_at = time.perf_counter()
+        context = contextvars.copy_context()
+
+        def call() -> T:
+            started_at = time.perf_counter()
+            sampler = None
+            if self.track_rss:
+                sampler = PeakRSSSampler() if self.sample_rss else MaxRSSReading()
+            try:
+                if sampler is None:
+                    return fn(*args, **kwargs)
+                with sampler:
+                    return fn(*args, **kwargs)
+            finally:
+                # Released here, not by the awaiting coroutine: if the client
+                # disconnects the work still occupies the worker until done
+                self._slots.release()
+                wait_ms = (started_at - queued_at) * 1000
+                run_ms = (time.perf_counter() - started_at) * 1000
+                peak_mb = sampler.peak_mb if sampler else None
+                delta_mb = sampler.delta_mb if sampler else None
+                timings = _current_timings.get()
+                if timings is not None:
+                    timings.record(stage, wait_ms, run_ms, peak_mb, delta_mb)
+                if peak_mb is None:
+                    logger.info(
+                        "Stage %s on %s pool: waited %.1fms, ran %.1fms", stage, self.name, wait_ms, run_ms
+                    )
+                else:
+                    logger.info(
+                        "Stage %s on %s pool: waited %.1fms, ran %.1fms, peak RSS %.1fMB (+%.1fMB)",
+                        stage,
+                        self.name,
+                        wait_ms,
+                        run_ms,
+                        peak_mb,
+                        delta_mb,
+                    )
+
+        try:
+            future = self.executor.submit(context.run, call)
+        except BaseException:
+            self._slots.release()
+            raise
+        # Cancelled before a worker picked it up (client gone, shutdown):
+        # call() never runs, so its finally can't free the slot
+        future.add_done_callback(lambda f: f.cancelled() and self._slots.release())
+        return await asyncio.wrap_future(future)
+
+    def shutdown(self) -> None:
+        with self._lock:
+            executor, self._executor = self._executor, None
+        if executor is not None:
+            executor.shutdown(wait=False, cancel_futures=True)
+
+
+# CPU-bound parsing: spreadsheet reading/validation and image decoding.
+# These stages hold whole uploads and decoded bitmaps, so report their RSS.
+parse_pool = BoundedPool(
+    "parse",
+    max_workers=settings.PARSE_POOL_WORKERS,
+    max_queued=settings.PARSE_POOL_QUEUE,
+    track_rss=True,
+    sample_rss=settings.STAGE_RSS_SAMPLING,
+)
@@ -0,0 +1,25 @@
+from datetime import datetime
+from typing import Any, Dict, List, Literal
+from uuid import UUID
+
+from pydantic import BaseModel
+
+
+class ChangeEntry(BaseModel):
+    """One change-log entry. data is the row as written, or just {"id": ...}
+    for deletions."""
+
+    id: int
+    entity: Literal["shift", "schedule", "employee", "availability"]
+    entity_id: UUID
+    op: Literal["created", "updated", "deleted"]
+    data: Dict[str, Any]
+    changed_at: datetime
+
+
+class ChangeFeedResponse(BaseModel):
+    """A page of the delta sync feed."""
+
+    changes: List[ChangeEntry]
+    cursor: str
+    has_more: bool
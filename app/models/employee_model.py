@@ -1,6 +1,6 @@
 from pydantic import BaseModel, EmailStr
 from uuid import UUID
-from typing import Optional
+from typing import Dict, List, Optional
 
 
 class EmployeeCreate(BaseModel):
@@ -27,3 +27,46 @@ class EmployeeUpdate(BaseModel):
     deleted_at: Optional[str] = None
     salary: Optional[float] = None
     max_hours_per_week: Optional[float] = None
+
+
+class EmployeeBulkRow(BaseModel):
+    """
+    One row of a bulk import. Rows with an `id` update that employee
+    (only the fields given change); rows without one create a new employee.
+    """
+
+    id: Optional[UUID] = None
+    name: Optional[str] = None
+    role: Optional[str] = None
+    restaurant_id: Optional[str] = None
+    is_active: Optional[bool] = None
+    salary: Optional[float] = None
+    max_hours_per_week: Optional[float] = None
+
+
+class EmployeeBulkRequest(BaseModel):
+    # Applied to any row that doesn't set its own restaurant_id
+    restaurant_id: Optional[str] = None
+    employees: List[EmployeeBulkRow]
+
+
+class EmployeeBulkRowResult(BaseModel):
+    row_number: int
+    action: str  # "create" | "update"
+    status: str  # "created" | "updated" | "valid" (dry run) | "error"
+    employee: Optional[EmployeeModel] = None
+    errors: List[str] = []
+
+
+class EmployeeBulkResponse(BaseModel):
+    created_count: int
+    updated_count: int
+    error_count: int
+    column_mapping: Dict[str, str] = {}  # set for file uploads only
+    rows: List[EmployeeBulkRowResult]
+
+
+class CalendarFeedTokenResponse(BaseModel):
+    feed_token: str
+    # Relative subscription URL (prefix with the API host)
+    feed_path: str
@@ -1,7 +1,7 @@
 from pydantic import BaseModel, Field
 from uuid import UUID
 from datetime import date, time, datetime
-from typing import List, Optional
+from typing import Dict, List, Optional
 
 
 class ScheduleCreate(BaseModel):
@@ -13,6 +13,16 @@ class ScheduleModel(ScheduleCreate):
     id: UUID
 
 
+class ScheduleWeeksCreate(BaseModel):
+    """Request to create schedules for the next N weeks."""
+
+    restaurant_id: str
+    weeks: int = Field(..., ge=1, le=52, description="Number of consecutive weeks")
+    start_date: Optional[date] = Field(
+        None, description="Any day in the first week (defaults to the current week)"
+    )
+
+
 class EmployeeBasic(BaseModel):
     """Embedded employee info in shift response"""
 
@@ -45,6 +55,36 @@ class ScheduleResponse(BaseModel):
     total_hours: float = 0.0
 
 
+class ScheduleCalendarResponse(BaseModel):
+    """Several consecutive weeks of schedules for one restaurant."""
+
+    restaurant_id: str
+    start_date: date
+    end_date: date
+    weeks: List[ScheduleResponse]
+
+
+class EmployeeHours(BaseModel):
+    """One employee's share of a schedule's hours."""
+
+    employee_id: UUID
+    name: str
+    shift_count: int
+    hours: float
+
+
+class ScheduleSummary(BaseModel):
+    """Aggregated totals for one schedule, computed in the database."""
+
+    schedule_id: UUID
+    restaurant_id: str
+    week_start: date
+    shift_count: int
+    total_hours: float
+    hours_by_role: Dict[str, float]
+    hours_by_employee: List[EmployeeHours]
+
+
 class ShiftTemplate(BaseModel):
     """Template for a shift to be created."""
 
@@ -1,6 +1,6 @@
 from datetime import date, time, datetime, timedelta
 from uuid import UUID
-from typing import Optional
+from typing import List, Literal, Optional
 from pydantic import BaseModel, field_validator, Field
 
 
@@ -47,3 +47,53 @@ class ShiftResponse(BaseModel):
 
     # employee: Optional[dict] = None
     # schedule: Optional[dict] = None
+
+
+class ShiftBatchOperation(BaseModel):
+    """
+    One operation in a shift batch. `create` needs employee_id, shift_date,
+    start_time and end_time; `update` needs shift_id plus the fields to
+    change; `delete` needs only shift_id.
+    """
+
+    op: Literal["create", "update", "delete"]
+    shift_id: Optional[UUID] = None
+    employee_id: Optional[UUID] = None
+    shift_date: Optional[date] = None
+    start_time: Optional[time] = None
+    end_time: Optional[time] = None
+    notes: Optional[str] = None
+
+
+class ShiftBatchRequest(BaseModel):
+    schedule_id: UUID
+    operations: List[ShiftBatchOperation]
+
+
+class ShiftBatchResponse(BaseModel):
+    created: List[ShiftResponse]
+    updated: List[ShiftResponse]
+    deleted: List[UUID]
+
+
+class EmployeeShift(BaseModel):
+    id: UUID
+    schedule_id: UUID
+    shift_date: date
+    start_time: time
+    end_time: time
+    notes: Optional[str] = None
+
+
+class WeeklyHours(BaseModel):
+    week_start: date
+    shift_count: int
+    hours: float
+
+
+class EmployeeShiftsResponse(BaseModel):
+    employee_id: UUID
+    shifts: List[EmployeeShift]
+    # Totals over the shifts in this response (i.e. this page, when paginating)
+    weekly_hours: List[WeeklyHours]
+    total_hours: float
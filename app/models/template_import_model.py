@@ -15,6 +15,7 @@ class ParsedTemplateRow(BaseModel):
     role: Optional[str] = None
     count: Optional[int] = None
     confidence: Optional[str] = None  # "high" | "low" — set by image import, unset for file import
+    sheet: Optional[str] = None  # workbook sheet the row came from (Excel import only)
     errors: List[str] = []
     warnings: List[str] = []
     is_valid: bool
@@ -27,6 +28,14 @@ class TemplateImportPreviewResponse(BaseModel):
     rows: List[ParsedTemplateRow]
     valid_count: int
     error_count: int
+    # File import: rows in the whole file. rows itself is capped (leading
+    # rows plus later errors) and truncated says whether anything was left out.
+    total_rows: Optional[int] = None
+    truncated: bool = False
+    # Image import only: "miss" (model called), "hit" (same image seen
+    # before) or "near_duplicate" (a very similar image seen before — worth
+    # a second look, or re-run with refresh=true)
+    vision_cache: Optional[str] = None
 
 
 class TemplateImportConfirmRequest(BaseModel):
@@ -34,3 +43,35 @@ class TemplateImportConfirmRequest(BaseModel):
 
     restaurant_id: str
     rows: List[ShiftTemplate]
+
+
+class TemplateBatchFilePreview(BaseModel):
+    """One file of a batch import: its preview, or why it couldn't be read."""
+
+    filename: str
+    kind: str  # "file" (CSV/Excel) | "image"
+    preview: Optional[TemplateImportPreviewResponse] = None
+    error: Optional[str] = None
+
+
+class TemplateBatchPreviewResponse(BaseModel):
+    """Per-file previews from /import/batch/parse, in upload order."""
+
+    files: List[TemplateBatchFilePreview]
+
+
+class TemplateBatchConfirmRequest(BaseModel):
+    """Confirmed rows of a batch import, one entry per reviewed file. Entries
+    for the same restaurant are saved together."""
+
+    imports: List[TemplateImportConfirmRequest]
+
+
+class TemplateBatchConfirmResult(BaseModel):
+    restaurant_id: str
+    imported_count: int
+    error: Optional[str] = None
+
+
+class TemplateBatchConfirmResponse(BaseModel):
+    results: List[TemplateBatchConfirmResult]
@@ -1,15 +1,21 @@
 import base64
+import hashlib
 import json
 import logging
 from typing import Any, Dict, List, Optional
 
 import groq
 
+from ..core.ai_client import AsyncCompletionClient
 from ..core.config import settings
 
 logger = logging.getLogger(__name__)
 
 MODEL = "llama-3.3-70b-versatile"
+# Part of every analysis cache key (analysis_input_hash). The prompt text
+# itself is hashed too, so bump this only for changes the model's input
+# doesn't show, e.g. to _validate_analysis_shape or the response model.
+ANALYSIS_PROMPT_VERSION = "1"
 
 _VISION_SYSTEM_PROMPT = """You are extracting a restaurant shift schedule from an image — a photo or screenshot of a handwritten or printed schedule table. Most schedules like this (whiteboards especially) show employee NAMES, not job roles — that's expected, not a gap.
 
@@ -79,23 +85,43 @@ class AIServiceUnavailableError(Exception):
 
 
 class AIService:
-    """Provides AI-powered schedule analysis using Groq (llama-3.3-70b-versatile)."""
+    """
+    Provides AI-powered schedule analysis using Groq (llama-3.3-70b-versatile).
+
+    Every model call goes through AsyncCompletionClient (shared concurrency
+    cap, deadlines, retries, optional hedging, per-model metrics) rather
+    than holding a worker thread for the length of the call.
+    """
 
     def __init__(self) -> None:
         if not settings.GROQ_API_KEY:
             raise AIServiceUnavailableError(
                 "GROQ_API_KEY is not configured. Set it in your .env file."
             )
-        self._client = groq.Groq(api_key=settings.GROQ_API_KEY)
+        self._async_client: Optional[AsyncCompletionClient] = None
+
+    @property
+    def async_client(self) -> AsyncCompletionClient:
+        if self._async_client is None:
+            # Retries are AsyncCompletionClient's, within the call's deadline
+            self._async_client = AsyncCompletionClient(
+                groq.AsyncGroq(api_key=settings.GROQ_API_KEY, max_retries=0),
+                max_concurrency=settings.AI_MAX_CONCURRENCY,
+                max_queued=settings.AI_MAX_QUEUED,
+                max_attempts=settings.AI_MAX_ATTEMPTS,
+                hedge=settings.AI_HEDGE_REQUESTS,
+            )
+        return self._async_client
 
-    def analyze_schedule(
+    async def analyze_schedule(
         self,
         schedule: Dict[str, Any],
         shifts: List[Dict[str, Any]],
         all_employees: Optional[List[Dict[str, Any]]] = None,
     ) -> Dict[str, Any]:
         """
-        Analyse a weekly schedule and return a structured report.
+        Analyse a weekly schedule and return a structured report, within
+        AI_ANALYSIS_DEADLINE_SECONDS.
 
         Args:
             schedule: The schedule record (id, restaurant_id, week_start, …)
@@ -108,7 +134,22 @@ class AIService:
 
         Raises:
             ValueError: If the model returns malformed JSON or a schema mismatch.
+            PoolSaturatedError: If too many model calls are already outstanding
+            AIDeadlineExceededError: If the model doesn't answer in time
         """
+        response = await self.async_client.complete(
+            "analysis",
+            settings.AI_ANALYSIS_DEADLINE_SECONDS,
+            **self._analysis_request(schedule, shifts, all_employees),
+        )
+        return self._parse_analysis(schedule, response)
+
+    @staticmethod
+    def _analysis_request(
+        schedule: Dict[str, Any],
+        shifts: List[Dict[str, Any]],
+        all_employees: Optional[List[Dict[str, Any]]],
+    ) -> Dict[str, Any]:
         logger.info(
             "Analysing schedule id=%s week_start=%s shifts=%d",
             schedule.get("id"),
@@ -116,19 +157,32 @@ class AIService:
             len(shifts),
         )
 
-        prompt = self._build_analysis_prompt(schedule, shifts, all_employees or [])
+        # Canonical order, so the same shifts fetched in a different order
+        # make the same prompt (and analysis_input_hash)
+        shifts = sorted(
+            shifts,
+            key=lambda s: (
+                str(s.get("shift_date", "")),
+                str(s.get("start_time", "")),
+                str(s.get("employee_id", "")),
+                str(s.get("id", "")),
+            ),
+        )
+        prompt = AIService._build_analysis_prompt(schedule, shifts, all_employees or [])
 
-        response = self._client.chat.completions.create(
-            model=MODEL,
-            messages=[
+        return {
+            "model": MODEL,
+            "messages": [
                 {"role": "system", "content": _SYSTEM_PROMPT},
                 {"role": "user", "content": prompt},
             ],
-            response_format={"type": "json_object"},
-            temperature=0.3,  # low temp for consistent, factual output
-            max_tokens=1024,
-        )
+            "response_format": {"type": "json_object"},
+            "temperature": 0.3,  # low temp for consistent, factual output
+            "max_tokens": 1024,
+        }
 
+    @staticmethod
+    def _parse_analysis(schedule: Dict[str, Any], response: Any) -> Dict[str, Any]:
         raw = response.choices[0].message.content.strip()
 
         try:
@@ -142,11 +196,12 @@ class AIService:
         logger.info("Schedule analysis complete for id=%s", schedule.get("id"))
         return result
 
-    def analyze_image_for_templates(
+    async def analyze_image_for_templates(
         self, image_bytes: bytes, mime_type: str = "image/jpeg"
     ) -> List[Dict[str, Any]]:
         """
-        Extract candidate shift templates from a photo/screenshot of a schedule.
+        Extract candidate shift templates from a photo/screenshot of a
+        schedule, within AI_VISION_DEADLINE_SECONDS.
 
         All Groq-specific details (model choice, image encoding, message
         shape) live in this one method. Callers depend only on the
@@ -169,14 +224,25 @@ class AIService:
         Raises:
             ValueError: If the model's response can't be parsed into the
                         expected shape.
+            PoolSaturatedError: If too many model calls are already outstanding
+            AIDeadlineExceededError: If the model doesn't answer in time
         """
+        response = await self.async_client.complete(
+            "vision",
+            settings.AI_VISION_DEADLINE_SECONDS,
+            **self._vision_request(image_bytes, mime_type),
+        )
+        return self._parse_vision(response)
+
+    @staticmethod
+    def _vision_request(image_bytes: bytes, mime_type: str) -> Dict[str, Any]:
         logger.info("Analysing schedule image (%d bytes, %s)", len(image_bytes), mime_type)
 
         b64_image = base64.b64encode(image_bytes).decode("utf-8")
 
-        response = self._client.chat.completions.create(
-            model=settings.GROQ_VISION_MODEL,
-            messages=[
+        return {
+            "model": settings.GROQ_VISION_MODEL,
+            "messages": [
                 {"role": "system", "content": _VISION_SYSTEM_PROMPT},
                 {
                     "role": "user",
@@ -192,11 +258,13 @@ class AIService:
                     ],
                 },
             ],
-            response_format={"type": "json_object"},
-            temperature=0.1,  # low temp — this is extraction, not generation
-            max_tokens=2048,
-        )
+            "response_format": {"type": "json_object"},
+            "temperature": 0.1,  # low temp — this is extraction, not generation
+            "max_tokens": 2048,
+        }
 
+    @staticmethod
+    def _parse_vision(response: Any) -> List[Dict[str, Any]]:
         raw = response.choices[0].message.content.strip()
 
         try:
@@ -298,6 +366,26 @@ class AIService:
         )
 
 
+def analysis_input_hash(
+    schedule: Dict[str, Any],
+    shifts: List[Dict[str, Any]],
+    all_employees: Optional[List[Dict[str, Any]]] = None,
+) -> str:
+    """
+    sha256 over exactly what analyze_schedule would send the model (model,
+    prompts built from the shifts and roster, sampling parameters) plus
+    ANALYSIS_PROMPT_VERSION: equal hashes mean an equal request, so a cached
+    analysis for one is valid for the other.
+
+    Doesn't need GROQ_API_KEY.
+    """
+    request = AIService._analysis_request(schedule, shifts, all_employees)
+    payload = json.dumps(
+        {"prompt_version": ANALYSIS_PROMPT_VERSION, **request}, sort_keys=True, default=str
+    )
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
 def _validate_analysis_shape(data: Dict[str, Any]) -> None:
     """Raise ValueError if the model response is missing required top-level keys."""
     required = {"summary", "fairness", "coverage", "workload", "patterns", "recommendations"}
@@ -328,3 +416,11 @@ def get_ai_service() -> AIService:
     if _ai_service is None:
         _ai_service = AIService()
     return _ai_service
+
+
+async def close_ai_service() -> None:
+    """Close the shared instance's async HTTP client, if it was ever created."""
+    global _ai_service
+    if _ai_service is not None and _ai_service._async_client is not None:
+        await _ai_service._async_client.close()
+    _ai_service = None
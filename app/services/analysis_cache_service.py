@@ -0,0 +1,80 @@
+import logging
+from datetime import datetime, timedelta, timezone
+from typing import Any, Dict, Optional
+
+from supabase import Client
+
+from ..core.config import settings
+from ..core.db import get_supabase
+from .ai_service import ANALYSIS_PROMPT_VERSION, MODEL
+
+logger = logging.getLogger(__name__)
+
+TABLE = "schedule_analyses"
+
+
+class AnalysisCacheService:
+    """
+    Persistent cache of AI schedule analyses (migrations/0009), keyed by
+    analysis_input_hash — a hash of everything the model would be sent. A
+    changed shift or roster gives a new key, so entries never need
+    invalidating; they just stop being read after the TTL.
+
+    Shared by every worker process and survives restarts, unlike the
+    in-process TTLCaches: an analysis costs seconds and API quota.
+
+    The cache is best-effort. A failed read is treated as a miss and a
+    failed write is logged, so an analysis never fails because of it.
+    """
+
+    def __init__(self, supabase_client: Optional[Client] = None):
+        self._supabase = supabase_client
+
+    @property
+    def supabase(self) -> Client:
+        if self._supabase is None:
+            self._supabase = get_supabase()
+        return self._supabase
+
+    def get(self, input_hash: str) -> Optional[Dict[str, Any]]:
+        """The cached analysis for input_hash, or None if absent or expired."""
+        try:
+            response = (
+                self.supabase.table(TABLE)
+                .select("result")
+                .eq("input_hash", input_hash)
+                .gt("expires_at", datetime.now(timezone.utc).isoformat())
+                .execute()
+            )
+        except Exception as e:
+            logger.error("Analysis cache read failed for %s: %s", input_hash[:12], e)
+            return None
+        if not response.data:
+            return None
+        return response.data[0]["result"]
+
+    def put(
+        self,
+        input_hash: str,
+        schedule_id: str,
+        result: Dict[str, Any],
+        ttl_seconds: int = settings.AI_ANALYSIS_CACHE_TTL_SECONDS,
+    ) -> None:
+        """Store an analysis, replacing (and re-timing) any existing entry."""
+        now = datetime.now(timezone.utc)
+        row = {
+            "input_hash": input_hash,
+            "schedule_id": str(schedule_id),
+            "model": MODEL,
+            "prompt_version": ANALYSIS_PROMPT_VERSION,
+            "result": result,
+            "created_at": now.isoformat(),
+            "expires_at": (now + timedelta(seconds=ttl_seconds)).isoformat(),
+        }
+        try:
+            self.supabase.table(TABLE).upsert(row, on_conflict="input_hash").execute()
+        except Exception as e:
+            logger.error("Analysis cache write failed for schedule_id=%s: %s", schedule_id, e)
+
+
+analysis_cache_service = AnalysisCacheService()
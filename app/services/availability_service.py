@@ -7,11 +7,16 @@ from uuid import UUID
 from supabase import Client
 
 from ..core.db import get_supabase
+from .change_log_service import change_log_service
 from .employee_service import EmployeeService, EmployeeNotFoundError
 
 logger = logging.getLogger(__name__)
 
 TABLE = "employee_availability"
+AVAILABILITY_COLUMNS = (
+    "id, employee_id, restaurant_id, day_of_week, start_time, end_time, "
+    "created_at, updated_at"
+)
 
 
 class AvailabilityConflictError(Exception):
@@ -61,7 +66,7 @@ class AvailabilityService:
         logger.debug("get_availability employee_id=%s", employee_id)
         response = (
             self.supabase.table(TABLE)
-            .select("*")
+            .select(AVAILABILITY_COLUMNS)
             .eq("employee_id", str(employee_id))
             .order("day_of_week")
             .order("start_time")
@@ -97,7 +102,9 @@ class AvailabilityService:
             ValueError: If end_time <= start_time
             AvailabilityConflictError: If identical window already exists
         """
-        employee = self.employee_service.get_employee_by_id(employee_id)
+        employee = self.employee_service.get_employee_by_id(
+            employee_id, columns="id, restaurant_id"
+        )
         if not employee:
             raise EmployeeNotFoundError(employee_id)
 
@@ -135,6 +142,7 @@ class AvailabilityService:
 
         created = response.data[0]
         logger.info("Availability created id=%s", created.get("id"))
+        change_log_service.record("availability", "created", [created])
         return created
 
     def delete_availability(
@@ -158,7 +166,7 @@ class AvailabilityService:
         """
         response = (
             self.supabase.table(TABLE)
-            .select("*")
+            .select(AVAILABILITY_COLUMNS)
             .eq("id", str(availability_id))
             .eq("employee_id", str(employee_id))
             .execute()
@@ -172,6 +180,7 @@ class AvailabilityService:
         self.supabase.table(TABLE).delete().eq("id", str(availability_id)).execute()
 
         logger.info("Availability deleted id=%s", availability_id)
+        change_log_service.record("availability", "deleted", [existing])
         return existing
 
 
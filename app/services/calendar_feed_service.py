@@ -0,0 +1,197 @@
+import logging
+import secrets
+
+from datetime import date, datetime, time, timedelta, timezone
+from typing import Any, Dict, Optional
+from uuid import UUID
+
+from supabase import Client
+
+from ..core.cache import TTLCache
+from ..core.db import get_supabase
+from ..core.etags import make_etag
+from ..core.ics import iter_calendar, local_datetime, utc_datetime
+from .employee_service import EmployeeNotFoundError
+from .schedule_service import ScheduleService
+from .shifts_service import ShiftsService
+
+logger = logging.getLogger(__name__)
+
+FEED_PRODID = "-//Prep//Employee Shift Feed//EN"
+# Rolling window served by every feed, relative to today
+FEED_PAST_WEEKS = 2
+FEED_FUTURE_WEEKS = 8
+# Hint to calendar apps (REFRESH-INTERVAL / X-PUBLISHED-TTL)
+FEED_REFRESH_INTERVAL = "PT1H"
+
+# (employee_id, shift_version, window_start) -> rendered feed. The key
+# changes whenever shifts or the employee's name or role do; the TTL bounds memory
+# and how long a restaurant rename takes to show up.
+FEED_CACHE_SIZE = 5000
+FEED_CACHE_TTL_SECONDS = 24 * 3600
+
+# shift_version and shifts_changed_at are maintained by triggers
+# (migrations/0008).
+FEED_EMPLOYEE_COLUMNS = "id, name, role, restaurant_id, shift_version, shifts_changed_at"
+FEED_SHIFT_COLUMNS = "id, shift_date, start_time, end_time"
+
+
+class CalendarFeedService:
+    """
+    Per-employee subscribable .ics feeds: a rolling window of one
+    employee's shifts (FEED_PAST_WEEKS back, FEED_FUTURE_WEEKS ahead),
+    fetched by calendar apps with a secret feed token instead of a login.
+
+    Rendered feeds are cached per (employee, shift_version, window start),
+    so a poll costs one indexed lookup of the token unless the employee's
+    shifts changed or the window rolled over to a new day.
+    """
+
+    def __init__(self, supabase_client: Optional[Client] = None, cache: Optional[TTLCache] = None):
+        self._supabase = supabase_client
+        self.table_name = "employees"
+        self._cache = cache or TTLCache(
+            max_size=FEED_CACHE_SIZE, ttl_seconds=FEED_CACHE_TTL_SECONDS
+        )
+
+    @property
+    def supabase(self) -> Client:
+        if self._supabase is None:
+            self._supabase = get_supabase()
+        return self._supabase
+
+    # === TOKENS ===
+
+    def create_feed_token(self, employee_id: UUID) -> str:
+        """
+        Create (or rotate) an employee's feed token. Rotating invalidates
+        every existing subscription to the old URL.
+
+        Raises:
+            EmployeeNotFoundError: If the employee doesn't exist
+        """
+        token = secrets.token_urlsafe(32)
+        response = (
+            self.supabase.table(self.table_name)
+            .update({"feed_token": token})
+            .eq("id", str(employee_id))
+            .execute()
+        )
+        if not response.data:
+            raise EmployeeNotFoundError(employee_id)
+        logger.info("Calendar feed token issued for employee id=%s", employee_id)
+        return token
+
+    def revoke_feed_token(self, employee_id: UUID) -> None:
+        """
+        Disable an employee's feed.
+
+        Raises:
+            EmployeeNotFoundError: If the employee doesn't exist
+        """
+        response = (
+            self.supabase.table(self.table_name)
+            .update({"feed_token": None})
+            .eq("id", str(employee_id))
+            .execute()
+        )
+        if not response.data:
+            raise EmployeeNotFoundError(employee_id)
+        logger.info("Calendar feed token revoked for employee id=%s", employee_id)
+
+    # === FEED ===
+
+    def get_feed(self, token: str, today: Optional[date] = None) -> Optional[Dict[str, Any]]:
+        """
+        Rendered feed for a token.
+
+        Args:
+            token: Feed token from the subscription URL
+            today: Anchor for the rolling window (defaults to today)
+
+        Returns:
+            {"body": bytes, "etag": str, "last_modified": datetime (UTC)}, or
+            None if the token is unknown or the employee is inactive
+        """
+        if not token:
+            return None
+        response = (
+            self.supabase.table(self.table_name)
+            .select(FEED_EMPLOYEE_COLUMNS)
+            .eq("feed_token", token)
+            .eq("is_active", True)
+            .execute()
+        )
+        if not response.data:
+            logger.info("Calendar feed token not found or employee inactive")
+            return None
+        employee = response.data[0]
+
+        today = today or date.today()
+        window_start = today - timedelta(weeks=FEED_PAST_WEEKS)
+        key = (employee["id"], employee.get("shift_version"), window_start)
+        feed = self._cache.get(key)
+        if feed is None:
+            feed = self._render(employee, window_start, today + timedelta(weeks=FEED_FUTURE_WEEKS))
+            self._cache.set(key, feed)
+
+        # The window moves daily even when no shift changes
+        rolled_at = datetime.combine(today, time.min, tzinfo=timezone.utc)
+        return {**feed, "last_modified": max(feed["last_modified"], rolled_at)}
+
+    def _render(self, employee: Dict[str, Any], start: date, end: date) -> Dict[str, Any]:
+        shifts = ShiftsService(self.supabase).get_employee_shifts(
+            employee["id"], start, end, columns=FEED_SHIFT_COLUMNS
+        )
+        restaurant_name = ScheduleService(self.supabase).get_restaurant_name(
+            employee.get("restaurant_id")
+        )
+
+        dtstamp = utc_datetime(datetime.utcnow())
+        summary = f"Shift - {employee.get('role') or 'Unknown'}"
+        events = (
+            {
+                "uid": f"{shift['id']}@prep-app",
+                "dtstamp": dtstamp,
+                "dtstart": local_datetime(shift["shift_date"], shift["start_time"]),
+                "dtend": local_datetime(shift["shift_date"], shift["end_time"]),
+                "summary": summary,
+                "description": restaurant_name,
+            }
+            for shift in shifts
+        )
+        body = "".join(
+            iter_calendar(
+                events,
+                prodid=FEED_PRODID,
+                calendar_properties={
+                    "X-WR-CALNAME": f"{employee.get('name', 'My')} shifts - {restaurant_name}",
+                    "REFRESH-INTERVAL;VALUE=DURATION": FEED_REFRESH_INTERVAL,
+                    "X-PUBLISHED-TTL": FEED_REFRESH_INTERVAL,
+                },
+            )
+        ).encode("utf-8")
+
+        logger.info(
+            "Calendar feed rendered for employee id=%s: %d shifts %s..%s",
+            employee["id"],
+            len(shifts),
+            start,
+            end,
+        )
+        return {
+            "body": body,
+            "etag": make_etag(employee["id"], employee.get("shift_version"), start.isoformat()),
+            "last_modified": _parse_timestamp(employee.get("shifts_changed_at")),
+        }
+
+
+def _parse_timestamp(raw: Optional[str]) -> datetime:
+    """Parse a timestamptz string as UTC (epoch if missing)."""
+    if not raw:
+        return datetime(1970, 1, 1, tzinfo=timezone.utc)
+    parsed = datetime.fromisoformat(raw.replace("Z", "+00:00"))
+    return parsed if parsed.tzinfo else parsed.replace(tzinfo=timezone.utc)
+
+
+calendar_feed_service = CalendarFeedService()
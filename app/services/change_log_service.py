@@ -0,0 +1,192 @@
+import logging
+
+from collections import defaultdict
+from datetime import datetime, timedelta, timezone
+from typing import Any, Dict, Iterable, List, Optional
+
+from supabase import Client
+
+from ..core.cache import TTLCache
+from ..core.db import get_supabase
+from ..core.pagination import InvalidCursorError, decode_cursor, encode_cursor
+
+logger = logging.getLogger(__name__)
+
+TABLE = "change_log"
+CHANGE_COLUMNS = "id, entity, entity_id, op, data, changed_at"
+
+# Default and maximum number of entries per feed page.
+CHANGE_FEED_PAGE_SIZE = 500
+
+# Entries younger than this are held back from the feed. change_log ids come
+# from a sequence, so a write that took its id first can commit after a
+# later one; without the delay a client could advance its cursor past an
+# entry that wasn't visible yet and never see it.
+CHANGE_FEED_SETTLE_SECONDS = 2
+
+# A schedule never moves between restaurants, so this mapping never goes
+# stale; the TTL only bounds memory for schedules nobody edits any more.
+_SCHEDULE_RESTAURANT_TTL_SECONDS = 3600
+
+
+class ChangeLogService:
+    """
+    Append-only log of writes (migrations/0007) and the delta sync feed
+    read from it.
+
+    Writers call record() / record_shifts() after a write succeeds. Logging
+    is best-effort: a failed append is logged and swallowed, because the
+    write it describes has already been committed and must not be reported
+    as failed.
+    """
+
+    def __init__(self, supabase_client: Optional[Client] = None):
+        self._supabase = supabase_client
+        self._schedule_restaurants = TTLCache(
+            max_size=10_000, ttl_seconds=_SCHEDULE_RESTAURANT_TTL_SECONDS
+        )
+
+    @property
+    def supabase(self) -> Client:
+        if self._supabase is None:
+            self._supabase = get_supabase()
+        return self._supabase
+
+    # === WRITE ===
+
+    def record(
+        self,
+        entity: str,
+        op: str,
+        rows: Iterable[Dict[str, Any]],
+        restaurant_id: Optional[str] = None,
+    ) -> None:
+        """
+        Append one entry per row. Each row's own restaurant_id is used unless
+        restaurant_id is given; deletions store only the id (a tombstone).
+        """
+        entries = []
+        for row in rows:
+            owner = restaurant_id or row.get("restaurant_id")
+            if not owner or not row.get("id"):
+                logger.warning("change_log: skipping %s %s without id/restaurant", entity, op)
+                continue
+            entries.append(
+                {
+                    "restaurant_id": str(owner),
+                    "entity": entity,
+                    "entity_id": str(row["id"]),
+                    "op": op,
+                    "data": {"id": str(row["id"])} if op == "deleted" else row,
+                }
+            )
+        if not entries:
+            return
+        try:
+            self.supabase.table(TABLE).insert(entries).execute()
+        except Exception as e:
+            logger.exception("change_log append failed (%s %s x%d): %s", entity, op, len(entries), e)
+
+    def record_shifts(self, op: str, rows: Iterable[Dict[str, Any]]) -> None:
+        """Like record() for shift rows, which carry schedule_id rather than
+        restaurant_id; the owning restaurant is looked up (and cached)."""
+        by_schedule: Dict[str, List[Dict[str, Any]]] = defaultdict(list)
+        for row in rows:
+            if row.get("schedule_id"):
+                by_schedule[str(row["schedule_id"])].append(row)
+        if not by_schedule:
+            return
+        try:
+            restaurants = self.get_schedule_restaurants(by_schedule.keys())
+        except Exception as e:
+            logger.exception("change_log: schedule lookup failed: %s", e)
+            return
+        for schedule_id, shift_rows in by_schedule.items():
+            restaurant_id = restaurants.get(schedule_id)
+            if restaurant_id:
+                self.record("shift", op, shift_rows, restaurant_id=restaurant_id)
+
+    def get_schedule_restaurants(self, schedule_ids: Iterable[str]) -> Dict[str, str]:
+        """Map schedule ids to restaurant ids, querying only uncached ones
+        (in a single in_ query)."""
+        result, missing = {}, []
+        for schedule_id in schedule_ids:
+            cached = self._schedule_restaurants.get(schedule_id)
+            if cached is None:
+                missing.append(schedule_id)
+            else:
+                result[schedule_id] = cached
+        if missing:
+            response = (
+                self.supabase.table("schedules")
+                .select("id, restaurant_id")
+                .in_("id", missing)
+                .execute()
+            )
+            for row in response.data:
+                schedule_id, restaurant_id = str(row["id"]), str(row["restaurant_id"])
+                self._schedule_restaurants.set(schedule_id, restaurant_id)
+                result[schedule_id] = restaurant_id
+        return result
+
+    # === READ ===
+
+    def get_changes(
+        self,
+        restaurant_id,
+        since: Optional[str] = None,
+        limit: int = CHANGE_FEED_PAGE_SIZE,
+    ) -> Dict[str, Any]:
+        """
+        Entries for a restaurant after the `since` cursor, oldest first.
+
+        Without `since` no entries are returned, only a cursor for the
+        current end of the log: clients do one full fetch of the resources
+        they need, then sync from that cursor.
+
+        Args:
+            restaurant_id: Restaurant whose changes to return
+            since: Cursor from a previous call (opaque)
+            limit: Max entries to return
+
+        Returns:
+            {"changes": [...], "cursor": str, "has_more": bool}; pass cursor
+            back as `since` on the next call (it is unchanged if there was
+            nothing new).
+
+        Raises:
+            InvalidCursorError: If since can't be decoded
+        """
+        settled = (
+            datetime.now(timezone.utc) - timedelta(seconds=CHANGE_FEED_SETTLE_SECONDS)
+        ).isoformat()
+        query = (
+            self.supabase.table(TABLE)
+            .select(CHANGE_COLUMNS)
+            .eq("restaurant_id", str(restaurant_id))
+            .lt("changed_at", settled)
+        )
+
+        if since is None:
+            response = query.order("id", desc=True).limit(1).execute()
+            last_id = response.data[0]["id"] if response.data else 0
+            return {"changes": [], "cursor": encode_cursor([last_id]), "has_more": False}
+
+        (last_id,) = decode_cursor(since, 1)
+        if not isinstance(last_id, int):
+            raise InvalidCursorError(since)
+        response = query.gt("id", last_id).order("id").limit(limit + 1).execute()
+        changes = response.data[:limit]
+        if changes:
+            last_id = changes[-1]["id"]
+        logger.info(
+            "Change feed restaurant_id=%s: %d changes after cursor", restaurant_id, len(changes)
+        )
+        return {
+            "changes": changes,
+            "cursor": encode_cursor([last_id]),
+            "has_more": len(response.data) > limit,
+        }
+
+
+change_log_service = ChangeLogService()
@@ -0,0 +1,282 @@
+import logging
+from typing import Any, Dict, List, Optional, Tuple
+from uuid import UUID
+
+from ..core.import_utils import iter_mapped_rows
+from .employee_service import (
+    EMPLOYEE_COLUMNS,
+    EmployeeNotFoundError,
+    EmployeeService,
+    validate_employee_fields,
+)
+
+logger = logging.getLogger(__name__)
+
+# Rows per multi-row INSERT/upsert. Keeps each PostgREST request body small
+# and means one bad row (e.g. a constraint violation) only fails its own
+# chunk rather than the whole import.
+BULK_CHUNK_SIZE = 100
+
+# Hard cap per request — a location's full roster fits comfortably; anything
+# bigger is almost certainly the wrong file.
+MAX_BULK_ROWS = 2000
+
+# Best-guess header -> field mapping for roster spreadsheets, matched the same
+# way as template import (see guess_column_mapping). "id" is exact-only so a
+# "Restaurant ID" column isn't mistaken for the employee's own ID.
+EMPLOYEE_FIELD_SYNONYMS: Dict[str, List[str]] = {
+    "id": ["id", "employeeid", "staffid", "uuid"],
+    "name": ["name", "employeename", "staffname", "fullname"],
+    "role": ["role", "position", "job", "jobtitle", "employeerole"],
+    "restaurant_id": ["restaurantid", "restaurant", "locationid", "location"],
+    "is_active": ["isactive", "active", "status", "enabled"],
+    "salary": ["salary", "wage", "pay", "hourlyrate", "rate"],
+    "max_hours_per_week": ["maxhoursperweek", "maxhours", "maxweeklyhours", "hourslimit"],
+}
+
+# Columns written on create/update. Every row in a multi-row write carries
+# all of them so PostgREST sees a uniform column list.
+_WRITE_FIELDS = ("name", "role", "restaurant_id", "is_active", "salary", "max_hours_per_week")
+
+_TRUE_VALUES = {"true", "t", "yes", "y", "1", "active"}
+_FALSE_VALUES = {"false", "f", "no", "n", "0", "inactive"}
+
+
+class EmployeeImportService:
+    """Service for validating and bulk-saving many employees at once."""
+
+    def __init__(self, employee_service: Optional[EmployeeService] = None):
+        self.employee_service = employee_service or EmployeeService()
+
+    # === Parsing ===
+
+    def parse_employee_file(
+        self, file_bytes: bytes, filename: str
+    ) -> Tuple[List[Dict[str, Any]], Dict[str, str]]:
+        """
+        Parse an uploaded CSV or Excel roster into raw row dicts, using a
+        best-guess mapping from source columns to employee fields.
+
+        Blank cells become None ("not given"), so on update rows they leave
+        the stored value alone. The file is read in chunks, and every sheet
+        of a workbook is read, each with its own column mapping.
+
+        Returns:
+            (rows, column_mapping), shaped like
+            TemplateImportService.parse_template_file's output
+
+        Raises:
+            ValueError: If the file can't be parsed at all (corrupt, wrong format)
+        """
+        rows: List[Dict[str, Any]] = []
+        column_mapping: Optional[Dict[str, str]] = None
+        for _, mapping, chunk_rows in iter_mapped_rows(
+            file_bytes, filename, EMPLOYEE_FIELD_SYNONYMS, exact_only={"id"}, empty=None
+        ):
+            if column_mapping is None:
+                column_mapping = mapping
+            rows.extend(chunk_rows)
+        column_mapping = column_mapping or {}
+
+        logger.info(
+            "Parsed %d employee rows from %s, mapped columns=%s",
+            len(rows),
+            filename,
+            column_mapping,
+        )
+        return rows, column_mapping
+
+    # === Import ===
+
+    def import_employees(
+        self,
+        rows: List[Dict[str, Any]],
+        default_restaurant_id: Optional[str] = None,
+        dry_run: bool = False,
+    ) -> Dict[str, Any]:
+        """
+        Validate every row locally, then persist the valid ones in chunked
+        multi-row writes: one INSERT per chunk of new employees and one
+        upsert per chunk of updates. Existing employees referenced by update
+        rows are fetched in a single query up front.
+
+        Invalid rows are reported, not fatal — the rest of the import still
+        goes through. A chunk the database rejects fails only its own rows.
+
+        Args:
+            rows: Raw rows (from EmployeeBulkRow dicts or parse_employee_file)
+            default_restaurant_id: restaurant_id for rows that don't set one
+            dry_run: Validate only; nothing is written
+
+        Returns:
+            Dict shaped like EmployeeBulkResponse (without column_mapping)
+
+        Raises:
+            ValueError: If there are more than MAX_BULK_ROWS rows
+        """
+        if len(rows) > MAX_BULK_ROWS:
+            raise ValueError(
+                f"Too many rows: {len(rows)} (maximum is {MAX_BULK_ROWS} per import)"
+            )
+
+        results: List[Dict[str, Any]] = []
+        normalized: List[Dict[str, Any]] = []
+        for i, raw in enumerate(rows, start=1):
+            values, errors = self._normalize_row(raw)
+            results.append(
+                {
+                    "row_number": i,
+                    "action": "update" if values.get("id") else "create",
+                    "status": "error" if errors else "valid",
+                    "employee": None,
+                    "errors": errors,
+                }
+            )
+            normalized.append(values)
+
+        update_ids = [
+            v["id"] for v, r in zip(normalized, results) if v.get("id") and not r["errors"]
+        ]
+        existing = self.employee_service.get_employees_by_ids(
+            update_ids, columns=EMPLOYEE_COLUMNS
+        )
+
+        to_insert: List[Tuple[Dict[str, Any], Dict[str, Any]]] = []
+        to_update: List[Tuple[Dict[str, Any], Dict[str, Any]]] = []
+        seen_ids = set()
+        for values, result in zip(normalized, results):
+            if result["errors"]:
+                continue
+
+            employee_id = values.get("id")
+            if employee_id:
+                if employee_id in seen_ids:
+                    result["errors"].append(
+                        f"Employee {employee_id} appears more than once in this import"
+                    )
+                    continue
+                seen_ids.add(employee_id)
+                if employee_id not in existing:
+                    result["errors"].append(str(EmployeeNotFoundError(employee_id)))
+                    continue
+                record = {"id": employee_id}
+                for field in _WRITE_FIELDS:
+                    given = values.get(field)
+                    record[field] = given if given is not None else existing[employee_id].get(field)
+            else:
+                record = {field: values.get(field) for field in _WRITE_FIELDS}
+                record["restaurant_id"] = record["restaurant_id"] or default_restaurant_id
+                if record["is_active"] is None:
+                    record["is_active"] = True
+
+            result["errors"].extend(
+                validate_employee_fields(record["name"], record["role"], record["restaurant_id"])
+            )
+            if result["errors"]:
+                continue
+
+            record["name"] = record["name"].strip()
+            record["role"] = record["role"].strip()
+            (to_update if employee_id else to_insert).append((record, result))
+
+        for result in results:
+            if result["errors"]:
+                result["status"] = "error"
+
+        if not dry_run:
+            self._write_in_chunks(to_insert, self.employee_service.insert_employees, "created")
+            self._write_in_chunks(to_update, self.employee_service.upsert_employees, "updated")
+
+        summary = {
+            "created_count": sum(1 for r in results if r["status"] == "created"),
+            "updated_count": sum(1 for r in results if r["status"] == "updated"),
+            "error_count": sum(1 for r in results if r["status"] == "error"),
+            "rows": results,
+        }
+        logger.info(
+            "Employee import%s: %d rows, %d created, %d updated, %d errors",
+            " (dry run)" if dry_run else "",
+            len(results),
+            summary["created_count"],
+            summary["updated_count"],
+            summary["error_count"],
+        )
+        return summary
+
+    @staticmethod
+    def _write_in_chunks(
+        pending: List[Tuple[Dict[str, Any], Dict[str, Any]]],
+        write,
+        status: str,
+    ) -> None:
+        """Send pending (record, result) pairs to `write` BULK_CHUNK_SIZE at a time,
+        filling in each result from the rows the database returned."""
+        for start in range(0, len(pending), BULK_CHUNK_SIZE):
+            chunk = pending[start:start + BULK_CHUNK_SIZE]
+            try:
+                saved = write([record for record, _ in chunk])
+            except Exception as e:
+                logger.exception(
+                    "Bulk employee write failed for rows %d-%d: %s",
+                    chunk[0][1]["row_number"],
+                    chunk[-1][1]["row_number"],
+                    e,
+                )
+                for _, result in chunk:
+                    result["status"] = "error"
+                    result["errors"].append(f"Database write failed: {e}")
+                continue
+
+            for (_, result), employee in zip(chunk, saved):
+                result["status"] = status
+                result["employee"] = employee
+
+    @staticmethod
+    def _normalize_row(raw: Dict[str, Any]) -> Tuple[Dict[str, Any], List[str]]:
+        """
+        Coerce one raw row (typed JSON values or spreadsheet strings) into
+        field values, dropping fields that weren't given.
+
+        Returns:
+            (values, errors) — errors are type/format problems only; required
+            fields are checked after update rows are merged with stored data
+        """
+        values: Dict[str, Any] = {}
+        errors: List[str] = []
+
+        employee_id = raw.get("id")
+        if employee_id is not None and str(employee_id).strip():
+            try:
+                values["id"] = str(UUID(str(employee_id).strip()))
+            except ValueError:
+                errors.append(f"id {employee_id!r} is not a valid employee ID")
+
+        for field in ("name", "role", "restaurant_id"):
+            if raw.get(field) is not None:
+                values[field] = str(raw[field])
+
+        is_active = raw.get("is_active")
+        if isinstance(is_active, bool):
+            values["is_active"] = is_active
+        elif is_active is not None:
+            text = str(is_active).strip().lower()
+            if text in _TRUE_VALUES:
+                values["is_active"] = True
+            elif text in _FALSE_VALUES:
+                values["is_active"] = False
+            else:
+                errors.append(f"is_active {is_active!r} is not recognized (expected yes/no)")
+
+        for field in ("salary", "max_hours_per_week"):
+            value = raw.get(field)
+            if value is None:
+                continue
+            try:
+                values[field] = float(str(value).replace("$", "").replace(",", "").strip())
+            except ValueError:
+                errors.append(f"{field} {value!r} is not a number")
+
+        return values, errors
+
+
+employee_import_service = EmployeeImportService()
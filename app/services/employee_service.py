@@ -1,12 +1,52 @@
 import logging
 
 from ..core.db import get_supabase
+from .change_log_service import change_log_service
 from uuid import UUID
 from supabase import Client
-from typing import List, Optional, Dict, Any
+from typing import Iterator, List, Optional, Dict, Any
+
+from ..core.pagination import (
+    STREAM_PAGE_SIZE,
+    decode_cursor,
+    keyset_filter,
+    next_cursor,
+)
 
 logger = logging.getLogger(__name__)
 
+# Per-use-case column sets: EMPLOYEE_COLUMNS is the full API shape
+# (EmployeeModel); EMPLOYEE_ROSTER_COLUMNS is what scheduling/validation
+# code actually reads.
+EMPLOYEE_COLUMNS = (
+    "id, name, role, restaurant_id, is_active, salary, max_hours_per_week, "
+    "email, created_at, deleted_at"
+)
+EMPLOYEE_ROSTER_COLUMNS = "id, name, role, restaurant_id, is_active, max_hours_per_week"
+
+# Keyset ordering for paginated employee lists: (column, descending).
+EMPLOYEE_SORT_KEYS = [("name", False), ("id", False)]
+
+
+def validate_employee_fields(
+    name: Optional[str], role: Optional[str], restaurant_id: Optional[str]
+) -> List[str]:
+    """
+    Check the fields every employee row must have. Shared by create_employee
+    and bulk import so single and bulk creates reject exactly the same input.
+
+    Returns:
+        Error messages, empty if the fields are valid
+    """
+    errors = []
+    if not name or not name.strip():
+        errors.append("Employee name cannot be empty")
+    if not role or not role.strip():
+        errors.append("Employee role cannot be empty")
+    if not restaurant_id:
+        errors.append("Restaurant ID is required")
+    return errors
+
 
 class EmployeeNotFoundError(Exception):
     """
@@ -50,41 +90,85 @@ class EmployeeService:
         return self._supabase
 
     def get_employees(
-        self, restaurant_id: Optional[str] = None, is_active: Optional[bool] = None
+        self,
+        restaurant_id: Optional[str] = None,
+        is_active: Optional[bool] = None,
+        columns: str = EMPLOYEE_COLUMNS,
+        limit: Optional[int] = None,
+        cursor: Optional[str] = None,
     ) -> List[Dict[str, Any]]:
         """
-        Get all employees with optional filtering.
+        Get employees with optional filtering and keyset pagination.
 
         Args:
             restaurant_id: Filter by restaurant (for future multi-tenant support)
             is_active: Filter by active status (True/False/None for all)
+            columns: Column set to select (defaults to EMPLOYEE_COLUMNS);
+                     must include name and id when paginating
+            limit: Max rows to return (None = unbounded)
+            cursor: Opaque cursor from a previous page (see next_cursor)
 
         Returns:
-            List of employee dictionaries
+            List of employee dictionaries, ordered by name then id
+
+        Raises:
+            InvalidCursorError: If cursor can't be decoded
         """
         logger.debug(
-            "get_employees called: restaurant_id=%s is_active=%s",
+            "get_employees called: restaurant_id=%s is_active=%s limit=%s cursor=%s",
             restaurant_id,
             is_active,
+            limit,
+            bool(cursor),
         )
-        query = self.supabase.table(self.table_name).select("*")
+        query = self.supabase.table(self.table_name).select(columns)
 
         if restaurant_id is not None:
             query = query.eq("restaurant_id", restaurant_id)
         if is_active is not None:
             query = query.eq("is_active", is_active)
+        if cursor:
+            last = decode_cursor(cursor, len(EMPLOYEE_SORT_KEYS))
+            query = query.or_(keyset_filter(EMPLOYEE_SORT_KEYS, last))
 
-        query = query.order("name")
+        query = query.order("name").order("id")
+        if limit is not None:
+            query = query.limit(limit)
         response = query.execute()
         logger.info("Returning %d employees", len(response.data))
         return response.data
 
-    def get_employee_by_id(self, employee_id: UUID) -> Optional[Dict[str, Any]]:
+    def iter_employees(
+        self,
+        restaurant_id: Optional[str] = None,
+        is_active: Optional[bool] = None,
+        page_size: int = STREAM_PAGE_SIZE,
+    ) -> Iterator[Dict[str, Any]]:
+        """
+        Yield every matching employee, fetching page_size rows per round trip.
+
+        Backs the NDJSON streaming mode of GET /employees so bulk consumers
+        never hold the whole result set in memory.
+        """
+        cursor = None
+        while True:
+            page = self.get_employees(
+                restaurant_id, is_active, limit=page_size, cursor=cursor
+            )
+            yield from page
+            cursor = next_cursor(page, page_size, EMPLOYEE_SORT_KEYS)
+            if cursor is None:
+                return
+
+    def get_employee_by_id(
+        self, employee_id: UUID, columns: str = EMPLOYEE_COLUMNS
+    ) -> Optional[Dict[str, Any]]:
         """
         Get a single employee by ID.
 
         Args:
             employee_id: UUID of the employee
+            columns: Column set to select (defaults to EMPLOYEE_COLUMNS)
 
         Returns:
             Employee dictionary or None if not found
@@ -92,7 +176,7 @@ class EmployeeService:
         logger.debug("Looking up employee id=%s", employee_id)
         response = (
             self.supabase.table(self.table_name)
-            .select("*")
+            .select(columns)
             .eq("id", str(employee_id))
             .execute()
         )
@@ -102,6 +186,64 @@ class EmployeeService:
         logger.warning("Employee not found id=%s", employee_id)
         return None
 
+    def get_employees_by_ids(
+        self, employee_ids: List[str], columns: str = EMPLOYEE_COLUMNS
+    ) -> Dict[str, Dict[str, Any]]:
+        """
+        Fetch many employees in one round trip.
+
+        Args:
+            employee_ids: Employee UUIDs (as strings)
+            columns: Column set to select (must include id)
+
+        Returns:
+            employee_id -> employee dictionary, only for IDs that exist
+        """
+        if not employee_ids:
+            return {}
+        response = (
+            self.supabase.table(self.table_name)
+            .select(columns)
+            .in_("id", list(employee_ids))
+            .execute()
+        )
+        return {row["id"]: row for row in response.data}
+
+    def insert_employees(self, rows: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """
+        Insert many already-validated employee rows in a single multi-row
+        INSERT. Every row must carry the same keys (PostgREST requirement).
+
+        Returns:
+            Created employee dictionaries, in input order
+        """
+        if not rows:
+            return []
+        logger.info("Bulk inserting %d employees", len(rows))
+        response = self.supabase.table(self.table_name).insert(rows).execute()
+        change_log_service.record("employee", "created", response.data)
+        return response.data
+
+    def upsert_employees(self, rows: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """
+        Update many existing employees in a single multi-row upsert keyed on
+        id. Rows must be complete (merged with the stored record), since an
+        upsert writes every column it's given.
+
+        Returns:
+            Updated employee dictionaries
+        """
+        if not rows:
+            return []
+        logger.info("Bulk updating %d employees", len(rows))
+        response = (
+            self.supabase.table(self.table_name)
+            .upsert(rows, on_conflict="id")
+            .execute()
+        )
+        change_log_service.record("employee", "updated", response.data)
+        return response.data
+
     def create_employee(
         self,
         name: str,
@@ -127,14 +269,9 @@ class EmployeeService:
             ValueError: If required fields are invalid
         """
         # Input validation
-        if not name or not name.strip():
-            raise ValueError("Employee name cannot be empty")
-
-        if not role or not role.strip():
-            raise ValueError("Employee role cannot be empty")
-
-        if not restaurant_id:
-            raise ValueError("Restaurant ID is required")
+        errors = validate_employee_fields(name, role, restaurant_id)
+        if errors:
+            raise ValueError(errors[0])
 
         logger.info(
             "Creating employee name=%s role=%s restaurant_id=%s",
@@ -158,6 +295,7 @@ class EmployeeService:
         response = self.supabase.table(self.table_name).insert(employee_data).execute()
         created = response.data[0]
         logger.info("Employee created id=%s", created.get("id"))
+        change_log_service.record("employee", "created", [created])
         return created
 
     def update_employee(
@@ -224,6 +362,8 @@ class EmployeeService:
 
         result = response.data[0] if response.data else existing
         logger.info("Employee %s updated", employee_id)
+        if response.data:
+            change_log_service.record("employee", "updated", response.data)
         return result
 
     def delete_employee(self, employee_id: UUID) -> Dict[str, Any]:
@@ -277,6 +417,8 @@ class EmployeeService:
             .execute()
         )
         logger.info("Employee deleted id=%s", employee_id)
+        # Clients drop the employee's availability windows along with it
+        change_log_service.record("employee", "deleted", [existing])
         return response.data[0] if response.data else existing
 
     def deactivate_employee(self, employee_id: UUID) -> Dict[str, Any]:
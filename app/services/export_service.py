@@ -1,21 +1,52 @@
+import csv
+import io
 import logging
+import tempfile
 
-from datetime import datetime
-from typing import Optional
+from datetime import date, datetime
+from typing import Any, BinaryIO, Dict, Iterator, List, Optional
 
-from icalendar import Calendar, Event
+from openpyxl import Workbook
+from openpyxl.cell import WriteOnlyCell
+from openpyxl.styles import Font
 from supabase import Client
 
+from ..core.ics import iter_calendar, local_datetime, utc_datetime
 from .schedule_service import ScheduleService
+from .shifts_service import ShiftsService
 
 logger = logging.getLogger(__name__)
 
+ICAL_PRODID = "-//Prep//Schedule Export//EN"
+
+# Spreadsheet exports (CSV / XLSX), one row per shift
+EXPORT_HEADER = [
+    "Week Start",
+    "Date",
+    "Day",
+    "Employee",
+    "Employee ID",
+    "Role",
+    "Start",
+    "End",
+    "Hours",
+    "Notes",
+]
+EXPORT_SHIFT_COLUMNS = (
+    "id, schedule_id, employee_id, shift_date, start_time, end_time, notes, "
+    "employee:employees(name, role)"
+)
+MAX_EXPORT_DAYS = 366
+# Approximate bytes per chunk yielded to StreamingResponse
+EXPORT_CHUNK_SIZE = 64 * 1024
+
 
 class ExportService:
     """Service for generating calendar/file exports of schedules."""
 
     def __init__(self, supabase_client: Optional[Client] = None):
         self.schedule_service = ScheduleService(supabase_client)
+        self.shifts_service = ShiftsService(supabase_client)
 
     def generate_ical(self, schedule_id) -> str:
         """
@@ -27,6 +58,18 @@ class ExportService:
         Returns:
             Raw .ics file content as a string
 
+        Raises:
+            ScheduleNotFoundError: If the schedule doesn't exist
+        """
+        return "".join(self.iter_ical(schedule_id))
+
+    def iter_ical(self, schedule_id) -> Iterator[str]:
+        """
+        Stream a schedule's .ics document in chunks (for StreamingResponse).
+
+        The schedule is loaded before this returns, so ScheduleNotFoundError
+        is raised here rather than halfway through a response.
+
         Raises:
             ScheduleNotFoundError: If the schedule doesn't exist
         """
@@ -40,32 +83,144 @@ class ExportService:
             schedule_id,
             schedule["total_shifts"],
         )
+        dtstamp = utc_datetime(datetime.utcnow())
+        events = (
+            shift_to_event(shift, restaurant_name, dtstamp) for shift in schedule["shifts"]
+        )
+        return iter_calendar(events, prodid=ICAL_PRODID)
 
-        cal = Calendar()
-        cal.add("prodid", "-//Prep//Schedule Export//EN")
-        cal.add("version", "2.0")
+    def iter_csv(self, restaurant_id, start_date: date, end_date: date) -> Iterator[str]:
+        """
+        Stream a CSV of every shift in the schedules whose week falls in
+        [start_date, end_date]. Rows are written as shift pages arrive, so
+        memory use doesn't grow with the range.
 
-        dtstamp = datetime.utcnow()
-        for shift in schedule["shifts"]:
-            shift_date = datetime.strptime(shift["shift_date"], "%Y-%m-%d").date()
-            start_time = datetime.strptime(shift["start_time"], "%H:%M:%S").time()
-            end_time = datetime.strptime(shift["end_time"], "%H:%M:%S").time()
+        Raises:
+            ValueError: If the range is reversed or longer than MAX_EXPORT_DAYS
+        """
+        rows = self._iter_export_rows(restaurant_id, start_date, end_date)
+
+        def generate() -> Iterator[str]:
+            buffer = io.StringIO()
+            writer = csv.writer(buffer)
+            writer.writerow(EXPORT_HEADER)
+            for row in rows:
+                writer.writerow(row)
+                if buffer.tell() >= EXPORT_CHUNK_SIZE:
+                    yield buffer.getvalue()
+                    buffer.seek(0)
+                    buffer.truncate()
+            yield buffer.getvalue()
+
+        return generate()
+
+    def iter_xlsx(self, restaurant_id, start_date: date, end_date: date) -> Iterator[bytes]:
+        """
+        Build an XLSX workbook of the same rows as iter_csv and stream it.
 
-            employee = shift.get("employee") or {}
-            role = employee.get("role", "Unknown")
+        openpyxl's write-only mode writes rows straight to a temporary file,
+        so memory stays flat regardless of range size. The workbook is
+        complete before this returns (errors surface before the response
+        starts); the returned iterator reads the file back in chunks and
+        deletes it when done.
 
-            event = Event()
-            event.add("summary", f"Shift - {role}")
-            event.add("dtstart", datetime.combine(shift_date, start_time))
-            event.add("dtend", datetime.combine(shift_date, end_time))
-            event.add("dtstamp", dtstamp)
-            event.add("uid", f"{shift['id']}@prep-app")
-            event.add("description", restaurant_name)
+        Raises:
+            ValueError: If the range is reversed or longer than MAX_EXPORT_DAYS
+        """
+        rows = self._iter_export_rows(restaurant_id, start_date, end_date)
+
+        workbook = Workbook(write_only=True)
+        sheet = workbook.create_sheet("Shifts")
+        bold = Font(bold=True)
+        header = []
+        for title in EXPORT_HEADER:
+            cell = WriteOnlyCell(sheet, value=title)
+            cell.font = bold
+            header.append(cell)
+        sheet.append(header)
+        for row in rows:
+            sheet.append(row)
+
+        output = tempfile.TemporaryFile()
+        try:
+            workbook.save(output)
+        except Exception:
+            output.close()
+            raise
+        output.seek(0)
+        return _iter_file(output)
+
+    def _iter_export_rows(
+        self, restaurant_id, start_date: date, end_date: date
+    ) -> Iterator[List[Any]]:
+        """Validate the range and return a lazy iterator of export rows."""
+        if end_date < start_date:
+            raise ValueError("'to' date must be on or after 'from' date")
+        if (end_date - start_date).days >= MAX_EXPORT_DAYS:
+            raise ValueError(f"Export range cannot exceed {MAX_EXPORT_DAYS} days")
+
+        # Whole weeks: a range starting mid-week includes that week's schedule
+        week_starts = {
+            str(schedule["id"]): schedule["week_start"]
+            for schedule in self.schedule_service.iter_schedules(
+                restaurant_id, self.schedule_service.get_week_start(start_date), end_date
+            )
+        }
+        logger.info(
+            "Exporting shifts restaurant_id=%s %s..%s from %d schedules",
+            restaurant_id,
+            start_date,
+            end_date,
+            len(week_starts),
+        )
+        shifts = self.shifts_service.iter_schedule_shifts(
+            list(week_starts), columns=EXPORT_SHIFT_COLUMNS
+        )
+        return (
+            shift_to_row(shift, week_starts.get(str(shift["schedule_id"])))
+            for shift in shifts
+        )
 
-            cal.add_component(event)
 
-        logger.info("iCal export complete for schedule id=%s", schedule_id)
-        return cal.to_ical().decode("utf-8")
+def shift_to_event(shift: Dict[str, Any], restaurant_name: str, dtstamp: str) -> Dict[str, str]:
+    """VEVENT properties for a shift row (see app.core.ics.iter_calendar)."""
+    employee = shift.get("employee") or {}
+    return {
+        "uid": f"{shift['id']}@prep-app",
+        "dtstamp": dtstamp,
+        "dtstart": local_datetime(shift["shift_date"], shift["start_time"]),
+        "dtend": local_datetime(shift["shift_date"], shift["end_time"]),
+        "summary": f"Shift - {employee.get('role', 'Unknown')}",
+        "description": restaurant_name,
+    }
+
+
+def _iter_file(file: BinaryIO, chunk_size: int = EXPORT_CHUNK_SIZE) -> Iterator[bytes]:
+    """Yield a file's contents in chunks, closing (and so deleting) it after."""
+    try:
+        while chunk := file.read(chunk_size):
+            yield chunk
+    finally:
+        file.close()
+
+
+def shift_to_row(shift: Dict[str, Any], week_start: Optional[str]) -> List[Any]:
+    """Spreadsheet row (EXPORT_HEADER order) for a shift row."""
+    employee = shift.get("employee") or {}
+    shift_date = date.fromisoformat(shift["shift_date"])
+    hours = ScheduleService.calculate_duration(shift["start_time"], shift["end_time"])
+    return [
+        week_start,
+        shift["shift_date"],
+        shift_date.strftime("%A"),
+        employee.get("name", "Unknown"),
+        shift.get("employee_id"),
+        employee.get("role", "Unknown"),
+        shift["start_time"][:5],
+        shift["end_time"][:5],
+        round(hours, 2),
+        shift.get("notes") or "",
+    ]
 
 
 export_service = ExportService()
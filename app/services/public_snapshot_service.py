@@ -0,0 +1,155 @@
+import hashlib
+import logging
+import threading
+from datetime import datetime
+from typing import Any, Dict, Optional
+
+from ..core.cache import TTLCache
+from ..core.config import settings
+from ..core.etags import make_etag
+from ..models.schedule_model import PublicScheduleResponse
+from .schedule_service import ScheduleService, schedule_service
+
+logger = logging.getLogger(__name__)
+
+
+def _seconds_until(expires_at_raw: Optional[str]) -> float:
+    """Seconds from now until a share_expires_at timestamp (<= 0 if past)."""
+    if not expires_at_raw:
+        return 0.0
+    expires_at = datetime.fromisoformat(expires_at_raw.replace("Z", "+00:00"))
+    now = datetime.now(expires_at.tzinfo) if expires_at.tzinfo else datetime.utcnow()
+    return (expires_at - now).total_seconds()
+
+
+class PublicScheduleSnapshotService:
+    """
+    Pre-rendered, pre-serialized public schedules keyed by share token.
+
+    A snapshot is the exact response body of GET /api/v1/public/schedules/
+    {token} (JSON bytes) plus its ETag. It is built when a share link is
+    created and rebuilt whenever the schedule's shifts change (see
+    ShiftsService.notify_shifts_changed), so serving a share link is a dict
+    lookup — no queries, no Pydantic validation, no JSON encoding.
+
+    The cache is per process. A snapshot lives at most
+    PUBLIC_SNAPSHOT_TTL_SECONDS (and never past the link's expiry), which
+    bounds staleness for changes this process didn't see: writes handled by
+    another worker and employee renames.
+    """
+
+    def __init__(
+        self,
+        schedule_service: Optional[ScheduleService] = None,
+        cache: Optional[TTLCache] = None,
+    ):
+        self._schedule_service = schedule_service
+        self._snapshots = cache or TTLCache(
+            max_size=settings.PUBLIC_SNAPSHOT_CACHE_SIZE,
+            ttl_seconds=settings.PUBLIC_SNAPSHOT_TTL_SECONDS,
+        )
+        # schedule_id -> share token of its cached snapshot
+        self._tokens: Dict[str, str] = {}
+        self._lock = threading.Lock()
+
+    @property
+    def schedule_service(self) -> ScheduleService:
+        if self._schedule_service is None:
+            self._schedule_service = schedule_service
+        return self._schedule_service
+
+    def get_snapshot(self, token: str) -> Optional[Dict[str, Any]]:
+        """
+        Snapshot for a share token, building it on a cache miss.
+
+        Returns:
+            Dict with body (bytes), etag and schedule_id, or None if the
+            token doesn't resolve to an active, unexpired link.
+        """
+        snapshot = self._snapshots.get(token)
+        if snapshot is not None:
+            return snapshot
+
+        schedule = self.schedule_service.get_active_share(token=token)
+        if not schedule:
+            return None
+        return self._store(schedule)
+
+    def publish(self, schedule_id) -> Optional[Dict[str, Any]]:
+        """
+        (Re)build and cache the snapshot for a schedule's active share link.
+        Call after creating or rotating the link. Returns None (and drops any
+        cached copy) if the schedule has no active link.
+        """
+        schedule = self.schedule_service.get_active_share(schedule_id=schedule_id)
+        if not schedule:
+            self.revoke(schedule_id)
+            return None
+        return self._store(schedule)
+
+    def refresh(self, schedule_id) -> None:
+        """
+        Rebuild the snapshot for a schedule whose shifts changed — only if one
+        is cached here; uncached schedules are built lazily on first view.
+
+        Never raises: a failed rebuild drops the cached copy so the next view
+        rebuilds it, rather than failing the write that triggered it.
+        """
+        with self._lock:
+            token = self._tokens.get(str(schedule_id))
+        if token is None:
+            return
+        if token not in self._snapshots:
+            # Expired or evicted since; forget it rather than rebuild
+            with self._lock:
+                self._tokens.pop(str(schedule_id), None)
+            return
+        try:
+            self.publish(schedule_id)
+        except Exception as e:
+            logger.warning("Public snapshot refresh failed for schedule id=%s: %s", schedule_id, e)
+            self.revoke(schedule_id)
+
+    def revoke(self, schedule_id) -> None:
+        """Drop the cached snapshot for a schedule (link revoked or deleted)."""
+        with self._lock:
+            token = self._tokens.pop(str(schedule_id), None)
+        if token is not None:
+            self._snapshots.pop(token)
+            logger.info("Public snapshot evicted for schedule id=%s", schedule_id)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._tokens.clear()
+        self._snapshots.clear()
+
+    def _store(self, schedule: Dict[str, Any]) -> Dict[str, Any]:
+        payload = self.schedule_service.render_public_schedule(schedule)
+        body = PublicScheduleResponse.model_validate(payload).model_dump_json().encode()
+        schedule_id = str(schedule["id"])
+        token = schedule["share_token"]
+        snapshot = {
+            "schedule_id": schedule_id,
+            "body": body,
+            "etag": make_etag(hashlib.sha256(body).hexdigest()[:32]),
+        }
+
+        ttl = min(
+            settings.PUBLIC_SNAPSHOT_TTL_SECONDS,
+            _seconds_until(schedule.get("share_expires_at")),
+        )
+        with self._lock:
+            previous = self._tokens.get(schedule_id)
+            self._tokens[schedule_id] = token
+        if previous is not None and previous != token:
+            # Link was rotated; the old token must stop resolving immediately
+            self._snapshots.pop(previous)
+        if ttl > 0:
+            self._snapshots.set(token, snapshot, ttl_seconds=ttl)
+        logger.info(
+            "Public snapshot built for schedule id=%s (%d bytes)", schedule_id, len(body)
+        )
+        return snapshot
+
+
+public_snapshot_service = PublicScheduleSnapshotService()
@@ -6,7 +6,7 @@ from typing import List, Dict, Any, Optional, Tuple
 from uuid import UUID, uuid4
 from supabase import Client
 from ..core.db import get_supabase
-from .employee_service import EmployeeService
+from .employee_service import EmployeeService, EMPLOYEE_ROSTER_COLUMNS
 from .shifts_service import shifts_service
 from .schedule_service import ScheduleService
 from .shift_template_service import ShiftTemplateService
@@ -162,7 +162,9 @@ class ScheduleGenerator:
         else:
             schedule = self.schedule_service.create_schedule(restaurant_id, week_start)
 
-        employees = self.employee_service.get_employees(restaurant_id, is_active=True)
+        employees = self.employee_service.get_employees(
+            restaurant_id, is_active=True, columns=EMPLOYEE_ROSTER_COLUMNS
+        )
 
         if not employees:
             raise ValueError("No active employees found")
@@ -320,6 +322,7 @@ class ScheduleGenerator:
 
         if created_shifts:
             self.supabase.table("shifts").insert(created_shifts).execute()
+            self.shift_service.notify_shifts_changed(created=created_shifts)
 
         logger.info("Schedule generated: %d total shifts", len(created_shifts))
 
@@ -442,7 +445,7 @@ class ScheduleGenerator:
 
         response = (
             self.supabase.table("shifts")
-            .select("*")
+            .select("employee_id, shift_date, start_time, end_time, notes")
             .eq("schedule_id", str(schedule_id))
             .execute()
         )
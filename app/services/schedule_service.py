@@ -2,13 +2,43 @@ import logging
 import secrets
 
 from datetime import date, timedelta, datetime
-from typing import List, Optional, Dict, Any
+from typing import Iterator, List, Optional, Dict, Any
 from uuid import UUID
 from supabase import Client
 from ..core.db import get_supabase
+from .change_log_service import change_log_service
+from ..core.pagination import (
+    STREAM_PAGE_SIZE,
+    decode_cursor,
+    keyset_filter,
+    next_cursor,
+)
 
 logger = logging.getLogger(__name__)
 
+# Per-use-case column sets. Schedule and shift rows are wide (share metadata,
+# timestamps, notes) and these tables are hot, so each query selects only
+# what its caller actually reads instead of "*".
+SCHEDULE_COLUMNS = "id, restaurant_id, week_start, created_at"
+# schedules.version is bumped by triggers on every change to the schedule's
+# shifts (migrations/0004) and backs the ETag on GET /schedules/{id}.
+SCHEDULE_DETAIL_COLUMNS = SCHEDULE_COLUMNS + ", version"
+SCHEDULE_SHARE_COLUMNS = "id, share_token, share_enabled, share_expires_at"
+SCHEDULE_PUBLIC_COLUMNS = "id, restaurant_id, week_start, share_expires_at"
+SCHEDULE_SHIFT_COLUMNS = (
+    "id, employee_id, shift_date, start_time, end_time, notes, "
+    "employee:employees(id, name, role)"
+)
+# Schedules with their shifts embedded, for multi-week calendar reads
+SCHEDULE_CALENDAR_COLUMNS = f"{SCHEDULE_COLUMNS}, shifts({SCHEDULE_SHIFT_COLUMNS})"
+PUBLIC_SHIFT_COLUMNS = "shift_date, start_time, end_time, employee:employees(name, role)"
+
+# Keyset ordering for paginated schedule lists (newest week first).
+SCHEDULE_SORT_KEYS = [("week_start", True), ("id", True)]
+
+# Widest window GET /schedules/calendar will load in one request.
+MAX_CALENDAR_WEEKS = 12
+
 
 class ScheduleAlreadyExistsError(Exception):
     """
@@ -68,25 +98,34 @@ class ScheduleService:
         restaurant_id: Optional[str] = None,
         start_date: Optional[date] = None,
         end_date: Optional[date] = None,
+        limit: Optional[int] = None,
+        cursor: Optional[str] = None,
     ) -> List[Dict[str, Any]]:
         """
-        Get schedules with optional filtering
+        Get schedules with optional filtering and keyset pagination
 
         Args:
             restaurant_id: Filter by restaurant
             start_date: Get schedules starting on or after this date
+            end_date: Get schedules starting on or before this date
+            limit: Max rows to return (None = unbounded)
+            cursor: Opaque cursor from a previous page (see next_cursor)
 
         Returns:
-            List of schedule dictionaries
+            List of schedule dictionaries, newest week first
 
+        Raises:
+            InvalidCursorError: If cursor can't be decoded
         """
         logger.debug(
-            "get_schedules called: restaurant_id=%s start_date=%s end_date=%s",
+            "get_schedules called: restaurant_id=%s start_date=%s end_date=%s limit=%s cursor=%s",
             restaurant_id,
             start_date,
             end_date,
+            limit,
+            bool(cursor),
         )
-        query = self.supabase.table(self.table_name).select("*")
+        query = self.supabase.table(self.table_name).select(SCHEDULE_COLUMNS)
 
         if restaurant_id is not None:
             query = query.eq("restaurant_id", restaurant_id)
@@ -97,18 +136,48 @@ class ScheduleService:
         if end_date is not None:
             query = query.lte("week_start", end_date.isoformat())
 
-        query = query.order("week_start", desc=True)
+        if cursor:
+            last = decode_cursor(cursor, len(SCHEDULE_SORT_KEYS))
+            query = query.or_(keyset_filter(SCHEDULE_SORT_KEYS, last))
+
+        query = query.order("week_start", desc=True).order("id", desc=True)
+        if limit is not None:
+            query = query.limit(limit)
 
         response = query.execute()
         logger.info("Returning %d schedules", len(response.data))
         return response.data
 
-    def get_schedule_by_id(self, schedule_id) -> Dict[str, Any]:
+    def iter_schedules(
+        self,
+        restaurant_id: Optional[str] = None,
+        start_date: Optional[date] = None,
+        end_date: Optional[date] = None,
+        page_size: int = STREAM_PAGE_SIZE,
+    ) -> Iterator[Dict[str, Any]]:
+        """
+        Yield every matching schedule, fetching page_size rows per round trip.
+        Backs the NDJSON streaming mode of GET /schedules.
+        """
+        cursor = None
+        while True:
+            page = self.get_schedules(
+                restaurant_id, start_date, end_date, limit=page_size, cursor=cursor
+            )
+            yield from page
+            cursor = next_cursor(page, page_size, SCHEDULE_SORT_KEYS)
+            if cursor is None:
+                return
+
+    def get_schedule_by_id(
+        self, schedule_id, columns: str = SCHEDULE_COLUMNS
+    ) -> Dict[str, Any]:
         """
         Get a specific schedule based on id
 
         Args:
             schedule_id: Retrieve specific schedule
+            columns: Column set to select (defaults to SCHEDULE_COLUMNS)
 
 
         Returns:
@@ -117,7 +186,9 @@ class ScheduleService:
         """
         logger.debug("Looking up schedule id=%s", schedule_id)
         query = (
-            self.supabase.table(self.table_name).select("*").eq("id", str(schedule_id))
+            self.supabase.table(self.table_name)
+            .select(columns)
+            .eq("id", str(schedule_id))
         )
         response = query.execute()
 
@@ -127,6 +198,24 @@ class ScheduleService:
         logger.warning("Schedule not found id=%s", schedule_id)
         return None
 
+    def get_schedule_version(self, schedule_id) -> Optional[int]:
+        """
+        Current change counter for a schedule — a single-row, single-column
+        read used to answer conditional GETs without loading any shifts.
+
+        Returns:
+            The version, or None if the schedule doesn't exist
+        """
+        response = (
+            self.supabase.table(self.table_name)
+            .select("version")
+            .eq("id", str(schedule_id))
+            .execute()
+        )
+        if not response.data:
+            return None
+        return response.data[0]["version"]
+
     def get_schedule_with_shifts(self, schedule_id) -> Dict[str, Any]:
         """
         Get a schedule with all the shifts associated with it
@@ -142,50 +231,108 @@ class ScheduleService:
 
         """
 
-        schedule = self.get_schedule_by_id(schedule_id)
+        schedule = self.get_schedule_by_id(schedule_id, columns=SCHEDULE_DETAIL_COLUMNS)
 
         if not schedule:
             raise ScheduleNotFoundError(schedule_id)
 
         shifts_response = (
             self.supabase.table("shifts")
-            .select("*, employee:employees(id, name, role)")
+            .select(SCHEDULE_SHIFT_COLUMNS)
             .eq("schedule_id", str(schedule_id))
             .order("shift_date")
             .order("start_time")
             .execute()
         )
 
-        # Calculate duration for each shift
-        shifts = []
-        total_hours = 0
+        self._attach_shift_totals(schedule, shifts_response.data)
 
-        schedule["shifts"] = []
-        schedule["total_shifts"] = 0
-        schedule["total_hours"] = 0.0
+        logger.info(
+            "Schedule %s loaded: %d shifts, %.1f total hours",
+            schedule_id,
+            schedule["total_shifts"],
+            schedule["total_hours"],
+        )
+        return schedule
 
-        for shift in shifts_response.data:
-            start = datetime.strptime(shift["start_time"], "%H:%M:%S")
-            end = datetime.strptime(shift["end_time"], "%H:%M:%S")
-            duration = (end - start).total_seconds() / 3600
+    def get_schedule_calendar(
+        self,
+        restaurant_id,
+        start_date: date,
+        end_date: date,
+        employee_id=None,
+    ) -> List[Dict[str, Any]]:
+        """
+        Load every schedule (with shifts) for a restaurant whose week falls in
+        [start_date, end_date], in one query: shifts and their employees are
+        embedded in the schedules select, so a 6-week calendar costs one
+        round trip instead of two per week.
+
+        Args:
+            restaurant_id: Restaurant to load
+            start_date: Any day in the first week
+            end_date: Any day in the last week
+            employee_id: Only include this employee's shifts (optional)
 
+        Returns:
+            Schedules shaped like get_schedule_with_shifts, oldest week first
+
+        Raises:
+            ValueError: If the range is reversed or wider than MAX_CALENDAR_WEEKS
+        """
+        first_week = self.get_week_start(start_date)
+        last_week = self.get_week_start(end_date)
+        if last_week < first_week:
+            raise ValueError("end_date must be on or after start_date")
+        weeks = (last_week - first_week).days // 7 + 1
+        if weeks > MAX_CALENDAR_WEEKS:
+            raise ValueError(f"Calendar range cannot exceed {MAX_CALENDAR_WEEKS} weeks")
+
+        query = (
+            self.supabase.table(self.table_name)
+            .select(SCHEDULE_CALENDAR_COLUMNS)
+            .eq("restaurant_id", str(restaurant_id))
+            .gte("week_start", first_week.isoformat())
+            .lte("week_start", last_week.isoformat())
+        )
+        if employee_id is not None:
+            # Filters the embedded shifts, not the schedules
+            query = query.eq("shifts.employee_id", str(employee_id))
+        response = (
+            query.order("week_start")
+            .order("shift_date", foreign_table="shifts")
+            .order("start_time", foreign_table="shifts")
+            .execute()
+        )
+
+        schedules = response.data
+        for schedule in schedules:
+            self._attach_shift_totals(schedule, schedule.pop("shifts", None) or [])
+
+        logger.info(
+            "Calendar loaded restaurant_id=%s %s..%s: %d schedules",
+            restaurant_id,
+            first_week,
+            last_week,
+            len(schedules),
+        )
+        return schedules
+
+    def _attach_shift_totals(
+        self, schedule: Dict[str, Any], shifts: List[Dict[str, Any]]
+    ) -> None:
+        """Set duration_hours on each shift and shifts/total_shifts/total_hours
+        on the schedule."""
+        total_hours = 0.0
+        for shift in shifts:
+            duration = self.calculate_duration(shift["start_time"], shift["end_time"])
             shift["duration_hours"] = round(duration, 2)
             total_hours += duration
 
-            shifts.append(shift)
-
         schedule["shifts"] = shifts
         schedule["total_shifts"] = len(shifts)
         schedule["total_hours"] = round(total_hours, 2)
 
-        logger.info(
-            "Schedule %s loaded: %d shifts, %.1f total hours",
-            schedule_id,
-            schedule["total_shifts"],
-            schedule["total_hours"],
-        )
-        return schedule
-
     @staticmethod
     def calculate_duration(start_time: str, end_time: str) -> float:
         """Calculate hours between two time strings."""
@@ -193,6 +340,35 @@ class ScheduleService:
         end = datetime.strptime(end_time, "%H:%M:%S")
         return (end - start).total_seconds() / 3600
 
+    def get_schedule_summaries(
+        self,
+        restaurant_id: Optional[str] = None,
+        start_date: Optional[date] = None,
+        end_date: Optional[date] = None,
+    ) -> List[Dict[str, Any]]:
+        """
+        Per-schedule totals computed in the database by the
+        get_schedule_summaries function (migrations/0006): shift count,
+        total hours, hours per role and hours per employee. One round trip
+        regardless of how many schedules or shifts are covered.
+
+        Args:
+            restaurant_id: Filter by restaurant
+            start_date: Schedules starting on or after this date
+            end_date: Schedules starting on or before this date
+
+        Returns:
+            List of summary dictionaries, newest week first
+        """
+        params = {
+            "p_restaurant_id": str(restaurant_id) if restaurant_id else None,
+            "p_from": start_date.isoformat() if start_date else None,
+            "p_to": end_date.isoformat() if end_date else None,
+        }
+        response = self.supabase.rpc("get_schedule_summaries", params).execute()
+        logger.info("Returning %d schedule summaries", len(response.data))
+        return response.data
+
     def get_schedule_by_week(
         self, week_start: date, restaurant_id: UUID
     ) -> Optional[Dict[str, Any]]:
@@ -207,7 +383,7 @@ class ScheduleService:
 
         query = (
             self.supabase.table(self.table_name)
-            .select("*")
+            .select(SCHEDULE_COLUMNS)
             .eq("week_start", normalized_week_start.isoformat())
         )
 
@@ -250,6 +426,7 @@ class ScheduleService:
         response = self.supabase.table(self.table_name).insert(schedule_data).execute()
         created = response.data[0]
         logger.info("Schedule created id=%s", created.get("id"))
+        change_log_service.record("schedule", "created", [created])
         return created
 
     def create_schedules_for_range(
@@ -259,6 +436,10 @@ class ScheduleService:
         Create schedules for all weeks in a date range.
 
         Useful for bulk-creating schedules (e.g., "create next 4 weeks").
+        Every week is written in one multi-row upsert that ignores weeks
+        which already have a schedule (the (restaurant_id, week_start) unique
+        constraint, migrations/0005), so this is a single round trip no
+        matter how many weeks are requested.
 
         Args:
             start_date: Range start
@@ -266,7 +447,7 @@ class ScheduleService:
             restaurant_id: Restaurant ID
 
         Returns:
-            List of created schedules
+            List of created schedules (weeks that already existed are skipped)
         """
         logger.info(
             "Creating schedules for range: %s to %s restaurant_id=%s",
@@ -274,26 +455,34 @@ class ScheduleService:
             end_date,
             restaurant_id,
         )
-        created_schedules = []
-        skipped = 0
-
         current_week_start = self.get_week_start(start_date)
         end_week_start = self.get_week_start(end_date)
 
+        rows = []
         while current_week_start <= end_week_start:
-            try:
-                schedule = self.create_schedule(restaurant_id, current_week_start)
-                created_schedules.append(schedule)
-            except ScheduleAlreadyExistsError:
-                # Skip weeks that already have schedules
-                skipped += 1
-
+            rows.append(
+                {
+                    "restaurant_id": str(restaurant_id),
+                    "week_start": current_week_start.isoformat(),
+                }
+            )
             current_week_start += timedelta(weeks=1)
 
+        if not rows:
+            return []
+
+        response = (
+            self.supabase.table(self.table_name)
+            .upsert(rows, on_conflict="restaurant_id,week_start", ignore_duplicates=True)
+            .execute()
+        )
+        created_schedules = response.data or []
+        change_log_service.record("schedule", "created", created_schedules)
+
         logger.info(
             "%d schedules created, %d skipped (already exist)",
             len(created_schedules),
-            skipped,
+            len(rows) - len(created_schedules),
         )
         return created_schedules
 
@@ -323,6 +512,8 @@ class ScheduleService:
             .execute()
         )
         logger.info("Schedule deleted id=%s", schedule_id)
+        # Clients drop the schedule's shifts along with it
+        change_log_service.record("schedule", "deleted", [existing])
         return response.data[0] if response.data else existing
 
     def generate_share_link(self, schedule_id) -> Dict[str, Any]:
@@ -404,14 +595,30 @@ class ScheduleService:
             Minimal public schedule dict (restaurant_name, week_start, shifts)
             or None if the token doesn't resolve to an active, unexpired link.
         """
-        logger.debug("Looking up schedule by share_token")
-        response = (
-            self.supabase.table(self.table_name)
-            .select("*")
-            .eq("share_token", token)
-            .eq("share_enabled", True)
-            .execute()
+        schedule = self.get_active_share(token=token)
+        if not schedule:
+            return None
+        return self.render_public_schedule(schedule)
+
+    def get_active_share(
+        self, token: Optional[str] = None, schedule_id=None
+    ) -> Optional[Dict[str, Any]]:
+        """
+        Look up a schedule by share token or by ID, returning it only if its
+        share link is enabled and unexpired.
+
+        Returns:
+            Schedule dict (SCHEDULE_PUBLIC_COLUMNS plus share_token) or None
+        """
+        query = self.supabase.table(self.table_name).select(
+            SCHEDULE_PUBLIC_COLUMNS + ", share_token"
         )
+        if token is not None:
+            logger.debug("Looking up schedule by share_token")
+            query = query.eq("share_token", token)
+        else:
+            query = query.eq("id", str(schedule_id))
+        response = query.eq("share_enabled", True).execute()
 
         if not response.data:
             logger.info("Share token not found or disabled")
@@ -422,10 +629,22 @@ class ScheduleService:
         if self._is_share_expired(schedule.get("share_expires_at")):
             logger.info("Share token expired for schedule id=%s", schedule.get("id"))
             return None
+        return schedule
 
+    def render_public_schedule(self, schedule: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Build the public (share link) view of a schedule: restaurant name,
+        week, and shifts with employee name/role only — no internal IDs.
+
+        Args:
+            schedule: Schedule dict with id, restaurant_id and week_start
+
+        Returns:
+            Dict shaped like PublicScheduleResponse
+        """
         shifts_response = (
             self.supabase.table("shifts")
-            .select("*, employee:employees(name, role)")
+            .select(PUBLIC_SHIFT_COLUMNS)
             .eq("schedule_id", str(schedule["id"]))
             .order("shift_date")
             .order("start_time")
@@ -448,7 +667,7 @@ class ScheduleService:
             )
 
         logger.info(
-            "Public schedule resolved via share token id=%s shifts=%d",
+            "Public schedule rendered id=%s shifts=%d",
             schedule.get("id"),
             len(shifts),
         )
@@ -501,7 +720,7 @@ class ScheduleService:
         if not token:
             return False
 
-        schedule = self.get_schedule_by_id(schedule_id)
+        schedule = self.get_schedule_by_id(schedule_id, columns=SCHEDULE_SHARE_COLUMNS)
         if not schedule:
             return False
 
@@ -41,7 +41,7 @@ class ShiftTemplateService:
 
         response = (
             self.supabase.table(self.table_name)
-            .select("*")
+            .select("id, restaurant_id, templates, updated_at")
             .eq("restaurant_id", restaurant_id)
             .execute()
         )
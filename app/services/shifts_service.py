@@ -1,15 +1,46 @@
+import json
 import logging
 
 from ..core.db import get_supabase
+from ..core.events import get_event_broker, schedule_channel
+from ..core.pagination import STREAM_PAGE_SIZE, decode_cursor, keyset_filter
+from postgrest.exceptions import APIError
 from supabase import Client
-from typing import List, Optional, Dict, Any
-from .schedule_service import schedule_service, ScheduleNotFoundError
-from .employee_service import employee_service, EmployeeNotFoundError
+from typing import Iterator, List, Optional, Dict, Any
+from .schedule_service import schedule_service, ScheduleNotFoundError, ScheduleService
+from .change_log_service import change_log_service
+from .public_snapshot_service import public_snapshot_service
+from .employee_service import (
+    employee_service,
+    EmployeeNotFoundError,
+    EMPLOYEE_ROSTER_COLUMNS,
+)
 from uuid import UUID
+from collections import defaultdict
 from datetime import datetime, date, time, timedelta
 
 logger = logging.getLogger(__name__)
 
+# Per-use-case column sets — see schedule_service for the rationale.
+SHIFT_COLUMNS = (
+    "id, schedule_id, employee_id, shift_date, start_time, end_time, notes, "
+    "created_at, updated_at"
+)
+SHIFT_OVERLAP_COLUMNS = "id, start_time, end_time"
+# Fields of a shift included in live-update events
+SHIFT_DELTA_KEYS = ("id", "employee_id", "shift_date", "start_time", "end_time", "notes")
+EMPLOYEE_SHIFT_COLUMNS = "id, schedule_id, shift_date, start_time, end_time, notes"
+
+# Keyset ordering for an employee's shifts, matching idx_shifts_employee_date.
+SHIFT_SORT_KEYS = [("shift_date", False), ("start_time", False), ("id", False)]
+
+# Longest range GET /employees/{id}/shifts will scan in one request.
+MAX_EMPLOYEE_SHIFT_RANGE_DAYS = 366
+
+# Upper bound on operations per POST /shifts/batch — a full week's edit for a
+# large restaurant is well under this.
+MAX_BATCH_OPERATIONS = 200
+
 
 class ShiftValidationError(Exception):
     """Raised when shift validation fails."""
@@ -38,6 +69,27 @@ class OverlappingShiftError(ShiftValidationError):
         )
 
 
+class ShiftBatchError(ShiftValidationError):
+    """
+    Raised when one or more operations in a shift batch are invalid. Nothing
+    in the batch is applied; `errors` holds one entry per failing operation
+    ({"index", "op", "message"}, plus "overlapping_shifts" for overlaps).
+    """
+
+    def __init__(self, errors: List[Dict[str, Any]]):
+        self.errors = errors
+        super().__init__(f"{len(errors)} operation(s) in the batch are invalid")
+
+
+def _shift_delta(row: Dict[str, Any]) -> Dict[str, Any]:
+    """Compact shift shape pushed to live-update subscribers."""
+    return {key: row.get(key) for key in SHIFT_DELTA_KEYS}
+
+
+def _to_time(value: Any) -> time:
+    return value if isinstance(value, time) else time.fromisoformat(value)
+
+
 class ShiftsService:
     """Service to manage the employee shifts"""
 
@@ -51,6 +103,41 @@ class ShiftsService:
             self._supabase = get_supabase()
         return self._supabase
 
+    def notify_shifts_changed(
+        self,
+        created: List[Dict[str, Any]] = (),
+        updated: List[Dict[str, Any]] = (),
+        deleted: List[Dict[str, Any]] = (),
+    ) -> None:
+        """
+        Post-write hook: every code path that inserts, updates or deletes
+        shifts calls this once, after the write succeeded, with the affected
+        shift rows (each must carry schedule_id). Keeps derived state in step
+        with the shifts table: the change log behind the sync feed, the
+        pre-rendered public share snapshots, and live-update subscribers.
+        """
+        for op, rows in (("created", created), ("updated", updated), ("deleted", deleted)):
+            if rows:
+                change_log_service.record_shifts(op, rows)
+
+        deltas: Dict[str, Dict[str, list]] = defaultdict(
+            lambda: {"created": [], "updated": [], "deleted": []}
+        )
+        for op, rows in (("created", created), ("updated", updated), ("deleted", deleted)):
+            for row in rows:
+                if not row.get("schedule_id"):
+                    continue
+                entry = str(row["id"]) if op == "deleted" else _shift_delta(row)
+                deltas[str(row["schedule_id"])][op].append(entry)
+
+        broker = get_event_broker()
+        for schedule_id, delta in deltas.items():
+            public_snapshot_service.refresh(schedule_id)
+            broker.publish(
+                schedule_channel(schedule_id),
+                {"type": "shifts", "schedule_id": schedule_id, **delta},
+            )
+
     def validate_schedule_exists(self, schedule_id: UUID):
         """Ensure schedule exists before adding shifts to it."""
         logger.debug("Validating schedule exists id=%s", schedule_id)
@@ -85,7 +172,9 @@ class ShiftsService:
     def validate_employee_can_work(self, employee_id: UUID):
         """Ensure employee exists and is active."""
         logger.debug("Validating employee can work id=%s", employee_id)
-        employee = employee_service.get_employee_by_id(employee_id)
+        employee = employee_service.get_employee_by_id(
+            employee_id, columns=EMPLOYEE_ROSTER_COLUMNS
+        )
         if not employee:
             logger.error("Employee not found id=%s", employee_id)
             raise EmployeeNotFoundError(employee_id)
@@ -144,7 +233,7 @@ class ShiftsService:
         # Query existing shifts for this employee on this date
         query = (
             self.supabase.table(self.table_name)
-            .select("*")
+            .select(SHIFT_OVERLAP_COLUMNS)
             .eq("employee_id", str(employee_id))
             .eq("shift_date", shift_date.isoformat())
         )
@@ -181,7 +270,11 @@ class ShiftsService:
     def get_shift_by_id(self, shift_id: UUID) -> Optional[Dict[str, Any]]:
         """Get a single shift by ID."""
         logger.debug("Looking up shift id=%s", shift_id)
-        query = self.supabase.table(self.table_name).select("*").eq("id", str(shift_id))
+        query = (
+            self.supabase.table(self.table_name)
+            .select(SHIFT_COLUMNS)
+            .eq("id", str(shift_id))
+        )
         response = query.execute()
 
         if response.data:
@@ -191,10 +284,137 @@ class ShiftsService:
         return None
 
     def get_employee_shifts(
-        self, employee_id: UUID, start_date: date, end_date: date
+        self,
+        employee_id: UUID,
+        start_date: date,
+        end_date: date,
+        columns: str = EMPLOYEE_SHIFT_COLUMNS,
+        limit: Optional[int] = None,
+        cursor: Optional[str] = None,
     ) -> List[Dict[str, Any]]:
-        """Get all shifts for an employee in a date range."""
-        pass
+        """
+        Get an employee's shifts in a date range (inclusive), across all
+        schedules. A single range scan on idx_shifts_employee_date.
+
+        Args:
+            employee_id: UUID of the employee
+            start_date: First day of the range
+            end_date: Last day of the range
+            columns: Column set to select (must include the sort keys when paginating)
+            limit: Max rows to return (None = unbounded)
+            cursor: Opaque cursor from a previous page (see next_cursor)
+
+        Returns:
+            List of shift dictionaries, ordered by date, start time, id
+
+        Raises:
+            ShiftValidationError: If end_date is before start_date or the
+                                  range is longer than MAX_EMPLOYEE_SHIFT_RANGE_DAYS
+            InvalidCursorError: If cursor can't be decoded
+        """
+        if end_date < start_date:
+            raise ShiftValidationError("'to' date must be on or after 'from' date")
+        if (end_date - start_date).days >= MAX_EMPLOYEE_SHIFT_RANGE_DAYS:
+            raise ShiftValidationError(
+                f"Date range cannot exceed {MAX_EMPLOYEE_SHIFT_RANGE_DAYS} days"
+            )
+
+        logger.debug(
+            "get_employee_shifts: employee_id=%s %s..%s limit=%s cursor=%s",
+            employee_id,
+            start_date,
+            end_date,
+            limit,
+            bool(cursor),
+        )
+        query = (
+            self.supabase.table(self.table_name)
+            .select(columns)
+            .eq("employee_id", str(employee_id))
+            .gte("shift_date", start_date.isoformat())
+            .lte("shift_date", end_date.isoformat())
+        )
+        if cursor:
+            last = decode_cursor(cursor, len(SHIFT_SORT_KEYS))
+            query = query.or_(keyset_filter(SHIFT_SORT_KEYS, last))
+
+        query = query.order("shift_date").order("start_time").order("id")
+        if limit is not None:
+            query = query.limit(limit)
+        response = query.execute()
+        logger.info(
+            "Returning %d shifts for employee_id=%s", len(response.data), employee_id
+        )
+        return response.data
+
+    def iter_schedule_shifts(
+        self,
+        schedule_ids: List[str],
+        columns: str = SHIFT_COLUMNS,
+        page_size: int = STREAM_PAGE_SIZE,
+    ) -> Iterator[Dict[str, Any]]:
+        """
+        Yield every shift of the given schedules ordered by date, start time
+        and id, fetching page_size rows per round trip (keyset pagination),
+        so exports of any length hold one page in memory at a time.
+
+        Args:
+            schedule_ids: Schedules whose shifts to yield
+            columns: Column set to select (must include the sort keys)
+            page_size: Rows per round trip
+        """
+        if not schedule_ids:
+            return
+        last = None
+        while True:
+            query = (
+                self.supabase.table(self.table_name)
+                .select(columns)
+                .in_("schedule_id", [str(s) for s in schedule_ids])
+            )
+            if last is not None:
+                query = query.or_(keyset_filter(SHIFT_SORT_KEYS, last))
+            page = (
+                query.order("shift_date")
+                .order("start_time")
+                .order("id")
+                .limit(page_size)
+                .execute()
+                .data
+            )
+            yield from page
+            if len(page) < page_size:
+                return
+            last = [page[-1][column] for column, _ in SHIFT_SORT_KEYS]
+
+    @staticmethod
+    def summarize_weekly_hours(shifts: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """
+        Total hours and shift count per ISO week (Monday start), in one pass
+        over shifts already ordered by date.
+
+        Returns:
+            [{"week_start", "shift_count", "hours"}, ...] in week order
+        """
+        weeks: Dict[date, Dict[str, Any]] = {}
+        for shift in shifts:
+            week_start = ScheduleService.get_week_start(
+                date.fromisoformat(shift["shift_date"])
+            )
+            week = weeks.get(week_start)
+            if week is None:
+                week = weeks[week_start] = {
+                    "week_start": week_start,
+                    "shift_count": 0,
+                    "hours": 0.0,
+                }
+            week["shift_count"] += 1
+            week["hours"] += ScheduleService.calculate_duration(
+                shift["start_time"], shift["end_time"]
+            )
+        for week in weeks.values():
+            week["hours"] = round(week["hours"], 2)
+        return list(weeks.values())
 
     def create_shift(
         self,
@@ -206,18 +426,26 @@ class ShiftsService:
         notes: Optional[str] = None,
     ) -> Dict[str, Any]:
         """
-        Create a new shift with full validation.
+        Create a new shift with full validation, in a single round trip.
 
-        Validates:
+        Everything runs inside the create_shift database function
+        (migrations/0002_create_shift_function.sql), atomically:
         1. Schedule exists
         2. Employee exists and is active
         3. Date is within schedule week
         4. Times are valid
         5. Within operating hours (TODO)
-        6. No overlapping shifts
+        6. No overlapping shifts — enforced by the shifts_no_overlap
+           exclusion constraint, so concurrent creates can't both pass
+
+        Start/end ordering is also checked locally first, since it needs no
+        data and saves a round trip for an obviously bad request.
 
         Raises:
-            ShiftValidationError: If any validation fails
+            ScheduleNotFoundError: If the schedule doesn't exist
+            EmployeeNotFoundError: If the employee doesn't exist
+            OverlappingShiftError: If the shift overlaps an existing one
+            ShiftValidationError: If any other validation fails
         """
         logger.info(
             "Creating shift: employee_id=%s date=%s %s-%s",
@@ -226,37 +454,54 @@ class ShiftsService:
             start_time,
             end_time,
         )
-        self.validate_schedule_exists(schedule_id)
-        self.validate_employee_can_work(employee_id)
-        self.validate_date_in_schedule_week(schedule_id, shift_date)
         self.validate_shift_times(start_time, end_time, shift_date)
 
-        overlapping_shifts = self.check_for_overlapping_shifts(
-            employee_id, shift_date, start_time, end_time
-        )
-        if overlapping_shifts:
-            raise OverlappingShiftError(overlapping_shifts)
-
-        shift_data = {
-            "schedule_id": str(schedule_id),
-            "employee_id": str(employee_id),
-            "shift_date": shift_date.isoformat(),
-            "start_time": start_time.isoformat(),
-            "end_time": end_time.isoformat(),
-            "notes": notes.strip() if notes else None,
-            "created_at": datetime.utcnow().isoformat(),
-            "updated_at": datetime.utcnow().isoformat(),
+        params = {
+            "p_schedule_id": str(schedule_id),
+            "p_employee_id": str(employee_id),
+            "p_shift_date": shift_date.isoformat(),
+            "p_start_time": start_time.isoformat(),
+            "p_end_time": end_time.isoformat(),
+            "p_notes": notes,
         }
-
-        response = self.supabase.table(self.table_name).insert(shift_data).execute()
-
-        if not response.data:
+        try:
+            response = self.supabase.rpc("create_shift", params).execute()
+        except APIError as e:
+            self._raise_create_shift_error(e, schedule_id, employee_id)
+
+        # A function returning a single row comes back as an object, not a list
+        created = response.data[0] if isinstance(response.data, list) else response.data
+        if not created:
             raise ShiftValidationError("Failed to create shift")
 
-        created = response.data[0]
         logger.info("Shift created id=%s", created.get("id"))
+        self.notify_shifts_changed(created=[created])
         return created
 
+    @staticmethod
+    def _raise_create_shift_error(error: APIError, schedule_id: UUID, employee_id: UUID):
+        """Translate an error raised by the create_shift database function
+        into the service's own exceptions (see the migration for the codes)."""
+        logger.warning(
+            "create_shift rejected: code=%s hint=%s message=%s",
+            error.code,
+            error.hint,
+            error.message,
+        )
+        if error.code == "P0002" and error.hint == "schedule_not_found":
+            raise ScheduleNotFoundError(schedule_id) from error
+        if error.code == "P0002" and error.hint == "employee_not_found":
+            raise EmployeeNotFoundError(employee_id) from error
+        if error.code == "23P01":
+            try:
+                overlapping = json.loads(error.details or "[]")
+            except ValueError:
+                overlapping = []
+            raise OverlappingShiftError(overlapping) from error
+        if error.code == "22023":
+            raise ShiftValidationError(error.message) from error
+        raise error
+
     def update_shift(
         self,
         shift_id: UUID,
@@ -393,16 +638,296 @@ class ShiftsService:
             "Updating shift id=%s fields=%s", shift_id, list(update_data.keys())
         )
 
-        response = (
-            self.supabase.table(self.table_name)
-            .update(update_data)
-            .eq("id", str(shift_id))
-            .execute()
-        )
+        try:
+            response = (
+                self.supabase.table(self.table_name)
+                .update(update_data)
+                .eq("id", str(shift_id))
+                .execute()
+            )
+        except APIError as e:
+            # Another request saved a clashing shift after our overlap check;
+            # the shifts_no_overlap constraint caught it.
+            if e.code != "23P01":
+                raise
+            raise OverlappingShiftError(
+                self.check_for_overlapping_shifts(
+                    final_employee_id,
+                    final_shift_date,
+                    final_start_time,
+                    final_end_time,
+                    exclude_shift_id=shift_id,
+                )
+            ) from e
 
         logger.info("Shift updated id=%s", shift_id)
+        self.notify_shifts_changed(updated=response.data)
         return response.data[0]
 
+    # === BATCH ===
+
+    def apply_shift_batch(
+        self, schedule_id: UUID, operations: List[Dict[str, Any]]
+    ) -> Dict[str, Any]:
+        """
+        Validate and apply many create/update/delete operations on one
+        schedule's shifts.
+
+        Everything validation needs is loaded up front — the schedule, the
+        week's shifts for this schedule and for every involved employee, and
+        the employees being assigned — so checking N operations costs a fixed
+        handful of round trips instead of 4-5 per shift. Operations are then
+        checked against an in-memory (employee, date) interval index that
+        reflects the batch's *final* state: deleted and moved shifts free
+        their slots first, so reordering operations never changes the
+        outcome, and two operations in the same batch that collide are
+        caught just like a collision with a stored shift.
+
+        All-or-nothing: if any operation is invalid nothing is written.
+        Valid batches are written by the apply_shift_batch database function
+        (migrations/0010) — one DELETE, one UPDATE and one multi-row INSERT
+        in a single transaction, so a concurrent edit tripping the
+        shifts_no_overlap constraint rolls the whole batch back.
+
+        Args:
+            schedule_id: Schedule every operation applies to
+            operations: Dicts shaped like ShiftBatchOperation
+
+        Returns:
+            {"created": [...], "updated": [...], "deleted": [shift_id, ...]}
+
+        Raises:
+            ScheduleNotFoundError: If the schedule doesn't exist
+            ShiftBatchError: If any operation fails validation
+            ShiftValidationError: If the batch is empty or too large
+        """
+        if not operations:
+            raise ShiftValidationError("Batch contains no operations")
+        if len(operations) > MAX_BATCH_OPERATIONS:
+            raise ShiftValidationError(
+                f"Batch contains {len(operations)} operations "
+                f"(maximum is {MAX_BATCH_OPERATIONS})"
+            )
+
+        schedule = self.validate_schedule_exists(schedule_id)
+        week_start = datetime.strptime(schedule["week_start"], "%Y-%m-%d").date()
+        week_end = week_start + timedelta(days=6)
+
+        logger.info(
+            "Applying shift batch: schedule_id=%s operations=%d",
+            schedule_id,
+            len(operations),
+        )
+
+        assigned_ids = {str(op["employee_id"]) for op in operations if op.get("employee_id")}
+        week_shifts = self._load_week_shifts(week_start, week_end, str(schedule_id), assigned_ids)
+        schedule_shifts = {
+            s["id"]: s for s in week_shifts if s["schedule_id"] == str(schedule_id)
+        }
+
+        errors: List[Dict[str, Any]] = []
+
+        def fail(index: int, op: Dict[str, Any], message: str, **extra) -> None:
+            errors.append({"index": index, "op": op.get("op"), "message": message, **extra})
+
+        # Pass 1: resolve the shifts that update/delete operations refer to.
+        touched: Dict[str, int] = {}
+        for i, op in enumerate(operations):
+            if op.get("op") not in ("update", "delete"):
+                continue
+            if not op.get("shift_id"):
+                fail(i, op, f"shift_id is required to {op['op']} a shift")
+                continue
+            shift_id = str(op["shift_id"])
+            if shift_id not in schedule_shifts:
+                fail(i, op, f"Shift with ID {shift_id} not found in this schedule")
+            elif shift_id in touched:
+                fail(i, op, f"Shift {shift_id} is already changed by operation {touched[shift_id]}")
+            else:
+                touched[shift_id] = i
+
+        # Employees kept on a moved shift may also work other schedules this week
+        kept_ids = {
+            schedule_shifts[str(op["shift_id"])]["employee_id"]
+            for op in operations
+            if op.get("op") == "update"
+            and not op.get("employee_id")
+            and str(op.get("shift_id")) in schedule_shifts
+        } - assigned_ids
+        if kept_ids:
+            loaded = {s["id"] for s in week_shifts}
+            week_shifts += [
+                s for s in self._load_week_shifts(week_start, week_end, None, kept_ids)
+                if s["id"] not in loaded
+            ]
+
+        roster = employee_service.get_employees_by_ids(
+            list(assigned_ids), columns=EMPLOYEE_ROSTER_COLUMNS
+        )
+
+        # (employee_id, shift_date) -> occupied intervals, minus every shift
+        # this batch deletes or moves.
+        index: Dict[tuple, List[Dict[str, Any]]] = defaultdict(list)
+        for s in week_shifts:
+            if s["id"] not in touched:
+                index[(s["employee_id"], s["shift_date"])].append(s)
+
+        # Pass 2: validate each create/update's final shift against the index.
+        to_create: List[Dict[str, Any]] = []
+        to_update: List[Dict[str, Any]] = []
+        to_delete: List[str] = []
+        failed = {e["index"] for e in errors}
+
+        for i, op in enumerate(operations):
+            if i in failed:
+                continue
+            kind = op.get("op")
+            if kind == "delete":
+                to_delete.append(str(op["shift_id"]))
+                continue
+            if kind not in ("create", "update"):
+                fail(i, op, f"Unknown operation {kind!r} (expected create, update or delete)")
+                continue
+
+            existing = schedule_shifts[str(op["shift_id"])] if kind == "update" else {}
+            employee_id = str(op["employee_id"]) if op.get("employee_id") else existing.get("employee_id")
+            shift_date = op.get("shift_date") or (
+                date.fromisoformat(existing["shift_date"]) if existing else None
+            )
+            start_time = op.get("start_time") or (
+                _to_time(existing["start_time"]) if existing else None
+            )
+            end_time = op.get("end_time") or (
+                _to_time(existing["end_time"]) if existing else None
+            )
+            if None in (employee_id, shift_date, start_time, end_time):
+                fail(i, op, "employee_id, shift_date, start_time and end_time are required to create a shift")
+                continue
+
+            if employee_id != existing.get("employee_id"):
+                employee = roster.get(employee_id)
+                if not employee:
+                    fail(i, op, str(EmployeeNotFoundError(employee_id)))
+                    continue
+                if not employee.get("is_active"):
+                    fail(i, op, f"Cannot assign shifts to inactive employee {employee['name']}")
+                    continue
+
+            if start_time >= end_time:
+                fail(i, op, "End time must be after start time")
+                continue
+            if not (week_start <= shift_date <= week_end):
+                fail(
+                    i,
+                    op,
+                    f"Shift date {shift_date} must be within schedule week "
+                    f"({week_start} to {week_end})",
+                )
+                continue
+
+            slot = index[(employee_id, shift_date.isoformat())]
+            overlapping = [
+                s for s in slot
+                if start_time < _to_time(s["end_time"]) and _to_time(s["start_time"]) < end_time
+            ]
+            if overlapping:
+                fail(
+                    i,
+                    op,
+                    str(OverlappingShiftError(overlapping)),
+                    overlapping_shifts=overlapping,
+                )
+                continue
+
+            row = {
+                "employee_id": employee_id,
+                "shift_date": shift_date.isoformat(),
+                "start_time": start_time.isoformat(),
+                "end_time": end_time.isoformat(),
+            }
+            if kind == "create":
+                row["notes"] = op["notes"].strip() if op.get("notes") else None
+                to_create.append(row)
+                slot.append({"id": None, "start_time": row["start_time"], "end_time": row["end_time"]})
+            else:
+                row["id"] = existing["id"]
+                row["notes"] = op["notes"] if op.get("notes") is not None else existing.get("notes")
+                to_update.append(row)
+                slot.append({"id": row["id"], "start_time": row["start_time"], "end_time": row["end_time"]})
+
+        if errors:
+            errors.sort(key=lambda e: e["index"])
+            logger.warning(
+                "Shift batch rejected: schedule_id=%s %d of %d operations invalid",
+                schedule_id,
+                len(errors),
+                len(operations),
+            )
+            raise ShiftBatchError(errors)
+
+        params = {
+            "p_schedule_id": str(schedule_id),
+            "p_delete_ids": to_delete,
+            "p_updates": to_update,
+            "p_creates": to_create,
+        }
+        try:
+            response = self.supabase.rpc("apply_shift_batch", params).execute()
+        except APIError as e:
+            if e.code != "23P01":
+                raise
+            logger.warning("Shift batch lost a race: schedule_id=%s %s", schedule_id, e.message)
+            raise ShiftValidationError(
+                "Another change to these shifts was saved while this batch was being "
+                "applied; nothing was saved. Reload the schedule and try again."
+            ) from e
+
+        # A function returning a single value comes back as an object, not a list
+        written = response.data[0] if isinstance(response.data, list) else response.data
+        created = written.get("created") or []
+        updated = written.get("updated") or []
+
+        logger.info(
+            "Shift batch applied: schedule_id=%s created=%d updated=%d deleted=%d",
+            schedule_id,
+            len(created),
+            len(updated),
+            len(to_delete),
+        )
+        self.notify_shifts_changed(
+            created=created,
+            updated=updated,
+            deleted=[schedule_shifts[shift_id] for shift_id in to_delete],
+        )
+        return {"created": created, "updated": updated, "deleted": to_delete}
+
+    def _load_week_shifts(
+        self,
+        week_start: date,
+        week_end: date,
+        schedule_id: Optional[str],
+        employee_ids: set,
+    ) -> List[Dict[str, Any]]:
+        """
+        One query for every shift in [week_start, week_end] that belongs to
+        schedule_id or to any of employee_ids (in any schedule — overlap
+        checks are per employee, not per schedule).
+        """
+        query = (
+            self.supabase.table(self.table_name)
+            .select(SHIFT_COLUMNS)
+            .gte("shift_date", week_start.isoformat())
+            .lte("shift_date", week_end.isoformat())
+        )
+        in_list = ",".join(sorted(employee_ids))
+        if schedule_id and employee_ids:
+            query = query.or_(f"schedule_id.eq.{schedule_id},employee_id.in.({in_list})")
+        elif schedule_id:
+            query = query.eq("schedule_id", schedule_id)
+        else:
+            query = query.in_("employee_id", sorted(employee_ids))
+        return query.execute().data
+
     # === DELETE ===
 
     def delete_shift(self, shift_id: UUID) -> Dict[str, Any]:
@@ -424,6 +949,7 @@ class ShiftsService:
         logger.info("Deleting shift id=%s", shift_id)
         self.supabase.table(self.table_name).delete().eq("id", str(shift_id)).execute()
         logger.info("Shift deleted id=%s", shift_id)
+        self.notify_shifts_changed(deleted=[existing])
         return existing
 
 
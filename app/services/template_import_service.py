@@ -1,15 +1,22 @@
+import asyncio
+import hashlib
 import io
 import logging
 import re
-from datetime import datetime
+import threading
 from typing import Any, Dict, List, Optional, Tuple
 
 import pandas as pd
 import pillow_heif
 from PIL import Image, UnidentifiedImageError
 
+from ..core.cache import TTLCache
+from ..core.config import settings
 from ..core.constants import DayOfWeek
-from .ai_service import get_ai_service
+from ..core.import_utils import is_spreadsheet, iter_mapped_rows
+from ..core.ai_client import AIDeadlineExceededError
+from ..core.workers import PoolSaturatedError, parse_pool
+from .ai_service import AIServiceUnavailableError, get_ai_service
 from .shift_template_service import ShiftTemplateService
 
 logger = logging.getLogger(__name__)
@@ -32,6 +39,11 @@ pillow_heif.register_heif_opener()
 # and re-encoded as JPEG before it reaches the model, regardless of what the
 # client claimed it was.
 _MAX_IMAGE_DIMENSION = 2048  # iPhone photos are often 4000px+; no need to ship that much detail
+# JPEGs are decoded at a reduced scale (libjpeg DCT scaling: 1/2, 1/4 or
+# 1/8) as long as the long side stays at least this big, so a 12 MP iPhone
+# JPEG is decoded straight to ~2016x1512 and a 48 MP one to ~2000x1500,
+# never as a full-size bitmap. Other formats have no scaled decode.
+_MIN_DRAFT_DIMENSION = 1536
 
 # Best-guess header -> normalized field mapping. Matched against a lowercased,
 # whitespace/punctuation-stripped version of each source column header.
@@ -48,21 +60,64 @@ FIELD_SYNONYMS: Dict[str, List[str]] = {
     "count": ["count", "headcount", "qty", "quantity", "needed", "numemployees", "employeesneeded"],
 }
 
-_DAY_NAME_TO_ISO = {name.lower(): member.value for name, member in DayOfWeek.__members__.items()}
+# Vision results per normalized JPEG, so re-uploading the same photo (a
+# retry after a network blip, or re-opening the import dialog) skips the
+# model. Keyed by model + sha256 of the JPEG; a photo re-encoded or resized
+# along the way (e.g. sent through a messenger) is caught by the dHash
+# near-duplicate lookup instead. Per process, like every TTLCache here.
+#
+# An exact hit can be served to anyone: they uploaded the very same image.
+# Near-duplicate lookups only consider images the same owner (user) has
+# uploaded, since a near match could be someone else's board, staff names
+# and all.
+VISION_CACHE_SIZE = 256
+VISION_CACHE_TTL_SECONDS = 24 * 3600
+# dHash grid side: 16 -> 256-bit hashes. Schedule photos are mostly white
+# grids, and at the usual 8 (64 bits) two different boards differed by a
+# single bit; at 16 they differ by ~15 while a re-encode moves 0-1 bits.
+DHASH_SIZE = 16
+# Max differing bits for a near-duplicate. No perceptual hash can see an
+# edited time on a photo of the same board, so near-duplicate hits are
+# reported to the client (vision_cache) and can be bypassed with refresh.
+NEAR_DUPLICATE_MAX_DISTANCE = 4
+
+# File previews return at most this many leading rows, plus this many
+# invalid rows from the rest of the file (see preview_template_file)
+PREVIEW_ROW_LIMIT = 500
+PREVIEW_ERROR_LIMIT = 100
+
+# Weekday names are matched on their first three letters, so "Tue",
+# "Tues" and "Tuesday" all resolve to 2
 _DAY_ABBR_TO_ISO = {name.lower()[:3]: member.value for name, member in DayOfWeek.__members__.items()}
 
-_TIME_FORMATS = ["%H:%M:%S", "%H:%M", "%I:%M:%S %p", "%I:%M %p", "%I%p", "%I %p"]
-
-
-def _normalize_header(header: str) -> str:
-    return re.sub(r"[^a-z0-9]", "", str(header).lower())
+# Accepted time shapes: "17:00", "17:00:00", "9:00 AM", "9:00:00 PM", "9PM",
+# "9 pm". Hours without minutes need AM/PM. The regex only splits a cell
+# into parts; hour and minute ranges (0-23 or 1-12, 0-59) are checked by
+# pd.to_datetime's explicit formats below, which would let a leap second
+# (":60") through, so seconds are bounded here.
+_TIME_PATTERN = re.compile(
+    r"^(?P<hour>\d{1,2})(?::(?P<minute>\d{1,2})(?::(?P<second>[0-5]?\d))?)?\s*(?P<meridiem>AM|PM)?$"
+)
+_TIME_FORMAT_24H = "%H:%M:%S"
+_TIME_FORMAT_12H = "%I:%M:%S %p"
 
 
 class TemplateImportService:
     """Service for parsing, validating, and saving imported shift templates."""
 
-    def __init__(self, shift_template_service: Optional[ShiftTemplateService] = None):
+    def __init__(
+        self,
+        shift_template_service: Optional[ShiftTemplateService] = None,
+        vision_cache: Optional[TTLCache] = None,
+    ):
         self.shift_template_service = shift_template_service or ShiftTemplateService()
+        self._vision_cache = vision_cache or TTLCache(
+            max_size=VISION_CACHE_SIZE, ttl_seconds=VISION_CACHE_TTL_SECONDS
+        )
+        # owner -> {cache key: dHash of its image}, scanned for that owner's
+        # near-duplicates
+        self._vision_hashes: Dict[str, Dict[str, int]] = {}
+        self._vision_lock = threading.Lock()
 
     # === Parsing ===
 
@@ -89,34 +144,12 @@ class TemplateImportService:
         Raises:
             ValueError: If the file can't be parsed at all (corrupt, wrong format)
         """
-        lower_name = (filename or "").lower()
-        try:
-            if lower_name.endswith(".csv"):
-                df = pd.read_csv(io.BytesIO(file_bytes), dtype=str, keep_default_na=False)
-            elif lower_name.endswith(".xlsx") or lower_name.endswith(".xls"):
-                df = pd.read_excel(io.BytesIO(file_bytes), dtype=str, engine="openpyxl")
-                df = df.fillna("")
-            else:
-                raise ValueError(
-                    f"Unsupported file type: {filename!r}. Expected .csv or .xlsx"
-                )
-        except ValueError:
-            raise
-        except Exception as e:
-            logger.error("Failed to parse template file %s: %s", filename, e)
-            raise ValueError(f"Could not parse file: {e}") from e
-
-        # Drop fully-empty rows (common in exported spreadsheets)
-        df = df[~(df.apply(lambda row: all(str(v).strip() == "" for v in row), axis=1))]
-
-        column_mapping = self._guess_column_mapping(list(df.columns))
-
         rows: List[Dict[str, Any]] = []
-        for _, series in df.iterrows():
-            row = {}
-            for field, source_col in column_mapping.items():
-                row[field] = str(series.get(source_col, "")).strip()
-            rows.append(row)
+        column_mapping: Optional[Dict[str, str]] = None
+        for _, mapping, chunk_rows in iter_mapped_rows(file_bytes, filename, FIELD_SYNONYMS):
+            if column_mapping is None:
+                column_mapping = mapping
+            rows.extend(chunk_rows)
 
         logger.info(
             "Parsed %d rows from %s, mapped columns=%s",
@@ -124,45 +157,101 @@ class TemplateImportService:
             filename,
             column_mapping,
         )
-        return rows, column_mapping
+        return rows, column_mapping or {}
+
+    def preview_template_file(
+        self,
+        file_bytes: bytes,
+        filename: str,
+        preview_rows: int = PREVIEW_ROW_LIMIT,
+        preview_errors: int = PREVIEW_ERROR_LIMIT,
+    ) -> Dict[str, Any]:
+        """
+        Parse and validate an uploaded file a chunk at a time, keeping only
+        what the preview shows: the first preview_rows rows, plus up to
+        preview_errors invalid rows from further down. Memory and response
+        size stay bounded however long the file is; the counts still cover
+        every row.
 
-    @staticmethod
-    def _guess_column_mapping(columns: List[str]) -> Dict[str, str]:
-        """Best-guess match each normalized field to a source column header."""
-        normalized_columns = {col: _normalize_header(col) for col in columns}
-        mapping: Dict[str, str] = {}
-
-        for field, synonyms in FIELD_SYNONYMS.items():
-            for col, normalized in normalized_columns.items():
-                if normalized in synonyms:
-                    mapping[field] = col
-                    break
-            else:
-                # Fallback: substring match (e.g. header "Day of Week (1-7)")
-                for col, normalized in normalized_columns.items():
-                    if any(syn in normalized for syn in synonyms):
-                        mapping[field] = col
-                        break
+        Every sheet of a workbook is read, each with its own column mapping.
+        Rows carry their sheet name; row numbers run on across sheets.
 
-        return mapping
+        Returns:
+            Dict shaped like TemplateImportPreviewResponse. column_mapping is
+            the first sheet's. truncated is True when rows doesn't hold
+            every row of the file.
 
-    def parse_template_image(
-        self, image_bytes: bytes, mime_type: str = "image/jpeg"
-    ) -> List[Dict[str, Any]]:
+        Raises:
+            ValueError: If the file can't be parsed at all (corrupt, wrong format)
+        """
+        column_mapping: Optional[Dict[str, str]] = None
+        kept: List[Dict[str, Any]] = []
+        total = valid = extra_errors = 0
+
+        for sheet, mapping, rows in iter_mapped_rows(file_bytes, filename, FIELD_SYNONYMS):
+            if column_mapping is None:
+                column_mapping = mapping
+            validated = self.validate_parsed_templates(rows, first_row_number=total + 1)
+            for row in validated:
+                if row["is_valid"]:
+                    valid += 1
+                if row["row_number"] <= preview_rows:
+                    kept.append({**row, "sheet": sheet})
+                elif not row["is_valid"] and extra_errors < preview_errors:
+                    kept.append({**row, "sheet": sheet})
+                    extra_errors += 1
+            total += len(rows)
+
+        logger.info(
+            "Previewed %d rows from %s (%d valid), returning %d",
+            total,
+            filename,
+            valid,
+            len(kept),
+        )
+        return {
+            "column_mapping": column_mapping or {},
+            "rows": kept,
+            "valid_count": valid,
+            "error_count": total - valid,
+            "total_rows": total,
+            "truncated": len(kept) < total,
+        }
+
+    def prepare_image(self, image_bytes: bytes) -> bytes:
+        """
+        First (CPU-bound) half of image import: decode and re-encode as
+        JPEG. Kept apart from the (network-bound) vision call so the two run
+        on different pools.
+
+        Raises:
+            InvalidImageError: If the bytes can't be decoded as an image at
+                                all — browser-reported content-type is NOT
+                                trusted for this; decoding is the real check
         """
-        Extract candidate shift templates from a photo/screenshot via vision AI.
+        return self._normalize_to_jpeg(image_bytes)
 
-        Does NOT save anything. Returns raw rows shaped exactly like
-        parse_template_file's output (plus a "confidence" flag), so callers
-        run them through the same validate_parsed_templates / confirm flow
-        used by CSV/Excel import.
+    async def analyze_prepared_image(
+        self, jpeg_bytes: bytes, owner: str, refresh: bool = False
+    ) -> Tuple[List[Dict[str, Any]], str]:
+        """
+        Second half of image import: send a prepare_image() result to the
+        vision model (or reuse a cached answer for the same or a
+        near-identical image) and shape it into raw rows. The cache lookup
+        (which hashes the image) runs on parse_pool, the vision call on the
+        async AI client.
 
         Args:
-            image_bytes: Raw image content
-            mime_type: Image MIME type (e.g. "image/jpeg", "image/png")
+            jpeg_bytes: Output of prepare_image
+            owner: Id of the uploading user; near-duplicates are only
+                   looked up among their own images
+            refresh: Skip the cache lookup and ask the model again (the
+                     fresh answer replaces any cached one)
 
         Returns:
-            List of raw row dicts with a "confidence" of "low" or "high".
+            (rows, vision_cache) where rows are shaped exactly like
+            parse_template_file's output plus a "confidence" of "low" or
+            "high", and vision_cache is "miss", "hit" or "near_duplicate".
             `role` is frequently null here by design — most schedule photos
             (whiteboards etc.) show names, not role labels, and the caller
             is expected to resolve role from name via the employee roster.
@@ -170,60 +259,125 @@ class TemplateImportService:
             day_of_week, start_time, or end_time does.
 
         Raises:
-            InvalidImageError: If the bytes can't be decoded as an image at
-                                all — browser-reported content-type is NOT
-                                trusted for this; decoding is the real check
-            ValueError: If the file decodes fine but the vision model's
-                        response can't be parsed
+            ValueError: If the vision model's response can't be parsed
             AIServiceUnavailableError: If GROQ_API_KEY isn't configured
+            PoolSaturatedError: If parse_pool or the AI client turns the
+                                call away
+            AIDeadlineExceededError: If the vision model doesn't answer in time
+        """
+        key, image_hash, cached = await parse_pool.run(
+            "vision_cache", self._lookup_vision_cache, jpeg_bytes, owner, refresh
+        )
+        if cached is not None:
+            raw_shifts, vision_cache = cached
+        else:
+            raw_shifts = await get_ai_service().analyze_image_for_templates(jpeg_bytes, "image/jpeg")
+            self._store_vision_result(key, owner, image_hash, raw_shifts)
+            vision_cache = "miss"
+        return _shifts_to_rows(raw_shifts), vision_cache
+
+    def _lookup_vision_cache(
+        self, jpeg_bytes: bytes, owner: str, refresh: bool
+    ) -> Tuple[str, int, Optional[Tuple[List[Dict[str, Any]], str]]]:
         """
-        jpeg_bytes = self._normalize_to_jpeg(image_bytes)
-
-        ai = get_ai_service()
-        raw_shifts = ai.analyze_image_for_templates(jpeg_bytes, "image/jpeg")
-
-        rows = []
-        for raw in raw_shifts:
-            fields = {
-                "name": raw.get("name"),
-                "day_of_week": raw.get("day_of_week"),
-                "start_time": raw.get("start_time"),
-                "end_time": raw.get("end_time"),
-                "role": raw.get("role"),
-                "count": raw.get("count"),
-            }
-            confidence_fields = ("name", "day_of_week", "start_time", "end_time")
-            confidence = "low" if any(fields[f] is None for f in confidence_fields) else "high"
-            rows.append({**{k: "" if v is None else str(v) for k, v in fields.items()}, "confidence": confidence})
-
-        logger.info("Parsed %d rows from image (mime=%s)", len(rows), mime_type)
-        return rows
+        (cache key, dHash, cached) for an image, where cached is
+        (shifts, "hit" | "near_duplicate"), or None on a miss or refresh.
+        An exact hit is added to owner's near-duplicate candidates.
+        """
+        key = f"{settings.GROQ_VISION_MODEL}:{hashlib.sha256(jpeg_bytes).hexdigest()}"
+        image_hash = _dhash(jpeg_bytes)
+
+        if not refresh:
+            cached = self._vision_cache.get(key)
+            if cached is not None:
+                logger.info("Vision cache hit for image %s", key[-12:])
+                with self._vision_lock:
+                    self._vision_hashes.setdefault(owner, {})[key] = image_hash
+                return key, image_hash, ([dict(shift) for shift in cached], "hit")
+            near = self._find_near_duplicate(owner, image_hash)
+            if near is not None:
+                near_key, cached, distance = near
+                logger.info(
+                    "Vision cache near-duplicate for image %s: %s (distance %d)",
+                    key[-12:],
+                    near_key[-12:],
+                    distance,
+                )
+                return key, image_hash, ([dict(shift) for shift in cached], "near_duplicate")
+        return key, image_hash, None
+
+    def _store_vision_result(
+        self, key: str, owner: str, image_hash: int, raw_shifts: List[Dict[str, Any]]
+    ) -> None:
+        self._vision_cache.set(key, [dict(shift) for shift in raw_shifts])
+        with self._vision_lock:
+            self._vision_hashes.setdefault(owner, {})[key] = image_hash
+
+    def _find_near_duplicate(
+        self, owner: str, image_hash: int
+    ) -> Optional[Tuple[str, List[Dict[str, Any]], int]]:
+        """Closest of owner's cached images within NEAR_DUPLICATE_MAX_DISTANCE,
+        if any, as (key, shifts, distance). Forgets hashes whose entry has
+        expired."""
+        with self._vision_lock:
+            candidates = sorted(
+                (bin(image_hash ^ other).count("1"), key)
+                for key, other in self._vision_hashes.get(owner, {}).items()
+            )
+        for distance, key in candidates:
+            if distance > NEAR_DUPLICATE_MAX_DISTANCE:
+                break
+            cached = self._vision_cache.get(key)
+            if cached is not None:
+                return key, cached, distance
+        # Drop hashes of evicted/expired entries so the scans stay small
+        with self._vision_lock:
+            for hashes_owner, hashes in list(self._vision_hashes.items()):
+                for key in [k for k in hashes if k not in self._vision_cache]:
+                    del hashes[key]
+                if not hashes:
+                    del self._vision_hashes[hashes_owner]
+        return None
+
+    def clear_vision_cache(self) -> None:
+        with self._vision_lock:
+            self._vision_hashes.clear()
+        self._vision_cache.clear()
 
     @staticmethod
     def _normalize_to_jpeg(image_bytes: bytes) -> bytes:
         """
         Decode any Pillow-readable image (including HEIC/HEIF, thanks to
         pillow_heif) and re-encode it as JPEG, downscaled if it's larger than
-        _MAX_IMAGE_DIMENSION on either side.
+        _MAX_IMAGE_DIMENSION on either side. JPEGs are decoded in draft mode
+        (see _MIN_DRAFT_DIMENSION) to keep peak memory down.
 
         This is what actually fixes "invalid image data" errors from the
         vision model on iPhone photos — HEIC is iOS's default camera format,
         and no mainstream vision API accepts it directly.
 
         Raises:
-            InvalidImageError: If the bytes aren't a readable image at all
+            InvalidImageError: If the bytes aren't a readable image at all, or
+                               decode to more pixels than Pillow's
+                               decompression-bomb limit
         """
         try:
             image = Image.open(io.BytesIO(image_bytes))
-            image.load()  # force full decode now, not lazily inside the request
-        except (UnidentifiedImageError, OSError) as e:
+            if image.format == "JPEG":
+                image.draft("RGB", _draft_size(image.size))
+            image.load()  # force decode now, not lazily inside the request
+        except (UnidentifiedImageError, OSError, Image.DecompressionBombError) as e:
             raise InvalidImageError(f"Could not read image file: {e}") from e
 
         if image.mode != "RGB":
             image = image.convert("RGB")
 
         if image.width > _MAX_IMAGE_DIMENSION or image.height > _MAX_IMAGE_DIMENSION:
-            image.thumbnail((_MAX_IMAGE_DIMENSION, _MAX_IMAGE_DIMENSION), Image.LANCZOS)
+            # reducing_gap: box-reduce by an integer factor first, then
+            # LANCZOS on the much smaller intermediate
+            image.thumbnail(
+                (_MAX_IMAGE_DIMENSION, _MAX_IMAGE_DIMENSION), Image.LANCZOS, reducing_gap=2.0
+            )
 
         buf = io.BytesIO()
         image.save(buf, format="JPEG", quality=90)
@@ -231,12 +385,16 @@ class TemplateImportService:
 
     # === Validation ===
 
-    def validate_parsed_templates(self, rows: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    def validate_parsed_templates(
+        self, rows: List[Dict[str, Any]], first_row_number: int = 1
+    ) -> List[Dict[str, Any]]:
         """
         Validate and normalize each parsed row.
 
         Args:
             rows: Raw rows from parse_template_file (or image parsing in Phase 4)
+            first_row_number: row_number of rows[0], for validating a file a
+                chunk at a time
 
         Returns:
             List of row dicts shaped like ParsedTemplateRow (row_number,
@@ -251,23 +409,29 @@ class TemplateImportService:
             A row with neither name nor role is an error either way, since
             nothing in it can be resolved to a template.
         """
+        # Day and time cells are parsed a column at a time; only the error
+        # bookkeeping below runs per row
+        frame = pd.DataFrame.from_records(rows, columns=["day_of_week", "start_time", "end_time"])
+        days = self._parse_days_of_week(frame["day_of_week"])
+        start_times = self._parse_times(frame["start_time"])
+        end_times = self._parse_times(frame["end_time"])
+
         validated = []
-        for i, raw in enumerate(rows, start=1):
+        for i, (raw, day_of_week, start_time, end_time) in enumerate(
+            zip(rows, days, start_times, end_times), start=first_row_number
+        ):
             errors: List[str] = []
             warnings: List[str] = []
             confidence = raw.get("confidence")  # set by image import only; None for file import
 
             name = str(raw.get("name") or "").strip()
 
-            day_of_week = self._parse_day_of_week(raw.get("day_of_week"))
             if day_of_week is None:
                 errors.append("day_of_week is missing or not recognized (expected 1-7 or a weekday name)")
 
-            start_time = self._parse_time(raw.get("start_time"))
             if start_time is None:
                 errors.append("start_time is missing or not a recognized time format")
 
-            end_time = self._parse_time(raw.get("end_time"))
             if end_time is None:
                 errors.append("end_time is missing or not a recognized time format")
 
@@ -318,42 +482,146 @@ class TemplateImportService:
         return validated
 
     @staticmethod
-    def _parse_day_of_week(value: Any) -> Optional[int]:
-        if value is None:
-            return None
-        text = str(value).strip().lower()
-        if not text:
-            return None
-
-        # Numeric (1-7, ISO 8601: Monday=1)
-        try:
-            num = int(float(text))
-            if 1 <= num <= 7:
-                return num
-            return None
-        except ValueError:
-            pass
-
-        if text in _DAY_NAME_TO_ISO:
-            return _DAY_NAME_TO_ISO[text]
-        if text[:3] in _DAY_ABBR_TO_ISO:
-            return _DAY_ABBR_TO_ISO[text[:3]]
-        return None
+    def _parse_days_of_week(values: pd.Series) -> List[Optional[int]]:
+        """
+        Parse a column of day cells: ISO numbers 1-7 (Monday=1, "2.0" is
+        fine) or weekday names/abbreviations. Unrecognized cells -> None.
+
+        Imported columns repeat a handful of values, so only the distinct
+        cells are parsed and the results mapped back.
+        """
+        codes, cells = pd.factorize(values.fillna("").astype(str))
+        text = pd.Series(cells, dtype=object).str.strip().str.lower()
+
+        numeric = pd.to_numeric(text, errors="coerce")
+        # A number outside 1-7 is invalid, not a name
+        in_range = numeric.where(numeric.abs() != float("inf")).floordiv(1)
+        in_range = in_range.where((in_range >= 1) & (in_range <= 7))
+        named = text.str[:3].map(_DAY_ABBR_TO_ISO)
+        days = [None if pd.isna(day) else int(day) for day in in_range.where(numeric.notna(), named)]
+
+        return [days[code] for code in codes]
 
     @staticmethod
-    def _parse_time(value: Any) -> Optional[str]:
-        if value is None:
-            return None
-        text = str(value).strip().upper().replace(".", "")
-        if not text:
-            return None
-
-        for fmt in _TIME_FORMATS:
-            try:
-                return datetime.strptime(text, fmt).strftime("%H:%M:%S")
-            except ValueError:
-                continue
-        return None
+    def _parse_times(values: pd.Series) -> List[Optional[str]]:
+        """
+        Parse a column of time cells into "HH:MM:SS" strings (see
+        _TIME_PATTERN for accepted shapes). Unrecognized cells -> None.
+        Like _parse_days_of_week, works on the distinct cells only.
+        """
+        codes, cells = pd.factorize(values.fillna("").astype(str))
+        text = pd.Series(cells, dtype=object).str.strip().str.upper().str.replace(".", "", regex=False)
+        parts = text.str.extract(_TIME_PATTERN)
+
+        normalized = (
+            parts["hour"].str.zfill(2)
+            + ":" + parts["minute"].fillna("0").str.zfill(2)
+            + ":" + parts["second"].fillna("0").str.zfill(2)
+        )
+        meridiem = parts["meridiem"]
+        is_12h = meridiem.notna()
+        # "17" alone is ambiguous; 24-hour cells need minutes
+        is_24h = ~is_12h & parts["minute"].notna()
+
+        parsed = pd.to_datetime(
+            normalized.where(is_24h), format=_TIME_FORMAT_24H, errors="coerce"
+        )
+        parsed_12h = pd.to_datetime(
+            (normalized + " " + meridiem).where(is_12h), format=_TIME_FORMAT_12H, errors="coerce"
+        )
+        times = [
+            None if pd.isna(t) else t for t in parsed.fillna(parsed_12h).dt.strftime("%H:%M:%S")
+        ]
+
+        return [times[code] for code in codes]
+
+    # === Async previews (worker pools) ===
+
+    async def preview_image(self, image_bytes: bytes, owner: str, refresh: bool = False) -> Dict[str, Any]:
+        """
+        Preview an uploaded image: prepare_image on parse_pool, then
+        analyze_prepared_image and validation.
+
+        Returns:
+            Dict shaped like TemplateImportPreviewResponse
+
+        Raises:
+            PoolSaturatedError: If a pool or the AI client turns the call away
+            As prepare_image / analyze_prepared_image
+        """
+        jpeg_bytes = await parse_pool.run("decode_image", self.prepare_image, image_bytes)
+        rows, vision_cache = await self.analyze_prepared_image(jpeg_bytes, owner, refresh)
+        # Vision output is a few dozen rows at most; cheap enough for the loop
+        validated_rows = self.validate_parsed_templates(rows)
+        return {
+            "column_mapping": {},
+            "rows": validated_rows,
+            "valid_count": sum(1 for r in validated_rows if r["is_valid"]),
+            "error_count": sum(1 for r in validated_rows if not r["is_valid"]),
+            "vision_cache": vision_cache,
+        }
+
+    async def preview_upload(
+        self, filename: str, data: bytes, owner: str, refresh: bool = False
+    ) -> Dict[str, Any]:
+        """
+        Preview one upload of either kind: spreadsheets (by extension) via
+        preview_template_file on parse_pool, anything else as an image via
+        preview_image.
+
+        Raises:
+            PoolSaturatedError: If a pool turns the stage away
+            As preview_template_file / preview_image
+        """
+        if is_spreadsheet(filename):
+            return await parse_pool.run("parse_file", self.preview_template_file, data, filename)
+        return await self.preview_image(data, owner, refresh)
+
+    async def preview_batch(
+        self,
+        files: List[Tuple[str, bytes]],
+        owner: str,
+        refresh: bool = False,
+        concurrency: int = settings.BATCH_IMPORT_CONCURRENCY,
+    ) -> List[Dict[str, Any]]:
+        """
+        Preview several uploads (a mix of spreadsheets and photos) at once.
+
+        Up to `concurrency` files are in flight at a time, so one file's
+        vision call overlaps the next files' parsing and decoding, while a
+        large batch still can't flood the shared pools. A file that fails
+        (unreadable, vision error, pool busy) gets an error entry; the rest
+        of the batch still comes back.
+
+        Args:
+            files: (filename, content) per upload
+            owner: Id of the uploading user (see analyze_prepared_image)
+            refresh: Skip the vision cache for images
+            concurrency: Files of this batch processed at once
+
+        Returns:
+            One {"filename", "kind" ("file" | "image"), "preview", "error"}
+            per file, in upload order; exactly one of preview / error is set
+        """
+        semaphore = asyncio.Semaphore(concurrency)
+
+        async def preview_one(filename: str, data: bytes) -> Dict[str, Any]:
+            kind = "file" if is_spreadsheet(filename) else "image"
+            result: Dict[str, Any] = {"filename": filename, "kind": kind, "preview": None, "error": None}
+            async with semaphore:
+                try:
+                    result["preview"] = await self.preview_upload(filename, data, owner, refresh)
+                except Exception as e:
+                    result["error"] = _batch_error_message(kind, filename, e)
+            return result
+
+        results = await asyncio.gather(*(preview_one(name, data) for name, data in files))
+        logger.info(
+            "Batch import previewed %d files (%d failed)",
+            len(results),
+            sum(1 for r in results if r["error"]),
+        )
+        return list(results)
 
     # === Saving ===
 
@@ -388,5 +656,116 @@ class TemplateImportService:
         merged = existing_templates + rows
         return self.shift_template_service.upsert_templates(restaurant_id, merged)
 
+    def save_templates_for_restaurants(
+        self, imports: List[Tuple[str, List[Dict[str, Any]]]]
+    ) -> List[Dict[str, Any]]:
+        """
+        Save the confirmed rows of a batch import. Rows are grouped by
+        restaurant first, so several files for the same location still
+        mean one save_templates_batch (one upsert) for it.
+
+        A restaurant whose save fails is reported and the others are still
+        saved; each restaurant's upsert is all-or-nothing on its own.
+
+        Args:
+            imports: (restaurant_id, confirmed rows) per imported file
+
+        Returns:
+            One {"restaurant_id", "imported_count", "error"} per restaurant,
+            in first-seen order
+        """
+        grouped: Dict[str, List[Dict[str, Any]]] = {}
+        for restaurant_id, rows in imports:
+            grouped.setdefault(restaurant_id, []).extend(rows)
+
+        results = []
+        for restaurant_id, rows in grouped.items():
+            try:
+                self.save_templates_batch(restaurant_id, rows)
+            except Exception as e:
+                logger.exception("Batch import save failed for restaurant_id=%s: %s", restaurant_id, e)
+                results.append(
+                    {
+                        "restaurant_id": restaurant_id,
+                        "imported_count": 0,
+                        "error": f"Failed to save imported templates: {e}",
+                    }
+                )
+                continue
+            results.append({"restaurant_id": restaurant_id, "imported_count": len(rows), "error": None})
+        return results
+
+
+def _shifts_to_rows(raw_shifts: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """Vision model shifts -> raw rows like parse_template_file's, plus a
+    "confidence" flag ("low" if any identifying field came back null)."""
+    rows = []
+    for raw in raw_shifts:
+        fields = {
+            "name": raw.get("name"),
+            "day_of_week": raw.get("day_of_week"),
+            "start_time": raw.get("start_time"),
+            "end_time": raw.get("end_time"),
+            "role": raw.get("role"),
+            "count": raw.get("count"),
+        }
+        confidence_fields = ("name", "day_of_week", "start_time", "end_time")
+        confidence = "low" if any(fields[f] is None for f in confidence_fields) else "high"
+        rows.append({**{k: "" if v is None else str(v) for k, v in fields.items()}, "confidence": confidence})
+    return rows
+
+
+def _batch_error_message(kind: str, filename: str, e: Exception) -> str:
+    """
+    Client-facing error for one file of a batch, matching what the
+    single-file endpoints would have said.
+    """
+    if isinstance(
+        e, (PoolSaturatedError, AIServiceUnavailableError, AIDeadlineExceededError, InvalidImageError)
+    ):
+        return str(e)
+    if isinstance(e, ValueError):
+        if kind == "file":
+            return str(e)
+        # The image decoded fine, so this is the vision model's response
+        logger.error("Vision model response unusable for %s: %s", filename, e)
+        return "Vision AI returned an unexpected response. Please try again."
+    logger.exception("Batch import of %s failed: %s", filename, e)
+    if kind == "file":
+        return "An unexpected error occurred while parsing the file."
+    return "Vision AI analysis failed. Please try again later."
+
+
+def _dhash(jpeg_bytes: bytes, size: int = DHASH_SIZE) -> int:
+    """
+    Difference hash (size*size bits): shrink to (size+1) x size grayscale
+    and set one bit per pixel brighter than its right-hand neighbour.
+    Re-encoding or resizing an image barely changes it. Decoded at a
+    reduced scale, so it costs a few milliseconds.
+    """
+    image = Image.open(io.BytesIO(jpeg_bytes))
+    image.draft("L", (size * 8, size * 8))
+    width = size + 1
+    pixels = image.convert("L").resize((width, size), Image.BILINEAR).tobytes()
+    bits = 0
+    for row in range(size):
+        for col in range(size):
+            offset = row * width + col
+            bits = (bits << 1) | (pixels[offset] > pixels[offset + 1])
+    return bits
+
+
+def _draft_size(size: Tuple[int, int]) -> Tuple[int, int]:
+    """
+    Size to request from Image.draft(): the image scaled so its long side
+    is _MIN_DRAFT_DIMENSION. draft() then picks the largest DCT reduction
+    that still yields at least this size.
+    """
+    width, height = size
+    scale = max(width, height) / _MIN_DRAFT_DIMENSION
+    if scale <= 1:
+        return size
+    return (max(1, int(width / scale)), max(1, int(height / scale)))
+
 
 template_import_service = TemplateImportService()
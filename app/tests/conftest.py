@@ -20,7 +20,10 @@ def make_supabase_chain(return_data=None):
     """Build a chainable Supabase mock where every method returns itself and
     .execute() returns a MagicMock with the given data list."""
     chain = MagicMock()
-    for method in ("table", "select", "insert", "update", "upsert", "delete", "eq", "neq", "gte", "lte", "order", "limit"):
+    for method in (
+        "table", "select", "insert", "update", "upsert", "delete", "rpc",
+        "eq", "neq", "gt", "gte", "lt", "lte", "in_", "or_", "order", "limit",
+    ):
         getattr(chain, method).return_value = chain
     chain.execute.return_value = MagicMock(data=return_data if return_data is not None else [])
     return chain
@@ -119,3 +122,18 @@ def shifts_service(mock_supabase):
 def generator_service(mock_supabase):
     from app.services.schedule_generator_service import ScheduleGenerator
     return ScheduleGenerator(mock_supabase)
+
+
+@pytest.fixture(autouse=True)
+def change_log():
+    """Service writes append to the change log through a module singleton;
+    point it at its own mock so no test reaches a real database. Tests can
+    request this fixture to inspect what was logged."""
+    from app.services.change_log_service import change_log_service
+
+    original = change_log_service._supabase
+    change_log_service._supabase = make_supabase_chain()
+    change_log_service._schedule_restaurants.clear()
+    yield change_log_service
+    change_log_service._supabase = original
+    change_log_service._schedule_restaurants.clear()
@@ -0,0 +1,168 @@
+import asyncio
+from unittest.mock import AsyncMock, MagicMock
+
+import groq
+import httpx
+import pytest
+
+from app.core import ai_client
+from app.core.ai_client import AIDeadlineExceededError, AIMetrics, AsyncCompletionClient
+from app.core.workers import PoolSaturatedError, start_stage_timings
+
+MODEL = "test-model"
+
+
+@pytest.fixture(autouse=True)
+def no_backoff(monkeypatch):
+    monkeypatch.setattr(ai_client, "BACKOFF_BASE_SECONDS", 0)
+
+
+def _status_error(cls, status_code: int, headers=None):
+    response = httpx.Response(status_code, headers=headers, request=httpx.Request("POST", "https://api.groq.test"))
+    return cls("upstream said no", response=response, body=None)
+
+
+def _client(create, **kwargs) -> AsyncCompletionClient:
+    groq_client = MagicMock()
+    groq_client.chat.completions.create = create
+    options = {"max_concurrency": 2, "max_queued": 2, "metrics": AIMetrics(), **kwargs}
+    return AsyncCompletionClient(groq_client, **options)
+
+
+def test_complete_passes_model_and_kwargs_and_records_latency():
+    create = AsyncMock(return_value="response")
+    client = _client(create)
+
+    async def scenario():
+        timings = start_stage_timings()
+        return await client.complete("vision", 5, model=MODEL, temperature=0.1), timings
+
+    result, timings = asyncio.run(scenario())
+
+    assert result == "response"
+    create.assert_awaited_once_with(model=MODEL, temperature=0.1)
+    stats = client.metrics.snapshot()[MODEL]
+    assert stats["calls"] == 1 and stats["latency_ms"]["le_250"] == 1 and stats["errors"] == {}
+    assert timings.summary()["stages"][0]["stage"] == "vision"
+
+
+def test_complete_retries_rate_limits_and_server_errors():
+    create = AsyncMock(side_effect=[
+        _status_error(groq.RateLimitError, 429),
+        _status_error(groq.InternalServerError, 503),
+        "response",
+    ])
+    client = _client(create)
+
+    assert asyncio.run(client.complete("analysis", 5, model=MODEL)) == "response"
+    stats = client.metrics.snapshot()[MODEL]
+    assert create.await_count == 3
+    assert stats["errors"] == {"rate_limited": 1, "server_error": 1}
+    assert stats["retries"] == 2
+
+
+def test_complete_does_not_retry_client_errors():
+    create = AsyncMock(side_effect=_status_error(groq.BadRequestError, 400))
+    client = _client(create)
+
+    with pytest.raises(groq.BadRequestError):
+        asyncio.run(client.complete("analysis", 5, model=MODEL))
+    assert create.await_count == 1
+    assert client.metrics.snapshot()[MODEL]["errors"] == {"client_error": 1}
+
+
+def test_complete_gives_up_after_max_attempts():
+    create = AsyncMock(side_effect=_status_error(groq.InternalServerError, 500))
+    client = _client(create, max_attempts=2)
+
+    with pytest.raises(groq.InternalServerError):
+        asyncio.run(client.complete("analysis", 5, model=MODEL))
+    assert create.await_count == 2
+
+
+def test_complete_gives_up_when_retry_after_outlasts_the_deadline():
+    create = AsyncMock(side_effect=_status_error(groq.RateLimitError, 429, headers={"retry-after": "30"}))
+    client = _client(create)
+
+    with pytest.raises(groq.RateLimitError):
+        asyncio.run(client.complete("analysis", 1, model=MODEL))
+    assert create.await_count == 1
+
+
+def test_complete_raises_deadline_exceeded():
+    async def hang(**kwargs):
+        await asyncio.sleep(10)
+
+    client = _client(hang)
+
+    with pytest.raises(AIDeadlineExceededError):
+        asyncio.run(client.complete("vision", 0.05, model=MODEL))
+    assert client.metrics.snapshot()[MODEL]["errors"] == {"deadline_exceeded": 1}
+
+
+def test_complete_rejects_beyond_concurrency_plus_queue():
+    release = None
+
+    async def wait_for_release(**kwargs):
+        await release.wait()
+        return "response"
+
+    client = _client(wait_for_release, max_concurrency=1, max_queued=1)
+
+    async def scenario():
+        nonlocal release
+        release = asyncio.Event()
+        running = asyncio.ensure_future(client.complete("a", 5, model=MODEL))
+        queued = asyncio.ensure_future(client.complete("b", 5, model=MODEL))
+        await asyncio.sleep(0.01)
+        with pytest.raises(PoolSaturatedError):
+            await client.complete("c", 5, model=MODEL)
+        release.set()
+        return await asyncio.gather(running, queued)
+
+    assert asyncio.run(scenario()) == ["response", "response"]
+
+
+def test_complete_hedges_a_request_slower_than_p95():
+    calls = 0
+
+    async def first_hangs(**kwargs):
+        nonlocal calls
+        calls += 1
+        if calls == 1:
+            await asyncio.sleep(10)
+        return f"response {calls}"
+
+    client = _client(first_hangs, hedge=True)
+    for _ in range(ai_client.HEDGE_MIN_SAMPLES):
+        client.metrics.record_call(MODEL, 20)
+
+    assert asyncio.run(client.complete("vision", 5, model=MODEL)) == "response 2"
+    stats = client.metrics.snapshot()[MODEL]
+    assert (stats["hedges"], stats["hedge_wins"]) == (1, 1)
+
+
+def test_complete_does_not_hedge_without_enough_samples():
+    create = AsyncMock(return_value="response")
+    client = _client(create, hedge=True)
+
+    asyncio.run(client.complete("vision", 5, model=MODEL))
+    assert create.await_count == 1
+    assert client.metrics.snapshot()[MODEL]["hedges"] == 0
+
+
+def test_metrics_histogram_and_percentiles():
+    metrics = AIMetrics()
+    for latency in (100, 300, 300, 5000, 70000):
+        metrics.record_call(MODEL, latency)
+    metrics.record_call(MODEL, 1200, "timeout")
+
+    stats = metrics.snapshot()[MODEL]
+    assert stats["calls"] == 6
+    assert stats["latency_ms"]["le_250"] == 1
+    assert stats["latency_ms"]["le_500"] == 2
+    assert stats["latency_ms"]["le_2000"] == 1
+    assert stats["latency_ms"]["le_8000"] == 1
+    assert stats["latency_ms"]["le_inf"] == 1
+    assert stats["p50_ms"] == 300 and stats["p95_ms"] == 70000
+    assert stats["errors"] == {"timeout": 1}
@@ -1,5 +1,7 @@
+import asyncio
+
 import pytest
-from unittest.mock import MagicMock, patch
+from unittest.mock import AsyncMock, MagicMock, patch
 
 from app.tests.conftest import SCHEDULE_ID, RESTAURANT_ID, EMPLOYEE_ID, EMPLOYEE_ID_2
 
@@ -48,21 +50,28 @@ VALID_ANALYSIS = {
 
 
 def _make_ai_service():
-    """Build an AIService with a mocked Groq client."""
+    """Build an AIService with a mocked async completion client."""
     from app.services.ai_service import AIService
-    with patch("app.services.ai_service.settings") as mock_settings, \
-         patch("app.services.ai_service.groq.Groq"):
+    with patch("app.services.ai_service.settings") as mock_settings:
         mock_settings.GROQ_API_KEY = "test-key"
-        return AIService()
+        svc = AIService()
+    svc._async_client = MagicMock()
+    svc._async_client.complete = AsyncMock()
+    return svc
 
 
 def _mock_groq_response(svc, content: str) -> None:
-    """Wire the Groq client mock to return a specific content string."""
+    """Wire the completion client mock to return a specific content string."""
     mock_choice = MagicMock()
     mock_choice.message.content = content
     mock_response = MagicMock()
     mock_response.choices = [mock_choice]
-    svc._client.chat.completions.create.return_value = mock_response
+    svc._async_client.complete.return_value = mock_response
+
+
+def _request_kwargs(svc) -> dict:
+    """Keyword arguments (model, messages, ...) of the last completion request."""
+    return svc._async_client.complete.call_args[1]
 
 
 # === AIService init ===
@@ -75,13 +84,18 @@ def test_ai_service_raises_when_no_api_key():
             AIService()
 
 
-def test_ai_service_creates_client_when_key_present():
+def test_ai_service_builds_async_client_on_first_use():
     from app.services.ai_service import AIService
     with patch("app.services.ai_service.settings") as mock_settings, \
-         patch("app.services.ai_service.groq.Groq") as mock_groq:
+         patch("app.services.ai_service.groq.AsyncGroq") as mock_groq:
         mock_settings.GROQ_API_KEY = "test-key"
-        AIService()
-        mock_groq.assert_called_once_with(api_key="test-key")
+        mock_settings.AI_MAX_CONCURRENCY = 4
+        mock_settings.AI_MAX_QUEUED = 16
+        svc = AIService()
+        mock_groq.assert_not_called()
+        assert svc.async_client is svc.async_client
+        # Retries are the completion client's, within each call's deadline
+        mock_groq.assert_called_once_with(api_key="test-key", max_retries=0)
 
 
 # === analyze_schedule — happy path ===
@@ -91,7 +105,7 @@ def test_analyze_schedule_returns_structured_dict():
     svc = _make_ai_service()
     _mock_groq_response(svc, json.dumps(VALID_ANALYSIS))
 
-    result = svc.analyze_schedule(SAMPLE_SCHEDULE, SAMPLE_SHIFTS)
+    result = asyncio.run(svc.analyze_schedule(SAMPLE_SCHEDULE, SAMPLE_SHIFTS))
 
     assert isinstance(result, dict)
     assert "summary" in result
@@ -107,7 +121,7 @@ def test_analyze_schedule_scores_are_valid_values():
     svc = _make_ai_service()
     _mock_groq_response(svc, json.dumps(VALID_ANALYSIS))
 
-    result = svc.analyze_schedule(SAMPLE_SCHEDULE, SAMPLE_SHIFTS)
+    result = asyncio.run(svc.analyze_schedule(SAMPLE_SCHEDULE, SAMPLE_SHIFTS))
 
     for dim in ("fairness", "coverage", "workload"):
         assert result[dim]["score"] in ("good", "fair", "poor")
@@ -118,9 +132,9 @@ def test_analyze_schedule_calls_correct_model():
     svc = _make_ai_service()
     _mock_groq_response(svc, json.dumps(VALID_ANALYSIS))
 
-    svc.analyze_schedule(SAMPLE_SCHEDULE, SAMPLE_SHIFTS)
+    asyncio.run(svc.analyze_schedule(SAMPLE_SCHEDULE, SAMPLE_SHIFTS))
 
-    call_kwargs = svc._client.chat.completions.create.call_args[1]
+    call_kwargs = _request_kwargs(svc)
     assert call_kwargs["model"] == "llama-3.3-70b-versatile"
 
 
@@ -129,9 +143,9 @@ def test_analyze_schedule_requests_json_output():
     svc = _make_ai_service()
     _mock_groq_response(svc, json.dumps(VALID_ANALYSIS))
 
-    svc.analyze_schedule(SAMPLE_SCHEDULE, SAMPLE_SHIFTS)
+    asyncio.run(svc.analyze_schedule(SAMPLE_SCHEDULE, SAMPLE_SHIFTS))
 
-    call_kwargs = svc._client.chat.completions.create.call_args[1]
+    call_kwargs = _request_kwargs(svc)
     assert call_kwargs["response_format"] == {"type": "json_object"}
 
 
@@ -140,9 +154,9 @@ def test_analyze_schedule_passes_system_prompt():
     svc = _make_ai_service()
     _mock_groq_response(svc, json.dumps(VALID_ANALYSIS))
 
-    svc.analyze_schedule(SAMPLE_SCHEDULE, SAMPLE_SHIFTS)
+    asyncio.run(svc.analyze_schedule(SAMPLE_SCHEDULE, SAMPLE_SHIFTS))
 
-    messages = svc._client.chat.completions.create.call_args[1]["messages"]
+    messages = _request_kwargs(svc)["messages"]
     system_msg = next((m for m in messages if m["role"] == "system"), None)
     assert system_msg is not None
     assert "json" in system_msg["content"].lower()
@@ -153,7 +167,7 @@ def test_analyze_schedule_patterns_and_recommendations_are_lists():
     svc = _make_ai_service()
     _mock_groq_response(svc, json.dumps(VALID_ANALYSIS))
 
-    result = svc.analyze_schedule(SAMPLE_SCHEDULE, SAMPLE_SHIFTS)
+    result = asyncio.run(svc.analyze_schedule(SAMPLE_SCHEDULE, SAMPLE_SHIFTS))
 
     assert isinstance(result["patterns"], list)
     assert isinstance(result["recommendations"], list)
@@ -166,7 +180,7 @@ def test_analyze_schedule_raises_on_invalid_json():
     _mock_groq_response(svc, "this is not json at all")
 
     with pytest.raises(ValueError, match="malformed JSON"):
-        svc.analyze_schedule(SAMPLE_SCHEDULE, SAMPLE_SHIFTS)
+        asyncio.run(svc.analyze_schedule(SAMPLE_SCHEDULE, SAMPLE_SHIFTS))
 
 
 def test_analyze_schedule_raises_on_missing_fields():
@@ -176,7 +190,7 @@ def test_analyze_schedule_raises_on_missing_fields():
     _mock_groq_response(svc, json.dumps(incomplete))
 
     with pytest.raises(ValueError, match="missing required fields"):
-        svc.analyze_schedule(SAMPLE_SCHEDULE, SAMPLE_SHIFTS)
+        asyncio.run(svc.analyze_schedule(SAMPLE_SCHEDULE, SAMPLE_SHIFTS))
 
 
 def test_analyze_schedule_raises_on_invalid_score():
@@ -189,7 +203,7 @@ def test_analyze_schedule_raises_on_invalid_score():
     _mock_groq_response(svc, json.dumps(bad_score))
 
     with pytest.raises(ValueError, match="Invalid score value"):
-        svc.analyze_schedule(SAMPLE_SCHEDULE, SAMPLE_SHIFTS)
+        asyncio.run(svc.analyze_schedule(SAMPLE_SCHEDULE, SAMPLE_SHIFTS))
 
 
 def test_analyze_schedule_raises_on_malformed_dimension():
@@ -202,7 +216,7 @@ def test_analyze_schedule_raises_on_malformed_dimension():
     _mock_groq_response(svc, json.dumps(missing_details))
 
     with pytest.raises(ValueError, match="malformed 'coverage'"):
-        svc.analyze_schedule(SAMPLE_SCHEDULE, SAMPLE_SHIFTS)
+        asyncio.run(svc.analyze_schedule(SAMPLE_SCHEDULE, SAMPLE_SHIFTS))
 
 
 # === _build_analysis_prompt ===
@@ -295,7 +309,7 @@ def test_analyze_image_returns_shifts_list():
         ),
     )
 
-    result = svc.analyze_image_for_templates(b"fake-image-bytes", "image/png")
+    result = asyncio.run(svc.analyze_image_for_templates(b"fake-image-bytes", "image/png"))
 
     assert isinstance(result, list)
     assert result[0]["role"] == "Server"
@@ -310,7 +324,7 @@ def test_analyze_image_accepts_bare_list_response():
         json.dumps([{"day_of_week": 3, "start_time": "11:00", "end_time": "20:00", "role": "Cook", "count": 2}]),
     )
 
-    result = svc.analyze_image_for_templates(b"fake-image-bytes", "image/png")
+    result = asyncio.run(svc.analyze_image_for_templates(b"fake-image-bytes", "image/png"))
 
     assert len(result) == 1
     assert result[0]["role"] == "Cook"
@@ -324,7 +338,7 @@ def test_analyze_image_flags_uncertain_fields_as_null():
         json.dumps({"shifts": [{"day_of_week": 2, "start_time": None, "end_time": None, "role": "Server", "count": None}]}),
     )
 
-    result = svc.analyze_image_for_templates(b"fake-image-bytes", "image/png")
+    result = asyncio.run(svc.analyze_image_for_templates(b"fake-image-bytes", "image/png"))
 
     assert result[0]["start_time"] is None
     assert result[0]["count"] is None
@@ -335,7 +349,7 @@ def test_analyze_image_raises_on_invalid_json():
     _mock_groq_response(svc, "not json")
 
     with pytest.raises(ValueError, match="malformed JSON"):
-        svc.analyze_image_for_templates(b"fake-image-bytes", "image/png")
+        asyncio.run(svc.analyze_image_for_templates(b"fake-image-bytes", "image/png"))
 
 
 def test_analyze_image_raises_when_shifts_key_missing():
@@ -344,20 +358,19 @@ def test_analyze_image_raises_when_shifts_key_missing():
     _mock_groq_response(svc, json.dumps({"summary": "no shifts key here"}))
 
     with pytest.raises(ValueError, match="shifts"):
-        svc.analyze_image_for_templates(b"fake-image-bytes", "image/png")
+        asyncio.run(svc.analyze_image_for_templates(b"fake-image-bytes", "image/png"))
 
 
 def test_analyze_image_uses_configured_vision_model():
     import json
     svc = _make_ai_service()
-    svc._client.chat.completions.create = MagicMock()
     _mock_groq_response(svc, json.dumps({"shifts": []}))
 
     from app.services import ai_service as ai_module
     with patch.object(ai_module.settings, "GROQ_VISION_MODEL", "test-vision-model"):
-        svc.analyze_image_for_templates(b"fake-image-bytes", "image/jpeg")
+        asyncio.run(svc.analyze_image_for_templates(b"fake-image-bytes", "image/jpeg"))
 
-    call_kwargs = svc._client.chat.completions.create.call_args[1]
+    call_kwargs = _request_kwargs(svc)
     assert call_kwargs["model"] == "test-vision-model"
 
 
@@ -367,20 +380,68 @@ def test_analyze_image_embeds_base64_data_uri():
     svc = _make_ai_service()
     _mock_groq_response(svc, json.dumps({"shifts": []}))
 
-    svc.analyze_image_for_templates(b"fake-image-bytes", "image/png")
+    asyncio.run(svc.analyze_image_for_templates(b"fake-image-bytes", "image/png"))
 
-    call_kwargs = svc._client.chat.completions.create.call_args[1]
+    call_kwargs = _request_kwargs(svc)
     user_message = next(m for m in call_kwargs["messages"] if m["role"] == "user")
     image_part = next(p for p in user_message["content"] if p["type"] == "image_url")
     expected_b64 = base64.b64encode(b"fake-image-bytes").decode("utf-8")
     assert image_part["image_url"]["url"] == f"data:image/png;base64,{expected_b64}"
 
 
+# === deadlines ===
+
+def test_analyze_schedule_runs_under_the_analysis_deadline():
+    import json
+    from app.services import ai_service as ai_module
+    svc = _make_ai_service()
+    _mock_groq_response(svc, json.dumps(VALID_ANALYSIS))
+
+    asyncio.run(svc.analyze_schedule(SAMPLE_SCHEDULE, SAMPLE_SHIFTS))
+
+    stage, deadline = svc._async_client.complete.call_args[0]
+    assert (stage, deadline) == ("analysis", ai_module.settings.AI_ANALYSIS_DEADLINE_SECONDS)
+
+
+def test_analyze_image_runs_under_the_vision_deadline():
+    import json
+    from app.services import ai_service as ai_module
+    svc = _make_ai_service()
+    _mock_groq_response(svc, json.dumps({"shifts": []}))
+
+    asyncio.run(svc.analyze_image_for_templates(b"fake-image-bytes", "image/png"))
+
+    stage, deadline = svc._async_client.complete.call_args[0]
+    assert (stage, deadline) == ("vision", ai_module.settings.AI_VISION_DEADLINE_SECONDS)
+
+
+# === analysis_input_hash ===
+
+def test_analysis_input_hash_ignores_shift_order():
+    from app.services.ai_service import analysis_input_hash
+    forward = analysis_input_hash(SAMPLE_SCHEDULE, SAMPLE_SHIFTS, SAMPLE_EMPLOYEES)
+    backward = analysis_input_hash(SAMPLE_SCHEDULE, list(reversed(SAMPLE_SHIFTS)), SAMPLE_EMPLOYEES)
+    assert forward == backward
+
+
+def test_analysis_input_hash_changes_with_shifts_roster_and_prompt_version():
+    from app.services import ai_service
+    baseline = ai_service.analysis_input_hash(SAMPLE_SCHEDULE, SAMPLE_SHIFTS, SAMPLE_EMPLOYEES)
+
+    moved = [{**SAMPLE_SHIFTS[0], "end_time": "18:00:00"}, SAMPLE_SHIFTS[1]]
+    assert ai_service.analysis_input_hash(SAMPLE_SCHEDULE, moved, SAMPLE_EMPLOYEES) != baseline
+
+    hired = SAMPLE_EMPLOYEES + [{"id": "ccc", "name": "Cara", "role": "Host", "is_active": True}]
+    assert ai_service.analysis_input_hash(SAMPLE_SCHEDULE, SAMPLE_SHIFTS, hired) != baseline
+
+    with patch.object(ai_service, "ANALYSIS_PROMPT_VERSION", "next"):
+        assert ai_service.analysis_input_hash(SAMPLE_SCHEDULE, SAMPLE_SHIFTS, SAMPLE_EMPLOYEES) != baseline
+
+
 def test_get_ai_service_returns_same_instance():
     """get_ai_service() must return the same object on repeated calls."""
     import app.services.ai_service as ai_module
-    with patch("app.services.ai_service.settings") as mock_settings, \
-         patch("app.services.ai_service.groq.Groq"):
+    with patch("app.services.ai_service.settings") as mock_settings:
         mock_settings.GROQ_API_KEY = "test-key"
         # Reset singleton for clean test
         ai_module._ai_service = None
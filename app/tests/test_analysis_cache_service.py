@@ -0,0 +1,46 @@
+from app.services.ai_service import ANALYSIS_PROMPT_VERSION, MODEL
+from app.services.analysis_cache_service import AnalysisCacheService
+from app.tests.conftest import SCHEDULE_ID, make_supabase_chain
+
+INPUT_HASH = "ab" * 32
+ANALYSIS = {"summary": "A balanced week.", "patterns": [], "recommendations": []}
+
+
+def test_get_returns_unexpired_result():
+    mock_sb = make_supabase_chain([{"result": ANALYSIS}])
+
+    assert AnalysisCacheService(mock_sb).get(INPUT_HASH) == ANALYSIS
+    mock_sb.table.assert_called_with("schedule_analyses")
+    mock_sb.eq.assert_called_with("input_hash", INPUT_HASH)
+    assert mock_sb.gt.call_args[0][0] == "expires_at"
+
+
+def test_get_miss_returns_none():
+    assert AnalysisCacheService(make_supabase_chain([])).get(INPUT_HASH) is None
+
+
+def test_get_treats_read_failure_as_miss():
+    mock_sb = make_supabase_chain()
+    mock_sb.execute.side_effect = Exception("connection reset")
+
+    assert AnalysisCacheService(mock_sb).get(INPUT_HASH) is None
+
+
+def test_put_upserts_by_input_hash_with_expiry():
+    mock_sb = make_supabase_chain()
+
+    AnalysisCacheService(mock_sb).put(INPUT_HASH, SCHEDULE_ID, ANALYSIS, ttl_seconds=3600)
+
+    row = mock_sb.upsert.call_args[0][0]
+    assert mock_sb.upsert.call_args[1] == {"on_conflict": "input_hash"}
+    assert row["input_hash"] == INPUT_HASH and row["schedule_id"] == SCHEDULE_ID
+    assert (row["model"], row["prompt_version"]) == (MODEL, ANALYSIS_PROMPT_VERSION)
+    assert row["result"] == ANALYSIS
+    assert row["expires_at"] > row["created_at"]
+
+
+def test_put_swallows_write_failure():
+    mock_sb = make_supabase_chain()
+    mock_sb.execute.side_effect = Exception("connection reset")
+
+    AnalysisCacheService(mock_sb).put(INPUT_HASH, SCHEDULE_ID, ANALYSIS)
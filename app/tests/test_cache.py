@@ -0,0 +1,56 @@
+from app.core.cache import TTLCache
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+def test_get_returns_value_until_ttl_expires():
+    clock = FakeClock()
+    cache = TTLCache(max_size=10, ttl_seconds=5, clock=clock)
+    cache.set("a", 1)
+    clock.now = 4.9
+    assert cache.get("a") == 1
+    clock.now = 5.0
+    assert cache.get("a") is None
+    assert len(cache) == 0
+
+
+def test_per_entry_ttl_overrides_default():
+    clock = FakeClock()
+    cache = TTLCache(max_size=10, ttl_seconds=60, clock=clock)
+    cache.set("short", 1, ttl_seconds=1)
+    clock.now = 2
+    assert "short" not in cache
+
+
+def test_evicts_least_recently_used_when_full():
+    cache = TTLCache(max_size=2, ttl_seconds=60)
+    cache.set("a", 1)
+    cache.set("b", 2)
+    cache.get("a")  # b is now least recently used
+    cache.set("c", 3)
+    assert "a" in cache
+    assert "b" not in cache
+    assert "c" in cache
+
+
+def test_falsy_values_are_cached():
+    cache = TTLCache(max_size=2, ttl_seconds=60)
+    cache.set("empty", [])
+    assert "empty" in cache
+    assert cache.get("empty", "default") == []
+
+
+def test_pop_and_clear():
+    cache = TTLCache(max_size=10, ttl_seconds=60)
+    cache.set("a", 1)
+    cache.set("b", 2)
+    assert cache.pop("a") == 1
+    assert cache.pop("a", "gone") == "gone"
+    cache.clear()
+    assert len(cache) == 0
@@ -0,0 +1,95 @@
+import pytest
+from datetime import date, datetime, timezone
+from unittest.mock import MagicMock
+
+from app.core.cache import TTLCache
+from app.services.calendar_feed_service import CalendarFeedService
+from app.services.employee_service import EmployeeNotFoundError
+from app.tests.conftest import EMPLOYEE_ID, RESTAURANT_ID, SHIFT_ID, make_supabase_chain
+
+TODAY = date(2026, 4, 22)
+
+
+def _employee(version=3):
+    return {
+        "id": EMPLOYEE_ID,
+        "name": "Alice",
+        "role": "Server",
+        "restaurant_id": RESTAURANT_ID,
+        "shift_version": version,
+        "shifts_changed_at": "2026-04-21T08:30:00+00:00",
+    }
+
+
+def _shift():
+    return {
+        "id": SHIFT_ID,
+        "shift_date": "2026-04-23",
+        "start_time": "09:00:00",
+        "end_time": "17:00:00",
+    }
+
+
+def _service(mock_sb):
+    return CalendarFeedService(mock_sb, TTLCache(max_size=10, ttl_seconds=60))
+
+
+def test_get_feed_renders_rolling_window():
+    mock_sb = make_supabase_chain()
+    mock_sb.execute.side_effect = [
+        MagicMock(data=[_employee()]),  # token lookup
+        MagicMock(data=[_shift()]),  # employee shifts
+        MagicMock(data=[{"name": "Bellagios"}]),  # restaurant name
+    ]
+    feed = _service(mock_sb).get_feed("tok", today=TODAY)
+
+    body = feed["body"].decode()
+    assert "SUMMARY:Shift - Server" in body
+    assert "DTSTART:20260423T090000" in body
+    assert "X-WR-CALNAME:Alice shifts - Bellagios" in body
+    mock_sb.gte.assert_called_once_with("shift_date", "2026-04-08")
+    mock_sb.lte.assert_called_once_with("shift_date", "2026-06-17")
+    # The window rolled today, after the last shift change
+    assert feed["last_modified"] == datetime(2026, 4, 22, tzinfo=timezone.utc)
+
+
+def test_get_feed_cached_until_shift_version_changes():
+    mock_sb = make_supabase_chain()
+    mock_sb.execute.side_effect = [
+        MagicMock(data=[_employee()]),
+        MagicMock(data=[_shift()]),
+        MagicMock(data=[{"name": "Bellagios"}]),
+        MagicMock(data=[_employee()]),  # second poll: lookup only
+        MagicMock(data=[_employee(version=4)]),  # shifts changed
+        MagicMock(data=[]),
+        MagicMock(data=[{"name": "Bellagios"}]),
+    ]
+    svc = _service(mock_sb)
+    first = svc.get_feed("tok", today=TODAY)
+    second = svc.get_feed("tok", today=TODAY)
+    assert second["etag"] == first["etag"]
+    assert mock_sb.execute.call_count == 4
+
+    third = svc.get_feed("tok", today=TODAY)
+    assert third["etag"] != first["etag"]
+    assert "BEGIN:VEVENT" not in third["body"].decode()
+
+
+def test_get_feed_unknown_token():
+    svc = _service(make_supabase_chain([]))
+    assert svc.get_feed("nope") is None
+
+
+def test_create_feed_token_rotates():
+    mock_sb = make_supabase_chain([{"id": EMPLOYEE_ID}])
+    token = _service(mock_sb).create_feed_token(EMPLOYEE_ID)
+    assert len(token) > 30
+    mock_sb.update.assert_called_once_with({"feed_token": token})
+
+
+def test_feed_token_unknown_employee():
+    svc = _service(make_supabase_chain([]))
+    with pytest.raises(EmployeeNotFoundError):
+        svc.create_feed_token(EMPLOYEE_ID)
+    with pytest.raises(EmployeeNotFoundError):
+        svc.revoke_feed_token(EMPLOYEE_ID)
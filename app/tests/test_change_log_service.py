@@ -0,0 +1,113 @@
+import pytest
+from unittest.mock import MagicMock
+
+from app.core.pagination import InvalidCursorError, decode_cursor, encode_cursor
+from app.services.change_log_service import ChangeLogService
+from app.services.employee_service import EmployeeService
+from app.services.shifts_service import ShiftsService
+from app.tests.conftest import (
+    EMPLOYEE_ID,
+    RESTAURANT_ID,
+    SCHEDULE_ID,
+    SHIFT_ID,
+    make_supabase_chain,
+)
+
+
+def test_record_appends_one_multi_row_insert():
+    mock_sb = make_supabase_chain()
+    svc = ChangeLogService(mock_sb)
+    rows = [
+        {"id": EMPLOYEE_ID, "restaurant_id": RESTAURANT_ID, "name": "Alice"},
+        {"id": "e2", "restaurant_id": RESTAURANT_ID, "name": "Bob"},
+    ]
+    svc.record("employee", "created", rows)
+    mock_sb.table.assert_called_once_with("change_log")
+    entries = mock_sb.insert.call_args.args[0]
+    assert len(entries) == 2
+    assert entries[0]["entity_id"] == EMPLOYEE_ID
+    assert entries[0]["data"]["name"] == "Alice"
+
+
+def test_record_deleted_stores_tombstone_only():
+    mock_sb = make_supabase_chain()
+    svc = ChangeLogService(mock_sb)
+    svc.record("employee", "deleted", [{"id": EMPLOYEE_ID, "restaurant_id": RESTAURANT_ID, "name": "A"}])
+    entry = mock_sb.insert.call_args.args[0][0]
+    assert entry["op"] == "deleted"
+    assert entry["data"] == {"id": EMPLOYEE_ID}
+
+
+def test_record_failure_is_swallowed():
+    mock_sb = make_supabase_chain()
+    mock_sb.execute.side_effect = RuntimeError("db down")
+    svc = ChangeLogService(mock_sb)
+    svc.record("employee", "created", [{"id": EMPLOYEE_ID, "restaurant_id": RESTAURANT_ID}])
+
+
+def test_record_shifts_caches_schedule_restaurant():
+    mock_sb = make_supabase_chain()
+    mock_sb.execute.side_effect = [
+        MagicMock(data=[{"id": SCHEDULE_ID, "restaurant_id": RESTAURANT_ID}]),  # lookup
+        MagicMock(data=[]),  # append
+        MagicMock(data=[]),  # append (lookup cached)
+    ]
+    svc = ChangeLogService(mock_sb)
+    shift = {"id": SHIFT_ID, "schedule_id": SCHEDULE_ID}
+    svc.record_shifts("created", [shift])
+    svc.record_shifts("updated", [shift])
+    assert mock_sb.execute.call_count == 3
+    mock_sb.in_.assert_called_once_with("id", [SCHEDULE_ID])
+    assert mock_sb.insert.call_args.args[0][0]["restaurant_id"] == RESTAURANT_ID
+
+
+def test_get_changes_without_since_returns_head_cursor():
+    mock_sb = make_supabase_chain([{"id": 41}])
+    svc = ChangeLogService(mock_sb)
+    result = svc.get_changes(RESTAURANT_ID)
+    assert result["changes"] == []
+    assert decode_cursor(result["cursor"], 1) == [41]
+    assert result["has_more"] is False
+
+
+def test_get_changes_pages_after_cursor():
+    rows = [{"id": i, "entity": "shift"} for i in (42, 43, 44)]
+    mock_sb = make_supabase_chain(rows)
+    svc = ChangeLogService(mock_sb)
+    result = svc.get_changes(RESTAURANT_ID, since=encode_cursor([41]), limit=2)
+    mock_sb.gt.assert_called_once_with("id", 41)
+    mock_sb.limit.assert_called_once_with(3)
+    assert [c["id"] for c in result["changes"]] == [42, 43]
+    assert decode_cursor(result["cursor"], 1) == [43]
+    assert result["has_more"] is True
+
+
+def test_get_changes_nothing_new_keeps_cursor():
+    svc = ChangeLogService(make_supabase_chain([]))
+    since = encode_cursor([41])
+    result = svc.get_changes(RESTAURANT_ID, since=since)
+    assert result["cursor"] == since
+
+
+def test_get_changes_rejects_bad_cursor():
+    svc = ChangeLogService(make_supabase_chain([]))
+    with pytest.raises(InvalidCursorError):
+        svc.get_changes(RESTAURANT_ID, since=encode_cursor(["41"]))
+
+
+def test_service_writes_are_logged(change_log, sample_employee):
+    employee_svc = EmployeeService(make_supabase_chain([sample_employee]))
+    employee_svc.update_employee(EMPLOYEE_ID, name="Alicia")
+
+    change_log.supabase.execute.side_effect = [
+        MagicMock(data=[{"id": SCHEDULE_ID, "restaurant_id": RESTAURANT_ID}]),
+        MagicMock(data=[]),
+    ]
+    shifts_svc = ShiftsService(make_supabase_chain([{"id": SHIFT_ID, "schedule_id": SCHEDULE_ID}]))
+    shifts_svc.delete_shift(SHIFT_ID)
+
+    entries = [c.args[0][0] for c in change_log.supabase.insert.call_args_list]
+    assert [(e["entity"], e["op"]) for e in entries] == [
+        ("employee", "updated"),
+        ("shift", "deleted"),
+    ]
@@ -0,0 +1,201 @@
+import pytest
+from unittest.mock import MagicMock
+
+from app.services.employee_import_service import (
+    BULK_CHUNK_SIZE,
+    MAX_BULK_ROWS,
+    EmployeeImportService,
+)
+from app.tests.conftest import EMPLOYEE_ID, EMPLOYEE_ID_2, RESTAURANT_ID
+
+
+@pytest.fixture
+def employee_service():
+    service = MagicMock()
+    service.get_employees_by_ids.return_value = {}
+    # Echo back what was written, with an id, like PostgREST's representation
+    service.insert_employees.side_effect = lambda rows: [
+        {**row, "id": f"new-{i}", "created_at": "2026-01-01T00:00:00"}
+        for i, row in enumerate(rows)
+    ]
+    service.upsert_employees.side_effect = lambda rows: [
+        {**row, "created_at": "2026-01-01T00:00:00"} for row in rows
+    ]
+    return service
+
+
+@pytest.fixture
+def import_service(employee_service):
+    return EmployeeImportService(employee_service=employee_service)
+
+
+# === parse_employee_file ===
+
+
+def test_parse_csv_guesses_headers(import_service):
+    csv = (
+        "Full Name,Position,Restaurant ID,Active,Hourly Rate,Max Hours\n"
+        "Alice,Server,,yes,15.50,30\n"
+        "\n"
+        "Bob,Cook,,,,\n"
+    ).encode("utf-8")
+    rows, mapping = import_service.parse_employee_file(csv, "roster.csv")
+
+    assert mapping == {
+        "name": "Full Name",
+        "role": "Position",
+        "restaurant_id": "Restaurant ID",
+        "is_active": "Active",
+        "salary": "Hourly Rate",
+        "max_hours_per_week": "Max Hours",
+    }
+    # "Restaurant ID" must not be mistaken for the employee's own id
+    assert "id" not in mapping
+    assert len(rows) == 2
+    assert rows[1] == {
+        "name": "Bob",
+        "role": "Cook",
+        "restaurant_id": None,
+        "is_active": None,
+        "salary": None,
+        "max_hours_per_week": None,
+    }
+
+
+def test_parse_unsupported_file_type_raises(import_service):
+    with pytest.raises(ValueError, match="Unsupported file type"):
+        import_service.parse_employee_file(b"whatever", "roster.pdf")
+
+
+# === import_employees: creates ===
+
+
+def test_creates_valid_rows_in_one_insert_and_reports_invalid(import_service, employee_service):
+    rows = [
+        {"name": "Alice", "role": "Server"},
+        {"name": "  ", "role": "Cook"},
+        {"name": "Carol", "role": "Host", "is_active": "no", "salary": "$1,200"},
+    ]
+    result = import_service.import_employees(rows, default_restaurant_id=RESTAURANT_ID)
+
+    employee_service.insert_employees.assert_called_once()
+    inserted = employee_service.insert_employees.call_args[0][0]
+    assert [r["name"] for r in inserted] == ["Alice", "Carol"]
+    assert inserted[0]["restaurant_id"] == RESTAURANT_ID
+    assert inserted[0]["is_active"] is True
+    assert inserted[1]["is_active"] is False
+    assert inserted[1]["salary"] == 1200.0
+    # Uniform keys across the multi-row insert
+    assert inserted[0].keys() == inserted[1].keys()
+
+    assert result["created_count"] == 2
+    assert result["error_count"] == 1
+    assert result["rows"][1]["status"] == "error"
+    assert result["rows"][1]["errors"] == ["Employee name cannot be empty"]
+    assert result["rows"][2]["employee"]["name"] == "Carol"
+
+
+def test_missing_restaurant_id_is_a_row_error(import_service, employee_service):
+    result = import_service.import_employees([{"name": "Alice", "role": "Server"}])
+    assert result["rows"][0]["errors"] == ["Restaurant ID is required"]
+    employee_service.insert_employees.assert_not_called()
+
+
+def test_unparseable_values_are_row_errors(import_service):
+    result = import_service.import_employees(
+        [{"name": "A", "role": "B", "is_active": "maybe", "max_hours_per_week": "lots"}],
+        default_restaurant_id=RESTAURANT_ID,
+    )
+    errors = result["rows"][0]["errors"]
+    assert any("is_active" in e for e in errors)
+    assert any("max_hours_per_week" in e for e in errors)
+
+
+def test_inserts_are_chunked(import_service, employee_service):
+    rows = [{"name": f"E{i}", "role": "Server"} for i in range(BULK_CHUNK_SIZE * 2 + 5)]
+    result = import_service.import_employees(rows, default_restaurant_id=RESTAURANT_ID)
+
+    sizes = [len(c[0][0]) for c in employee_service.insert_employees.call_args_list]
+    assert sizes == [BULK_CHUNK_SIZE, BULK_CHUNK_SIZE, 5]
+    assert result["created_count"] == len(rows)
+
+
+def test_failed_chunk_only_fails_its_own_rows(import_service, employee_service):
+    calls = {"n": 0}
+
+    def insert(rows):
+        calls["n"] += 1
+        if calls["n"] == 2:
+            raise Exception("duplicate key")
+        return [{**row, "id": "x", "created_at": "t"} for row in rows]
+
+    employee_service.insert_employees.side_effect = insert
+    rows = [{"name": f"E{i}", "role": "Server"} for i in range(BULK_CHUNK_SIZE + 1)]
+    result = import_service.import_employees(rows, default_restaurant_id=RESTAURANT_ID)
+
+    assert result["created_count"] == BULK_CHUNK_SIZE
+    assert result["error_count"] == 1
+    assert "duplicate key" in result["rows"][-1]["errors"][0]
+
+
+# === import_employees: updates ===
+
+
+def test_updates_merge_with_stored_rows_and_upsert(import_service, employee_service, sample_employee):
+    employee_service.get_employees_by_ids.return_value = {EMPLOYEE_ID: sample_employee}
+    rows = [
+        {"id": EMPLOYEE_ID, "role": "Manager"},
+        {"id": EMPLOYEE_ID_2, "name": "Ghost"},
+    ]
+    result = import_service.import_employees(rows)
+
+    employee_service.get_employees_by_ids.assert_called_once()
+    assert employee_service.get_employees_by_ids.call_args[0][0] == [EMPLOYEE_ID, EMPLOYEE_ID_2]
+    upserted = employee_service.upsert_employees.call_args[0][0]
+    assert upserted == [
+        {
+            "id": EMPLOYEE_ID,
+            "name": "Alice",
+            "role": "Manager",
+            "restaurant_id": RESTAURANT_ID,
+            "is_active": True,
+            "salary": None,
+            "max_hours_per_week": None,
+        }
+    ]
+    assert result["updated_count"] == 1
+    assert result["rows"][0]["action"] == "update"
+    assert "not found" in result["rows"][1]["errors"][0]
+
+
+def test_duplicate_update_ids_are_rejected(import_service, employee_service, sample_employee):
+    employee_service.get_employees_by_ids.return_value = {EMPLOYEE_ID: sample_employee}
+    result = import_service.import_employees(
+        [{"id": EMPLOYEE_ID, "role": "A"}, {"id": EMPLOYEE_ID, "role": "B"}]
+    )
+    assert result["updated_count"] == 1
+    assert "more than once" in result["rows"][1]["errors"][0]
+
+
+def test_invalid_id_is_a_row_error(import_service, employee_service):
+    result = import_service.import_employees([{"id": "not-a-uuid", "name": "A"}])
+    assert "not a valid employee ID" in result["rows"][0]["errors"][0]
+    assert employee_service.get_employees_by_ids.call_args[0][0] == []
+
+
+# === dry run / limits ===
+
+
+def test_dry_run_validates_without_writing(import_service, employee_service):
+    result = import_service.import_employees(
+        [{"name": "Alice", "role": "Server"}], default_restaurant_id=RESTAURANT_ID, dry_run=True
+    )
+    employee_service.insert_employees.assert_not_called()
+    employee_service.upsert_employees.assert_not_called()
+    assert result["rows"][0]["status"] == "valid"
+    assert result["created_count"] == 0
+
+
+def test_too_many_rows_raises(import_service):
+    with pytest.raises(ValueError, match="Too many rows"):
+        import_service.import_employees([{}] * (MAX_BULK_ROWS + 1))
@@ -36,6 +36,43 @@ def test_get_employees_with_active_filter(sample_employee):
     mock_sb.eq.assert_any_call("is_active", True)
 
 
+def test_get_employees_custom_columns(sample_employee):
+    from app.services.employee_service import EMPLOYEE_ROSTER_COLUMNS
+    mock_sb = make_supabase_chain([sample_employee])
+    svc = EmployeeService(mock_sb)
+    svc.get_employees(columns=EMPLOYEE_ROSTER_COLUMNS)
+    mock_sb.select.assert_called_once_with(EMPLOYEE_ROSTER_COLUMNS)
+
+
+def test_get_employees_with_limit_and_cursor(sample_employee):
+    from app.core.pagination import encode_cursor
+    mock_sb = make_supabase_chain([sample_employee])
+    svc = EmployeeService(mock_sb)
+    svc.get_employees(limit=50, cursor=encode_cursor(["Alice", EMPLOYEE_ID]))
+    mock_sb.limit.assert_called_once_with(50)
+    mock_sb.or_.assert_called_once_with(
+        f'name.gt."Alice",and(name.eq."Alice",id.gt."{EMPLOYEE_ID}")'
+    )
+
+
+def test_get_employees_invalid_cursor():
+    from app.core.pagination import InvalidCursorError
+    svc = EmployeeService(make_supabase_chain([]))
+    with pytest.raises(InvalidCursorError):
+        svc.get_employees(limit=10, cursor="garbage")
+
+
+def test_iter_employees_pages_until_short_page(sample_employee):
+    page_1 = [{**sample_employee, "name": "A", "id": "1"}, {**sample_employee, "name": "B", "id": "2"}]
+    page_2 = [{**sample_employee, "name": "C", "id": "3"}]
+    mock_sb = make_supabase_chain()
+    mock_sb.execute.side_effect = [MagicMock(data=page_1), MagicMock(data=page_2)]
+    svc = EmployeeService(mock_sb)
+    result = list(svc.iter_employees(page_size=2))
+    assert [e["name"] for e in result] == ["A", "B", "C"]
+    assert mock_sb.execute.call_count == 2
+
+
 # === get_employee_by_id ===
 
 def test_get_employee_by_id_found(sample_employee):
@@ -52,6 +89,29 @@ def test_get_employee_by_id_not_found():
     assert result is None
 
 
+def test_get_employees_by_ids_single_query(sample_employee):
+    mock_sb = make_supabase_chain([sample_employee])
+    svc = EmployeeService(mock_sb)
+    result = svc.get_employees_by_ids([EMPLOYEE_ID, "missing"])
+    assert result == {EMPLOYEE_ID: sample_employee}
+    mock_sb.in_.assert_called_once_with("id", [EMPLOYEE_ID, "missing"])
+    assert mock_sb.execute.call_count == 1
+
+
+def test_get_employees_by_ids_empty_skips_query():
+    mock_sb = make_supabase_chain([])
+    svc = EmployeeService(mock_sb)
+    assert svc.get_employees_by_ids([]) == {}
+    mock_sb.execute.assert_not_called()
+
+
+def test_upsert_employees_conflicts_on_id(sample_employee):
+    mock_sb = make_supabase_chain([sample_employee])
+    svc = EmployeeService(mock_sb)
+    svc.upsert_employees([sample_employee])
+    mock_sb.upsert.assert_called_once_with([sample_employee], on_conflict="id")
+
+
 # === create_employee ===
 
 def test_create_employee_success(sample_employee):
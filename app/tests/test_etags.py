@@ -0,0 +1,40 @@
+from app.core.etags import etag_matches, make_etag
+from app.tests.conftest import SCHEDULE_ID
+
+
+def test_make_etag_is_quoted_and_deterministic():
+    assert make_etag(SCHEDULE_ID, 7) == f'"{SCHEDULE_ID}.7"'
+    assert make_etag(SCHEDULE_ID, 7) == make_etag(SCHEDULE_ID, 7)
+    assert make_etag(SCHEDULE_ID, 7) != make_etag(SCHEDULE_ID, 8)
+
+
+def test_etag_matches_exact():
+    etag = make_etag("a", 1)
+    assert etag_matches(etag, etag)
+    assert not etag_matches(make_etag("a", 2), etag)
+
+
+def test_etag_matches_list_weak_and_star():
+    etag = make_etag("a", 1)
+    assert etag_matches(f'"x", W/{etag}', etag)
+    assert etag_matches("*", etag)
+
+
+def test_etag_matches_missing_header():
+    assert not etag_matches(None, make_etag("a", 1))
+    assert not etag_matches("", make_etag("a", 1))
+
+
+def test_not_modified_prefers_if_none_match():
+    from datetime import datetime, timezone
+    from app.core.etags import http_date, not_modified
+
+    modified = datetime(2026, 4, 20, 12, 0, 0, 500000, tzinfo=timezone.utc)
+    etag = make_etag("a", 1)
+    assert not_modified(etag, None, etag, modified)
+    # A stale ETag wins over a fresh date
+    assert not not_modified(make_etag("a", 0), http_date(modified), etag, modified)
+    assert not_modified(None, http_date(modified), etag, modified)
+    assert not not_modified(None, "Mon, 20 Apr 2026 11:59:59 GMT", etag, modified)
+    assert not not_modified(None, "not a date", etag, modified)
+    assert not not_modified(None, None, etag, modified)
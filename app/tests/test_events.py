@@ -0,0 +1,86 @@
+import asyncio
+import threading
+
+import pytest
+
+from app.core.events import (
+    RESYNC_EVENT,
+    SUBSCRIBER_QUEUE_SIZE,
+    EventBroker,
+    InMemoryBroker,
+    schedule_channel,
+)
+from app.services.shifts_service import ShiftsService
+from app.tests.conftest import SCHEDULE_ID, SHIFT_ID, make_supabase_chain
+
+
+def test_publish_reaches_only_channel_subscribers():
+    async def scenario():
+        broker = InMemoryBroker()
+        mine = broker.subscribe("a")
+        other = broker.subscribe("b")
+        broker.publish("a", {"n": 1})
+        assert await mine.get(timeout=1) == {"n": 1}
+        assert await other.get(timeout=0.01) is None
+        mine.close()
+        other.close()
+        assert broker.subscriber_count("a") == 0
+
+    asyncio.run(scenario())
+
+
+def test_publish_from_worker_thread_is_delivered():
+    async def scenario():
+        broker = InMemoryBroker()
+        subscription = broker.subscribe("a")
+        thread = threading.Thread(target=broker.publish, args=("a", {"n": 1}))
+        thread.start()
+        thread.join()
+        assert await subscription.get(timeout=1) == {"n": 1}
+
+    asyncio.run(scenario())
+
+
+def test_slow_subscriber_gets_resync_instead_of_backlog():
+    async def scenario():
+        broker = InMemoryBroker()
+        subscription = broker.subscribe("a")
+        for n in range(SUBSCRIBER_QUEUE_SIZE + 1):
+            broker.publish("a", {"n": n})
+        await asyncio.sleep(0)
+        assert await subscription.get(timeout=1) is RESYNC_EVENT
+        assert await subscription.get(timeout=0.01) is None
+
+    asyncio.run(scenario())
+
+
+def test_incomplete_broker_fails_at_construction():
+    class PublishOnlyBroker(EventBroker):
+        def publish(self, channel, event):
+            pass
+
+    with pytest.raises(TypeError):
+        PublishOnlyBroker()
+
+
+def test_shift_writes_publish_compact_delta(monkeypatch):
+    broker = InMemoryBroker()
+    published = []
+    monkeypatch.setattr(broker, "publish", lambda channel, event: published.append((channel, event)))
+    monkeypatch.setattr("app.services.shifts_service.get_event_broker", lambda: broker)
+
+    existing = {"id": SHIFT_ID, "schedule_id": SCHEDULE_ID, "employee_id": "e1"}
+    ShiftsService(make_supabase_chain([existing])).delete_shift(SHIFT_ID)
+
+    assert published == [
+        (
+            schedule_channel(SCHEDULE_ID),
+            {
+                "type": "shifts",
+                "schedule_id": SCHEDULE_ID,
+                "created": [],
+                "updated": [],
+                "deleted": [SHIFT_ID],
+            },
+        )
+    ]
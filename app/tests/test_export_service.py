@@ -1,5 +1,6 @@
 import pytest
 from unittest.mock import MagicMock
+from datetime import date
 from uuid import UUID
 
 from app.services.export_service import ExportService
@@ -51,3 +52,91 @@ def test_generate_ical_schedule_not_found():
     svc = ExportService(mock_sb)
     with pytest.raises(ScheduleNotFoundError):
         svc.generate_ical(UUID(SCHEDULE_ID))
+
+
+EXPORT_SHIFTS = [
+    {
+        "id": "s1",
+        "schedule_id": SCHEDULE_ID,
+        "employee_id": "bbbb",
+        "shift_date": "2026-04-22",
+        "start_time": "09:00:00",
+        "end_time": "17:30:00",
+        "notes": "Opens, then bar",
+        "employee": {"name": "Alice", "role": "Server"},
+    },
+    {
+        "id": "s2",
+        "schedule_id": SCHEDULE_ID,
+        "employee_id": "cccc",
+        "shift_date": "2026-04-23",
+        "start_time": "18:00:00",
+        "end_time": "22:00:00",
+        "notes": None,
+        "employee": None,
+    },
+]
+
+
+def _export_client(sample_schedule, shifts=EXPORT_SHIFTS):
+    mock_sb = make_supabase_chain()
+    mock_sb.execute.side_effect = [
+        MagicMock(data=[sample_schedule]),  # schedules in range
+        MagicMock(data=shifts),  # shift page
+    ]
+    return mock_sb
+
+
+def test_iter_csv_rows(sample_schedule):
+    import csv
+
+    svc = ExportService(_export_client(sample_schedule))
+    text = "".join(svc.iter_csv("rest", date(2026, 4, 20), date(2026, 4, 26)))
+    rows = list(csv.reader(text.splitlines()))
+
+    assert rows[0][:3] == ["Week Start", "Date", "Day"]
+    assert rows[1] == [
+        sample_schedule["week_start"], "2026-04-22", "Wednesday", "Alice", "bbbb",
+        "Server", "09:00", "17:30", "8.5", "Opens, then bar",
+    ]
+    # Missing employee join
+    assert rows[2][3] == "Unknown"
+    assert rows[2][8] == "4.0"
+    assert len(rows) == 3
+
+
+def test_iter_csv_rejects_reversed_range():
+    svc = ExportService(make_supabase_chain())
+    with pytest.raises(ValueError):
+        svc.iter_csv("rest", date(2026, 4, 26), date(2026, 4, 20))
+
+
+def test_iter_csv_rejects_long_range():
+    svc = ExportService(make_supabase_chain())
+    with pytest.raises(ValueError):
+        svc.iter_csv("rest", date(2026, 1, 1), date(2027, 6, 1))
+
+
+def test_iter_csv_no_schedules_skips_shift_query():
+    mock_sb = make_supabase_chain([])
+    svc = ExportService(mock_sb)
+    text = "".join(svc.iter_csv("rest", date(2026, 4, 20), date(2026, 4, 26)))
+
+    assert text.strip().startswith("Week Start")
+    assert len(text.strip().splitlines()) == 1
+    assert mock_sb.execute.call_count == 1
+
+
+def test_iter_xlsx_is_readable_workbook(sample_schedule):
+    from io import BytesIO
+    from openpyxl import load_workbook
+
+    svc = ExportService(_export_client(sample_schedule))
+    data = b"".join(svc.iter_xlsx("rest", date(2026, 4, 20), date(2026, 4, 26)))
+
+    sheet = load_workbook(BytesIO(data))["Shifts"]
+    rows = list(sheet.iter_rows(values_only=True))
+    assert rows[0][0] == "Week Start"
+    assert rows[1][3] == "Alice"
+    assert rows[1][8] == 8.5
+    assert len(rows) == 3
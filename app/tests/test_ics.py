@@ -0,0 +1,67 @@
+from datetime import datetime
+
+from icalendar import Calendar
+
+from app.core.ics import (
+    escape_text,
+    fold_line,
+    iter_calendar,
+    local_datetime,
+    utc_datetime,
+)
+
+
+def test_escape_text():
+    assert escape_text("a,b;c\\d\ne") == "a\\,b\\;c\\\\d\\ne"
+
+
+def test_fold_line_short_line_untouched():
+    assert fold_line("SUMMARY:Shift") == "SUMMARY:Shift\r\n"
+
+
+def test_fold_line_respects_octet_limit_and_utf8():
+    line = "DESCRIPTION:" + "é" * 100
+    folded = fold_line(line)
+    physical = folded.split("\r\n")[:-1]
+    assert all(len(p.encode("utf-8")) <= 75 for p in physical)
+    assert all(p.startswith(" ") for p in physical[1:])
+    assert "".join(p[1:] if i else p for i, p in enumerate(physical)) == line
+
+
+def test_datetime_formatting():
+    assert local_datetime("2026-04-22", "09:30:00") == "20260422T093000"
+    assert local_datetime("2026-04-22", "09:30") == "20260422T093000"
+    assert utc_datetime(datetime(2026, 4, 22, 9, 5, 7)) == "20260422T090507Z"
+
+
+def test_iter_calendar_round_trips_through_icalendar():
+    events = [
+        {
+            "uid": f"{n}@prep-app",
+            "dtstamp": "20260420T000000Z",
+            "dtstart": local_datetime("2026-04-22", "09:00:00"),
+            "dtend": local_datetime("2026-04-22", "17:00:00"),
+            "summary": "Shift - Server",
+            "description": "Bellagio's, Main St; " + "long " * 30,
+        }
+        for n in range(50)
+    ]
+    chunks = list(iter_calendar(events, prodid="-//Test//EN", chunk_size=1024))
+    assert len(chunks) > 1
+
+    cal = Calendar.from_ical("".join(chunks))
+    parsed = cal.walk("VEVENT")
+    assert len(parsed) == 50
+    assert str(parsed[0]["SUMMARY"]) == "Shift - Server"
+    assert str(parsed[0]["DESCRIPTION"]) == events[0]["description"]
+    assert parsed[0].decoded("DTSTART") == datetime(2026, 4, 22, 9, 0)
+
+
+def test_iter_calendar_empty_and_calendar_properties():
+    text = "".join(
+        iter_calendar([], prodid="-//Test//EN", calendar_properties={"X-WR-CALNAME": "My shifts"})
+    )
+    assert text.startswith("BEGIN:VCALENDAR\r\n")
+    assert "X-WR-CALNAME:My shifts\r\n" in text
+    assert text.endswith("END:VCALENDAR\r\n")
+    assert "BEGIN:VEVENT" not in text
@@ -0,0 +1,55 @@
+from fastapi import FastAPI, File, UploadFile
+from fastapi.testclient import TestClient
+
+from app.api.middleware import BodySizeLimitMiddleware
+
+LIMIT = 1024
+
+
+def _client() -> TestClient:
+    app = FastAPI()
+    app.add_middleware(BodySizeLimitMiddleware, max_bytes=LIMIT)
+
+    @app.post("/upload")
+    async def upload(file: UploadFile = File(...)):
+        return {"size": len(await file.read())}
+
+    return TestClient(app)
+
+
+def test_body_within_limit_passes():
+    response = _client().post("/upload", files={"file": ("a.csv", b"x" * 100)})
+    assert response.status_code == 200
+    assert response.json() == {"size": 100}
+
+
+def test_content_length_over_limit_rejected_up_front():
+    response = _client().post("/upload", files={"file": ("a.csv", b"x" * (LIMIT * 2))})
+    assert response.status_code == 413
+
+
+def test_streamed_body_over_limit_rejected_while_reading():
+    def chunks():
+        for _ in range(4):
+            yield b"x" * LIMIT
+
+    # A generator body is sent chunked, with no Content-Length
+    response = _client().post(
+        "/upload",
+        content=chunks(),
+        headers={"content-type": "multipart/form-data; boundary=abc"},
+    )
+    assert response.status_code == 413
+
+
+def test_path_limit_overrides_default():
+    app = FastAPI()
+    app.add_middleware(BodySizeLimitMiddleware, max_bytes=LIMIT, path_limits={"/batch": LIMIT * 4})
+
+    @app.post("/batch")
+    async def batch(file: UploadFile = File(...)):
+        return {"size": len(await file.read())}
+
+    client = TestClient(app)
+    assert client.post("/batch", files={"file": ("a.csv", b"x" * (LIMIT * 2))}).status_code == 200
+    assert client.post("/batch", files={"file": ("a.csv", b"x" * (LIMIT * 5))}).status_code == 413
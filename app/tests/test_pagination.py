@@ -0,0 +1,61 @@
+import pytest
+
+from app.core.pagination import (
+    InvalidCursorError,
+    decode_cursor,
+    encode_cursor,
+    iter_ndjson,
+    keyset_filter,
+    next_cursor,
+)
+
+KEYS = [("name", False), ("id", False)]
+
+
+def test_cursor_round_trip():
+    cursor = encode_cursor(["Alice", "1111"])
+    assert decode_cursor(cursor, 2) == ["Alice", "1111"]
+    assert "=" not in cursor  # URL-safe, unpadded
+
+
+def test_decode_cursor_rejects_garbage():
+    with pytest.raises(InvalidCursorError):
+        decode_cursor("not-a-cursor!!", 2)
+
+
+def test_decode_cursor_rejects_wrong_arity():
+    with pytest.raises(InvalidCursorError):
+        decode_cursor(encode_cursor(["only-one"]), 2)
+
+
+@pytest.mark.parametrize("values", [[None, {"a": 1}], ["Alice", [1]], [True, "1111"], [1.5, "1111"]])
+def test_decode_cursor_rejects_non_scalar_values(values):
+    with pytest.raises(InvalidCursorError):
+        decode_cursor(encode_cursor(values), 2)
+
+
+def test_keyset_filter_ascending():
+    expr = keyset_filter(KEYS, ["Bob", "abc"])
+    assert expr == 'name.gt."Bob",and(name.eq."Bob",id.gt."abc")'
+
+
+def test_keyset_filter_descending():
+    expr = keyset_filter([("week_start", True), ("id", True)], ["2026-04-20", "abc"])
+    assert expr == 'week_start.lt."2026-04-20",and(week_start.eq."2026-04-20",id.lt."abc")'
+
+
+def test_keyset_filter_quotes_reserved_characters():
+    expr = keyset_filter(KEYS, ['O"Brien, Jr.', "abc"])
+    assert 'name.gt."O\\"Brien, Jr."' in expr
+
+
+def test_next_cursor_only_when_page_is_full():
+    rows = [{"name": "A", "id": "1"}, {"name": "B", "id": "2"}]
+    assert next_cursor(rows, 3, KEYS) is None
+    assert next_cursor(rows, None, KEYS) is None
+    assert decode_cursor(next_cursor(rows, 2, KEYS), 2) == ["B", "2"]
+
+
+def test_iter_ndjson():
+    lines = list(iter_ndjson([{"a": 1}, {"b": 2}]))
+    assert lines == [b'{"a": 1}\n', b'{"b": 2}\n']
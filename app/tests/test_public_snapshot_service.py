@@ -0,0 +1,114 @@
+from datetime import datetime, timedelta
+from unittest.mock import MagicMock, patch
+
+from app.core.cache import TTLCache
+from app.services.public_snapshot_service import PublicScheduleSnapshotService
+from app.services.shifts_service import ShiftsService
+from app.tests.conftest import SCHEDULE_ID, SHIFT_ID, make_supabase_chain
+
+
+def _shared_schedule(token="abc123", expires_in=timedelta(days=1)):
+    return {
+        "id": SCHEDULE_ID,
+        "restaurant_id": "r1",
+        "week_start": "2026-04-20",
+        "share_token": token,
+        "share_expires_at": (datetime.utcnow() + expires_in).isoformat(),
+    }
+
+
+def _public_payload(employee_name="Alice"):
+    return {
+        "restaurant_name": "Bellagios",
+        "week_start": "2026-04-20",
+        "shifts": [
+            {
+                "employee_name": employee_name,
+                "role": "Server",
+                "shift_date": "2026-04-22",
+                "start_time": "09:00:00",
+                "end_time": "17:00:00",
+            }
+        ],
+    }
+
+
+def _make_service(schedule=None, payload=None):
+    schedule_svc = MagicMock()
+    schedule_svc.get_active_share.return_value = schedule or _shared_schedule()
+    schedule_svc.render_public_schedule.return_value = payload or _public_payload()
+    cache = TTLCache(max_size=10, ttl_seconds=300)
+    return PublicScheduleSnapshotService(schedule_svc, cache), schedule_svc
+
+
+def test_get_snapshot_builds_once_then_serves_from_cache():
+    svc, schedule_svc = _make_service()
+    first = svc.get_snapshot("abc123")
+    second = svc.get_snapshot("abc123")
+    assert first is second
+    assert b'"restaurant_name":"Bellagios"' in first["body"]
+    assert first["etag"].startswith('"')
+    schedule_svc.get_active_share.assert_called_once_with(token="abc123")
+    schedule_svc.render_public_schedule.assert_called_once()
+
+
+def test_get_snapshot_unknown_token_returns_none():
+    svc, schedule_svc = _make_service()
+    schedule_svc.get_active_share.return_value = None
+    assert svc.get_snapshot("nope") is None
+    schedule_svc.render_public_schedule.assert_not_called()
+
+
+def test_snapshot_does_not_outlive_share_expiry():
+    svc, _ = _make_service(schedule=_shared_schedule(expires_in=timedelta(seconds=-1)))
+    svc.publish(SCHEDULE_ID)
+    assert "abc123" not in svc._snapshots
+
+
+def test_refresh_rebuilds_cached_snapshot_with_new_etag():
+    svc, schedule_svc = _make_service()
+    before = svc.publish(SCHEDULE_ID)
+    schedule_svc.render_public_schedule.return_value = _public_payload("Bob")
+    svc.refresh(SCHEDULE_ID)
+    after = svc.get_snapshot("abc123")
+    assert after["etag"] != before["etag"]
+    assert b"Bob" in after["body"]
+
+
+def test_refresh_ignores_uncached_schedule():
+    svc, schedule_svc = _make_service()
+    svc.refresh(SCHEDULE_ID)
+    schedule_svc.get_active_share.assert_not_called()
+
+
+def test_refresh_failure_evicts_instead_of_raising():
+    svc, schedule_svc = _make_service()
+    svc.publish(SCHEDULE_ID)
+    schedule_svc.render_public_schedule.side_effect = RuntimeError("db down")
+    svc.refresh(SCHEDULE_ID)
+    assert "abc123" not in svc._snapshots
+
+
+def test_publish_rotated_token_drops_old_token():
+    svc, schedule_svc = _make_service()
+    svc.publish(SCHEDULE_ID)
+    schedule_svc.get_active_share.return_value = _shared_schedule(token="new456")
+    svc.publish(SCHEDULE_ID)
+    assert "abc123" not in svc._snapshots
+    assert "new456" in svc._snapshots
+
+
+def test_revoke_evicts_snapshot():
+    svc, _ = _make_service()
+    svc.publish(SCHEDULE_ID)
+    svc.revoke(SCHEDULE_ID)
+    assert "abc123" not in svc._snapshots
+
+
+def test_shift_writes_refresh_public_snapshot():
+    existing = {"id": SHIFT_ID, "schedule_id": SCHEDULE_ID}
+    mock_sb = make_supabase_chain([existing])
+    shifts_svc = ShiftsService(mock_sb)
+    with patch("app.services.shifts_service.public_snapshot_service") as snapshots:
+        shifts_svc.delete_shift(SHIFT_ID)
+    snapshots.refresh.assert_called_once_with(SCHEDULE_ID)
@@ -0,0 +1,137 @@
+import logging
+import re
+
+from contextvars import copy_context
+
+from app.core.query_metrics import (
+    InstrumentedClient,
+    get_query_stats,
+    start_query_stats,
+    warn_on_query_smells,
+)
+from app.tests.conftest import make_supabase_chain, SCHEDULE_ID
+
+
+def _run_in_request(fn):
+    """Run fn inside its own context, like a request under RequestLoggingMiddleware."""
+    def wrapper():
+        stats = start_query_stats()
+        fn()
+        return stats
+    return copy_context().run(wrapper)
+
+
+def test_execute_outside_request_is_not_recorded():
+    client = InstrumentedClient(make_supabase_chain([{"id": 1}]))
+    response = client.table("schedules").select("*").execute()
+    assert response.data == [{"id": 1}]
+    assert get_query_stats() is None
+
+
+def test_counts_and_tags_each_execute():
+    client = InstrumentedClient(make_supabase_chain())
+
+    def handler():
+        client.table("schedules").select("*").eq("id", SCHEDULE_ID).execute()
+        client.table("shifts").select("*").eq("schedule_id", SCHEDULE_ID).execute()
+        client.table("shifts").insert({"id": "x"}).execute()
+        client.rpc("create_shift", {"p_schedule_id": SCHEDULE_ID}).execute()
+
+    stats = _run_in_request(handler)
+
+    assert stats.count == 4
+    assert stats.by_table() == {
+        "schedules.select": 1,
+        "shifts.select": 1,
+        "shifts.insert": 1,
+        "rpc:create_shift.rpc": 1,
+    }
+    assert stats.summary()["db_calls"] == 4
+
+
+def test_operation_is_first_verb_in_chain():
+    client = InstrumentedClient(make_supabase_chain())
+
+    def handler():
+        client.table("shift_templates").upsert({"a": 1}, on_conflict="restaurant_id").select("*").execute()
+
+    stats = _run_in_request(handler)
+    assert stats.by_table() == {"shift_templates.upsert": 1}
+
+
+def test_repeated_identical_query_is_flagged():
+    client = InstrumentedClient(make_supabase_chain())
+
+    def handler():
+        for _ in range(3):
+            client.table("employees").select("*").eq("id", "same").execute()
+        client.table("employees").select("*").eq("id", "other").execute()
+
+    stats = _run_in_request(handler)
+    repeated = stats.repeated_queries()
+    assert len(repeated) == 1
+    assert list(repeated.values()) == [3]
+
+
+def test_signature_reduces_payloads_to_shape_and_hash():
+    client = InstrumentedClient(make_supabase_chain())
+    rows = [{"id": str(i), "notes": "x" * 100} for i in range(50)]
+
+    def handler():
+        for _ in range(2):
+            client.table("shifts").insert(rows).execute()
+            client.table("shifts").select("*").in_("id", ["a", "b"]).execute()
+
+    stats = _run_in_request(handler)
+    signatures = list(stats.repeated_queries())
+    assert len(signatures) == 2
+    assert re.fullmatch(r"shifts\.insert\(list\[50\]#[0-9a-f]{8}\)", signatures[0])
+    assert re.fullmatch(r"shifts\.select\('\*'\)\.in_\('id', list\[2\]#[0-9a-f]{8}\)", signatures[1])
+    assert "notes" not in signatures[0]
+
+
+def test_rpc_calls_with_different_params_are_not_repeats():
+    client = InstrumentedClient(make_supabase_chain())
+
+    def handler():
+        client.rpc("create_shift", {"p_schedule_id": SCHEDULE_ID, "p_start_time": "09:00"}).execute()
+        client.rpc("create_shift", {"p_schedule_id": SCHEDULE_ID, "p_start_time": "17:00"}).execute()
+        client.table("shifts").insert({"id": "a"}).execute()
+        client.table("shifts").insert({"id": "b"}).execute()
+
+    assert _run_in_request(handler).repeated_queries() == {}
+
+
+def test_non_query_attributes_pass_through():
+    chain = make_supabase_chain()
+    chain.auth.get_user.return_value = "user"
+    client = InstrumentedClient(chain)
+    assert client.auth.get_user("token") == "user"
+
+
+def test_warn_on_query_smells_budget_and_repeats(caplog):
+    client = InstrumentedClient(make_supabase_chain())
+
+    def handler():
+        for _ in range(3):
+            client.table("shifts").select("*").eq("employee_id", "e").execute()
+
+    stats = _run_in_request(handler)
+    with caplog.at_level(logging.WARNING, logger="app.core.query_metrics"):
+        warn_on_query_smells(stats, budget=2, method="GET", path="/x", request_id="r")
+
+    messages = [r.getMessage() for r in caplog.records]
+    assert any("budget exceeded" in m for m in messages)
+    assert any("N+1" in m for m in messages)
+
+
+def test_warn_on_query_smells_quiet_when_within_budget(caplog):
+    client = InstrumentedClient(make_supabase_chain())
+
+    def handler():
+        client.table("shifts").select("*").execute()
+
+    stats = _run_in_request(handler)
+    with caplog.at_level(logging.WARNING, logger="app.core.query_metrics"):
+        warn_on_query_smells(stats, budget=5, method="GET", path="/x", request_id="r")
+    assert caplog.records == []
@@ -8,7 +8,13 @@ from app.services.schedule_service import (
     ScheduleAlreadyExistsError,
     ScheduleNotFoundError,
 )
-from app.tests.conftest import make_supabase_chain, SCHEDULE_ID, RESTAURANT_ID
+from app.tests.conftest import (
+    make_supabase_chain,
+    EMPLOYEE_ID,
+    RESTAURANT_ID,
+    SCHEDULE_ID,
+    SHIFT_ID,
+)
 
 
 # === get_week_start ===
@@ -59,6 +65,16 @@ def test_get_schedules_with_date_range(sample_schedule):
     mock_sb.lte.assert_called_once_with("week_start", "2026-04-27")
 
 
+def test_get_schedules_with_cursor_uses_descending_keyset(sample_schedule):
+    from app.core.pagination import encode_cursor
+    mock_sb = make_supabase_chain([sample_schedule])
+    svc = ScheduleService(mock_sb)
+    svc.get_schedules(limit=1, cursor=encode_cursor(["2026-04-20", SCHEDULE_ID]))
+    mock_sb.limit.assert_called_once_with(1)
+    expr = mock_sb.or_.call_args[0][0]
+    assert expr.startswith('week_start.lt."2026-04-20"')
+
+
 # === get_schedule_by_id ===
 
 
@@ -69,6 +85,15 @@ def test_get_schedule_by_id_found(sample_schedule):
     assert result["id"] == SCHEDULE_ID
 
 
+def test_get_schedule_by_id_uses_projection(sample_schedule):
+    from app.services.schedule_service import SCHEDULE_COLUMNS
+    mock_sb = make_supabase_chain([sample_schedule])
+    svc = ScheduleService(mock_sb)
+    svc.get_schedule_by_id(UUID(SCHEDULE_ID))
+    mock_sb.select.assert_called_once_with(SCHEDULE_COLUMNS)
+    assert "*" not in SCHEDULE_COLUMNS
+
+
 def test_get_schedule_by_id_not_found():
     mock_sb = make_supabase_chain([])
     svc = ScheduleService(mock_sb)
@@ -100,6 +125,36 @@ def test_get_schedule_with_shifts_success(sample_schedule):
     assert result["shifts"][0]["duration_hours"] == 8.0
 
 
+def test_get_schedule_with_shifts_selects_version(sample_schedule):
+    from app.services.schedule_service import SCHEDULE_DETAIL_COLUMNS
+
+    mock_sb = make_supabase_chain()
+    mock_sb.execute.side_effect = [
+        MagicMock(data=[{**sample_schedule, "version": 3}]),
+        MagicMock(data=[]),
+    ]
+    svc = ScheduleService(mock_sb)
+    result = svc.get_schedule_with_shifts(UUID(SCHEDULE_ID))
+    assert mock_sb.select.call_args_list[0][0][0] == SCHEDULE_DETAIL_COLUMNS
+    assert result["version"] == 3
+
+
+# === get_schedule_version ===
+
+
+def test_get_schedule_version_reads_only_version():
+    mock_sb = make_supabase_chain([{"version": 5}])
+    svc = ScheduleService(mock_sb)
+    assert svc.get_schedule_version(UUID(SCHEDULE_ID)) == 5
+    mock_sb.select.assert_called_once_with("version")
+    mock_sb.eq.assert_called_once_with("id", SCHEDULE_ID)
+
+
+def test_get_schedule_version_not_found():
+    svc = ScheduleService(make_supabase_chain([]))
+    assert svc.get_schedule_version(UUID(SCHEDULE_ID)) is None
+
+
 def test_get_schedule_with_shifts_not_found():
     mock_sb = make_supabase_chain([])
     svc = ScheduleService(mock_sb)
@@ -163,18 +218,10 @@ def test_create_schedule_already_exists(sample_schedule):
 
 def test_create_schedules_for_range_success(sample_schedule):
     # 3 weeks, none exist yet
-    s1 = {**sample_schedule, "id": "aaa", "week_start": "2026-04-21"}
-    s2 = {**sample_schedule, "id": "bbb", "week_start": "2026-04-28"}
-    s3 = {**sample_schedule, "id": "ccc", "week_start": "2026-05-05"}
-    mock_sb = make_supabase_chain()
-    mock_sb.execute.side_effect = [
-        MagicMock(data=[]),  # week 1 check
-        MagicMock(data=[s1]),  # week 1 insert
-        MagicMock(data=[]),  # week 2 check
-        MagicMock(data=[s2]),  # week 2 insert
-        MagicMock(data=[]),  # week 3 check
-        MagicMock(data=[s3]),  # week 3 insert
-    ]
+    s1 = {**sample_schedule, "id": "aaa", "week_start": "2026-04-20"}
+    s2 = {**sample_schedule, "id": "bbb", "week_start": "2026-04-27"}
+    s3 = {**sample_schedule, "id": "ccc", "week_start": "2026-05-04"}
+    mock_sb = make_supabase_chain([s1, s2, s3])
     svc = ScheduleService(mock_sb)
     result = svc.create_schedules_for_range(
         start_date=date(2026, 4, 21),
@@ -182,17 +229,21 @@ def test_create_schedules_for_range_success(sample_schedule):
         restaurant_id=UUID(RESTAURANT_ID),
     )
     assert len(result) == 3
+    # One multi-row write, no per-week existence checks
+    assert mock_sb.execute.call_count == 1
+    rows = mock_sb.upsert.call_args.args[0]
+    assert [r["week_start"] for r in rows] == ["2026-04-20", "2026-04-27", "2026-05-04"]
+    assert all(r["restaurant_id"] == RESTAURANT_ID for r in rows)
+    assert mock_sb.upsert.call_args.kwargs == {
+        "on_conflict": "restaurant_id,week_start",
+        "ignore_duplicates": True,
+    }
 
 
 def test_create_schedules_for_range_skips_existing(sample_schedule):
-    # 2 weeks: first already exists, second is new
-    s2 = {**sample_schedule, "id": "bbb", "week_start": "2026-04-28"}
-    mock_sb = make_supabase_chain()
-    mock_sb.execute.side_effect = [
-        MagicMock(data=[sample_schedule]),  # week 1 check → already exists
-        MagicMock(data=[]),  # week 2 check → not found
-        MagicMock(data=[s2]),  # week 2 insert
-    ]
+    # 2 weeks: first already exists, so the upsert only returns the second
+    s2 = {**sample_schedule, "id": "bbb", "week_start": "2026-04-27"}
+    mock_sb = make_supabase_chain([s2])
     svc = ScheduleService(mock_sb)
     result = svc.create_schedules_for_range(
         start_date=date(2026, 4, 21),
@@ -201,6 +252,19 @@ def test_create_schedules_for_range_skips_existing(sample_schedule):
     )
     assert len(result) == 1
     assert result[0]["id"] == "bbb"
+    assert len(mock_sb.upsert.call_args.args[0]) == 2
+
+
+def test_create_schedules_for_range_empty_range_makes_no_calls():
+    mock_sb = make_supabase_chain()
+    svc = ScheduleService(mock_sb)
+    result = svc.create_schedules_for_range(
+        start_date=date(2026, 5, 5),
+        end_date=date(2026, 4, 21),
+        restaurant_id=UUID(RESTAURANT_ID),
+    )
+    assert result == []
+    mock_sb.execute.assert_not_called()
 
 
 # === delete_schedule ===
@@ -326,6 +390,23 @@ def test_get_schedule_by_share_token_expired(sample_schedule):
     assert result is None
 
 
+def test_get_active_share_by_schedule_id(sample_schedule):
+    future = (datetime.utcnow() + timedelta(days=1)).isoformat()
+    shared_schedule = {**sample_schedule, "share_token": "abc123", "share_expires_at": future}
+    mock_sb = make_supabase_chain([shared_schedule])
+    svc = ScheduleService(mock_sb)
+    result = svc.get_active_share(schedule_id=UUID(SCHEDULE_ID))
+    assert result["share_token"] == "abc123"
+    mock_sb.eq.assert_any_call("id", SCHEDULE_ID)
+    mock_sb.eq.assert_any_call("share_enabled", True)
+
+
+def test_get_active_share_disabled_returns_none():
+    mock_sb = make_supabase_chain([])
+    svc = ScheduleService(mock_sb)
+    assert svc.get_active_share(schedule_id=UUID(SCHEDULE_ID)) is None
+
+
 # === is_valid_share_token ===
 
 
@@ -406,3 +487,85 @@ def test_get_restaurant_name_not_found():
     mock_sb = make_supabase_chain([])
     svc = ScheduleService(mock_sb)
     assert svc.get_restaurant_name(RESTAURANT_ID) == RESTAURANT_ID
+
+
+# === get_schedule_summaries ===
+
+
+def test_get_schedule_summaries_calls_rpc_with_filters():
+    summary = {
+        "schedule_id": SCHEDULE_ID,
+        "restaurant_id": RESTAURANT_ID,
+        "week_start": "2026-04-20",
+        "shift_count": 2,
+        "total_hours": 16.0,
+        "hours_by_role": {"Server": 16.0},
+        "hours_by_employee": [],
+    }
+    mock_sb = make_supabase_chain([summary])
+    svc = ScheduleService(mock_sb)
+    result = svc.get_schedule_summaries(
+        UUID(RESTAURANT_ID), date(2026, 4, 1), date(2026, 6, 30)
+    )
+    assert result == [summary]
+    mock_sb.rpc.assert_called_once_with(
+        "get_schedule_summaries",
+        {"p_restaurant_id": RESTAURANT_ID, "p_from": "2026-04-01", "p_to": "2026-06-30"},
+    )
+
+
+def test_get_schedule_summaries_without_filters_passes_nulls():
+    mock_sb = make_supabase_chain([])
+    svc = ScheduleService(mock_sb)
+    assert svc.get_schedule_summaries() == []
+    mock_sb.rpc.assert_called_once_with(
+        "get_schedule_summaries", {"p_restaurant_id": None, "p_from": None, "p_to": None}
+    )
+
+
+# === get_schedule_calendar ===
+
+
+def test_get_schedule_calendar_single_joined_query(sample_schedule):
+    shift = {
+        "id": SHIFT_ID,
+        "employee_id": EMPLOYEE_ID,
+        "shift_date": "2026-04-22",
+        "start_time": "09:00:00",
+        "end_time": "17:30:00",
+        "notes": None,
+        "employee": {"id": EMPLOYEE_ID, "name": "Alice", "role": "Server"},
+    }
+    week1 = {**sample_schedule, "week_start": "2026-04-20", "shifts": [shift]}
+    week2 = {**sample_schedule, "id": "bbb", "week_start": "2026-04-27", "shifts": []}
+    mock_sb = make_supabase_chain([week1, week2])
+    svc = ScheduleService(mock_sb)
+
+    result = svc.get_schedule_calendar(RESTAURANT_ID, date(2026, 4, 22), date(2026, 4, 29))
+
+    assert mock_sb.execute.call_count == 1
+    assert "shifts(" in mock_sb.select.call_args.args[0]
+    mock_sb.gte.assert_called_once_with("week_start", "2026-04-20")
+    mock_sb.lte.assert_called_once_with("week_start", "2026-04-27")
+    assert [w["week_start"] for w in result] == ["2026-04-20", "2026-04-27"]
+    assert result[0]["total_shifts"] == 1
+    assert result[0]["total_hours"] == 8.5
+    assert result[0]["shifts"][0]["duration_hours"] == 8.5
+    assert result[1]["total_hours"] == 0.0
+
+
+def test_get_schedule_calendar_filters_embedded_shifts_by_employee():
+    mock_sb = make_supabase_chain([])
+    svc = ScheduleService(mock_sb)
+    svc.get_schedule_calendar(
+        RESTAURANT_ID, date(2026, 4, 20), date(2026, 4, 26), employee_id=UUID(EMPLOYEE_ID)
+    )
+    mock_sb.eq.assert_any_call("shifts.employee_id", EMPLOYEE_ID)
+
+
+def test_get_schedule_calendar_rejects_wide_or_reversed_range():
+    svc = ScheduleService(make_supabase_chain([]))
+    with pytest.raises(ValueError):
+        svc.get_schedule_calendar(RESTAURANT_ID, date(2026, 1, 5), date(2026, 6, 1))
+    with pytest.raises(ValueError):
+        svc.get_schedule_calendar(RESTAURANT_ID, date(2026, 4, 27), date(2026, 4, 20))
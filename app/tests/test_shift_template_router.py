@@ -0,0 +1,55 @@
+from types import SimpleNamespace
+from unittest.mock import AsyncMock, patch
+
+import pytest
+from fastapi.testclient import TestClient
+
+from ..api.main import app
+from ..core.auth import get_current_user
+from ..core.config import settings
+
+BATCH_PARSE = "/api/v1/shift-templates/import/batch/parse"
+
+
+@pytest.fixture
+def client():
+    app.dependency_overrides[get_current_user] = lambda: SimpleNamespace(id="user-1")
+    try:
+        yield TestClient(app)
+    finally:
+        app.dependency_overrides.clear()
+
+
+def _preview(uploads, owner, refresh=False, **kwargs):
+    return [{"filename": name, "kind": "image", "preview": None, "error": f"{len(data)}"} for name, data in uploads]
+
+
+def test_batch_parse_accepts_more_than_one_upload_limit_in_total(client):
+    size = settings.MAX_UPLOAD_BYTES * 2 // 3
+    files = [("files", (f"photo{i}.jpg", b"x" * size, "image/jpeg")) for i in range(2)]
+    with patch(
+        "app.api.routes.shift_template_router.template_import_service.preview_batch",
+        AsyncMock(side_effect=_preview),
+    ) as preview_batch:
+        response = client.post(BATCH_PARSE, files=files)
+
+    assert response.status_code == 200
+    assert [f["error"] for f in response.json()["files"]] == [str(size), str(size)]
+    assert preview_batch.call_args[0][1] == "user-1"
+
+
+def test_batch_parse_rejects_a_file_over_the_upload_limit(client, monkeypatch):
+    monkeypatch.setattr(settings, "MAX_UPLOAD_BYTES", 1024)
+    files = [
+        ("files", ("small.csv", b"x" * 100, "text/csv")),
+        ("files", ("big.jpg", b"x" * 2048, "image/jpeg")),
+    ]
+    with patch(
+        "app.api.routes.shift_template_router.template_import_service.preview_batch",
+        AsyncMock(side_effect=_preview),
+    ) as preview_batch:
+        response = client.post(BATCH_PARSE, files=files)
+
+    assert response.status_code == 413
+    assert "big.jpg" in response.json()["detail"]
+    preview_batch.assert_not_called()
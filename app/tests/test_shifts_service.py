@@ -1,4 +1,5 @@
 import pytest
+from postgrest.exceptions import APIError
 from unittest.mock import MagicMock, patch
 from datetime import date, time
 from uuid import UUID
@@ -8,7 +9,10 @@ from app.services.shifts_service import (
     ShiftValidationError,
     ShiftNotFoundError,
     OverlappingShiftError,
+    ShiftBatchError,
+    EMPLOYEE_SHIFT_COLUMNS,
 )
+from app.core.pagination import encode_cursor
 from app.services.employee_service import EmployeeNotFoundError
 from app.services.schedule_service import ScheduleNotFoundError
 from app.tests.conftest import (
@@ -159,6 +163,17 @@ def test_check_for_overlapping_shifts_adjacent_no_overlap(sample_shift):
     assert result == []
 
 
+def test_check_for_overlapping_shifts_selects_only_interval_columns():
+    from app.services.shifts_service import SHIFT_OVERLAP_COLUMNS
+    mock_sb = make_supabase_chain([])
+    svc = ShiftsService(mock_sb)
+    svc.check_for_overlapping_shifts(
+        UUID(EMPLOYEE_ID), date(2026, 4, 22), time(9, 0), time(17, 0)
+    )
+    mock_sb.select.assert_called_once_with(SHIFT_OVERLAP_COLUMNS)
+    assert SHIFT_OVERLAP_COLUMNS == "id, start_time, end_time"
+
+
 def test_check_for_overlapping_shifts_excludes_self(sample_shift):
     # Exclude the same shift ID (update scenario) — should report no overlap
     mock_sb = make_supabase_chain([])  # neq filter removes the shift
@@ -174,127 +189,163 @@ def test_check_for_overlapping_shifts_excludes_self(sample_shift):
     mock_sb.neq.assert_called_once_with("id", SHIFT_ID)
 
 
+# === get_employee_shifts ===
+
+def test_get_employee_shifts_range_query(sample_shift):
+    mock_sb = make_supabase_chain([sample_shift])
+    svc = ShiftsService(mock_sb)
+    result = svc.get_employee_shifts(UUID(EMPLOYEE_ID), date(2026, 4, 20), date(2026, 5, 3))
+    assert result == [sample_shift]
+    mock_sb.select.assert_called_once_with(EMPLOYEE_SHIFT_COLUMNS)
+    mock_sb.eq.assert_called_once_with("employee_id", EMPLOYEE_ID)
+    mock_sb.gte.assert_called_once_with("shift_date", "2026-04-20")
+    mock_sb.lte.assert_called_once_with("shift_date", "2026-05-03")
+    mock_sb.limit.assert_not_called()
+    assert mock_sb.execute.call_count == 1
+
+
+def test_get_employee_shifts_paginates_with_cursor():
+    mock_sb = make_supabase_chain([])
+    svc = ShiftsService(mock_sb)
+    cursor = encode_cursor(["2026-04-22", "09:00:00", SHIFT_ID])
+    svc.get_employee_shifts(
+        UUID(EMPLOYEE_ID), date(2026, 4, 20), date(2026, 5, 3), limit=10, cursor=cursor
+    )
+    mock_sb.limit.assert_called_once_with(10)
+    expr = mock_sb.or_.call_args[0][0]
+    assert expr.startswith('shift_date.gt."2026-04-22"')
+    assert f'id.gt."{SHIFT_ID}"' in expr
+
+
+def test_get_employee_shifts_rejects_reversed_range():
+    svc = ShiftsService(make_supabase_chain())
+    with pytest.raises(ShiftValidationError, match="on or after"):
+        svc.get_employee_shifts(UUID(EMPLOYEE_ID), date(2026, 5, 3), date(2026, 4, 20))
+
+
+def test_get_employee_shifts_rejects_huge_range():
+    svc = ShiftsService(make_supabase_chain())
+    with pytest.raises(ShiftValidationError, match="cannot exceed"):
+        svc.get_employee_shifts(UUID(EMPLOYEE_ID), date(2025, 1, 1), date(2026, 6, 1))
+
+
+def test_summarize_weekly_hours():
+    shifts = [
+        {"shift_date": "2026-04-21", "start_time": "09:00:00", "end_time": "17:00:00"},
+        {"shift_date": "2026-04-26", "start_time": "10:00:00", "end_time": "14:30:00"},
+        {"shift_date": "2026-04-27", "start_time": "08:00:00", "end_time": "12:00:00"},
+    ]
+    assert ShiftsService.summarize_weekly_hours(shifts) == [
+        {"week_start": date(2026, 4, 20), "shift_count": 2, "hours": 12.5},
+        {"week_start": date(2026, 4, 27), "shift_count": 1, "hours": 4.0},
+    ]
+
+
+def test_summarize_weekly_hours_empty():
+    assert ShiftsService.summarize_weekly_hours([]) == []
+
+
 # === create_shift ===
 
-def test_create_shift_success(sample_employee, sample_schedule, sample_shift):
+def _create(svc, **overrides):
+    kwargs = dict(
+        schedule_id=UUID(SCHEDULE_ID),
+        employee_id=UUID(EMPLOYEE_ID),
+        shift_date=date(2026, 4, 22),
+        start_time=time(9, 0),
+        end_time=time(17, 0),
+    )
+    kwargs.update(overrides)
+    return svc.create_shift(**kwargs)
+
+
+def _rpc_error(code, message, hint=None, details=None):
     mock_sb = make_supabase_chain()
-    # check_for_overlapping_shifts query → no overlaps; insert → created shift
-    mock_sb.execute.side_effect = [
-        MagicMock(data=[]),           # check_for_overlapping_shifts
-        MagicMock(data=[sample_shift]),  # insert
-    ]
+    mock_sb.execute.side_effect = APIError(
+        {"code": code, "message": message, "hint": hint, "details": details}
+    )
+    return mock_sb
+
+
+def test_create_shift_success(sample_shift):
+    # The create_shift function returns a single row as an object
+    mock_sb = make_supabase_chain(sample_shift)
     svc = ShiftsService(mock_sb)
-    with patch("app.services.shifts_service.schedule_service") as mock_sched, \
-         patch("app.services.shifts_service.employee_service") as mock_emp:
-        mock_sched.get_schedule_by_id.return_value = sample_schedule
-        mock_emp.get_employee_by_id.return_value = sample_employee
-        result = svc.create_shift(
-            schedule_id=UUID(SCHEDULE_ID),
-            employee_id=UUID(EMPLOYEE_ID),
-            shift_date=date(2026, 4, 22),
-            start_time=time(9, 0),
-            end_time=time(17, 0),
-        )
+    result = _create(svc, notes="Opening")
     assert result["id"] == SHIFT_ID
+    mock_sb.rpc.assert_called_once_with(
+        "create_shift",
+        {
+            "p_schedule_id": SCHEDULE_ID,
+            "p_employee_id": EMPLOYEE_ID,
+            "p_shift_date": "2026-04-22",
+            "p_start_time": "09:00:00",
+            "p_end_time": "17:00:00",
+            "p_notes": "Opening",
+        },
+    )
+    # Validation + insert in one round trip
+    assert mock_sb.execute.call_count == 1
 
 
 def test_create_shift_schedule_not_found():
-    svc = ShiftsService(make_supabase_chain())
-    with patch("app.services.shifts_service.schedule_service") as mock_sched:
-        mock_sched.get_schedule_by_id.return_value = None
-        with pytest.raises(ScheduleNotFoundError):
-            svc.create_shift(
-                schedule_id=UUID(SCHEDULE_ID),
-                employee_id=UUID(EMPLOYEE_ID),
-                shift_date=date(2026, 4, 22),
-                start_time=time(9, 0),
-                end_time=time(17, 0),
-            )
+    svc = ShiftsService(_rpc_error("P0002", "Schedule x not found", hint="schedule_not_found"))
+    with pytest.raises(ScheduleNotFoundError):
+        _create(svc)
 
 
-def test_create_shift_employee_not_found(sample_schedule):
-    svc = ShiftsService(make_supabase_chain())
-    with patch("app.services.shifts_service.schedule_service") as mock_sched, \
-         patch("app.services.shifts_service.employee_service") as mock_emp:
-        mock_sched.get_schedule_by_id.return_value = sample_schedule
-        mock_emp.get_employee_by_id.return_value = None
-        with pytest.raises(EmployeeNotFoundError):
-            svc.create_shift(
-                schedule_id=UUID(SCHEDULE_ID),
-                employee_id=UUID(EMPLOYEE_ID),
-                shift_date=date(2026, 4, 22),
-                start_time=time(9, 0),
-                end_time=time(17, 0),
-            )
+def test_create_shift_employee_not_found():
+    svc = ShiftsService(_rpc_error("P0002", "Employee x not found", hint="employee_not_found"))
+    with pytest.raises(EmployeeNotFoundError) as exc:
+        _create(svc)
+    assert exc.value.employee_id == UUID(EMPLOYEE_ID)
 
 
-def test_create_shift_employee_inactive(sample_schedule, sample_employee):
-    inactive = {**sample_employee, "is_active": False}
-    svc = ShiftsService(make_supabase_chain())
-    with patch("app.services.shifts_service.schedule_service") as mock_sched, \
-         patch("app.services.shifts_service.employee_service") as mock_emp:
-        mock_sched.get_schedule_by_id.return_value = sample_schedule
-        mock_emp.get_employee_by_id.return_value = inactive
-        with pytest.raises(ShiftValidationError, match="inactive"):
-            svc.create_shift(
-                schedule_id=UUID(SCHEDULE_ID),
-                employee_id=UUID(EMPLOYEE_ID),
-                shift_date=date(2026, 4, 22),
-                start_time=time(9, 0),
-                end_time=time(17, 0),
-            )
+def test_create_shift_employee_inactive():
+    svc = ShiftsService(
+        _rpc_error("22023", "Cannot assign shifts to inactive employee Alice", hint="invalid_shift")
+    )
+    with pytest.raises(ShiftValidationError, match="inactive"):
+        _create(svc)
 
 
-def test_create_shift_date_outside_week(sample_employee, sample_schedule):
-    svc = ShiftsService(make_supabase_chain())
-    with patch("app.services.shifts_service.schedule_service") as mock_sched, \
-         patch("app.services.shifts_service.employee_service") as mock_emp:
-        mock_sched.get_schedule_by_id.return_value = sample_schedule
-        mock_emp.get_employee_by_id.return_value = sample_employee
-        with pytest.raises(ShiftValidationError, match="within schedule week"):
-            svc.create_shift(
-                schedule_id=UUID(SCHEDULE_ID),
-                employee_id=UUID(EMPLOYEE_ID),
-                shift_date=date(2026, 5, 1),  # Outside 2026-04-21 week
-                start_time=time(9, 0),
-                end_time=time(17, 0),
-            )
+def test_create_shift_date_outside_week():
+    svc = ShiftsService(
+        _rpc_error(
+            "22023",
+            "Shift date 2026-05-01 must be within schedule week (2026-04-21 to 2026-04-27)",
+            hint="invalid_shift",
+        )
+    )
+    with pytest.raises(ShiftValidationError, match="within schedule week"):
+        _create(svc, shift_date=date(2026, 5, 1))
 
 
-def test_create_shift_time_invalid(sample_employee, sample_schedule):
-    svc = ShiftsService(make_supabase_chain())
-    with patch("app.services.shifts_service.schedule_service") as mock_sched, \
-         patch("app.services.shifts_service.employee_service") as mock_emp:
-        mock_sched.get_schedule_by_id.return_value = sample_schedule
-        mock_emp.get_employee_by_id.return_value = sample_employee
-        with pytest.raises(ShiftValidationError, match="End time must be after start time"):
-            svc.create_shift(
-                schedule_id=UUID(SCHEDULE_ID),
-                employee_id=UUID(EMPLOYEE_ID),
-                shift_date=date(2026, 4, 22),
-                start_time=time(17, 0),
-                end_time=time(9, 0),
-            )
+def test_create_shift_time_invalid_checked_locally():
+    mock_sb = make_supabase_chain()
+    svc = ShiftsService(mock_sb)
+    with pytest.raises(ShiftValidationError, match="End time must be after start time"):
+        _create(svc, start_time=time(17, 0), end_time=time(9, 0))
+    mock_sb.rpc.assert_not_called()
 
 
-def test_create_shift_overlap(sample_employee, sample_schedule, sample_shift):
-    mock_sb = make_supabase_chain()
-    mock_sb.execute.side_effect = [
-        MagicMock(data=[sample_shift]),  # check_for_overlapping_shifts → overlap found
+def test_create_shift_overlap():
+    details = '[{"id": "%s", "start_time": "08:00:00", "end_time": "12:00:00"}]' % SHIFT_ID
+    svc = ShiftsService(
+        _rpc_error("23P01", "Shift overlaps with an existing shift", hint="shift_overlap", details=details)
+    )
+    with pytest.raises(OverlappingShiftError) as exc:
+        _create(svc)
+    assert exc.value.overlapping_shifts == [
+        {"id": SHIFT_ID, "start_time": "08:00:00", "end_time": "12:00:00"}
     ]
-    svc = ShiftsService(mock_sb)
-    with patch("app.services.shifts_service.schedule_service") as mock_sched, \
-         patch("app.services.shifts_service.employee_service") as mock_emp:
-        mock_sched.get_schedule_by_id.return_value = sample_schedule
-        mock_emp.get_employee_by_id.return_value = sample_employee
-        with pytest.raises(OverlappingShiftError):
-            svc.create_shift(
-                schedule_id=UUID(SCHEDULE_ID),
-                employee_id=UUID(EMPLOYEE_ID),
-                shift_date=date(2026, 4, 22),
-                start_time=time(9, 0),
-                end_time=time(17, 0),
-            )
+    assert "08:00:00 - 12:00:00" in str(exc.value)
+
+
+def test_create_shift_unexpected_db_error_propagates():
+    svc = ShiftsService(_rpc_error("42501", "permission denied"))
+    with pytest.raises(APIError):
+        _create(svc)
 
 
 # === update_shift ===
@@ -347,6 +398,23 @@ def test_update_shift_creates_overlap(sample_shift, sample_schedule):
             svc.update_shift(UUID(SHIFT_ID), end_time=time(16, 0))
 
 
+def test_update_shift_race_caught_by_constraint(sample_shift, sample_schedule):
+    clash = {"id": "other", "start_time": "15:00:00", "end_time": "18:00:00"}
+    mock_sb = make_supabase_chain()
+    mock_sb.execute.side_effect = [
+        MagicMock(data=[sample_shift]),  # get_shift_by_id
+        MagicMock(data=[]),              # check_for_overlapping_shifts → clear
+        APIError({"code": "23P01", "message": "conflicting key value violates exclusion constraint"}),
+        MagicMock(data=[clash]),         # re-check to report the clash
+    ]
+    svc = ShiftsService(mock_sb)
+    with patch("app.services.shifts_service.schedule_service") as mock_sched:
+        mock_sched.get_schedule_by_id.return_value = sample_schedule
+        with pytest.raises(OverlappingShiftError) as exc:
+            svc.update_shift(UUID(SHIFT_ID), end_time=time(16, 0))
+    assert exc.value.overlapping_shifts == [clash]
+
+
 def test_update_shift_employee_change(sample_shift, sample_schedule, sample_employee):
     new_employee_id = "55555555-5555-5555-5555-555555555555"
     new_employee = {**sample_employee, "id": new_employee_id}
@@ -364,3 +432,183 @@ def test_update_shift_employee_change(sample_shift, sample_schedule, sample_empl
         mock_emp.get_employee_by_id.return_value = new_employee
         result = svc.update_shift(UUID(SHIFT_ID), employee_id=UUID(new_employee_id))
     assert result["employee_id"] == new_employee_id
+
+
+# === apply_shift_batch ===
+
+def _op(op, **fields):
+    return {"op": op, "shift_id": None, "employee_id": None, "shift_date": None,
+            "start_time": None, "end_time": None, "notes": None, **fields}
+
+
+def _run_batch(operations, week_shifts, schedule, roster, writes=()):
+    mock_sb = make_supabase_chain()
+    mock_sb.execute.side_effect = [MagicMock(data=week_shifts)] + [
+        MagicMock(data=w) for w in writes
+    ]
+    svc = ShiftsService(mock_sb)
+    with patch("app.services.shifts_service.schedule_service") as mock_sched, \
+         patch("app.services.shifts_service.employee_service") as mock_emp:
+        mock_sched.get_schedule_by_id.return_value = schedule
+        mock_emp.get_employees_by_ids.return_value = roster
+        result = svc.apply_shift_batch(UUID(SCHEDULE_ID), operations)
+    return result, mock_sb
+
+
+def test_apply_shift_batch_bulk_writes(sample_schedule, sample_employee, sample_shift):
+    ops = [
+        _op("create", employee_id=UUID(EMPLOYEE_ID), shift_date=date(2026, 4, 23),
+            start_time=time(9, 0), end_time=time(17, 0)),
+        _op("create", employee_id=UUID(EMPLOYEE_ID), shift_date=date(2026, 4, 24),
+            start_time=time(9, 0), end_time=time(17, 0), notes="  close  "),
+        _op("update", shift_id=UUID(SHIFT_ID), end_time=time(15, 0)),
+    ]
+    result, mock_sb = _run_batch(
+        ops, [sample_shift], sample_schedule, {EMPLOYEE_ID: sample_employee},
+        writes=[{"created": [{"id": "a"}, {"id": "b"}],
+                 "updated": [{**sample_shift, "end_time": "15:00:00"}]}],
+    )
+
+    # 1 load + 1 atomic write, regardless of operation count
+    assert mock_sb.execute.call_count == 2
+    function, params = mock_sb.rpc.call_args[0]
+    assert function == "apply_shift_batch"
+    assert params["p_schedule_id"] == SCHEDULE_ID
+    assert [r["shift_date"] for r in params["p_creates"]] == ["2026-04-23", "2026-04-24"]
+    assert params["p_creates"][1]["notes"] == "close"
+    [updated] = params["p_updates"]
+    assert updated["id"] == SHIFT_ID
+    assert (updated["start_time"], updated["end_time"]) == ("09:00:00", "15:00:00")
+    assert params["p_delete_ids"] == []
+    assert len(result["created"]) == 2
+    assert result["updated"][0]["end_time"] == "15:00:00"
+    assert result["deleted"] == []
+
+
+def test_apply_shift_batch_conflict_within_batch(sample_schedule, sample_employee):
+    ops = [
+        _op("create", employee_id=UUID(EMPLOYEE_ID), shift_date=date(2026, 4, 23),
+            start_time=time(9, 0), end_time=time(13, 0)),
+        _op("create", employee_id=UUID(EMPLOYEE_ID), shift_date=date(2026, 4, 23),
+            start_time=time(12, 0), end_time=time(18, 0)),
+    ]
+    with pytest.raises(ShiftBatchError) as exc:
+        _run_batch(ops, [], sample_schedule, {EMPLOYEE_ID: sample_employee})
+    assert [e["index"] for e in exc.value.errors] == [1]
+    assert "overlaps" in exc.value.errors[0]["message"]
+
+
+def test_apply_shift_batch_delete_frees_slot(sample_schedule, sample_employee, sample_shift):
+    # The create comes before the delete that frees its slot — order doesn't matter
+    ops = [
+        _op("create", employee_id=UUID(EMPLOYEE_ID), shift_date=date(2026, 4, 22),
+            start_time=time(10, 0), end_time=time(14, 0)),
+        _op("delete", shift_id=UUID(SHIFT_ID)),
+    ]
+    result, mock_sb = _run_batch(
+        ops, [sample_shift], sample_schedule, {EMPLOYEE_ID: sample_employee},
+        writes=[{"created": [{"id": "new"}], "updated": []}],
+    )
+    assert mock_sb.rpc.call_args[0][1]["p_delete_ids"] == [SHIFT_ID]
+    assert result["deleted"] == [SHIFT_ID]
+    assert result["created"] == [{"id": "new"}]
+
+
+def test_apply_shift_batch_reports_every_invalid_op(
+    sample_schedule, sample_employee, sample_shift
+):
+    inactive_id = "66666666-6666-6666-6666-666666666666"
+    ops = [
+        _op("create", employee_id=UUID(EMPLOYEE_ID), shift_date=date(2026, 5, 1),
+            start_time=time(9, 0), end_time=time(17, 0)),                      # outside week
+        _op("create", employee_id=UUID(inactive_id), shift_date=date(2026, 4, 23),
+            start_time=time(9, 0), end_time=time(17, 0)),                      # inactive
+        _op("update", shift_id=UUID("77777777-7777-7777-7777-777777777777")),  # not in schedule
+        _op("delete", shift_id=UUID(SHIFT_ID)),
+        _op("update", shift_id=UUID(SHIFT_ID), notes="x"),                     # touched twice
+        _op("create", employee_id=UUID(EMPLOYEE_ID)),                          # incomplete
+    ]
+    roster = {
+        EMPLOYEE_ID: sample_employee,
+        inactive_id: {**sample_employee, "id": inactive_id, "name": "Ivy", "is_active": False},
+    }
+    with pytest.raises(ShiftBatchError) as exc:
+        _run_batch(ops, [sample_shift], sample_schedule, roster)
+    assert [e["index"] for e in exc.value.errors] == [0, 1, 2, 4, 5]
+    assert "must be within schedule week" in exc.value.errors[0]["message"]
+    assert "inactive employee Ivy" in exc.value.errors[1]["message"]
+
+
+def test_apply_shift_batch_checks_other_schedules_for_kept_employee(
+    sample_schedule, sample_shift
+):
+    other = {**sample_shift, "id": "other", "schedule_id": "elsewhere",
+             "start_time": "17:00:00", "end_time": "20:00:00"}
+    mock_sb = make_supabase_chain()
+    mock_sb.execute.side_effect = [
+        MagicMock(data=[sample_shift]),  # this schedule's week
+        MagicMock(data=[other]),         # kept employee's shifts elsewhere
+    ]
+    svc = ShiftsService(mock_sb)
+    with patch("app.services.shifts_service.schedule_service") as mock_sched, \
+         patch("app.services.shifts_service.employee_service") as mock_emp:
+        mock_sched.get_schedule_by_id.return_value = sample_schedule
+        mock_emp.get_employees_by_ids.return_value = {}
+        with pytest.raises(ShiftBatchError):
+            svc.apply_shift_batch(
+                UUID(SCHEDULE_ID), [_op("update", shift_id=UUID(SHIFT_ID), end_time=time(18, 0))]
+            )
+    mock_sb.in_.assert_called_with("employee_id", [EMPLOYEE_ID])
+
+
+def test_apply_shift_batch_empty_raises():
+    svc = ShiftsService(make_supabase_chain())
+    with pytest.raises(ShiftValidationError, match="no operations"):
+        svc.apply_shift_batch(UUID(SCHEDULE_ID), [])
+
+
+def test_apply_shift_batch_race_maps_to_validation_error(sample_schedule, sample_employee):
+    ops = [
+        _op("create", employee_id=UUID(EMPLOYEE_ID), shift_date=date(2026, 4, 23),
+            start_time=time(9, 0), end_time=time(17, 0)),
+    ]
+    mock_sb = make_supabase_chain()
+    mock_sb.execute.side_effect = [
+        MagicMock(data=[]),
+        APIError({"code": "23P01", "message": "conflicting key value violates exclusion constraint"}),
+    ]
+    svc = ShiftsService(mock_sb)
+    with patch("app.services.shifts_service.schedule_service") as mock_sched, \
+         patch("app.services.shifts_service.employee_service") as mock_emp, \
+         patch.object(svc, "notify_shifts_changed") as notify:
+        mock_sched.get_schedule_by_id.return_value = sample_schedule
+        mock_emp.get_employees_by_ids.return_value = {EMPLOYEE_ID: sample_employee}
+        with pytest.raises(ShiftValidationError, match="nothing was saved"):
+            svc.apply_shift_batch(UUID(SCHEDULE_ID), ops)
+    # One rpc, rolled back as a whole: nothing committed to announce
+    assert mock_sb.rpc.call_count == 1
+    notify.assert_not_called()
+
+
+def test_iter_schedule_shifts_pages_with_keyset():
+    page1 = [
+        {"id": f"s{i}", "shift_date": "2026-04-22", "start_time": f"0{i}:00:00"}
+        for i in range(2)
+    ]
+    page2 = [{"id": "s9", "shift_date": "2026-04-23", "start_time": "09:00:00"}]
+    mock_sb = make_supabase_chain()
+    mock_sb.execute.side_effect = [MagicMock(data=page1), MagicMock(data=page2)]
+    svc = ShiftsService(mock_sb)
+
+    rows = list(svc.iter_schedule_shifts([SCHEDULE_ID], page_size=2))
+
+    assert [r["id"] for r in rows] == ["s0", "s1", "s9"]
+    assert mock_sb.execute.call_count == 2
+    # Second page continues after the last row of the first
+    assert "s1" in mock_sb.or_.call_args[0][0]
+
+
+def test_iter_schedule_shifts_no_schedules():
+    mock_sb = make_supabase_chain()
+    assert list(ShiftsService(mock_sb).iter_schedule_shifts([])) == []
+    mock_sb.execute.assert_not_called()
@@ -1,13 +1,16 @@
+import asyncio
 import io
 
 import pandas as pd
 import pytest
-from unittest.mock import MagicMock, patch
+from unittest.mock import AsyncMock, MagicMock, patch
 
 from app.services.ai_service import AIServiceUnavailableError
 from app.services.template_import_service import TemplateImportService
 from app.tests.conftest import RESTAURANT_ID
 
+OWNER = "user-1"
+
 
 @pytest.fixture
 def import_service():
@@ -122,7 +125,87 @@ def test_employee_role_header_maps_to_role_not_name(import_service):
     assert mapping.get("name") != "Employee Role"
 
 
-# === parse_template_image ===
+# === chunked reading / preview_template_file ===
+
+
+def _multi_sheet_xlsx() -> bytes:
+    from openpyxl import Workbook
+    wb = Workbook()
+    first = wb.active
+    first.title = "Week A"
+    first.append([None, None])  # blank rows above the header are skipped
+    first.append(["Day", "Start", "End", "Role", "Count"])
+    first.append([1, "09:00", "17:00", "Server", 2.0])
+    second = wb.create_sheet("Week B")
+    second.append(["Position", "Weekday", "From", "To"])  # different order, no count
+    second.append(["Cook", "Tue", "11:00", "20:00"])
+    second.append([None, None, None, None])
+    second.append(["Host", "Wed", "12:00"])  # ragged: end cell missing
+    wb.create_sheet("Empty")
+    buf = io.BytesIO()
+    wb.save(buf)
+    return buf.getvalue()
+
+
+def test_parse_xlsx_reads_every_sheet_with_its_own_mapping(import_service):
+    rows, mapping = import_service.parse_template_file(_multi_sheet_xlsx(), "templates.xlsx")
+
+    assert mapping["day_of_week"] == "Day"  # first sheet's mapping
+    assert [r["role"] for r in rows] == ["Server", "Cook", "Host"]
+    assert rows[0]["day_of_week"] == "1"
+    assert rows[0]["count"] == "2"  # integral floats read as ints, like read_excel
+    assert rows[1]["day_of_week"] == "Tue"
+    assert rows[2]["end_time"] == ""
+
+
+def test_parse_csv_in_chunks_matches_whole_file(import_service):
+    body = "".join(f"{i % 7 + 1},09:00,17:00,Server,1\n" + ("\n" if i % 3 == 0 else "") for i in range(25))
+    csv = _csv_bytes("day_of_week,start_time,end_time,role,count\n" + body)
+    from app.core.import_utils import iter_spreadsheet
+    chunks = list(iter_spreadsheet(csv, "t.csv", chunk_rows=4))
+    rows, _ = import_service.parse_template_file(csv, "t.csv")
+
+    assert len(chunks) > 1
+    assert sum(len(chunk) for _, chunk in chunks) == len(rows) == 25
+
+
+def test_parse_corrupt_xlsx_is_value_error(import_service):
+    with pytest.raises(ValueError):
+        import_service.parse_template_file(b"PK not really a zip", "templates.xlsx")
+
+
+def test_preview_counts_every_row_but_returns_a_bounded_sample(import_service):
+    good = "Mon,09:00,17:00,Server,1\n"
+    bad = "Mon,09:00,noon,Server,1\n"
+    lines = [good] * 30
+    lines[2] = bad
+    lines[20] = bad
+    lines[25] = bad
+    csv = _csv_bytes("day_of_week,start_time,end_time,role,count\n" + "".join(lines))
+
+    preview = import_service.preview_template_file(csv, "t.csv", preview_rows=5, preview_errors=1)
+
+    assert preview["total_rows"] == 30
+    assert preview["valid_count"] == 27
+    assert preview["error_count"] == 3
+    assert preview["truncated"] is True
+    # First 5 rows, then only the first of the later errors
+    assert [r["row_number"] for r in preview["rows"]] == [1, 2, 3, 4, 5, 21]
+
+
+def test_preview_row_numbers_and_sheets_across_workbook(import_service):
+    preview = import_service.preview_template_file(_multi_sheet_xlsx(), "templates.xlsx")
+
+    assert preview["truncated"] is False
+    assert [(r["row_number"], r["sheet"]) for r in preview["rows"]] == [
+        (1, "Week A"),
+        (2, "Week B"),
+        (3, "Week B"),
+    ]
+    assert preview["rows"][2]["is_valid"] is False  # missing end_time
+
+
+# === image import (prepare_image + analyze_prepared_image) ===
 
 
 def _png_bytes(size=(100, 80), color=(200, 50, 50)) -> bytes:
@@ -143,57 +226,84 @@ def _heic_bytes(size=(100, 80), color=(50, 120, 200)) -> bytes:
 
 def _mock_ai_returning(shifts):
     mock_ai = MagicMock()
-    mock_ai.analyze_image_for_templates.return_value = shifts
+    mock_ai.analyze_image_for_templates = AsyncMock(return_value=shifts)
     return mock_ai
 
 
-def test_parse_template_image_rejects_undecodable_bytes(import_service):
+def _analyze(import_service, jpeg_bytes, refresh=False, owner=OWNER):
+    return asyncio.run(import_service.analyze_prepared_image(jpeg_bytes, owner, refresh))
+
+
+def _parse_image(import_service, image_bytes):
+    """Raw rows for an upload: the image half of preview_image, before validation."""
+    rows, _ = _analyze(import_service, import_service.prepare_image(image_bytes))
+    return rows
+
+
+def test_image_import_rejects_undecodable_bytes(import_service):
     from app.services.template_import_service import InvalidImageError
     with pytest.raises(InvalidImageError):
-        import_service.parse_template_image(b"this is not an image", "image/png")
+        import_service.prepare_image(b"this is not an image")
 
 
-def test_parse_template_image_ignores_mismatched_content_type(import_service):
-    """A real PNG mislabeled as application/pdf should still decode and process —
-    decoding is the source of truth, not the browser-reported content-type."""
+def test_image_import_sends_png_as_jpeg(import_service):
+    """Decoding decides what an upload is, not the browser-reported
+    content-type, and the model always gets JPEG."""
     mock_ai = _mock_ai_returning([])
     with patch("app.services.template_import_service.get_ai_service", return_value=mock_ai):
-        rows = import_service.parse_template_image(_png_bytes(), "application/octet-stream")
+        rows = _parse_image(import_service, _png_bytes())
     assert rows == []
     mock_ai.analyze_image_for_templates.assert_called_once()
-    # normalized to JPEG regardless of what content-type was declared
     assert mock_ai.analyze_image_for_templates.call_args[0][1] == "image/jpeg"
 
 
-def test_parse_template_image_converts_heic(import_service):
+def test_image_import_converts_heic(import_service):
     """The bug this whole normalization step exists for: iPhone HEIC photos."""
     mock_ai = _mock_ai_returning([])
     with patch("app.services.template_import_service.get_ai_service", return_value=mock_ai):
-        rows = import_service.parse_template_image(_heic_bytes(), "image/heic")
+        rows = _parse_image(import_service, _heic_bytes())
     assert rows == []
     sent_bytes, sent_mime = mock_ai.analyze_image_for_templates.call_args[0]
     assert sent_mime == "image/jpeg"
     assert sent_bytes[:2] == b"\xff\xd8"  # JPEG magic bytes
 
 
-def test_parse_template_image_downscales_large_images(import_service):
+def test_image_import_downscales_large_images(import_service):
     from app.services.template_import_service import _MAX_IMAGE_DIMENSION
     from PIL import Image
     mock_ai = _mock_ai_returning([])
     huge = _png_bytes(size=(4000, 3000))
     with patch("app.services.template_import_service.get_ai_service", return_value=mock_ai):
-        import_service.parse_template_image(huge, "image/png")
+        _parse_image(import_service, huge)
     sent_bytes, _ = mock_ai.analyze_image_for_templates.call_args[0]
     resized = Image.open(io.BytesIO(sent_bytes))
     assert max(resized.size) <= _MAX_IMAGE_DIMENSION
 
 
-def test_parse_template_image_happy_path(import_service):
+def test_image_import_decodes_large_jpeg_in_draft_mode(import_service):
+    from app.services.template_import_service import _MAX_IMAGE_DIMENSION, _MIN_DRAFT_DIMENSION
+    from PIL import Image
+    img = Image.new("RGB", (4000, 3000), color=(10, 20, 30))
+    buf = io.BytesIO()
+    img.save(buf, format="JPEG")
+    mock_ai = _mock_ai_returning([])
+    with patch("app.services.template_import_service.get_ai_service", return_value=mock_ai), \
+            patch.object(Image.Image, "load", autospec=True, side_effect=Image.Image.load) as load:
+        _parse_image(import_service, buf.getvalue())
+
+    # libjpeg decoded at half scale; no full-size bitmap was built
+    decoded = load.call_args_list[0][0][0]
+    assert decoded.size == (2000, 1500)
+    sent_bytes, _ = mock_ai.analyze_image_for_templates.call_args[0]
+    assert _MIN_DRAFT_DIMENSION <= max(Image.open(io.BytesIO(sent_bytes)).size) <= _MAX_IMAGE_DIMENSION
+
+
+def test_image_import_happy_path(import_service):
     mock_ai = _mock_ai_returning([
         {"name": "Mya Ferrari", "day_of_week": 2, "start_time": "09:00:00", "end_time": "17:00:00", "role": "Server", "count": 1},
     ])
     with patch("app.services.template_import_service.get_ai_service", return_value=mock_ai):
-        rows = import_service.parse_template_image(_png_bytes(), "image/png")
+        rows = _parse_image(import_service, _png_bytes())
 
     assert len(rows) == 1
     assert rows[0]["confidence"] == "high"
@@ -203,13 +313,13 @@ def test_parse_template_image_happy_path(import_service):
     assert validated[0]["name"] == "Mya Ferrari"
 
 
-def test_parse_template_image_name_only_no_role_is_still_valid(import_service):
+def test_image_import_name_only_no_role_is_still_valid(import_service):
     """The common whiteboard case: name is extracted, role is not — this must NOT be an error."""
     mock_ai = _mock_ai_returning([
         {"name": "Mya Ferrari", "day_of_week": 2, "start_time": "11:00:00", "end_time": "16:00:00", "role": None, "count": None},
     ])
     with patch("app.services.template_import_service.get_ai_service", return_value=mock_ai):
-        rows = import_service.parse_template_image(_png_bytes(), "image/png")
+        rows = _parse_image(import_service, _png_bytes())
 
     # role being null doesn't count against confidence — name/day/times are all present
     assert rows[0]["confidence"] == "high"
@@ -221,12 +331,12 @@ def test_parse_template_image_name_only_no_role_is_still_valid(import_service):
     assert any("role" in w for w in validated[0]["warnings"])
 
 
-def test_parse_template_image_low_confidence_on_null_fields(import_service):
+def test_image_import_low_confidence_on_null_fields(import_service):
     mock_ai = _mock_ai_returning([
         {"name": "Mya Ferrari", "day_of_week": 2, "start_time": None, "end_time": "17:00:00", "role": "Server", "count": None},
     ])
     with patch("app.services.template_import_service.get_ai_service", return_value=mock_ai):
-        rows = import_service.parse_template_image(_png_bytes(), "image/png")
+        rows = _parse_image(import_service, _png_bytes())
 
     assert rows[0]["confidence"] == "low"
     validated = import_service.validate_parsed_templates(rows)
@@ -235,34 +345,213 @@ def test_parse_template_image_low_confidence_on_null_fields(import_service):
     assert validated[0]["confidence"] == "low"
 
 
-def test_parse_template_image_neither_name_nor_role_is_error(import_service):
+def test_image_import_neither_name_nor_role_is_error(import_service):
     mock_ai = _mock_ai_returning([
         {"name": None, "day_of_week": 2, "start_time": "09:00:00", "end_time": "17:00:00", "role": None, "count": 1},
     ])
     with patch("app.services.template_import_service.get_ai_service", return_value=mock_ai):
-        rows = import_service.parse_template_image(_png_bytes(), "image/png")
+        rows = _parse_image(import_service, _png_bytes())
 
     validated = import_service.validate_parsed_templates(rows)
     assert validated[0]["is_valid"] is False
     assert any("name or role" in e for e in validated[0]["errors"])
 
 
-def test_parse_template_image_propagates_ai_unavailable(import_service):
+def test_image_import_propagates_ai_unavailable(import_service):
     with patch(
         "app.services.template_import_service.get_ai_service",
         side_effect=AIServiceUnavailableError("GROQ_API_KEY is not configured."),
     ):
         with pytest.raises(AIServiceUnavailableError):
-            import_service.parse_template_image(_png_bytes(), "image/png")
+            _parse_image(import_service, _png_bytes())
 
 
-def test_parse_template_image_empty_shifts(import_service):
+def test_image_import_empty_shifts(import_service):
     mock_ai = _mock_ai_returning([])
     with patch("app.services.template_import_service.get_ai_service", return_value=mock_ai):
-        rows = import_service.parse_template_image(_png_bytes(), "image/png")
+        rows = _parse_image(import_service, _png_bytes())
     assert rows == []
 
 
+# === vision cache ===
+
+
+def _board_jpeg(seed=0, size=(1200, 900), quality=90) -> bytes:
+    """A schedule-board-like picture: white background, coloured columns."""
+    from PIL import Image, ImageDraw
+    img = Image.new("RGB", (1200, 900), "white")
+    draw = ImageDraw.Draw(img)
+    for i in range(8):
+        bottom = 800 - (i * 53 + seed * 97) % 500
+        draw.rectangle([50 + i * 140, 100, 150 + i * 140, bottom], fill=(30 * i % 255, 80, 160))
+    buf = io.BytesIO()
+    img.resize(size).save(buf, format="JPEG", quality=quality)
+    return buf.getvalue()
+
+
+VISION_SHIFTS = [
+    {"name": "Mya", "day_of_week": 2, "start_time": "09:00:00", "end_time": "17:00:00", "role": None, "count": 1},
+]
+
+
+def test_vision_cache_reuses_result_for_same_image(import_service):
+    mock_ai = _mock_ai_returning(VISION_SHIFTS)
+    jpeg = import_service.prepare_image(_board_jpeg())
+    with patch("app.services.template_import_service.get_ai_service", return_value=mock_ai):
+        first, first_source = _analyze(import_service, jpeg)
+        second, second_source = _analyze(import_service, jpeg)
+
+    assert (first_source, second_source) == ("miss", "hit")
+    assert first == second
+    mock_ai.analyze_image_for_templates.assert_called_once()
+
+
+def test_vision_cache_near_duplicate_for_reencoded_image(import_service):
+    mock_ai = _mock_ai_returning(VISION_SHIFTS)
+    original = import_service.prepare_image(_board_jpeg())
+    reencoded = import_service.prepare_image(_board_jpeg(size=(800, 600), quality=60))
+    assert original != reencoded
+    with patch("app.services.template_import_service.get_ai_service", return_value=mock_ai):
+        _analyze(import_service, original)
+        rows, source = _analyze(import_service, reencoded)
+
+    assert source == "near_duplicate"
+    assert rows[0]["name"] == "Mya"
+    mock_ai.analyze_image_for_templates.assert_called_once()
+
+
+def test_vision_cache_near_duplicates_stay_with_their_owner(import_service):
+    mock_ai = _mock_ai_returning(VISION_SHIFTS)
+    original = import_service.prepare_image(_board_jpeg())
+    reencoded = import_service.prepare_image(_board_jpeg(size=(800, 600), quality=60))
+    with patch("app.services.template_import_service.get_ai_service", return_value=mock_ai):
+        _analyze(import_service, original, owner="user-1")
+        mock_ai.analyze_image_for_templates.return_value = []
+        rows, source = _analyze(import_service, reencoded, owner="user-2")
+
+    assert (rows, source) == ([], "miss")
+    assert mock_ai.analyze_image_for_templates.call_count == 2
+
+
+def test_vision_cache_shares_exact_hits_across_owners(import_service):
+    mock_ai = _mock_ai_returning(VISION_SHIFTS)
+    jpeg = import_service.prepare_image(_board_jpeg())
+    reencoded = import_service.prepare_image(_board_jpeg(size=(800, 600), quality=60))
+    with patch("app.services.template_import_service.get_ai_service", return_value=mock_ai):
+        _analyze(import_service, jpeg, owner="user-1")
+        _, exact_source = _analyze(import_service, jpeg, owner="user-2")
+        # The exact hit makes the image one of user-2's own
+        _, near_source = _analyze(import_service, reencoded, owner="user-2")
+
+    assert (exact_source, near_source) == ("hit", "near_duplicate")
+    mock_ai.analyze_image_for_templates.assert_called_once()
+
+
+def test_vision_cache_misses_for_different_image(import_service):
+    mock_ai = _mock_ai_returning(VISION_SHIFTS)
+    with patch("app.services.template_import_service.get_ai_service", return_value=mock_ai):
+        _analyze(import_service, import_service.prepare_image(_board_jpeg(seed=0)))
+        _, source = _analyze(import_service, import_service.prepare_image(_board_jpeg(seed=1)))
+
+    assert source == "miss"
+    assert mock_ai.analyze_image_for_templates.call_count == 2
+
+
+def test_vision_cache_refresh_bypasses_and_replaces(import_service):
+    mock_ai = _mock_ai_returning(VISION_SHIFTS)
+    jpeg = import_service.prepare_image(_board_jpeg())
+    with patch("app.services.template_import_service.get_ai_service", return_value=mock_ai):
+        _analyze(import_service, jpeg)
+        mock_ai.analyze_image_for_templates.return_value = []
+        rows, source = _analyze(import_service, jpeg, refresh=True)
+        cached_rows, cached_source = _analyze(import_service, jpeg)
+
+    assert (rows, source) == ([], "miss")
+    assert (cached_rows, cached_source) == ([], "hit")
+
+
+def test_vision_cache_does_not_store_failures(import_service):
+    mock_ai = MagicMock()
+    mock_ai.analyze_image_for_templates = AsyncMock(side_effect=[ValueError("bad response"), VISION_SHIFTS])
+    jpeg = import_service.prepare_image(_board_jpeg())
+    with patch("app.services.template_import_service.get_ai_service", return_value=mock_ai):
+        with pytest.raises(ValueError):
+            _analyze(import_service, jpeg)
+        rows, source = _analyze(import_service, jpeg)
+
+    assert source == "miss"
+    assert len(rows) == 1
+
+
+# === batch import ===
+
+
+def test_preview_batch_mixes_files_and_images_in_upload_order(import_service):
+    from PIL import Image
+
+    async def analyze(jpeg_bytes, mime_type):
+        # The images are decoded concurrently, so answer by image (landscape
+        # uptown, portrait airport) rather than by call order
+        width, height = Image.open(io.BytesIO(jpeg_bytes)).size
+        if width < height:
+            raise ValueError("not JSON")
+        return VISION_SHIFTS
+
+    mock_ai = MagicMock()
+    mock_ai.analyze_image_for_templates = AsyncMock(side_effect=analyze)
+    files = [
+        ("downtown.csv", _csv_bytes("Day,Start,End,Role,Count\nMonday,09:00,17:00,Server,2\n")),
+        ("uptown.jpg", _board_jpeg(seed=0)),
+        ("notes.txt", b"not an image"),
+        ("airport.jpg", _board_jpeg(seed=1, size=(900, 1200))),
+    ]
+    with patch("app.services.template_import_service.get_ai_service", return_value=mock_ai):
+        results = asyncio.run(import_service.preview_batch(files, OWNER))
+
+    assert [(r["filename"], r["kind"]) for r in results] == [
+        ("downtown.csv", "file"), ("uptown.jpg", "image"), ("notes.txt", "image"), ("airport.jpg", "image"),
+    ]
+    assert results[0]["preview"]["valid_count"] == 1 and results[0]["error"] is None
+    assert results[1]["preview"]["rows"][0]["name"] == "Mya"
+    assert results[2]["preview"] is None and "image" in results[2]["error"].lower()
+    assert results[3]["error"] == "Vision AI returned an unexpected response. Please try again."
+
+
+def test_preview_batch_bounds_files_in_flight(import_service):
+    in_flight = peak = 0
+
+    async def slow_preview(filename, data, owner, refresh=False):
+        nonlocal in_flight, peak
+        in_flight += 1
+        peak = max(peak, in_flight)
+        await asyncio.sleep(0.01)
+        in_flight -= 1
+        return {"column_mapping": {}, "rows": [], "valid_count": 0, "error_count": 0}
+
+    with patch.object(import_service, "preview_upload", side_effect=slow_preview):
+        results = asyncio.run(import_service.preview_batch([(f"{i}.csv", b"") for i in range(7)], OWNER, concurrency=3))
+
+    assert peak == 3
+    assert all(r["error"] is None for r in results)
+
+
+def test_save_templates_for_restaurants_one_upsert_per_restaurant():
+    mock_shift_template_service = MagicMock()
+    mock_shift_template_service.get_templates.return_value = None
+    mock_shift_template_service.upsert_templates.side_effect = [{}, Exception("connection reset")]
+    svc = TemplateImportService(shift_template_service=mock_shift_template_service)
+    row = {"day_of_week": 3, "start_time": "11:00:00", "end_time": "20:00:00", "role": "Cook", "count": 2}
+
+    results = svc.save_templates_for_restaurants([("r1", [row]), ("r2", [row]), ("r1", [row, row])])
+
+    assert mock_shift_template_service.upsert_templates.call_count == 2
+    (first_id, first_templates), _ = mock_shift_template_service.upsert_templates.call_args_list[0]
+    assert first_id == "r1" and len(first_templates) == 3
+    assert results[0] == {"restaurant_id": "r1", "imported_count": 3, "error": None}
+    assert results[1]["restaurant_id"] == "r2" and results[1]["imported_count"] == 0
+    assert "connection reset" in results[1]["error"]
+
+
 # === validate_parsed_templates ===
 
 
@@ -332,6 +621,53 @@ def test_validate_row_numbers_are_1_indexed(import_service):
     assert [r["row_number"] for r in validated] == [1, 2]
 
 
+
+def test_validate_time_edge_cases(import_service):
+    cases = {
+        "12 AM": "00:00:00",
+        "9PM": "21:00:00",
+        "9 p.m.": "21:00:00",
+        "9:05:59": "09:05:59",
+        "17": None,  # hour alone needs AM/PM
+        "0 AM": None,
+        "13:00 PM": None,
+        "24:00": None,
+        "9:60": None,
+        "9:05:60": None,
+    }
+    rows = [
+        {"day_of_week": "2", "start_time": value, "end_time": "23:59", "role": "Server", "count": "1"}
+        for value in cases
+    ]
+    validated = import_service.validate_parsed_templates(rows)
+    assert [r["start_time"] for r in validated] == list(cases.values())
+
+
+def test_validate_day_of_week_numeric_edge_cases(import_service):
+    values = ["7.0", "0", "8", "inf", "Thurs", "", None]
+    rows = [
+        {"day_of_week": v, "start_time": "09:00", "end_time": "17:00", "role": "Server", "count": "1"}
+        for v in values
+    ]
+    validated = import_service.validate_parsed_templates(rows)
+    assert [r["day_of_week"] for r in validated] == [7, None, None, None, 4, None, None]
+
+
+def test_validate_reports_errors_on_the_offending_rows_only(import_service):
+    good = {"day_of_week": "Mon", "start_time": "9:00 AM", "end_time": "5 PM", "role": "Server", "count": "1"}
+    rows = [good] * 500 + [{**good, "end_time": "noon"}] + [good] * 500 + [{"role": "Cook"}]
+    validated = import_service.validate_parsed_templates(rows)
+
+    invalid = [r for r in validated if not r["is_valid"]]
+    assert [r["row_number"] for r in invalid] == [501, 1002]
+    assert invalid[0]["errors"] == ["end_time is missing or not a recognized time format"]
+    assert len(invalid[1]["errors"]) == 3  # day, start and end all missing
+
+
+def test_validate_empty_rows(import_service):
+    assert import_service.validate_parsed_templates([]) == []
+
+
 # === save_templates_batch ===
 
 
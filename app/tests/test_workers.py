@@ -0,0 +1,99 @@
+import asyncio
+import threading
+
+import pytest
+
+from app.core.memory import current_rss_bytes, max_rss_bytes
+from app.core.workers import (
+    BoundedPool,
+    PoolSaturatedError,
+    get_stage_timings,
+    start_stage_timings,
+)
+
+
+def test_run_returns_result_and_records_stage():
+    async def scenario():
+        timings = start_stage_timings()
+        pool = BoundedPool("test", max_workers=1, max_queued=0)
+        try:
+            assert await pool.run("double", lambda x: x * 2, 21) == 42
+        finally:
+            pool.shutdown()
+        return timings
+
+    timings = asyncio.run(scenario())
+    [entry] = timings.summary()["stages"]
+    assert entry["stage"] == "double"
+    assert entry["run_ms"] >= 0 and entry["wait_ms"] >= 0
+
+
+def test_run_sees_caller_context():
+    async def scenario():
+        timings = start_stage_timings()
+        pool = BoundedPool("test", max_workers=1, max_queued=0)
+        try:
+            return timings, await pool.run("ctx", get_stage_timings)
+        finally:
+            pool.shutdown()
+
+    timings, seen = asyncio.run(scenario())
+    assert seen is timings
+
+
+def test_run_rejects_when_workers_and_queue_are_full():
+    release = threading.Event()
+
+    async def scenario():
+        pool = BoundedPool("test", max_workers=1, max_queued=1)
+        try:
+            running = asyncio.ensure_future(pool.run("block", release.wait, 5))
+            queued = asyncio.ensure_future(pool.run("block", release.wait, 5))
+            await asyncio.sleep(0)
+            with pytest.raises(PoolSaturatedError):
+                await pool.run("rejected", lambda: None)
+            release.set()
+            await asyncio.gather(running, queued)
+            # Slots are freed once work finishes
+            assert await pool.run("after", lambda: "ok") == "ok"
+        finally:
+            pool.shutdown()
+
+    asyncio.run(scenario())
+
+
+def test_exception_propagates_and_frees_slot():
+    async def scenario():
+        pool = BoundedPool("test", max_workers=1, max_queued=0)
+        try:
+            with pytest.raises(ValueError):
+                await pool.run("boom", int, "nope")
+            assert await pool.run("after", lambda: 1) == 1
+        finally:
+            pool.shutdown()
+
+    asyncio.run(scenario())
+
+
+@pytest.mark.parametrize("sample_rss", [False, True])
+def test_track_rss_records_peak(sample_rss):
+    async def scenario():
+        timings = start_stage_timings()
+        pool = BoundedPool("test", max_workers=1, max_queued=0, track_rss=True, sample_rss=sample_rss)
+        try:
+            await pool.run("alloc", lambda: len(bytearray(8 * 2**20)))
+        finally:
+            pool.shutdown()
+        return timings
+
+    summary = asyncio.run(scenario()).summary()
+    if (current_rss_bytes() if sample_rss else max_rss_bytes()) is None:
+        pytest.skip("RSS not readable on this platform")
+    [entry] = summary["stages"]
+    assert entry["peak_rss_mb"] > 0
+    assert entry["rss_delta_mb"] >= 0
+    assert summary["peak_rss_mb"] == entry["peak_rss_mb"]
+
+
+def test_summary_empty_without_stages():
+    assert start_stage_timings().summary() == {}
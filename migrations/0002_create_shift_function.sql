@@ -0,0 +1,107 @@
+-- Atomic shift creation.
+--
+-- create_shift() does every check ShiftsService.create_shift used to do in
+-- separate round trips (schedule exists, employee exists and is active, date
+-- inside the schedule week, start < end, no overlap) plus the INSERT, in one
+-- call. The overlap rule is enforced by an exclusion constraint rather than a
+-- SELECT-then-INSERT, so two concurrent creates can't both succeed.
+--
+-- Errors are raised with a SQLSTATE and a HINT the API maps back to its own
+-- exceptions (see ShiftsService._raise_create_shift_error):
+--   P0002 / schedule_not_found
+--   P0002 / employee_not_found
+--   22023 / invalid_shift          (message is user-facing)
+--   23P01 / shift_overlap          (DETAIL is a JSON array of the clashing shifts)
+--
+-- NOTE: adding the constraint fails if the table already contains overlapping
+-- shifts for the same employee and day. Find them first with:
+--   SELECT a.id, b.id FROM shifts a JOIN shifts b
+--     ON a.employee_id = b.employee_id AND a.shift_date = b.shift_date
+--    AND a.id < b.id AND a.start_time < b.end_time AND b.start_time < a.end_time;
+
+CREATE EXTENSION IF NOT EXISTS btree_gist;
+
+-- DEFERRABLE INITIALLY IMMEDIATE: checked at the end of each statement rather
+-- than per row, so a multi-row upsert that swaps two shifts' times (batch
+-- edits) doesn't trip over its own intermediate state.
+ALTER TABLE shifts
+ADD CONSTRAINT shifts_no_overlap
+EXCLUDE USING gist (
+    employee_id WITH =,
+    shift_date WITH =,
+    tsrange(shift_date + start_time, shift_date + end_time) WITH &&
+)
+DEFERRABLE INITIALLY IMMEDIATE;
+
+CREATE OR REPLACE FUNCTION create_shift(
+    p_schedule_id UUID,
+    p_employee_id UUID,
+    p_shift_date DATE,
+    p_start_time TIME,
+    p_end_time TIME,
+    p_notes TEXT DEFAULT NULL
+)
+RETURNS shifts
+LANGUAGE plpgsql
+AS $$
+DECLARE
+    v_week_start DATE;
+    v_employee RECORD;
+    v_overlapping JSON;
+    v_shift shifts;
+BEGIN
+    SELECT week_start INTO v_week_start FROM schedules WHERE id = p_schedule_id;
+    IF NOT FOUND THEN
+        RAISE EXCEPTION 'Schedule % not found', p_schedule_id
+            USING ERRCODE = 'P0002', HINT = 'schedule_not_found';
+    END IF;
+
+    SELECT name, is_active INTO v_employee FROM employees WHERE id = p_employee_id;
+    IF NOT FOUND THEN
+        RAISE EXCEPTION 'Employee with ID % not found', p_employee_id
+            USING ERRCODE = 'P0002', HINT = 'employee_not_found';
+    END IF;
+    IF NOT COALESCE(v_employee.is_active, FALSE) THEN
+        RAISE EXCEPTION 'Cannot assign shifts to inactive employee %', v_employee.name
+            USING ERRCODE = '22023', HINT = 'invalid_shift';
+    END IF;
+
+    IF p_start_time >= p_end_time THEN
+        RAISE EXCEPTION 'End time must be after start time'
+            USING ERRCODE = '22023', HINT = 'invalid_shift';
+    END IF;
+
+    IF p_shift_date < v_week_start OR p_shift_date > v_week_start + 6 THEN
+        RAISE EXCEPTION 'Shift date % must be within schedule week (% to %)',
+            p_shift_date, v_week_start, v_week_start + 6
+            USING ERRCODE = '22023', HINT = 'invalid_shift';
+    END IF;
+
+    BEGIN
+        INSERT INTO shifts (
+            schedule_id, employee_id, shift_date, start_time, end_time, notes,
+            created_at, updated_at
+        )
+        VALUES (
+            p_schedule_id, p_employee_id, p_shift_date, p_start_time, p_end_time,
+            NULLIF(btrim(p_notes), ''), now(), now()
+        )
+        RETURNING * INTO v_shift;
+    EXCEPTION WHEN exclusion_violation THEN
+        SELECT json_agg(json_build_object(
+                   'id', id, 'start_time', start_time, 'end_time', end_time
+               ) ORDER BY start_time)
+          INTO v_overlapping
+          FROM shifts
+         WHERE employee_id = p_employee_id
+           AND shift_date = p_shift_date
+           AND start_time < p_end_time
+           AND p_start_time < end_time;
+        RAISE EXCEPTION 'Shift overlaps with an existing shift'
+            USING ERRCODE = '23P01', HINT = 'shift_overlap',
+                  DETAIL = COALESCE(v_overlapping, '[]'::json)::text;
+    END;
+
+    RETURN v_shift;
+END;
+$$;
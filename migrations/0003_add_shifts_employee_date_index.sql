@@ -0,0 +1,6 @@
+-- Supports ShiftsService.get_employee_shifts (GET /employees/{id}/shifts):
+-- an equality on employee_id plus a shift_date range, ordered by
+-- (shift_date, start_time, id) for keyset pagination. The trailing columns
+-- let the ORDER BY and the cursor predicate use the index instead of a sort.
+CREATE INDEX IF NOT EXISTS idx_shifts_employee_date
+ON shifts (employee_id, shift_date, start_time, id);
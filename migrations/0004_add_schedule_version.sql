@@ -0,0 +1,77 @@
+-- Per-schedule change counter backing ETags on GET /api/v1/schedules/{id}.
+--
+-- schedules.version is bumped by triggers whenever anything that appears in
+-- the schedule response changes: the schedule's shifts (insert/update/delete)
+-- or the name/role of an employee assigned to one of its shifts. The API
+-- reads only this column to answer If-None-Match, so an unchanged schedule
+-- costs one indexed single-row lookup instead of a full fetch.
+--
+-- Statement-level triggers with transition tables: a bulk insert of 100
+-- shifts (the generator, batch edits) bumps each affected schedule once, not
+-- 100 times.
+
+ALTER TABLE schedules
+ADD COLUMN version BIGINT NOT NULL DEFAULT 1;
+
+CREATE OR REPLACE FUNCTION bump_schedule_version_from_shifts()
+RETURNS trigger
+LANGUAGE plpgsql
+AS $$
+BEGIN
+    IF TG_OP = 'INSERT' THEN
+        UPDATE schedules SET version = version + 1
+         WHERE id IN (SELECT DISTINCT schedule_id FROM new_rows);
+    ELSIF TG_OP = 'DELETE' THEN
+        UPDATE schedules SET version = version + 1
+         WHERE id IN (SELECT DISTINCT schedule_id FROM old_rows);
+    ELSE
+        -- A shift moved between schedules changes both
+        UPDATE schedules SET version = version + 1
+         WHERE id IN (
+             SELECT schedule_id FROM new_rows
+             UNION
+             SELECT schedule_id FROM old_rows
+         );
+    END IF;
+    RETURN NULL;
+END;
+$$;
+
+CREATE TRIGGER shifts_bump_schedule_version_insert
+AFTER INSERT ON shifts
+REFERENCING NEW TABLE AS new_rows
+FOR EACH STATEMENT EXECUTE FUNCTION bump_schedule_version_from_shifts();
+
+CREATE TRIGGER shifts_bump_schedule_version_update
+AFTER UPDATE ON shifts
+REFERENCING OLD TABLE AS old_rows NEW TABLE AS new_rows
+FOR EACH STATEMENT EXECUTE FUNCTION bump_schedule_version_from_shifts();
+
+CREATE TRIGGER shifts_bump_schedule_version_delete
+AFTER DELETE ON shifts
+REFERENCING OLD TABLE AS old_rows
+FOR EACH STATEMENT EXECUTE FUNCTION bump_schedule_version_from_shifts();
+
+-- Schedule responses embed employee name and role.
+CREATE OR REPLACE FUNCTION bump_schedule_version_from_employees()
+RETURNS trigger
+LANGUAGE plpgsql
+AS $$
+BEGIN
+    UPDATE schedules SET version = version + 1
+     WHERE id IN (
+         SELECT DISTINCT s.schedule_id
+           FROM shifts s
+           JOIN new_rows n ON n.id = s.employee_id
+           JOIN old_rows o ON o.id = n.id
+          WHERE n.name IS DISTINCT FROM o.name
+             OR n.role IS DISTINCT FROM o.role
+     );
+    RETURN NULL;
+END;
+$$;
+
+CREATE TRIGGER employees_bump_schedule_version
+AFTER UPDATE ON employees
+REFERENCING OLD TABLE AS old_rows NEW TABLE AS new_rows
+FOR EACH STATEMENT EXECUTE FUNCTION bump_schedule_version_from_employees();
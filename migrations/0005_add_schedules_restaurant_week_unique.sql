@@ -0,0 +1,14 @@
+-- One schedule per restaurant per week.
+--
+-- ScheduleService.create_schedules_for_range writes all requested weeks in a
+-- single INSERT ... ON CONFLICT (restaurant_id, week_start) DO NOTHING
+-- (a PostgREST upsert with ignore-duplicates), which needs this constraint as
+-- its conflict target. It also closes the race where two concurrent
+-- create_schedule calls both pass the existence check.
+--
+-- NOTE: fails if duplicate weeks already exist. Find them first with:
+--   SELECT restaurant_id, week_start, count(*) FROM schedules
+--    GROUP BY restaurant_id, week_start HAVING count(*) > 1;
+
+ALTER TABLE schedules
+ADD CONSTRAINT schedules_restaurant_week_key UNIQUE (restaurant_id, week_start);
@@ -0,0 +1,91 @@
+-- Per-schedule totals for dashboards (GET /api/v1/schedules/summary).
+--
+-- Returns one row per schedule matching the filters, with shift count,
+-- total hours, hours per role and hours per employee, aggregated in the
+-- database. A season overview is one call instead of loading every shift
+-- of every schedule into the API.
+--
+-- Schedules with no shifts are included with zero totals. Roles come from
+-- the employee (not the shift notes); hours are rounded to 2 decimals to
+-- match ScheduleResponse.total_hours.
+
+CREATE OR REPLACE FUNCTION get_schedule_summaries(
+    p_restaurant_id UUID DEFAULT NULL,
+    p_from DATE DEFAULT NULL,
+    p_to DATE DEFAULT NULL
+)
+RETURNS TABLE (
+    schedule_id UUID,
+    restaurant_id UUID,
+    week_start DATE,
+    shift_count INT,
+    total_hours NUMERIC,
+    hours_by_role JSONB,
+    hours_by_employee JSONB
+)
+LANGUAGE sql
+STABLE
+AS $$
+    WITH sched AS (
+        SELECT s.id, s.restaurant_id, s.week_start
+          FROM schedules s
+         WHERE (p_restaurant_id IS NULL OR s.restaurant_id = p_restaurant_id)
+           AND (p_from IS NULL OR s.week_start >= p_from)
+           AND (p_to IS NULL OR s.week_start <= p_to)
+    ),
+    shift_hours AS (
+        SELECT sh.schedule_id,
+               sh.employee_id,
+               COALESCE(e.name, 'Unknown') AS name,
+               COALESCE(e.role, 'Unknown') AS role,
+               EXTRACT(EPOCH FROM (sh.end_time - sh.start_time)) / 3600.0 AS hours
+          FROM shifts sh
+          JOIN sched ON sched.id = sh.schedule_id
+          LEFT JOIN employees e ON e.id = sh.employee_id
+    ),
+    totals AS (
+        SELECT schedule_id, count(*)::INT AS shift_count, round(sum(hours), 2) AS total_hours
+          FROM shift_hours
+         GROUP BY schedule_id
+    ),
+    by_role AS (
+        SELECT schedule_id, jsonb_object_agg(role, hours) AS hours_by_role
+          FROM (
+              SELECT schedule_id, role, round(sum(hours), 2) AS hours
+                FROM shift_hours
+               GROUP BY schedule_id, role
+          ) r
+         GROUP BY schedule_id
+    ),
+    by_employee AS (
+        SELECT schedule_id,
+               jsonb_agg(
+                   jsonb_build_object(
+                       'employee_id', employee_id,
+                       'name', name,
+                       'shift_count', shift_count,
+                       'hours', hours
+                   )
+                   ORDER BY hours DESC, name
+               ) AS hours_by_employee
+          FROM (
+              SELECT schedule_id, employee_id, name,
+                     count(*) AS shift_count, round(sum(hours), 2) AS hours
+                FROM shift_hours
+               GROUP BY schedule_id, employee_id, name
+          ) x
+         GROUP BY schedule_id
+    )
+    SELECT sched.id,
+           sched.restaurant_id,
+           sched.week_start,
+           COALESCE(t.shift_count, 0),
+           COALESCE(t.total_hours, 0),
+           COALESCE(r.hours_by_role, '{}'::jsonb),
+           COALESCE(b.hours_by_employee, '[]'::jsonb)
+      FROM sched
+      LEFT JOIN totals t ON t.schedule_id = sched.id
+      LEFT JOIN by_role r ON r.schedule_id = sched.id
+      LEFT JOIN by_employee b ON b.schedule_id = sched.id
+     ORDER BY sched.week_start DESC, sched.id DESC;
+$$;
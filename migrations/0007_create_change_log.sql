@@ -0,0 +1,26 @@
+-- Append-only change log backing the delta sync feed (GET /api/v1/changes).
+--
+-- The service layer (ChangeLogService) appends one row per created, updated
+-- or deleted shift, schedule, employee or availability window. Clients keep
+-- the last id they saw (wrapped in an opaque cursor) and fetch only newer
+-- rows for their restaurant.
+--
+-- data holds the row as written for created/updated entries and just the id
+-- for deletions (a tombstone).
+--
+-- Nothing prunes this table yet; rows older than any client's cursor can be
+-- deleted safely, e.g.:
+--   DELETE FROM change_log WHERE changed_at < now() - interval '90 days';
+
+CREATE TABLE IF NOT EXISTS change_log (
+    id BIGSERIAL PRIMARY KEY,
+    restaurant_id UUID NOT NULL,
+    entity TEXT NOT NULL CHECK (entity IN ('shift', 'schedule', 'employee', 'availability')),
+    entity_id UUID NOT NULL,
+    op TEXT NOT NULL CHECK (op IN ('created', 'updated', 'deleted')),
+    data JSONB NOT NULL,
+    changed_at TIMESTAMPTZ NOT NULL DEFAULT now()
+);
+
+CREATE INDEX IF NOT EXISTS idx_change_log_restaurant_id
+ON change_log (restaurant_id, id);
@@ -0,0 +1,77 @@
+-- Per-employee subscribable calendar feeds
+-- (GET /api/v1/public/feeds/{feed_token}.ics).
+--
+-- feed_token authenticates the feed URL a calendar app polls; rotating or
+-- clearing it cuts off old subscriptions.
+--
+-- shift_version / shifts_changed_at change whenever anything in the
+-- employee's feed changes: one of their shifts is inserted, updated or
+-- deleted (including shifts moved to or from them), or their role changes
+-- (it appears in every event title). 0011 extends the role trigger to name
+-- changes (the feed's calendar name). The API caches rendered feeds keyed by
+-- shift_version and derives ETag / Last-Modified from these columns, so an
+-- unchanged feed costs one indexed lookup.
+--
+-- The shift triggers below update employees, which also fired 0004's
+-- schedule-version trigger on every shift write; 0012 limits that one to
+-- name and role changes.
+
+ALTER TABLE employees
+ADD COLUMN feed_token TEXT UNIQUE,
+ADD COLUMN shift_version BIGINT NOT NULL DEFAULT 1,
+ADD COLUMN shifts_changed_at TIMESTAMPTZ NOT NULL DEFAULT now();
+
+CREATE OR REPLACE FUNCTION bump_employee_shift_version()
+RETURNS trigger
+LANGUAGE plpgsql
+AS $$
+BEGIN
+    IF TG_OP = 'INSERT' THEN
+        UPDATE employees SET shift_version = shift_version + 1, shifts_changed_at = now()
+         WHERE id IN (SELECT DISTINCT employee_id FROM new_rows);
+    ELSIF TG_OP = 'DELETE' THEN
+        UPDATE employees SET shift_version = shift_version + 1, shifts_changed_at = now()
+         WHERE id IN (SELECT DISTINCT employee_id FROM old_rows);
+    ELSE
+        UPDATE employees SET shift_version = shift_version + 1, shifts_changed_at = now()
+         WHERE id IN (
+             SELECT employee_id FROM new_rows
+             UNION
+             SELECT employee_id FROM old_rows
+         );
+    END IF;
+    RETURN NULL;
+END;
+$$;
+
+CREATE TRIGGER shifts_bump_employee_shift_version_insert
+AFTER INSERT ON shifts
+REFERENCING NEW TABLE AS new_rows
+FOR EACH STATEMENT EXECUTE FUNCTION bump_employee_shift_version();
+
+CREATE TRIGGER shifts_bump_employee_shift_version_update
+AFTER UPDATE ON shifts
+REFERENCING OLD TABLE AS old_rows NEW TABLE AS new_rows
+FOR EACH STATEMENT EXECUTE FUNCTION bump_employee_shift_version();
+
+CREATE TRIGGER shifts_bump_employee_shift_version_delete
+AFTER DELETE ON shifts
+REFERENCING OLD TABLE AS old_rows
+FOR EACH STATEMENT EXECUTE FUNCTION bump_employee_shift_version();
+
+CREATE OR REPLACE FUNCTION bump_employee_shift_version_on_role()
+RETURNS trigger
+LANGUAGE plpgsql
+AS $$
+BEGIN
+    IF NEW.role IS DISTINCT FROM OLD.role THEN
+        NEW.shift_version := OLD.shift_version + 1;
+        NEW.shifts_changed_at := now();
+    END IF;
+    RETURN NEW;
+END;
+$$;
+
+CREATE TRIGGER employees_bump_shift_version_on_role
+BEFORE UPDATE OF role ON employees
+FOR EACH ROW EXECUTE FUNCTION bump_employee_shift_version_on_role();
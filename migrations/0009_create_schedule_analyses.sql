@@ -0,0 +1,24 @@
+-- Persistent cache of AI schedule analyses
+-- (POST /api/v1/schedules/{id}/analyze).
+--
+-- input_hash is a sha256 over everything the model is sent (model, prompt
+-- messages built from the shifts and roster, sampling parameters) plus the
+-- API's analysis prompt version. Any change to a shift, an assigned
+-- employee or the roster produces a new hash, so stale rows are never
+-- read; they only wait for expires_at.
+--
+-- Expired rows are ignored on read but not deleted; prune them with e.g.:
+--   DELETE FROM schedule_analyses WHERE expires_at < now();
+
+CREATE TABLE IF NOT EXISTS schedule_analyses (
+    input_hash TEXT PRIMARY KEY,
+    schedule_id UUID NOT NULL REFERENCES schedules(id) ON DELETE CASCADE,
+    model TEXT NOT NULL,
+    prompt_version TEXT NOT NULL,
+    result JSONB NOT NULL,
+    created_at TIMESTAMPTZ NOT NULL DEFAULT now(),
+    expires_at TIMESTAMPTZ NOT NULL
+);
+
+CREATE INDEX IF NOT EXISTS idx_schedule_analyses_schedule_id
+ON schedule_analyses (schedule_id);
@@ -0,0 +1,68 @@
+-- Atomic shift batch writes (POST /api/v1/shifts/batch).
+--
+-- ShiftsService.apply_shift_batch validates a whole batch in Python and then
+-- calls apply_shift_batch() to write it: one DELETE, one UPDATE and one
+-- multi-row INSERT, in that order so a slot freed by a delete or a move can
+-- be reused by a create. A function body runs in a single transaction, so
+-- if a concurrent edit trips shifts_no_overlap (23P01) on the UPDATE or
+-- INSERT, the DELETE is rolled back too and nothing is written.
+--
+-- p_updates / p_creates are JSON arrays of shift rows (id is required in
+-- updates and ignored in creates); p_delete_ids lists shift ids. Every
+-- statement is restricted to p_schedule_id.
+--
+-- Returns {"created": [shift, ...], "updated": [shift, ...]}.
+
+CREATE OR REPLACE FUNCTION apply_shift_batch(
+    p_schedule_id UUID,
+    p_delete_ids UUID[],
+    p_updates JSONB,
+    p_creates JSONB
+)
+RETURNS JSONB
+LANGUAGE plpgsql
+AS $$
+DECLARE
+    v_updated JSONB;
+    v_created JSONB;
+BEGIN
+    DELETE FROM shifts
+     WHERE schedule_id = p_schedule_id
+       AND id = ANY(COALESCE(p_delete_ids, '{}'));
+
+    WITH changed AS (
+        UPDATE shifts s
+           SET employee_id = u.employee_id,
+               shift_date = u.shift_date,
+               start_time = u.start_time,
+               end_time = u.end_time,
+               notes = u.notes,
+               updated_at = now()
+          FROM jsonb_to_recordset(COALESCE(p_updates, '[]'::jsonb)) AS u(
+                   id UUID, employee_id UUID, shift_date DATE,
+                   start_time TIME, end_time TIME, notes TEXT
+               )
+         WHERE s.id = u.id
+           AND s.schedule_id = p_schedule_id
+        RETURNING s.*
+    )
+    SELECT COALESCE(jsonb_agg(to_jsonb(changed)), '[]'::jsonb) INTO v_updated FROM changed;
+
+    WITH inserted AS (
+        INSERT INTO shifts (
+            schedule_id, employee_id, shift_date, start_time, end_time, notes,
+            created_at, updated_at
+        )
+        SELECT p_schedule_id, c.employee_id, c.shift_date, c.start_time, c.end_time,
+               NULLIF(btrim(c.notes), ''), now(), now()
+          FROM jsonb_to_recordset(COALESCE(p_creates, '[]'::jsonb)) AS c(
+                   employee_id UUID, shift_date DATE,
+                   start_time TIME, end_time TIME, notes TEXT
+               )
+        RETURNING *
+    )
+    SELECT COALESCE(jsonb_agg(to_jsonb(inserted)), '[]'::jsonb) INTO v_created FROM inserted;
+
+    RETURN jsonb_build_object('created', v_created, 'updated', v_updated);
+END;
+$$;
@@ -0,0 +1,26 @@
+-- Bump an employee's calendar feed version when their name changes too.
+--
+-- 0008 bumped shift_version / shifts_changed_at on a role change only, but
+-- the rendered feed also carries the employee's name (X-WR-CALNAME), so a
+-- rename kept serving the cached feed and a 304 for the old ETag. This
+-- replaces the role-only trigger with one that fires on either column.
+
+DROP TRIGGER IF EXISTS employees_bump_shift_version_on_role ON employees;
+DROP FUNCTION IF EXISTS bump_employee_shift_version_on_role();
+
+CREATE OR REPLACE FUNCTION bump_employee_shift_version_on_profile()
+RETURNS trigger
+LANGUAGE plpgsql
+AS $$
+BEGIN
+    IF NEW.role IS DISTINCT FROM OLD.role OR NEW.name IS DISTINCT FROM OLD.name THEN
+        NEW.shift_version := OLD.shift_version + 1;
+        NEW.shifts_changed_at := now();
+    END IF;
+    RETURN NEW;
+END;
+$$;
+
+CREATE TRIGGER employees_bump_shift_version_on_profile
+BEFORE UPDATE OF role, name ON employees
+FOR EACH ROW EXECUTE FUNCTION bump_employee_shift_version_on_profile();
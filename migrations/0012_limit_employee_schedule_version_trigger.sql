@@ -0,0 +1,32 @@
+-- Bump schedule versions only for employee updates that touch name or role.
+--
+-- 0004's employees_bump_schedule_version ran after every UPDATE of employees,
+-- joining shifts against its transition tables to find renamed employees.
+-- Since 0008, every shift insert/update/delete updates employees itself
+-- (shift_version / shifts_changed_at), so each shift write paid for that
+-- join with nothing to find. Triggers with transition tables can't have a
+-- column list, so this replaces it with a row-level trigger limited to
+-- name and role, with a WHEN clause that skips updates leaving both as
+-- they were. Renames are rare, so bumping per row costs nothing in
+-- practice.
+
+DROP TRIGGER IF EXISTS employees_bump_schedule_version ON employees;
+DROP FUNCTION IF EXISTS bump_schedule_version_from_employees();
+
+-- Schedule responses embed employee name and role.
+CREATE OR REPLACE FUNCTION bump_schedule_version_from_employee()
+RETURNS trigger
+LANGUAGE plpgsql
+AS $$
+BEGIN
+    UPDATE schedules SET version = version + 1
+     WHERE id IN (SELECT DISTINCT schedule_id FROM shifts WHERE employee_id = NEW.id);
+    RETURN NULL;
+END;
+$$;
+
+CREATE TRIGGER employees_bump_schedule_version
+AFTER UPDATE OF name, role ON employees
+FOR EACH ROW
+WHEN (OLD.name IS DISTINCT FROM NEW.name OR OLD.role IS DISTINCT FROM NEW.role)
+EXECUTE FUNCTION bump_schedule_version_from_employee();
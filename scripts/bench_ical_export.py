@@ -0,0 +1,113 @@
+"""
+Benchmark the streaming ICS writer against the previous icalendar-based
+export on synthetic multi-month schedules.
+
+Usage (from the repo root):
+    python scripts/bench_ical_export.py [--months 1 3 6] [--shifts-per-day 20]
+
+No database needed: shift rows are generated in the shape
+ScheduleService.get_schedule_with_shifts returns.
+"""
+
+import argparse
+import os
+import sys
+import time
+import uuid
+from datetime import date, datetime, timedelta
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+os.environ.setdefault("SUPABASE_URL", "https://bench.invalid")
+os.environ.setdefault("SUPABASE_ANON_KEY", "bench")
+os.environ.setdefault("CORS_ORIGINS", "http://localhost")
+
+from icalendar import Calendar, Event  # noqa: E402
+
+from app.core.ics import iter_calendar, utc_datetime  # noqa: E402
+from app.services.export_service import ICAL_PRODID, shift_to_event  # noqa: E402
+
+RESTAURANT_NAME = "Bellagios"
+
+
+def make_shifts(months: int, shifts_per_day: int):
+    start = date(2026, 1, 5)
+    roles = ["Server", "Cook", "Host", "Bartender"]
+    shifts = []
+    for day in range(months * 30):
+        shift_date = (start + timedelta(days=day)).isoformat()
+        for n in range(shifts_per_day):
+            shifts.append(
+                {
+                    "id": str(uuid.uuid4()),
+                    "shift_date": shift_date,
+                    "start_time": f"{8 + n % 8:02d}:00:00",
+                    "end_time": f"{16 + n % 8:02d}:00:00",
+                    "employee": {"name": f"Employee {n}", "role": roles[n % len(roles)]},
+                }
+            )
+    return shifts
+
+
+def legacy_export(shifts) -> str:
+    """The export as it was implemented with icalendar objects."""
+    cal = Calendar()
+    cal.add("prodid", ICAL_PRODID)
+    cal.add("version", "2.0")
+    dtstamp = datetime.utcnow()
+    for shift in shifts:
+        shift_date = datetime.strptime(shift["shift_date"], "%Y-%m-%d").date()
+        start_time = datetime.strptime(shift["start_time"], "%H:%M:%S").time()
+        end_time = datetime.strptime(shift["end_time"], "%H:%M:%S").time()
+        role = (shift.get("employee") or {}).get("role", "Unknown")
+
+        event = Event()
+        event.add("summary", f"Shift - {role}")
+        event.add("dtstart", datetime.combine(shift_date, start_time))
+        event.add("dtend", datetime.combine(shift_date, end_time))
+        event.add("dtstamp", dtstamp)
+        event.add("uid", f"{shift['id']}@prep-app")
+        event.add("description", RESTAURANT_NAME)
+        cal.add_component(event)
+    return cal.to_ical().decode("utf-8")
+
+
+def streaming_export(shifts):
+    dtstamp = utc_datetime(datetime.utcnow())
+    events = (shift_to_event(s, RESTAURANT_NAME, dtstamp) for s in shifts)
+    return iter_calendar(events, prodid=ICAL_PRODID)
+
+
+def best_of(fn, repeat: int) -> float:
+    timings = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        fn()
+        timings.append(time.perf_counter() - started)
+    return min(timings)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--months", type=int, nargs="+", default=[1, 3, 6])
+    parser.add_argument("--shifts-per-day", type=int, default=20)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    print(f"{'months':>6} {'shifts':>7} {'icalendar':>11} {'streaming':>11} {'speedup':>8} {'first chunk':>12}")
+    for months in args.months:
+        shifts = make_shifts(months, args.shifts_per_day)
+        legacy = best_of(lambda: legacy_export(shifts), args.repeat)
+        streaming = best_of(lambda: "".join(streaming_export(shifts)), args.repeat)
+
+        started = time.perf_counter()
+        next(streaming_export(shifts))
+        first_chunk = time.perf_counter() - started
+
+        print(
+            f"{months:>6} {len(shifts):>7} {legacy * 1000:>9.1f}ms {streaming * 1000:>9.1f}ms "
+            f"{legacy / streaming:>7.1f}x {first_chunk * 1000:>10.2f}ms"
+        )
+
+
+if __name__ == "__main__":
+    main()